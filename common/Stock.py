@@ -13,6 +13,10 @@ import numpy as np
 import datetime
 import time
 import requests
+from typing import TYPE_CHECKING, MutableMapping
+
+if TYPE_CHECKING:
+    from services.analysis_engine.analyser.IndicatorState import IndicatorState
 
 
 pd.options.mode.chained_assignment = None
@@ -41,6 +45,8 @@ class Stock:
                         "optionsData": {"currExpiry" : None, "nextExpiry" : None} 
         }
         self._tick_store = TickStore()
+        # Incremental TechnicalAnalyser indicators, attached by the analysis-engine worker
+        self.indicator_state: "IndicatorState | None" = None
         self.zerodha_ctx = {
             "last_notification_time": None,
 
@@ -182,7 +188,7 @@ class Stock:
         self._tick_store.recompute_options_aggregate(spot_price)
 
     @property
-    def options_live(self) -> dict:
+    def options_live(self) -> MutableMapping:
         return self._tick_store.options_live
 
     @property
@@ -48,12 +48,16 @@ ENV_NO_OF_INDEX  = "NO_OF_INDEX"
 ENV_DEV_MAX_CYCLES = "DEV_MAX_CYCLES"        # Max intraday loop cycles in dev mode (0 = unlimited)
 ENV_DEV_LOOP_WAIT  = "DEV_LOOP_WAIT_TIME"    # Seconds to sleep between dev cycles (-1 = use production wait time)
 ENV_THREAD_POOL_WORKERS = "THREAD_POOL_WORKERS"  # Number of worker threads in the analysis pool (default: 20)
+ENV_TICK_DISPATCH_SHARDS = "TICK_DISPATCH_SHARDS"  # Zerodha tick dispatch threads (default: 4)
+ENV_WS_CAPTURE_DIR = "WS_CAPTURE_DIR"  # market-data: record raw WS frames under this dir (unset = off)
+ENV_METRICS_FLUSH_MS = "METRICS_FLUSH_MS"  # services/common/metrics: buffered write flush interval (default: 500)
 
 # Phase 1C: analysis-engine stream contracts
 ANALYSIS_JOBS_STREAM     = "orchestrator:analysis_jobs"
 ANALYSIS_RESULTS_STREAM  = "analysis:results"
 ANALYSIS_JOBS_GROUP      = "analysis-workers"
 ANALYSIS_RESULTS_GROUP   = "monolith"
+ANALYSIS_JOBS_BATCH      = 10       # xreadgroup count per worker read
 
 # Signal intelligence: cross-layer confluence stream contracts
 SIGNALS_STREAM       = "intelligence:signals"
@@ -61,6 +65,25 @@ SIGNALS_GROUP        = "signal-intelligence"
 CONFLUENCE_STREAM    = "intelligence:confluence"
 CONFLUENCE_GROUP     = "monolith-confluence"
 
+# Symbol-partitioned signal-intelligence: producers hash each symbol onto one of
+# SIGNAL_PARTITIONS streams ("intelligence:signals:{p}"; the bare stream when 1),
+# and one signal-intelligence process consumes each partition.
+ENV_SIGNAL_PARTITIONS = "SIGNAL_PARTITIONS"   # must match across every producer and consumer
+ENV_SIGNAL_PARTITION  = "SIGNAL_PARTITION"    # signal-intelligence: partition this process owns
+SIGNAL_PARTITIONS     = max(1, int(os.environ.get(ENV_SIGNAL_PARTITIONS, 1)))
+CORRELATOR_STATE_KEY  = "intelligence:correlator_state"   # + ":{partition}", JSON snapshot
+CORRELATOR_STATE_INTERVAL = 5   # seconds between snapshots (stream entries are acked on snapshot)
+
+# data:options_live:{symbol} snapshot metadata — fields starting with this prefix
+# are not "{strike}_{CE|PE}" ticks and must be skipped by readers.
+OPTIONS_LIVE_META_PREFIX = "_"
+OPTIONS_LIVE_SEQ_FIELD   = "_seq"      # HINCRBY'd once per published snapshot
+OPTIONS_LIVE_VERSION_FIELD = "_version"  # TickStore.options_version at snapshot time
+OPTIONS_LIVE_TS_FIELD    = "_ts"       # publish wall-clock time (epoch seconds)
+# INCR'd after every snapshot pass that wrote anything; readers caching data:*
+# hashes (bot commands) drop their entries when it moves.
+SNAPSHOT_SEQ_KEY = "data:snapshot:seq"
+
 
 #DEV_CONSTANTS
 # Set NO_OF_STOCKS / NO_OF_INDEX env vars to limit how many stocks/indices are loaded
@@ -71,6 +94,9 @@ NO_OF_INDEX  = int(os.environ.get(ENV_NO_OF_INDEX,  -1))
 # Optimal for I/O-bound workload (90% network wait): 20 on i5-6200U (4 hw-threads).
 # Raise to 32 for larger FnO universes; lower to 12 if Sensibull 429s are observed.
 THREAD_POOL_WORKERS = int(os.environ.get(ENV_THREAD_POOL_WORKERS, "20"))
+# Threads routing Zerodha ticks into TickStores. Ticks are sharded by parent
+# symbol, so one stock's equity/option/future ticks are always applied in order.
+TICK_DISPATCH_SHARDS = int(os.environ.get(ENV_TICK_DISPATCH_SHARDS, "4"))
 
 
 #INTRADAY CONSTANTS
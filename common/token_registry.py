@@ -141,6 +141,50 @@ class TokenRegistry:
     def get_all_subscribed_tokens(self) -> List[int]:
         return [t for t, info in self._registry.items() if info.is_subscribed]
 
+    def to_dict(self) -> dict:
+        """JSON-safe snapshot of every registered token, strike gap and ATM."""
+        with self._lock:
+            infos = list(self._registry.values())
+        return {
+            "tokens": [
+                {
+                    "token": info.token,
+                    "token_type": info.token_type.value,
+                    "parent_symbol": info.parent_symbol,
+                    "tradingsymbol": info.tradingsymbol,
+                    "strike": info.strike,
+                    "option_type": info.option_type,
+                    "expiry": None if info.expiry is None else str(info.expiry),
+                    "zone": info.zone.value if info.zone else None,
+                    "is_subscribed": info.is_subscribed,
+                }
+                for info in infos
+            ],
+            "strike_gaps": dict(self._strike_gaps),
+            "current_atm": dict(self._current_atm),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TokenRegistry":
+        """Rebuild a registry from to_dict() output (parent objects are not included)."""
+        registry = cls()
+        for t in data.get("tokens", []):
+            registry.register(TokenInfo(
+                token=int(t["token"]),
+                token_type=TokenType(t["token_type"]),
+                parent_symbol=t["parent_symbol"],
+                tradingsymbol=t["tradingsymbol"],
+                strike=t.get("strike"),
+                option_type=t.get("option_type"),
+                expiry=t.get("expiry"),
+                zone=OptionZone(t["zone"]) if t.get("zone") else None,
+                is_subscribed=bool(t.get("is_subscribed")),
+            ))
+        for symbol, gap in data.get("strike_gaps", {}).items():
+            registry.set_strike_gap(symbol, gap)
+        registry._current_atm.update(data.get("current_atm", {}))
+        return registry
+
     def get_option_tokens_by_zone(self, parent_symbol: str, zone: OptionZone) -> List[int]:
         tokens = []
         for token in self._parent_map.get(parent_symbol, {}).get(TokenType.OPTION, set()):
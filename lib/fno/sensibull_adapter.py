@@ -244,14 +244,21 @@ def _patch_prev_oi(
     *previous* call.  After the first snapshot the cache holds the true previous
     OI value, so we write it back directly into options_live.
 
-    This is safe because options_live is a plain dict and the lock is not held
-    outside of TickStore methods — we call this immediately after update_option_tick
-    in the same thread.
+    The write goes through options_live's mapping view into the TickStore
+    columns; the lock is not held outside of TickStore methods — we call this
+    immediately after update_option_tick in the same thread.
     """
-    live = index_stock._tick_store.options_live.get(strike)
+    ts = index_stock._tick_store
+    live = ts.options_live.get(strike)
     if not live:
         return
+    patched = []
     for side, prev_oi in strike_cache.items():
         entry = live.get(side)
         if entry:
             entry["prev_oi"] = prev_oi
+            patched.append((strike, side))
+    # Re-mark so a snapshot drained between update_option_tick and this patch
+    # still republishes the corrected prev_oi.
+    if patched:
+        ts.mark_options_dirty(patched)
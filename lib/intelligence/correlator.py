@@ -11,6 +11,7 @@ Confluence levels:
 """
 
 from __future__ import annotations
+import heapq
 import json
 import time
 import threading
@@ -94,12 +95,102 @@ class Confluence:
         )
 
 
+class _SymbolBuffer:
+    """
+    Active signals for one symbol, keyed by Signal.key.
+
+    Expiry is a min-heap of (timestamp, seq, key) per layer (each layer has
+    one fixed window, so the oldest timestamp is always the next to expire).
+    Replaced signals leave stale heap entries that are skipped on pop and
+    dropped by _compact(). Per-direction layer counts and strength sums are
+    kept up to date on every add/remove, so a confluence check only touches
+    the two directions, not the signals.
+    """
+
+    __slots__ = ("lock", "entries", "by_direction", "layer_counts", "strength_sums",
+                 "heaps", "last_confluence", "confluences", "_seq")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: dict[str, tuple[int, Signal]] = {}            # key -> (seq, signal), arrival order
+        self.by_direction: dict[Direction, dict[str, Signal]] = {d: {} for d in Direction}
+        self.layer_counts: dict[Direction, dict[Layer, int]] = {d: defaultdict(int) for d in Direction}
+        self.strength_sums: dict[Direction, int] = {d: 0 for d in Direction}
+        self.heaps: dict[Layer, list] = {layer: [] for layer in Layer}
+        self.last_confluence: dict[Direction, float] = {}
+        self.confluences = 0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, signal: Signal) -> None:
+        """Insert `signal`, replacing (and moving to the end) any with the same key."""
+        key = signal.key
+        if key in self.entries:
+            self._remove(key)
+        self._seq += 1
+        self.entries[key] = (self._seq, signal)
+        self.by_direction[signal.direction][key] = signal
+        self.layer_counts[signal.direction][signal.layer] += 1
+        self.strength_sums[signal.direction] += signal.strength.value
+        heap = self.heaps[signal.layer]
+        heapq.heappush(heap, (signal.timestamp, self._seq, key))
+        if len(heap) > 2 * len(self.entries) + 64:
+            self._compact(signal.layer)
+
+    def prune(self, now: float, windows: dict[Layer, int]) -> int:
+        """Drop signals whose age has reached their layer's window. Returns the count."""
+        pruned = 0
+        for layer, heap in self.heaps.items():
+            window = windows[layer]
+            while heap and (now - heap[0][0]) >= window:
+                _, seq, key = heapq.heappop(heap)
+                current = self.entries.get(key)
+                if current is not None and current[0] == seq:
+                    self._remove(key)
+                    pruned += 1
+        return pruned
+
+    def directions(self) -> list[Direction]:
+        """BULLISH/BEARISH that have signals, in order of their oldest active signal."""
+        present = []
+        for direction in (Direction.BULLISH, Direction.BEARISH):
+            signals = self.by_direction[direction]
+            if signals:
+                present.append((self.entries[next(iter(signals))][0], direction))
+        return [d for _, d in sorted(present)]
+
+    def layers(self, direction: Direction) -> set[Layer]:
+        return {layer for layer, n in self.layer_counts[direction].items() if n}
+
+    def signals(self) -> list[Signal]:
+        return [signal for _, signal in self.entries.values()]
+
+    def _remove(self, key: str) -> None:
+        _, signal = self.entries.pop(key)
+        del self.by_direction[signal.direction][key]
+        self.layer_counts[signal.direction][signal.layer] -= 1
+        self.strength_sums[signal.direction] -= signal.strength.value
+
+    def _compact(self, layer: Layer) -> None:
+        """Rebuild a layer's heap from the live entries, dropping stale ones."""
+        heap = [(s.timestamp, seq, key) for key, (seq, s) in self.entries.items() if s.layer == layer]
+        heapq.heapify(heap)
+        self.heaps[layer] = heap
+
+
 class SignalCorrelator:
     """
     Detects cross-layer signal confluence in real time.
 
     Subscribes to SignalBus via on_signal(). When confluence is detected,
     calls the on_confluence callback.
+
+    Each symbol has its own buffer and lock (_SymbolBuffer), so signals for
+    different symbols never wait on each other; on_signal is O(log n) in the
+    symbol's active signals and the confluence check is O(1) until one fires.
+    `clock` supplies "now" (time.time by default; replays pass a recorded clock).
     """
 
     # How long a signal from each layer stays relevant (seconds)
@@ -112,75 +203,61 @@ class SignalCorrelator:
     # Minimum seconds between firing the same confluence for a symbol+direction
     CONFLUENCE_COOLDOWN = 600  # 10 min
 
-    def __init__(self, on_confluence: Callable[[Confluence], None] | None = None):
-        self._buffer: dict[str, list[Signal]] = defaultdict(list)
-        self._lock = threading.Lock()
+    def __init__(self, on_confluence: Callable[[Confluence], None] | None = None,
+                 clock: Callable[[], float] = time.time):
+        self._buffers: dict[str, _SymbolBuffer] = {}
+        self._buffers_lock = threading.Lock()
         self._on_confluence = on_confluence
-        self._last_confluence: dict[tuple[str, str], float] = {}
-        self._total_confluences = 0
+        self._clock = clock
+
+    def _buffer_for(self, symbol: str) -> _SymbolBuffer:
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            with self._buffers_lock:
+                buffer = self._buffers.setdefault(symbol, _SymbolBuffer())
+        return buffer
 
     def on_signal(self, signal: Signal):
         """Entry point — called by SignalBus on every new signal."""
-        with self._lock:
-            self._prune(signal.symbol)
-            self._dedupe_and_add(signal)
-            self._check_confluence(signal.symbol)
-
-    def _prune(self, symbol: str):
+        buffer = self._buffer_for(signal.symbol)
+        with buffer.lock:
+            self._prune(signal.symbol, buffer)
+            buffer.add(signal)
+            logger.debug("[Correlator] %s new: %s %s %s (buffer=%d)",
+                         signal.symbol, signal.layer.value, signal.source,
+                         signal.direction.value, len(buffer))
+            self._check_confluence(signal.symbol, buffer)
+
+    def _prune(self, symbol: str, buffer: _SymbolBuffer):
         """Remove expired signals outside their layer's time window."""
-        now = time.time()
-        before = len(self._buffer[symbol])
-        self._buffer[symbol] = [
-            s for s in self._buffer[symbol]
-            if (now - s.timestamp) < self.WINDOW[s.layer]
-        ]
-        pruned = before - len(self._buffer[symbol])
+        pruned = buffer.prune(self._clock(), self.WINDOW)
         if pruned > 0:
             logger.debug("[Correlator] %s pruned %d expired signals", symbol, pruned)
 
-    def _dedupe_and_add(self, signal: Signal):
-        """Replace any existing signal with same key (source+layer+direction)."""
-        self._buffer[signal.symbol] = [
-            s for s in self._buffer[signal.symbol]
-            if s.key != signal.key
-        ]
-        self._buffer[signal.symbol].append(signal)
-        logger.debug("[Correlator] %s new: %s %s %s (buffer=%d)",
-                     signal.symbol, signal.layer.value, signal.source,
-                     signal.direction.value, len(self._buffer[signal.symbol]))
-
-    def _check_confluence(self, symbol: str):
+    def _check_confluence(self, symbol: str, buffer: _SymbolBuffer):
         """Check if buffered signals form a cross-layer confluence."""
-        signals = self._buffer[symbol]
-        if len(signals) < 2:
+        if len(buffer) < 2:
             return
 
-        # Group by direction (skip NEUTRAL — they don't form directional confluence)
-        by_direction: dict[Direction, list[Signal]] = defaultdict(list)
-        for s in signals:
-            if s.direction != Direction.NEUTRAL:
-                by_direction[s.direction].append(s)
-
-        for direction, aligned_signals in by_direction.items():
-            layers = {s.layer for s in aligned_signals}
+        # NEUTRAL signals are buffered but don't form directional confluence
+        for direction in buffer.directions():
+            layers = buffer.layers(direction)
 
             # Need at least 2 different layers for confluence
             if len(layers) < 2:
                 continue
 
             # Cooldown check
-            cooldown_key = (symbol, direction.value)
-            last = self._last_confluence.get(cooldown_key, 0.0)
-            if (time.time() - last) < self.CONFLUENCE_COOLDOWN:
+            now = self._clock()
+            last = buffer.last_confluence.get(direction, 0.0)
+            if (now - last) < self.CONFLUENCE_COOLDOWN:
                 continue
 
             # Check for contradicting signals from other layers
             opposite = Direction.BEARISH if direction == Direction.BULLISH else Direction.BULLISH
-            opposing_signals = by_direction.get(opposite, [])
-            opposing_layers = {s.layer for s in opposing_signals}
-            has_contradiction = len(opposing_layers) > 0
+            has_contradiction = bool(buffer.by_direction[opposite])
 
-            base = sum(s.strength.value for s in aligned_signals)
+            base = buffer.strength_sums[direction]
             layer_bonus = (len(layers) - 1) * 5
             live_bonus = 3 if Layer.LIVE in layers else 0
             contra = -3 if has_contradiction else 0
@@ -191,15 +268,15 @@ class SignalCorrelator:
             confluence = Confluence(
                 symbol=symbol,
                 direction=direction,
-                signals=aligned_signals,
+                signals=list(buffer.by_direction[direction].values()),
                 layers_involved=layers,
                 score=score,
                 has_contradiction=has_contradiction,
-                timestamp=time.time(),
+                timestamp=now,
             )
 
-            self._last_confluence[cooldown_key] = time.time()
-            self._total_confluences += 1
+            buffer.last_confluence[direction] = now
+            buffer.confluences += 1
 
             level = confluence.level
             caution = " [CAUTION: contradicting signals]" if has_contradiction else ""
@@ -225,8 +302,9 @@ class SignalCorrelator:
           +3 if LIVE layer present (most timely confirmation)
           -3 if contradicting signals exist (dampener)
 
-        Note: _check_confluence() inlines this logic for DEBUG logging.
-        Keeping this as the canonical function for any external callers.
+        Note: _check_confluence() inlines this logic (with the buffer's running
+        strength sum as base) for DEBUG logging. Keeping this as the canonical
+        function for any external callers.
         """
         base = sum(s.strength.value for s in signals)
         layer_bonus = (len(layers) - 1) * 5
@@ -236,10 +314,64 @@ class SignalCorrelator:
 
     def get_buffer_snapshot(self, symbol: str) -> list[Signal]:
         """Return current active signals for a symbol (for debugging/display)."""
-        with self._lock:
-            self._prune(symbol)
-            return list(self._buffer.get(symbol, []))
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            return []
+        with buffer.lock:
+            self._prune(symbol, buffer)
+            return buffer.signals()
 
     @property
     def total_confluences(self) -> int:
-        return self._total_confluences
+        return sum(buffer.confluences for buffer in list(self._buffers.values()))
+
+    # ── State snapshot (warm restart) ────────────────────────────────────────
+
+    def snapshot(self) -> dict:
+        """JSON-safe state: each symbol's active signals (in order), cooldowns and confluence count."""
+        symbols = {}
+        for symbol, buffer in list(self._buffers.items()):
+            with buffer.lock:
+                self._prune(symbol, buffer)
+                symbols[symbol] = {
+                    "signals": [_signal_to_dict(s) for s in buffer.signals()],
+                    "last_confluence": {d.name: t for d, t in buffer.last_confluence.items()},
+                    "confluences": buffer.confluences,
+                }
+        return {"symbols": symbols}
+
+    def restore(self, state: dict) -> None:
+        """Load snapshot() output on top of the current state."""
+        for symbol, data in state.get("symbols", {}).items():
+            buffer = self._buffer_for(symbol)
+            with buffer.lock:
+                for fields in data.get("signals", []):
+                    buffer.add(_signal_from_dict(fields))
+                for name, ts in data.get("last_confluence", {}).items():
+                    buffer.last_confluence[Direction[name]] = float(ts)
+                buffer.confluences += int(data.get("confluences", 0))
+
+
+def _signal_to_dict(signal: Signal) -> dict:
+    """Signal as stream-style fields (enum names, as on intelligence:signals)."""
+    return {
+        "symbol": signal.symbol,
+        "direction": signal.direction.name,
+        "source": signal.source,
+        "layer": signal.layer.name,
+        "strength": signal.strength.name,
+        "timestamp": signal.timestamp,
+        "context": signal.context,
+    }
+
+
+def _signal_from_dict(fields: dict) -> Signal:
+    return Signal(
+        symbol=fields["symbol"],
+        direction=Direction[fields["direction"]],
+        source=fields["source"],
+        layer=Layer[fields["layer"]],
+        strength=SignalStrength[fields["strength"]],
+        timestamp=float(fields["timestamp"]),
+        context=fields.get("context") or {},
+    )
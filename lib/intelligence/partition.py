@@ -0,0 +1,35 @@
+"""
+Symbol partitioning for the intelligence:signals stream.
+
+Confluence state is per symbol, so every signal for a symbol must reach the
+same SignalCorrelator. Producers (RedisSignalBus) route each signal to the
+partition stream of its symbol and each signal-intelligence process consumes
+one partition. The hash is CRC32, not hash(), so every process agrees on it.
+
+With one partition the bare SIGNALS_STREAM is used, which keeps single-process
+deployments (and existing tooling) on the stream name they already know.
+"""
+from __future__ import annotations
+
+import zlib
+
+from common.constants import SIGNALS_STREAM
+
+
+def partition_for(symbol: str, partitions: int) -> int:
+    """Stable partition index of `symbol` in [0, partitions)."""
+    if partitions <= 1:
+        return 0
+    return zlib.crc32(symbol.encode("utf-8")) % partitions
+
+
+def partition_stream(partition: int, partitions: int) -> str:
+    """Stream name for one partition."""
+    if partitions <= 1:
+        return SIGNALS_STREAM
+    return f"{SIGNALS_STREAM}:{partition}"
+
+
+def stream_for(symbol: str, partitions: int) -> str:
+    """Stream a signal for `symbol` is published to."""
+    return partition_stream(partition_for(symbol, partitions), partitions)
@@ -17,6 +17,12 @@ Output::
 
     Format:  14:10:23 | INFO    | SA.orchestrator          | main.py:25 | Service started
 
+Non-blocking mode: set ``LOG_ASYNC=1`` (or call ``enable_async_logging()``) and
+log calls only enqueue; one background thread per process formats and writes.
+The queue is bounded and drops the oldest records when full
+(``async_logging_stats()``). Throttle hot DEBUG sites with
+``limit_rate(logger, per_second=1.0)``.
+
 Runtime level control via Redis key ``service:log_level:{name}``.
 Bot command ``/loglevel <name> <level>`` or CLI ``debug_cli.py loglevel <name> <level>``.
 
@@ -71,6 +77,12 @@ Startup/shutdown pattern
     logger.info("%s shutting down", name)
 """
 
+from lib.logging_util.async_logging import (
+    async_logging_stats,
+    disable_async_logging,
+    enable_async_logging,
+    limit_rate,
+)
 from lib.logging_util.factory import get_logger
 from lib.logging_util.levels import (
     refresh_level_from_redis,
@@ -82,6 +94,10 @@ from lib.logging_util.trace import trace_id, traced
 
 __all__ = [
     "get_logger",
+    "enable_async_logging",
+    "disable_async_logging",
+    "async_logging_stats",
+    "limit_rate",
     "refresh_level_from_redis",
     "set_runtime_level",
     "reset_runtime_level",
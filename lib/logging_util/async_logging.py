@@ -0,0 +1,244 @@
+"""
+Queue-backed (non-blocking) logging and per-call-site rate limiting.
+
+Opt-in with ``LOG_ASYNC=1`` (applied by ``get_logger``) or by calling
+``enable_async_logging()`` at service startup. In async mode each SA logger's
+console and file handlers are replaced by a ``QueueHandler``. That handler
+only puts the record on one bounded in-memory queue per process. A single
+``QueueListener`` thread formats each record and writes it (including file
+rotation) to the handlers of the logger it came from. The logging thread,
+e.g. a tick thread, never waits on disk.
+
+The queue holds at most ``capacity`` records. When it is full the oldest record
+is dropped (newest logs are the useful ones after a stall) and counted; see
+``async_logging_stats()``. The listener is stopped, and the queue drained, at
+interpreter exit. A forked child gets its own listener.
+
+Records are not pre-formatted on the calling thread, so ``%``-style args are
+rendered by the listener. Pass immutable values (or pre-rendered strings)
+for anything the caller mutates right after logging.
+
+High-frequency debug sites can be throttled per call site::
+
+    limit_rate(logger, per_second=1.0, burst=5)          # DEBUG and below
+    # ... emitted lines get " (+N suppressed)" when earlier ones were dropped
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from queue import Empty
+
+_DEFAULT_CAPACITY = 10_000
+
+
+class DropOldestQueue:
+    """Bounded queue for QueueHandler/QueueListener; a put on a full queue evicts the oldest item."""
+
+    def __init__(self, capacity: int = _DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._items: deque = deque()
+        self._cond = threading.Condition(threading.Lock())
+        self.enqueued = 0
+        self.dropped = 0
+
+    def put_nowait(self, item) -> None:
+        with self._cond:
+            if len(self._items) >= self.capacity:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.enqueued += 1
+            self._cond.notify()
+
+    put = put_nowait
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        with self._cond:
+            if block:
+                while not self._items:
+                    self._cond.wait(timeout)
+                    if timeout is not None and not self._items:
+                        break
+            if not self._items:
+                raise Empty
+            return self._items.popleft()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+
+class _LazyQueueHandler(QueueHandler):
+    """QueueHandler that skips formatting on the calling thread (the listener formats)."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _RouteHandler(logging.Handler):
+    """Listener-side handler: hand each record to the real handlers of the logger it came from."""
+
+    def __init__(self):
+        super().__init__()
+        self.routes: dict[str, list[logging.Handler]] = {}
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:   # handle() does the work
+        pass
+
+
+_lock = threading.Lock()
+_queue: DropOldestQueue | None = None
+_listener: QueueListener | None = None
+_router = _RouteHandler()
+_atexit_registered = False
+
+
+def enable_async_logging(capacity: int = _DEFAULT_CAPACITY) -> None:
+    """Switch every SA logger (existing and future) to the queue. Idempotent."""
+    global _queue, _listener, _atexit_registered
+    with _lock:
+        if _queue is None:
+            _queue = DropOldestQueue(capacity)
+            _listener = QueueListener(_queue, _router)
+            _listener.start()
+            if not _atexit_registered:
+                atexit.register(disable_async_logging)
+                _atexit_registered = True
+    from lib.logging_util.factory import _LOGGER_INSTANCES
+    for logger in list(_LOGGER_INSTANCES.values()):
+        attach(logger)
+
+
+def disable_async_logging() -> None:
+    """Drain the queue and give every SA logger its own handlers back."""
+    global _queue, _listener
+    with _lock:
+        listener, _listener, _queue = _listener, None, None
+    if listener is not None:
+        listener.stop()
+    for name, handlers in list(_router.routes.items()):
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, _LazyQueueHandler):
+                logger.removeHandler(handler)
+                for real in handlers:
+                    real.setLevel(handler.level)
+                    logger.addHandler(real)
+    _router.routes.clear()
+
+
+def is_async() -> bool:
+    return _queue is not None
+
+
+def attach(logger: logging.Logger) -> None:
+    """Route `logger` through the queue (no-op unless async mode is on, or if already routed)."""
+    queue = _queue
+    if queue is None or logger.name in _router.routes:
+        return
+    real = [h for h in logger.handlers if not isinstance(h, _LazyQueueHandler)]
+    level = min((h.level for h in real), default=logging.NOTSET)
+    front = _LazyQueueHandler(queue)
+    front.setLevel(level)
+    for handler in real:
+        logger.removeHandler(handler)
+        handler.setLevel(logging.NOTSET)       # the logger and its queue handler gate levels
+    _router.routes[logger.name] = real
+    logger.addHandler(front)
+
+
+def async_logging_stats() -> dict:
+    """Queue depth, capacity and enqueued / dropped record counts for this process."""
+    queue = _queue
+    if queue is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "depth": queue.qsize(),
+        "capacity": queue.capacity,
+        "enqueued": queue.enqueued,
+        "dropped": queue.dropped,
+    }
+
+
+def _after_fork_in_child() -> None:
+    """The parent's listener thread does not exist in a child; start a fresh queue and listener."""
+    global _queue, _listener, _lock
+    _lock = threading.Lock()
+    if _queue is None:
+        return
+    _queue = DropOldestQueue(_queue.capacity)
+    _listener = QueueListener(_queue, _router)
+    _listener.start()
+    for name in _router.routes:
+        for handler in logging.getLogger(name).handlers:
+            if isinstance(handler, _LazyQueueHandler):
+                handler.queue = _queue
+        for handler in _router.routes[name]:
+            handler.createLock()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# ── Rate limiting ─────────────────────────────────────────────────────────────
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per call site (file:line) for records at or below `level`.
+
+    Suppressed records are counted; the next record let through from that
+    site gets `` (+N suppressed)`` appended. Records above `level` always pass.
+    """
+
+    def __init__(self, per_second: float = 1.0, burst: int = 5, level: int = logging.DEBUG):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst
+        self.level = level
+        self._sites: dict[tuple[str, int], list] = {}   # site -> [tokens, updated, suppressed]
+        self._lock = threading.Lock()                    # loggers are called from many threads
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            now = time.monotonic()
+            state = self._sites.get(site)
+            if state is None:
+                state = self._sites[site] = [float(self.burst), now, 0]
+            state[0] = min(self.burst, state[0] + (now - state[1]) * self.per_second)
+            state[1] = now
+            if state[0] < 1:
+                state[2] += 1
+                self.suppressed += 1
+                return False
+            state[0] -= 1
+            suppressed, state[2] = state[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} (+{suppressed} suppressed)"
+        return True
+
+
+def limit_rate(logger: logging.Logger, per_second: float = 1.0, burst: int = 5,
+               level: int = logging.DEBUG) -> RateLimitFilter:
+    """Throttle `logger`'s records at or below `level` to `per_second` per call site."""
+    for existing in logger.filters:
+        if isinstance(existing, RateLimitFilter):
+            logger.removeFilter(existing)
+    rate_filter = RateLimitFilter(per_second, burst, level)
+    logger.addFilter(rate_filter)
+    return rate_filter
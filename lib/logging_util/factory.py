@@ -6,6 +6,9 @@ No module should call ``logging.getLogger()`` or ``logging.basicConfig()`` direc
 
 Runtime level overrides change the effective level WITHOUT modifying handlers,
 preserving the static configure-once model while allowing dynamic control.
+
+``LOG_ASYNC=1`` routes every logger through the queue-backed pipeline in
+``async_logging`` (handlers run on one background thread per process).
 """
 
 from __future__ import annotations
@@ -17,6 +20,8 @@ from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 
+from lib.logging_util import async_logging
+
 load_dotenv()
 
 _LOG_DIR = os.path.join(
@@ -33,6 +38,8 @@ _DEFAULT_LEVEL = getattr(logging, _DEFAULT_LEVEL_NAME, logging.INFO)
 
 _LOGGER_INSTANCES: dict[str, logging.Logger] = {}
 
+_ASYNC = os.environ.get("LOG_ASYNC", "").lower() in ("1", "true", "yes")
+
 
 def _resolve_effective_level(service_name: str) -> int:
     env_key = f"{service_name.upper().replace('-', '_')}_LOG_LEVEL"
@@ -71,4 +78,8 @@ def get_logger(service_name: str) -> logging.Logger:
     logger.addHandler(file_handler)
 
     _LOGGER_INSTANCES[service_name] = logger
+    if _ASYNC:
+        async_logging.enable_async_logging()
+    else:
+        async_logging.attach(logger)
     return logger
@@ -5,7 +5,8 @@ from common.constants import TELEGRAM_INTRADAY_TOKEN
 from lib.logging_util import get_logger
 logger = get_logger("notification")
 from .commands import register_all
-from .commands._guard import init_guard
+from .commands._cache import close_async_redis
+from .commands._guard import init_guard, job_publish_command_latency
 from .commands.system import job_llm_budget_alert
 
 # ── Re-exports for backward compatibility (tests and external callers) ────────
@@ -32,7 +33,12 @@ def init_telegram_bot():
     global _application
     logger.info("Initializing Telegram Bot...")
     init_guard()
-    _application = ApplicationBuilder().token(TELEGRAM_INTRADAY_TOKEN).build()
+    _application = (
+        ApplicationBuilder()
+        .token(TELEGRAM_INTRADAY_TOKEN)
+        .post_shutdown(_close_redis)   # before run_polling closes its loop
+        .build()
+    )
 
     # Register all commands via the router
     register_all(_application)
@@ -46,10 +52,15 @@ def init_telegram_bot():
             first=300,      # first check 5 minutes after startup
         )
         logger.info("LLM budget alert job scheduled (every 15 min)")
+        job_queue.run_repeating(job_publish_command_latency, interval=60, first=60)
 
     _retry_run_polling()
 
 
+async def _close_redis(_application) -> None:
+    await close_async_redis()
+
+
 def _retry_run_polling() -> None:
     delay = 10
     while True:
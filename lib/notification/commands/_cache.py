@@ -0,0 +1,207 @@
+"""Non-blocking Redis access for bot command handlers.
+
+Handlers run on the bot's event loop, so they must not call the synchronous
+Redis client. ``get_async_redis()`` returns a pooled ``redis.asyncio`` client
+for the running loop. ``get_snapshot_cache()`` returns the read-through cache
+that all handlers share: ``hgetall_many(keys)`` serves fresh entries from
+memory and fetches every miss in one pipeline.
+
+Cached prefixes and how long an entry lives:
+
+    data:*    up to DATA_TTL, and dropped as soon as the market-data snapshot
+              sequence (``SNAPSHOT_SEQ_KEY``, INCR'd once per publish pass)
+              moves; the sequence is polled at most every SEQ_CHECK_INTERVAL
+    stats:*   STATS_TTL
+
+The bot closes the client with ``close_async_redis()`` before its loop shuts
+down (bot_listener registers it as the Application's post_shutdown); a client
+still left from an earlier loop is released when a new loop asks for one.
+
+Other keys (e.g. ``service:registry:*``) are read through the same pipeline
+but never cached. Everything is fail-safe: a Redis error reads as empty
+hashes.
+
+``Prefetched`` adapts fetched hashes to the ``hgetall`` interface of the
+sync loaders in services/common/stock_loader.py, so they run without I/O.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import time
+from typing import Any
+
+from common.constants import SNAPSHOT_SEQ_KEY
+from lib.logging_util import get_logger
+logger = get_logger("notification")
+
+DATA_TTL = 30.0
+STATS_TTL = 5.0
+SEQ_CHECK_INTERVAL = 0.5
+_MAX_CONNECTIONS = 16
+
+_clients: dict[int, tuple[asyncio.AbstractEventLoop, Any]] = {}   # id(loop) -> (loop, client)
+
+
+def get_async_redis():
+    """Pooled redis.asyncio client bound to the running event loop (None if unavailable)."""
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(id(loop))
+    client = entry[1] if entry is not None and entry[0] is loop else None
+    if client is None:
+        try:
+            import redis.asyncio as aioredis
+            client = aioredis.from_url(
+                os.environ.get("REDIS_URL", "redis://localhost:6379"),
+                decode_responses=True,
+                max_connections=_MAX_CONNECTIONS,
+                socket_connect_timeout=2,
+                socket_timeout=5,
+            )
+        except Exception as e:
+            logger.debug("[cache] async Redis unavailable: %s", e)
+            return None
+        # A client from a previous (closed) loop is unusable; release its pool.
+        for old_loop, old_client in _clients.values():
+            _release(old_loop, old_client)
+        _clients.clear()
+        _clients[id(loop)] = (loop, client)
+    return client
+
+
+async def close_async_redis() -> None:
+    """Close the running loop's client and its pool (call before the loop closes)."""
+    entry = _clients.pop(id(asyncio.get_running_loop()), None)
+    if entry is None:
+        return
+    try:
+        await entry[1].aclose()
+    except Exception as e:
+        logger.debug("[cache] async Redis close failed: %s", e)
+
+
+def _release(loop: asyncio.AbstractEventLoop, client) -> None:
+    """Free the pooled connections of a client that belongs to another loop."""
+    if loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    # aclose() needs the client's own loop, which is gone: shut the sockets
+    # down so Redis drops the connections now (the fds close with the client).
+    pool = getattr(client, "connection_pool", None)
+    conns = [*getattr(pool, "_available_connections", ()), *getattr(pool, "_in_use_connections", ())]
+    for conn in conns:
+        writer = getattr(conn, "_writer", None)
+        sock = writer.get_extra_info("socket") if writer is not None else None
+        if sock is None:
+            continue
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class Prefetched:
+    """Read-only ``hgetall`` over hashes already fetched by ``SnapshotCache``."""
+
+    def __init__(self, hashes: dict[str, dict]):
+        self._hashes = hashes
+
+    def hgetall(self, key: str) -> dict:
+        return self._hashes.get(key) or {}
+
+
+class SnapshotCache:
+    """Read-through, short-TTL cache of snapshot / stats hashes shared by all handlers."""
+
+    def __init__(self, client_factory=get_async_redis, data_ttl: float = DATA_TTL,
+                 stats_ttl: float = STATS_TTL, seq_check_interval: float = SEQ_CHECK_INTERVAL):
+        self._client_factory = client_factory
+        self.data_ttl = data_ttl
+        self.stats_ttl = stats_ttl
+        self.seq_check_interval = seq_check_interval
+        self._entries: dict[str, tuple[float, dict]] = {}   # key -> (expires_at, hash)
+        self._seq: str | None = None
+        self._seq_checked = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _ttl(self, key: str) -> float:
+        if key.startswith("data:"):
+            return self.data_ttl
+        if key.startswith("stats:"):
+            return self.stats_ttl
+        return 0.0
+
+    async def _check_seq(self, client, now: float) -> None:
+        if now - self._seq_checked < self.seq_check_interval:
+            return
+        self._seq_checked = now
+        seq = await client.get(SNAPSHOT_SEQ_KEY)
+        if seq != self._seq:
+            if self._seq is not None:
+                self.invalidations += 1
+            self._seq = seq
+            for key in [k for k in self._entries if k.startswith("data:")]:
+                del self._entries[key]
+
+    async def hgetall_many(self, keys: list[str]) -> dict[str, dict]:
+        """{key: hash} for every key ({} for missing keys or on Redis errors)."""
+        client = self._client_factory()
+        if client is None:
+            return {key: {} for key in keys}
+        now = time.monotonic()
+        out: dict[str, dict] = {}
+        try:
+            await self._check_seq(client, now)
+            missing = []
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    out[key] = entry[1]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+            if missing:
+                self.misses += len(missing)
+                async with client.pipeline(transaction=False) as pipe:
+                    for key in missing:
+                        pipe.hgetall(key)
+                    results = await pipe.execute()
+                for key, value in zip(missing, results):
+                    value = value or {}
+                    out[key] = value
+                    ttl = self._ttl(key)
+                    if ttl:
+                        self._entries[key] = (now + ttl, value)
+        except Exception as e:
+            logger.debug("[cache] hgetall_many(%d keys) failed: %s", len(keys), e)
+            return {key: out.get(key, {}) for key in keys}
+        return out
+
+    async def scan_keys(self, match: str, count: int = 500) -> list[str]:
+        """All keys matching `match` (fail-safe)."""
+        client = self._client_factory()
+        if client is None:
+            return []
+        try:
+            return [key async for key in client.scan_iter(match=match, count=count)]
+        except Exception as e:
+            logger.debug("[cache] scan %s failed: %s", match, e)
+            return []
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+_cache = SnapshotCache()
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    return _cache
@@ -5,10 +5,17 @@ Provides two layers of access control:
      (TELEGRAM_ALLOWED_CHAT_IDS).  Applied to *all* command handlers.
   2. ``debug_chat_only()`` — additionally restricts debug commands to the
      dedicated debug chat (TELEGRAM_DEBUG_CHAT_ID).
+
+``@guard`` also times every allowed command. ``command_latency_stats()``
+returns p50/p95/p99 per handler over its last _LATENCY_WINDOW calls.
+``job_publish_command_latency`` writes them to stats:system as
+``cmd_{name}_p50_ms`` and so on.
 """
 from __future__ import annotations
 
 import os
+import time
+from collections import deque
 from functools import wraps
 from typing import Callable
 
@@ -20,6 +27,9 @@ from telegram.ext import ContextTypes
 
 from common.constants import ENV_DEBUG_CHAT_ID, ENV_ALLOWED_CHAT_IDS
 
+_LATENCY_WINDOW = 256
+_latencies: dict[str, deque] = {}
+
 _allowed_chat_ids: set[int] = set()
 _debug_chat_id: int | None = None
 _initialised = False
@@ -74,10 +84,44 @@ def debug_chat_only(update: Update) -> bool:
 
 def guard(fn: Callable) -> Callable:
     """Decorator: silently drop the update if the chat is not allowlisted."""
+    name = fn.__name__.removeprefix("cmd_")
+
     @wraps(fn)
     async def wrapped(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not chat_allowed(update):
             logger.debug("[guard] blocked chat_id=%d from %s", update.effective_chat.id, fn.__name__)
             return
-        return await fn(update, context)
+        start = time.perf_counter()
+        try:
+            return await fn(update, context)
+        finally:
+            record_latency(name, (time.perf_counter() - start) * 1000)
     return wrapped
+
+
+def record_latency(name: str, ms: float) -> None:
+    window = _latencies.get(name)
+    if window is None:
+        window = _latencies[name] = deque(maxlen=_LATENCY_WINDOW)
+    window.append(ms)
+
+
+def command_latency_stats() -> dict[str, str]:
+    """stats:system fields: cmd_{name}_p50_ms / _p95_ms / _p99_ms / _count per handler."""
+    fields = {}
+    for name, window in list(_latencies.items()):
+        ordered = sorted(window)
+        if not ordered:
+            continue
+        for p in (50, 95, 99):
+            fields[f"cmd_{name}_p{p}_ms"] = f"{ordered[min(len(ordered) - 1, len(ordered) * p // 100)]:.1f}"
+        fields[f"cmd_{name}_count"] = str(len(ordered))
+    return fields
+
+
+async def job_publish_command_latency(context) -> None:
+    """JobQueue callback: publish command latency percentiles to stats:system."""
+    from services.common.metrics import set_system
+    fields = command_latency_stats()
+    if fields:
+        set_system(**fields)
@@ -1,6 +1,13 @@
-"""Shared helper utilities used across multiple command modules."""
+"""Shared helper utilities used across multiple command modules.
+
+The ``*_async`` variants are for command handlers. They fetch through the
+shared snapshot cache (``_cache.py``) on the event loop and apply the result
+with the same stock_loader code, so the handler never blocks on Redis.
+"""
 from __future__ import annotations
 
+import asyncio
+
 import common.shared as shared
 from lib.logging_util import get_logger
 logger = get_logger("notification")
@@ -37,6 +44,24 @@ def _get_redis():
         return None
 
 
+_cached_binary_redis = None
+
+
+def _get_binary_redis():
+    """Binary (decode_responses=False) Redis client for packed-record keys; None if unavailable."""
+    global _cached_binary_redis
+    if _cached_binary_redis is not None:
+        return _cached_binary_redis
+    try:
+        import redis, os
+        _cached_binary_redis = redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379"))
+        _cached_binary_redis.ping()
+    except Exception as e:
+        logger.debug(f"[helpers] binary Redis unavailable: {e}")
+        _cached_binary_redis = None
+    return _cached_binary_redis
+
+
 def find_stock_by_symbol(symbol: str):
     """Look up a Stock object by symbol across all tracked dicts."""
     symbol_upper = symbol.upper().strip()
@@ -84,10 +109,43 @@ def refresh_stock_from_redis(symbol: str) -> bool:
         return False
 
 
+def _tick_keys(symbol: str) -> list[str]:
+    """The hashes load_tick_from_redis reads for `symbol`."""
+    return [f"data:tick:{symbol}", f"data:options_agg:{symbol}", f"data:options_live:{symbol}"]
+
+
+async def refresh_stock_async(symbol: str) -> bool:
+    """Non-blocking refresh_stock_from_redis: ticks via the snapshot cache, priceData off-loop."""
+    stock = find_stock_by_symbol(symbol)
+    if stock is None:
+        return False
+    from ._cache import Prefetched, get_snapshot_cache
+    from services.common.stock_loader import load_tick_from_redis
+    try:
+        if stock.is_price_data_empty():
+            await asyncio.to_thread(_load_price_data, stock)
+        hashes = await get_snapshot_cache().hgetall_many(_tick_keys(stock.stock_symbol))
+        load_tick_from_redis(Prefetched(hashes), stock)
+        stock.update_latest_data()
+        return True
+    except Exception as e:
+        logger.debug(f"[helpers] refresh_stock_async({symbol}): {e}")
+        return False
+
+
+def _load_price_data(stock) -> None:
+    redis = _get_redis()
+    if redis is None:
+        return
+    from services.common.stock_loader import load_price_data_from_redis
+    if stock.is_index:
+        load_price_data_from_redis(redis, [], [stock])
+    else:
+        load_price_data_from_redis(redis, [stock], [])
+
+
 def build_gainers_losers():
     """Compute top 5 gainers and losers from live stock data."""
-    from common.helperFunctions import percentageChange
-
     redis = _get_redis()
     if redis is not None:
         from services.common.stock_loader import load_tick_from_redis
@@ -98,6 +156,28 @@ def build_gainers_losers():
             except Exception as e:
                 logger.debug("[helpers] build_gainers_losers skip %s: %s", stock.stock_symbol, e)
                 continue
+    return _rank_gainers_losers()
+
+
+async def build_gainers_losers_async():
+    """build_gainers_losers with every stock's hashes fetched in one cached pipeline."""
+    from ._cache import Prefetched, get_snapshot_cache
+    from services.common.stock_loader import load_tick_from_redis
+    stocks = list(shared.app_ctx.stock_token_obj_dict.values())
+    keys = [key for stock in stocks for key in _tick_keys(stock.stock_symbol)]
+    if keys:
+        hashes = Prefetched(await get_snapshot_cache().hgetall_many(keys))
+        for stock in stocks:
+            try:
+                load_tick_from_redis(hashes, stock)
+                stock.update_latest_data()
+            except Exception as e:
+                logger.debug("[helpers] build_gainers_losers skip %s: %s", stock.stock_symbol, e)
+    return _rank_gainers_losers()
+
+
+def _rank_gainers_losers():
+    from common.helperFunctions import percentageChange
 
     gainers, losers = [], []
     for _, stock in shared.app_ctx.stock_token_obj_dict.items():
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import os
 import time
+from typing import cast
 
 import common.shared as shared
 from ._helpers import find_stock_by_symbol
@@ -56,13 +57,14 @@ def _read_market_data_registry() -> dict:
         _r = _get_redis()
         if _r is None:
             return {}
-        raw = _r.hgetall("service:registry:market-data")
+        raw = cast(dict, _r.hgetall("service:registry:market-data"))
         if not raw or raw.get("status") != "healthy":
             return {}
         return {
             "ws_connected": raw.get("ws1_connected", "False") == "True",
             "ws_options_connected": raw.get("ws2_connected", "False") == "True",
             "ws_tick_count": int(raw.get("tick_count", 0)),
+            "tick_queue_depth": int(raw.get("tick_queue_depth", 0)),
             "ws1_subscribed": int(raw.get("ws1_subs", 0)),
             "ws2_subscribed": int(raw.get("ws2_subs", 0)),
             "ws2_reconnects": int(raw.get("ws2_reconnects", 0)),
@@ -98,7 +100,7 @@ def inspect_overview() -> dict:
         ws1_subscribed = md["ws1_subscribed"]
         ws2_subscribed = md["ws2_subscribed"]
         ws2_reconnects = 0  # not published yet
-        tick_queue_depth = 0
+        tick_queue_depth = md["tick_queue_depth"]
         unknown_tokens = 0
         ws_reconnects = 0
         last_equity_tick = md["last_equity_tick"]
@@ -118,7 +120,7 @@ def inspect_overview() -> dict:
         ws_options_connected = getattr(tm, "options_connected", False) if tm else False
         ws_tick_count = getattr(tm, "_tick_count", 0) if tm else 0
         ws_reconnects = getattr(tm, "reconnect_attempts", 0) if tm else 0
-        tick_queue_depth = tm.tick_queue.qsize() if tm else 0
+        tick_queue_depth = tm.tick_dispatcher.depth() if tm else 0
         unknown_tokens = _safe_len(getattr(tm, "_unknown_tokens", set())) if tm else 0
         last_equity_tick = _fmt_age(ctx.last_equity_tick_time)
         sensibull_info = _inspect_sensibull_feed(ctx)
@@ -171,6 +173,7 @@ def _inspect_sensibull_feed(ctx) -> dict:
             "thread_alive": thread.is_alive() if thread else False,
             "stopped": stop_event.is_set() if stop_event else True,
             "subscription_count": _safe_len(subs),
+            "decode": feed.stats() if callable(getattr(feed, "stats", None)) else {},
             "subscriptions": [
                 {"underlying": s.get("underlying"), "expiry": s.get("expiry")}
                 for s in (subs if isinstance(subs, list) else [])
@@ -373,7 +376,7 @@ def inspect_counters() -> dict:
         "error_count": ctx.error_count,
         "ws_tick_count": getattr(tm, "_tick_count", 0) if tm else 0,
         "ws_reconnects": getattr(tm, "reconnect_attempts", 0) if tm else 0,
-        "tick_queue_depth": tm.tick_queue.qsize() if tm else 0,
+        "tick_queue_depth": tm.tick_dispatcher.depth() if tm else 0,
         "unknown_tokens": _safe_len(getattr(tm, "_unknown_tokens", set())) if tm else 0,
         "llm_tokens_used": (
             getattr(ctx.narrator._client, "_daily_tokens", 0)
@@ -1,6 +1,11 @@
-"""Market data commands: /ltp, /gainers, /losers, /watchlist, /holidays, /straddle, /walls."""
+"""Market data commands: /ltp, /gainers, /losers, /watchlist, /holidays, /straddle, /walls.
+
+Redis reads go through the shared async snapshot cache (``_cache.py``);
+the remaining sync calls run in a worker thread (``asyncio.to_thread``).
+"""
 from __future__ import annotations
 
+import asyncio
 import time
 from datetime import datetime
 
@@ -11,7 +16,8 @@ import common.shared as shared
 from lib.logging_util import get_logger
 logger = get_logger("notification")
 from ._guard import guard
-from ._helpers import find_stock_by_symbol, build_gainers_losers, refresh_stock_from_redis
+from ._cache import get_snapshot_cache
+from ._helpers import find_stock_by_symbol, build_gainers_losers_async, refresh_stock_async, _get_binary_redis
 
 # Supported symbols for options commands
 _OPTIONS_SYMBOLS = {"NIFTY", "BANKNIFTY"}
@@ -40,23 +46,26 @@ def _staleness_tag(last_updated: float) -> str:
 def _session_wall_delta(symbol: str, wall_type: str, minutes: int = 375) -> tuple[int, int] | None:
     """
     Returns (open_oi, current_oi) for the dominant OI wall since session open.
-    Uses LiveOptionsHistory via live_options_engine. Returns None if no history yet
-    or if the wall strike migrated during the window.
+    Uses the in-process LiveOptionsHistory when the WS runs here, otherwise the
+    market-data service's persisted history via SharedOptionsHistory. Returns
+    None if no history yet or if the wall strike migrated during the window.
     """
     import common.shared as _shared
     tm = _shared.app_ctx.zd_ticker_manager
-    if tm is None:
-        return None  # WS moved to market-data service — no in-process history
-    engine = getattr(tm, "live_options_engine", None)
-    if engine is None:
-        return None
-    history = engine.get_history(symbol)
+    engine = getattr(tm, "live_options_engine", None) if tm is not None else None
+    if engine is not None:
+        history = engine.get_history(symbol)
+    else:
+        # WS moved to market-data service — read its persisted history
+        from services.analysis_engine.analyser.LiveOptionsHistory import SharedOptionsHistory
+        rc = _get_binary_redis()
+        history = SharedOptionsHistory(symbol, rc) if rc is not None else None
     if history is None or history.size() < 2:
         return None
     return history.wall_oi_trend(wall_type, minutes)
 
 
-def _resolve_options_stock(symbol: str):
+async def _resolve_options_stock(symbol: str):
     """
     Returns (stock, error_text). stock is None when error_text is set.
     Validates symbol is in _OPTIONS_SYMBOLS and has live options data.
@@ -76,7 +85,7 @@ def _resolve_options_stock(symbol: str):
         return None, f"❌ <b>{symbol}</b> not found in tracked instruments."
 
     # Refresh live tick data from Redis (market-data service snapshots)
-    refresh_stock_from_redis(symbol)
+    await refresh_stock_async(symbol)
 
     return stock, None
 
@@ -103,7 +112,7 @@ async def cmd_ltp(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         return
 
     # Refresh live tick data from Redis
-    refresh_stock_from_redis(symbol)
+    await refresh_stock_async(symbol)
 
     ltp = stock.ltp
     change = stock.ltp_change_perc
@@ -133,7 +142,7 @@ async def cmd_ltp(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
 @guard
 async def cmd_gainers(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    gainers, _ = build_gainers_losers()
+    gainers, _ = await build_gainers_losers_async()
     if not gainers:
         await context.bot.send_message(
             chat_id=update.effective_chat.id, text="No gainer data available yet."
@@ -150,7 +159,7 @@ async def cmd_gainers(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
 @guard
 async def cmd_losers(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    _, losers = build_gainers_losers()
+    _, losers = await build_gainers_losers_async()
     if not losers:
         await context.bot.send_message(
             chat_id=update.effective_chat.id, text="No loser data available yet."
@@ -197,19 +206,25 @@ async def cmd_watchlist(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     parts.append(f"<b>🌍 Global Indices ({len(globals_list)})</b>")
     parts.append(f"<code>{', '.join(globals_list) if globals_list else '—'}</code>\n")
 
+    # One pipelined (cached) read: market-data registry + every index's futures_live
+    futures_stocks = [
+        stock for stock in ctx.index_token_obj_dict.values()
+        if (getattr(stock, "zerodha_ctx", None) or {}).get("futures_mdata", {}).get("current")
+    ]
+    hashes = await get_snapshot_cache().hgetall_many(
+        ["service:registry:market-data"] + [f"data:futures_live:{s.stock_symbol}" for s in futures_stocks]
+    )
+
     ws_connected = False
     ws1_subs = 0
     ws2_subs = 0
     # Read WS status from market-data service registry (WS moved to separate service)
     try:
-        from ._helpers import _get_redis
-        _r = _get_redis()
-        if _r is not None:
-            _md = _r.hgetall("service:registry:market-data")
-            if _md.get("status") == "healthy":
-                ws_connected = _md.get("ws1_connected", "False") == "True"
-                ws1_subs = int(_md.get("ws1_subs", 0))
-                ws2_subs = int(_md.get("ws2_subs", 0))
+        _md = hashes["service:registry:market-data"]
+        if _md.get("status") == "healthy":
+            ws_connected = _md.get("ws1_connected", "False") == "True"
+            ws1_subs = int(_md.get("ws1_subs", 0))
+            ws2_subs = int(_md.get("ws2_subs", 0))
     except Exception as e:
         logger.debug("[watchlist] Redis market-data registry read failed: %s", e)
     # Fallback: check monolith's own tm (still set in dev or if WS not yet moved)
@@ -262,38 +277,33 @@ async def cmd_watchlist(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             parts.append(f"  ⚠️ Registry error: {exc}")
 
     futures_symbols = []
-    for token, stock in ctx.index_token_obj_dict.items():
-        zctx = getattr(stock, "zerodha_ctx", None)
-        if zctx and zctx.get("futures_mdata", {}).get("current"):
-            # Read futures live data from Redis (market-data service snapshot)
-            try:
-                from ._helpers import _get_redis
-                _r = _get_redis()
-                if _r is not None:
-                    _fl = _r.hgetall(f"data:futures_live:{stock.stock_symbol}")
-                    if _fl:
-                        ltp_val = float(_fl.get("current_ltp", 0)) or None
-                        oi_val = float(_fl.get("current_oi", 0)) or None
-                        info = f"<b>{stock.stock_symbol}</b>"
-                        if ltp_val:
-                            info += f" LTP: <code>{ltp_val:.2f}</code>"
-                        if oi_val:
-                            info += f" OI: <code>{oi_val:,.0f}</code>"
-                        futures_symbols.append(info)
-                        continue
-            except Exception as e:
-                logger.debug("[watchlist] futures_live Redis read failed for %s: %s", stock.stock_symbol, e)
-            # Fallback: in-memory futures_live
-            live = getattr(stock, "futures_live", {})
-            cur = live.get("current", {})
-            ltp_val = cur.get("ltp")
-            oi_val = cur.get("oi")
-            info = f"<b>{stock.stock_symbol}</b>"
-            if ltp_val:
-                info += f" LTP: <code>{ltp_val:.2f}</code>"
-            if oi_val:
-                info += f" OI: <code>{oi_val:,}</code>"
-            futures_symbols.append(info)
+    for stock in futures_stocks:
+        # Futures live data from the market-data service snapshot
+        try:
+            _fl = hashes[f"data:futures_live:{stock.stock_symbol}"]
+            if _fl:
+                ltp_val = float(_fl.get("current_ltp", 0)) or None
+                oi_val = float(_fl.get("current_oi", 0)) or None
+                info = f"<b>{stock.stock_symbol}</b>"
+                if ltp_val:
+                    info += f" LTP: <code>{ltp_val:.2f}</code>"
+                if oi_val:
+                    info += f" OI: <code>{oi_val:,.0f}</code>"
+                futures_symbols.append(info)
+                continue
+        except Exception as e:
+            logger.debug("[watchlist] futures_live Redis read failed for %s: %s", stock.stock_symbol, e)
+        # Fallback: in-memory futures_live
+        live = getattr(stock, "futures_live", {})
+        cur = live.get("current", {})
+        ltp_val = cur.get("ltp")
+        oi_val = cur.get("oi")
+        info = f"<b>{stock.stock_symbol}</b>"
+        if ltp_val:
+            info += f" LTP: <code>{ltp_val:.2f}</code>"
+        if oi_val:
+            info += f" OI: <code>{oi_val:,}</code>"
+        futures_symbols.append(info)
 
     if futures_symbols:
         parts.append("")
@@ -378,7 +388,7 @@ async def cmd_holidays(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @guard
 async def cmd_straddle(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     symbol = context.args[0].upper().strip() if context.args else ""
-    stock, err = _resolve_options_stock(symbol)
+    stock, err = await _resolve_options_stock(symbol)
     if err:
         await context.bot.send_message(
             chat_id=update.effective_chat.id, text=err, parse_mode="HTML"
@@ -448,7 +458,7 @@ async def cmd_straddle(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @guard
 async def cmd_walls(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     symbol = context.args[0].upper().strip() if context.args else ""
-    stock, err = _resolve_options_stock(symbol)
+    stock, err = await _resolve_options_stock(symbol)
     if err:
         await context.bot.send_message(
             chat_id=update.effective_chat.id, text=err, parse_mode="HTML"
@@ -482,8 +492,10 @@ async def cmd_walls(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     pe_wall_tick_net = pe_wall_oi - pe_wall_data.get("prev_oi", pe_wall_oi)
 
     # Session-level delta from LiveOptionsHistory (open-of-day vs now)
-    ce_session = _session_wall_delta(symbol, "CE")
-    pe_session = _session_wall_delta(symbol, "PE")
+    ce_session, pe_session = await asyncio.gather(
+        asyncio.to_thread(_session_wall_delta, symbol, "CE"),
+        asyncio.to_thread(_session_wall_delta, symbol, "PE"),
+    )
 
     # Gaps from spot to each wall
     ce_gap = ce_wall - spot if spot > 0 else 0.0
@@ -10,9 +10,12 @@ Usage:
   /debugstats all nodata — filter to last_analysis_result=NO_DATA
 
 Restricted to the debug chat.
+
+stats:* hashes are read through the shared async snapshot cache (``_cache.py``).
 """
 from __future__ import annotations
 
+import asyncio
 import time
 
 from telegram import Update
@@ -22,11 +25,10 @@ from ._guard import guard, debug_chat_only
 from lib.logging_util import get_logger
 logger = get_logger("notification")
 from services.common.metrics import (
-    get_system_stats,
-    get_stock_stats,
-    get_all_stock_stats,
+    flush as flush_metrics,
     get_top_stocks,
 )
+from ._cache import get_snapshot_cache
 
 
 def _fmt_age(ts_str: str) -> str:
@@ -75,6 +77,14 @@ def _build_system_text(stats: dict) -> str:
     lines.append(f"  Total ticks:     <code>{int(float(ticks)):,}</code>")
     lines.append(f"  Tick rate:       {rate_icon} <code>{rate}</code>/s")
     lines.append(f"  Snapshots:       <code>{snap_age}</code> old")
+    if "snapshot_publish_duration_ms" in stats:
+        pub_ms = stats.get("snapshot_publish_duration_ms", "0")
+        pub_max = stats.get("snapshot_publish_duration_max_ms", "0")
+        pub_icon = "🟢" if float(pub_max or 0) < 500 else ("🟡" if float(pub_max or 0) < 1000 else "🔴")
+        lines.append(f"  Publish pass:    {pub_icon} <code>{pub_ms}</code>ms (max <code>{pub_max}</code>ms)")
+        lines.append(f"  Written/skipped: <code>{stats.get('snapshot_written', '0')}</code>"
+                     f" / <code>{stats.get('snapshot_skipped', '0')}</code>"
+                     f"  overruns <code>{stats.get('snapshot_overruns', '0')}</code>")
     lines.append(f"  WS2 reconnects:  {ws2_icon} <code>{ws2_rec}</code>")
 
     # Analysis Pipeline
@@ -199,8 +209,21 @@ def _build_stock_text(symbol: str, stats: dict) -> str:
     return "\n".join(lines)
 
 
-def _build_all_text(sort_by: str) -> str:
-    all_stats = get_all_stock_stats()
+async def _read_stats(keys: list[str]) -> dict[str, dict]:
+    """stats:* hashes via the snapshot cache, after this process's buffered writes land."""
+    await asyncio.to_thread(flush_metrics)
+    return await get_snapshot_cache().hgetall_many(keys)
+
+
+async def _read_all_stock_stats() -> dict[str, dict]:
+    cache = get_snapshot_cache()
+    await asyncio.to_thread(flush_metrics)
+    keys = await cache.scan_keys("stats:stock:*")
+    hashes = await cache.hgetall_many(keys)
+    return {key.split(":", 2)[-1]: value for key, value in hashes.items()}
+
+
+def _build_all_text(sort_by: str, all_stats: dict[str, dict]) -> str:
     if not all_stats:
         return "⚠️ No stock stats found."
 
@@ -259,13 +282,15 @@ async def cmd_debug_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     args = context.args or []
     if not args:
-        text = _build_system_text(get_system_stats())
+        stats = (await _read_stats(["stats:system"]))["stats:system"]
+        text = _build_system_text(stats)
     elif args[0].upper() == "ALL":
         sort_by = args[1].lower() if len(args) > 1 else "alerts"
-        text = _build_all_text(sort_by)
+        text = _build_all_text(sort_by, await _read_all_stock_stats())
     else:
         symbol = args[0].upper()
-        text = _build_stock_text(symbol, get_stock_stats(symbol))
+        key = f"stats:stock:{symbol}"
+        text = _build_stock_text(symbol, (await _read_stats([key]))[key])
 
     if len(text) <= 4096:
         await context.bot.send_message(
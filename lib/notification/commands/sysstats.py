@@ -9,10 +9,12 @@ Restricted to the debug chat (same as /debugstats).
 
 Reads from Redis keys written by the resource-monitor service:
   sys:latest:system, sys:latest:{service}, sys:latest:redis
-  sys:ts:* (ZSET time-series), sys:daily:{date} (daily rollup)
+  sys:ring:* (ring-buffer time series, services/common/timeseries.py),
+  sys:daily:{date} (daily rollup)
 """
 from __future__ import annotations
 
+import asyncio
 import os
 import time
 import json
@@ -24,6 +26,7 @@ from telegram.ext import ContextTypes
 from ._guard import guard, debug_chat_only
 from lib.logging_util import get_logger
 logger = get_logger("notification")
+from services.common.timeseries import query as ts_query
 
 
 # ── Redis access ─────────────────────────────────────────────────────────────
@@ -47,6 +50,25 @@ def _get_redis():
     return _REDIS_CLIENT
 
 
+_TS_REDIS_CLIENT = None
+
+
+def _get_ts_redis():
+    """Get a binary (decode_responses=False) sync Redis client for sys:ring:* reads."""
+    global _TS_REDIS_CLIENT
+    if _TS_REDIS_CLIENT is not None:
+        return _TS_REDIS_CLIENT
+    try:
+        import redis as _sync_redis
+        redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
+        _TS_REDIS_CLIENT = _sync_redis.from_url(redis_url)
+        _TS_REDIS_CLIENT.ping()
+    except Exception as e:
+        logger.debug(f"[sysstats] Redis unavailable: {e}")
+        _TS_REDIS_CLIENT = None
+    return _TS_REDIS_CLIENT
+
+
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
 _SPARK_CHARS = "▁▂▃▄▅▆▇█"
@@ -66,51 +88,30 @@ def _sparkline(values: list[float]) -> str:
     )
 
 
-def _ts_to_zset_values(rc, key: str, count: int = 24) -> list[float]:
-    """Read the last N values from a time-series ZSET (sorted by score=timestamp)."""
-    try:
-        raw = rc.zrange(key, -count, -1, withscores=False)
-        return [float(v.split(":", 1)[-1]) for v in raw]
-    except Exception:
-        return []
-
-
-def _ts_to_hourly_avg(rc, key: str, hours: int = 24) -> list[float]:
-    """Read time-series and downsample to hourly averages."""
-    try:
-        now = time.time()
-        raw = rc.zrangebyscore(key, now - hours * 3600, now, withscores=True)
-        if not raw:
-            return []
-        # Group by hour
-        hourly: dict[int, list[float]] = {}
-        for val_str, ts in raw:
-            val = float(val_str.split(":", 1)[-1])
-            hour_bucket = int(ts) // 3600
-            hourly.setdefault(hour_bucket, []).append(val)
-        # Build ordered list of hourly averages
-        buckets = sorted(hourly.keys())
-        return [sum(hourly[b]) / len(hourly[b]) for b in buckets[-hours:]]
-    except Exception:
+def _ts_to_hourly_avg(ts_rc, metric: str, hours: int = 24) -> list[float]:
+    """Hourly averages of a ring-buffer time series over the last N hours."""
+    if ts_rc is None:
         return []
+    now = time.time()
+    points = ts_query(ts_rc, metric, now - hours * 3600, now, step=3600)
+    return [p.avg for p in points[-hours:]]
 
 
-def _trend_arrow(rc, key: str, now_val: float) -> str:
+def _trend_arrow(ts_rc, metric: str, now_val: float) -> str:
     """Compare current value vs value 5min ago (10 samples)."""
-    try:
-        now = time.time()
-        raw = rc.zrangebyscore(key, now - 300, now - 290, withscores=False)
-        if raw:
-            old = float(raw[0].split(":", 1)[-1])
-            if old > 0:
-                pct_change = ((now_val - old) / old) * 100
-                if pct_change > 5:
-                    return "↑"
-                elif pct_change < -5:
-                    return "↓"
-        return "→"
-    except Exception:
+    if ts_rc is None:
         return "→"
+    now = time.time()
+    points = ts_query(ts_rc, metric, now - 300, now - 270)
+    if points:
+        old = points[0].last
+        if old > 0:
+            pct_change = ((now_val - old) / old) * 100
+            if pct_change > 5:
+                return "↑"
+            elif pct_change < -5:
+                return "↓"
+    return "→"
 
 
 def _color_icon(val: float, green: float = 60.0, yellow: float = 80.0) -> str:
@@ -175,7 +176,7 @@ def _discover_services(rc) -> list[str]:
 # View 1: Live dashboard
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _build_live_text(rc) -> str:
+def _build_live_text(rc, ts_rc=None) -> str:
     sys_raw = rc.hgetall("sys:latest:system") or {}
     redis_raw = rc.hgetall("sys:latest:redis") or {}
 
@@ -196,8 +197,8 @@ def _build_live_text(rc) -> str:
     core_max = float(sys_raw.get("cpu_core_max", 0))
     core_avg = float(sys_raw.get("cpu_core_avg", 0))
 
-    cpu_arrow = _trend_arrow(rc, "sys:ts:cpu", cpu)
-    ram_arrow = _trend_arrow(rc, "sys:ts:ram", ram)
+    cpu_arrow = _trend_arrow(ts_rc, "cpu", cpu)
+    ram_arrow = _trend_arrow(ts_rc, "ram", ram)
 
     lines.append("🖥️ <b>System</b>")
     lines.append(
@@ -320,26 +321,26 @@ def _build_live_text(rc) -> str:
 # View 2: History — 24h sparklines + 7-day table
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _build_history_text(rc) -> str:
+def _build_history_text(rc, ts_rc=None) -> str:
     now_str = datetime.now().strftime("%Y-%m-%d")
     lines = [f"📈 <b>24-Hour Trends</b> ({now_str})", ""]
 
     # ── Sparklines ──────────────────────────────────────────────────────────
     sparkline_specs = [
-        ("sys:ts:cpu", "CPU Total", "%"),
-        ("sys:ts:cpu_core_max", "CPU Core Max (hottest)", "%"),
-        ("sys:ts:cpu_core_avg", "CPU Core Avg", "%"),
-        ("sys:ts:ram", "RAM", "%"),
-        ("sys:ts:redis_mem", "Redis Memory", "MB"),
+        ("cpu", "CPU Total", "%"),
+        ("cpu_core_max", "CPU Core Max (hottest)", "%"),
+        ("cpu_core_avg", "CPU Core Avg", "%"),
+        ("ram", "RAM", "%"),
+        ("redis_mem", "Redis Memory", "MB"),
     ]
 
     # Per-service RSS sparklines
     service_names = _discover_services(rc)
     for name in service_names:
-        sparkline_specs.append((f"sys:ts:rss:{name}", f"RSS ({name})", "MB"))
+        sparkline_specs.append((f"rss:{name}", f"RSS ({name})", "MB"))
 
-    for key, label, unit in sparkline_specs:
-        hourly = _ts_to_hourly_avg(rc, key, 24)
+    for metric, label, unit in sparkline_specs:
+        hourly = _ts_to_hourly_avg(ts_rc, metric, 24)
         if not hourly:
             lines.append(f"  {label}: ⚪ no data")
             continue
@@ -394,7 +395,7 @@ def _build_history_text(rc) -> str:
 # View 3: Redis deep dive
 # ═══════════════════════════════════════════════════════════════════════════
 
-def _build_redis_text(rc) -> str:
+def _build_redis_text(rc, ts_rc=None) -> str:
     redis_raw = rc.hgetall("sys:latest:redis") or {}
 
     if not redis_raw:
@@ -457,7 +458,7 @@ def _build_redis_text(rc) -> str:
 
     # Redis memory sparkline
     lines.append("")
-    hourly = _ts_to_hourly_avg(rc, "sys:ts:redis_mem", 24)
+    hourly = _ts_to_hourly_avg(ts_rc, "redis_mem", 24)
     if hourly:
         avg_val = sum(hourly) / len(hourly)
         max_val = max(hourly)
@@ -485,13 +486,16 @@ async def cmd_sysstats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         )
         return
 
+    ts_rc = _get_ts_redis()
     args = context.args or []
     if args and args[0].lower() == "history":
-        text = _build_history_text(rc)
+        builder = _build_history_text
     elif args and args[0].lower() == "redis":
-        text = _build_redis_text(rc)
+        builder = _build_redis_text
     else:
-        text = _build_live_text(rc)
+        builder = _build_live_text
+    # The builders make many small sync reads (KEYS, ring GETRANGEs) — keep them off the event loop
+    text = await asyncio.to_thread(builder, rc, ts_rc)
 
     if len(text) <= 4096:
         await context.bot.send_message(
@@ -0,0 +1,413 @@
+"""
+NotificationDispatcher — concurrent, rate-aware delivery of notification jobs.
+
+Each destination (one Telegram bot+chat, or one Discord webhook) is a lane
+with its own worker thread and keep-alive requests.Session, so a slow or
+rate-limited destination only delays its own messages. Within a lane,
+messages go out in priority order (live-options / confluence / alerts first,
+positional reports last), then arrival order.
+
+Rate limits are token buckets: per Telegram chat, per Telegram bot (global
+across its chats) and per Discord webhook. A 429 pauses the destination's
+buckets for the server's `retry_after`.
+
+Failed sends (timeouts, connection errors, 429, 5xx) are retried with
+exponential backoff by putting the message back on its lane with a
+not-before time; the lane keeps sending other messages meanwhile. Other 4xx
+responses are not retried.
+
+A job fans out to one delivery per destination; `on_done(job, ok, error)` is
+called once all of them finished, with ok=True if any was delivered.
+
+stats() reports queue depth and queue-to-delivery latency percentiles
+(from the job's enqueue time, normally its Redis stream ID) for stats:system.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from lib.logging_util import get_logger
+from services.common.percentiles import percentiles
+logger = get_logger("notification-service")
+
+# ── Priorities ────────────────────────────────────────────────────────────────
+
+PRIORITY_URGENT = 0   # live options, confluence, crash/auth/resource alerts
+PRIORITY_NORMAL = 1   # intraday analysis results
+PRIORITY_BULK = 2     # positional reports
+
+_URGENT_MESSAGE_TYPES = {"live_options", "crash", "auth_alert", "resource_alert"}
+
+
+def job_priority(job: dict) -> int:
+    """Delivery priority of a notification:jobs message."""
+    if (job.get("chat_type") == "live_options"
+            or job.get("message_type") in _URGENT_MESSAGE_TYPES
+            or (job.get("priority") or "").upper() in ("HIGH", "CRITICAL")):
+        return PRIORITY_URGENT
+    if job.get("chat_type") == "positional" or job.get("message_type") == "report":
+        return PRIORITY_BULK
+    return PRIORITY_NORMAL
+
+
+# ── Rate limiting ─────────────────────────────────────────────────────────────
+
+# Telegram: ~1 msg/s per chat, 30 msg/s per bot. Discord webhooks: 5 per 2 s.
+TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST = 1.0, 3
+TELEGRAM_BOT_RATE, TELEGRAM_BOT_BURST = 30.0, 30
+DISCORD_WEBHOOK_RATE, DISCORD_WEBHOOK_BURST = 2.5, 5
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `take` may overdraw slightly when lanes race."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available (0 if now)."""
+        with self._lock:
+            self._refill(now)
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            return max(wait, self._paused_until - now)
+
+    def take(self, now: float) -> None:
+        with self._lock:
+            self._refill(now)
+            self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold the bucket for `seconds` (server-side rate limit hit)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+# ── Destinations ──────────────────────────────────────────────────────────────
+
+class SendResult(NamedTuple):
+    ok: bool
+    retryable: bool = False
+    retry_after: float | None = None
+    error: str = ""
+
+
+def _post(session: requests.Session, url: str, payload: dict, timeout) -> SendResult | requests.Response:
+    try:
+        return session.post(url, json=payload, timeout=timeout)
+    except requests.Timeout:
+        return SendResult(False, True, error="timeout")
+    except requests.ConnectionError as e:
+        return SendResult(False, True, error=f"connection error: {e}")
+    except Exception as e:
+        return SendResult(False, False, error=str(e))
+
+
+def _retry_after(resp: requests.Response, path: tuple[str, ...]) -> float | None:
+    try:
+        value = resp.json()
+        for key in path:
+            value = value[key]
+        return float(value)
+    except Exception:
+        header = resp.headers.get("Retry-After") if resp.headers else None
+        try:
+            return float(header) if header else None
+        except ValueError:
+            return None
+
+
+class Destination(ABC):
+    """One delivery target. Subclasses build the request and classify the response."""
+
+    key: tuple
+    buckets: tuple[TokenBucket, ...] = ()
+
+    @abstractmethod
+    def send(self, session: requests.Session, message: str, parse_mode: str | None) -> SendResult:
+        """Deliver one message and classify the response."""
+        ...
+
+
+class TelegramDestination(Destination):
+    def __init__(self, url: str, token: str, chat_id: str, buckets: tuple[TokenBucket, ...]):
+        self.key = ("telegram", token, chat_id)
+        self.url = url + token + "/sendMessage"
+        self.chat_id = chat_id
+        self.buckets = buckets
+
+    def send(self, session, message, parse_mode):
+        payload = {"chat_id": self.chat_id, "text": message}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        resp = _post(session, self.url, payload, timeout=15)
+        if isinstance(resp, SendResult):
+            return resp
+        if resp.status_code == 200:
+            return SendResult(True)
+        retry_after = _retry_after(resp, ("parameters", "retry_after")) if resp.status_code == 429 else None
+        return SendResult(False, resp.status_code == 429 or resp.status_code >= 500, retry_after,
+                          f"status={resp.status_code}: {resp.text[:200]}")
+
+    def __repr__(self):
+        return f"telegram:{self.chat_id}"
+
+
+class DiscordDestination(Destination):
+    def __init__(self, webhook_url: str, bucket: TokenBucket, render: Callable[[str, str | None], str]):
+        self.key = ("discord", webhook_url)
+        self.url = webhook_url
+        self.buckets = (bucket,)
+        self._render = render
+
+    def send(self, session, message, parse_mode):
+        resp = _post(session, self.url, {"content": self._render(message, parse_mode)}, timeout=(5, 10))
+        if isinstance(resp, SendResult):
+            return resp
+        if resp.status_code in (200, 204):
+            return SendResult(True)
+        retry_after = _retry_after(resp, ("retry_after",)) if resp.status_code == 429 else None
+        return SendResult(False, resp.status_code == 429 or resp.status_code >= 500, retry_after,
+                          f"status={resp.status_code}: {resp.text[:200]}")
+
+    def __repr__(self):
+        return "discord"
+
+
+# ── Jobs and lanes ────────────────────────────────────────────────────────────
+
+@dataclass
+class _Job:
+    fields: dict
+    message: str
+    parse_mode: str | None
+    priority: int
+    enqueued_at: float
+    remaining: int
+    ok: bool = False
+    errors: list = field(default_factory=list)
+
+
+@dataclass
+class _Delivery:
+    job: _Job
+    destination: Destination
+    attempt: int = 1
+
+
+class _Lane:
+    def __init__(self, dispatcher: "NotificationDispatcher", destination: Destination):
+        self.dispatcher = dispatcher
+        self.destination = destination
+        self.cond = threading.Condition(threading.Lock())
+        self.ready: list = []     # (priority, seq, delivery)
+        self.delayed: list = []   # (not_before, seq, delivery), monotonic time
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0))
+        self.thread = threading.Thread(target=self._run, daemon=True, name=f"notify-{destination!r}")
+
+    def depth(self) -> int:
+        return len(self.ready) + len(self.delayed)
+
+    def put(self, delivery: _Delivery, seq: int, not_before: float | None = None) -> None:
+        with self.cond:
+            if not_before is None:
+                heapq.heappush(self.ready, (delivery.job.priority, seq, delivery))
+            else:
+                heapq.heappush(self.delayed, (not_before, seq, delivery))
+            self.cond.notify()
+
+    def _next(self) -> _Delivery | None:
+        """Block until a delivery may be sent now; None when stopped and drained."""
+        buckets = self.destination.buckets
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                while self.delayed and self.delayed[0][0] <= now:
+                    not_before, seq, delivery = heapq.heappop(self.delayed)
+                    heapq.heappush(self.ready, (delivery.job.priority, seq, delivery))
+                if self.ready:
+                    wait = max((b.delay(now) for b in buckets), default=0.0)
+                    if wait <= 0:
+                        for bucket in buckets:
+                            bucket.take(now)
+                        return heapq.heappop(self.ready)[2]
+                elif self.delayed:
+                    wait = self.delayed[0][0] - now
+                elif not self.dispatcher._running:
+                    return None
+                else:
+                    wait = 1.0
+                if self.dispatcher._aborted:
+                    return None
+                self.cond.wait(min(wait, 1.0))
+
+    def _run(self) -> None:
+        while True:
+            delivery = self._next()
+            if delivery is None:
+                return
+            try:
+                result = self.destination.send(self.session, delivery.job.message, delivery.job.parse_mode)
+            except Exception as e:
+                result = SendResult(False, False, error=str(e))
+            self.dispatcher._settle(self, delivery, result)
+
+
+class NotificationDispatcher:
+    """Deliver jobs to their destinations on per-destination lanes (see module docstring)."""
+
+    def __init__(
+        self,
+        on_done: Callable[[dict, bool, str], None],
+        max_attempts: int = 3,
+        backoff: float = 2.0,
+        samples: int = 2048,
+    ):
+        self.on_done = on_done
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._lanes: dict[tuple, _Lane] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._running = True
+        self._aborted = False
+        self._inflight = 0
+        self._latencies: dict[int, deque] = {p: deque(maxlen=samples) for p in
+                                             (PRIORITY_URGENT, PRIORITY_NORMAL, PRIORITY_BULK)}
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+
+    def submit(self, job: dict, destinations: list[Destination], message: str,
+               parse_mode: str | None = None, enqueued_at: float | None = None) -> None:
+        """Queue `job` for every destination. Never blocks on the network."""
+        if not destinations:
+            self.failed += 1
+            self.on_done(job, False, "no destination configured")
+            return
+        entry = _Job(job, message, parse_mode, job_priority(job),
+                     enqueued_at if enqueued_at is not None else time.time(), len(destinations))
+        with self._lock:
+            self._inflight += 1
+        for destination in destinations:
+            self._lane(destination).put(_Delivery(entry, destination), next(self._seq))
+
+    def _lane(self, destination: Destination) -> _Lane:
+        lane = self._lanes.get(destination.key)
+        if lane is None:
+            with self._lock:
+                lane = self._lanes.get(destination.key)
+                if lane is None:
+                    lane = self._lanes[destination.key] = _Lane(self, destination)
+                    lane.thread.start()
+        return lane
+
+    # ── Lane callbacks ────────────────────────────────────────────────────────
+
+    def _settle(self, lane: _Lane, delivery: _Delivery, result: SendResult) -> None:
+        job = delivery.job
+        if not result.ok and result.retry_after:
+            self.rate_limited += 1
+            for bucket in lane.destination.buckets:
+                bucket.pause(result.retry_after)
+
+        if not result.ok and result.retryable and delivery.attempt < self.max_attempts and not self._aborted:
+            self.retries += 1
+            delay = result.retry_after or self.backoff ** delivery.attempt
+            logger.warning(
+                f"[notification] {lane.destination!r} send failed (attempt {delivery.attempt}): "
+                f"{result.error} — retrying in {delay:.0f}s"
+            )
+            delivery.attempt += 1
+            lane.put(delivery, next(self._seq), not_before=time.monotonic() + delay)
+            return
+
+        with self._lock:
+            if result.ok:
+                if not job.ok:
+                    self._latencies[job.priority].append(time.time() - job.enqueued_at)
+                job.ok = True
+            else:
+                job.errors.append(f"{lane.destination!r}: {result.error}")
+                logger.error(f"[notification] {lane.destination!r} send failed: {result.error}")
+            job.remaining -= 1
+            done = job.remaining == 0
+            if done:
+                self._inflight -= 1
+                if job.ok:
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+        if done:
+            try:
+                self.on_done(job.fields, job.ok, "; ".join(job.errors))
+            except Exception as e:
+                logger.error(f"[notification] on_done callback failed: {e}")
+
+    # ── Lifecycle / introspection ─────────────────────────────────────────────
+
+    def inflight(self) -> int:
+        """Jobs submitted and not yet delivered or given up on."""
+        return self._inflight
+
+    def depth(self) -> int:
+        """Deliveries waiting across all lanes (including scheduled retries)."""
+        return sum(lane.depth() for lane in list(self._lanes.values()))
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Drain queued deliveries for up to `timeout` seconds, then abandon the rest."""
+        self._running = False
+        deadline = time.monotonic() + timeout
+        for lane in list(self._lanes.values()):
+            with lane.cond:
+                lane.cond.notify()
+        for lane in list(self._lanes.values()):
+            lane.thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._aborted = True
+        for lane in list(self._lanes.values()):
+            with lane.cond:
+                lane.cond.notify()
+            lane.session.close()
+
+    def stats(self) -> dict[str, str]:
+        """stats:system fields: queue depth, outcomes and queue-to-delivery latency."""
+        with self._lock:
+            samples = {p: list(d) for p, d in self._latencies.items()}
+        overall = percentiles([s for values in samples.values() for s in values])
+        urgent = percentiles(samples[PRIORITY_URGENT])
+        return {
+            "notify_queue_depth": str(self.depth()),
+            "notify_inflight": str(self._inflight),
+            "notify_delivered": str(self.delivered),
+            "notify_failed": str(self.failed),
+            "notify_retries": str(self.retries),
+            "notify_rate_limited": str(self.rate_limited),
+            "notify_latency_p50_ms": f"{overall['p50'] * 1000:.0f}",
+            "notify_latency_p95_ms": f"{overall['p95'] * 1000:.0f}",
+            "notify_latency_p99_ms": f"{overall['p99'] * 1000:.0f}",
+            "notify_latency_max_ms": f"{overall['max'] * 1000:.0f}",
+            "notify_latency_urgent_p99_ms": f"{urgent['p99'] * 1000:.0f}",
+        }
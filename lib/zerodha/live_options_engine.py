@@ -10,6 +10,7 @@ and dispatches to the dedicated live-options Telegram channel.
 
 import time
 import threading
+from typing import Mapping
 
 from lib.logging_util import get_logger
 logger = get_logger("zerodha")
@@ -31,6 +32,10 @@ class LiveOptionsEngine:
         engine = LiveOptionsEngine()
         # After options_aggregate is recomputed:
         engine.on_aggregate_updated(stock_obj, spot_price)
+
+    With a binary Redis client (``LiveOptionsEngine(redis)``), each symbol's
+    history is persisted and reloaded on first use after a restart; other
+    processes read it through ``SharedOptionsHistory``.
     """
 
     # Cooldown (seconds) between consecutive alerts of the same type per symbol.
@@ -53,7 +58,9 @@ class LiveOptionsEngine:
         "IV_TREND_FALLING":         900,
     }
 
-    def __init__(self):
+    def __init__(self, redis=None):
+        self._redis = redis
+
         # Per-symbol analyser instances (created lazily)
         self._oi_analysers:       dict[str, LiveOIAnalyser]       = {}
         self._straddle_analysers: dict[str, LiveStraddleAnalyser] = {}
@@ -105,7 +112,11 @@ class LiveOptionsEngine:
 
     def _get_history(self, symbol: str) -> LiveOptionsHistory:
         if symbol not in self._histories:
-            self._histories[symbol] = LiveOptionsHistory(symbol)
+            history = LiveOptionsHistory(symbol, self._redis)
+            loaded = history.load()
+            if loaded:
+                logger.info("[LiveOptionsEngine] %s: restored %d history snapshots", symbol, loaded)
+            self._histories[symbol] = history
         return self._histories[symbol]
 
     def get_history(self, symbol: str) -> LiveOptionsHistory | None:
@@ -133,7 +144,7 @@ class LiveOptionsEngine:
         self._last_alert[(symbol, alert_type)] = time.time()
         TELEGRAM_NOTIFICATIONS.send_live_options_notification(msg, symbol=symbol)
         incr_stock(symbol, "alerts_live_options")
-        logger.info(f"[LiveOptions] {symbol} {alert_type}: {msg[:60]}…")
+        logger.info("[LiveOptions] %s %s: %s…", symbol, alert_type, msg[:60])
 
         # Emit to SignalBus for cross-layer correlation
         import common.shared as _shared
@@ -160,7 +171,7 @@ class LiveOptionsEngine:
         return 50.0  # NIFTY default
 
     def _run_oi_checks(
-        self, symbol: str, agg: dict, options_live: dict,
+        self, symbol: str, agg: dict, options_live: Mapping,
         spot: float, history: LiveOptionsHistory
     ):
         strike_gap = self._get_strike_gap(symbol)
@@ -195,7 +206,7 @@ class LiveOptionsEngine:
                 self._fire(symbol, alert_type, msg)
 
     def _run_straddle_checks(
-        self, symbol: str, agg: dict, options_live: dict,
+        self, symbol: str, agg: dict, options_live: Mapping,
         spot: float, history: LiveOptionsHistory
     ):
         analyser = self._straddle_analyser(symbol)
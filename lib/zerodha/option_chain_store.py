@@ -0,0 +1,567 @@
+"""
+OptionChainStore — columnar storage for a symbol's live option chain.
+
+TickStore.options_live used to be `{strike: {"CE": {...}, "PE": {...}}}`
+with a fresh dict per side (~15 keys) and, in MODE_FULL, a depth dict of
+ten level dicts, all rewritten on every tick. The store keeps one row per
+strike instead, on a strike axis that grows as strikes are first seen:
+
+  * a float64 block [side, row, field] for ltp/oi/prev_oi/volume/buy_qty/
+    sell_qty, the greeks and OHLC, written through a flat memoryview;
+  * a float64 depth block [side, row, buy/sell, level, qty/price/orders];
+  * a presence bitmask per side/row, so a side only "has" the keys that were
+    actually written, exactly like the dicts it replaces;
+  * the exchange timestamp and any non-numeric or unknown keys kept aside.
+
+Existing code keeps using the dict API — `options_live.get(strike, {})
+.get("CE", {}).get("oi", 0)`, `.items()`, `dict(entry)`, `setdefault` and
+in-place writes such as sensibull_adapter's prev_oi patch all go through
+mapping views onto the rows. Vectorised readers (OptionChainFrame) take the
+columns directly with `strikes()` / `column(side, field)`.
+
+Not thread-safe on its own: TickStore writes under its lock; lock-free
+readers see the same torn-read guarantees the dicts gave them.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+SIDES = ("CE", "PE")
+FIELDS = (
+    "prev_oi", "ltp", "oi", "volume", "buy_qty", "sell_qty",
+    "delta", "gamma", "theta", "vega", "iv", "iv_change",
+    "open", "high", "low", "close",
+)
+# Counts come back as int when integral, like the tick values they came from.
+INT_FIELDS = frozenset(("prev_oi", "oi", "volume", "buy_qty", "sell_qty"))
+
+DEPTH_LEVELS = 5
+_DEPTH_SIZE = 2 * DEPTH_LEVELS * 3
+
+_SIDE_INDEX = {side: i for i, side in enumerate(SIDES)}
+_FIELD_INDEX = {field: i for i, field in enumerate(FIELDS)}
+_NF = len(FIELDS)
+_TIMESTAMP_BIT = 1 << _NF
+_DEPTH_BIT = 1 << (_NF + 1)
+_SIDE_BIT = 1 << (_NF + 2)      # side exists (possibly with no keys)
+
+_F_OI = _FIELD_INDEX["oi"]
+_F_PREV_OI = _FIELD_INDEX["prev_oi"]
+_F_LTP = _FIELD_INDEX["ltp"]
+_F_VOLUME = _FIELD_INDEX["volume"]
+_F_BUY_QTY = _FIELD_INDEX["buy_qty"]
+_F_SELL_QTY = _FIELD_INDEX["sell_qty"]
+# (field index, tick key) replaced on every full tick
+_TICK_FIELDS = tuple((_FIELD_INDEX[field], key) for field, key in (
+    ("ltp", "last_price"), ("oi", "oi"), ("volume", "volume_traded"),
+    ("buy_qty", "total_buy_quantity"), ("sell_qty", "total_sell_quantity"),
+))
+_TICK_FIELD_NAMES = frozenset(FIELDS[f] for f, _ in _TICK_FIELDS) | {"prev_oi"}
+# Presence bits every full tick sets
+_TICK_BITS = (1 << _F_PREV_OI) | sum(1 << f for f, _ in _TICK_FIELDS) | _TIMESTAMP_BIT | _SIDE_BIT
+
+# (field index, key, default) written when a tick carries greeks
+_GREEK_FIELDS = (
+    (_FIELD_INDEX["delta"], "delta", None),
+    *((_FIELD_INDEX[g], g, 0.0) for g in ("gamma", "theta", "vega", "iv", "iv_change")),
+)
+_OHLC_FIELDS = tuple((_FIELD_INDEX[k], k) for k in ("open", "high", "low", "close"))
+_F_OPEN, _F_HIGH, _F_LOW, _F_CLOSE = (f for f, _ in _OHLC_FIELDS)
+_GREEK_BITS = sum(1 << f for f, _, _ in _GREEK_FIELDS)
+_OHLC_BITS = sum(1 << f for f, _ in _OHLC_FIELDS)
+_OPTIONAL_FIELD_NAMES = frozenset(k for _, k, _ in _GREEK_FIELDS) | {k for _, k in _OHLC_FIELDS}
+
+_INITIAL_CAPACITY = 64
+
+
+def _numeric(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class OptionChainStore(MutableMapping):
+    """`{strike: {"CE": {...}, "PE": {...}}}` mapping backed by NumPy columns."""
+
+    def __init__(self, options_live: Mapping | None = None, capacity: int = _INITIAL_CAPACITY):
+        self._rows: dict[float, int] = {}          # strike -> row, in first-seen order
+        self._strikes: list[float] = []            # row -> strike
+        self._allocate(max(1, capacity))
+        self._timestamps: tuple[list, list] = ([], [])
+        self._extras: dict[tuple[int, int], dict] = {}
+        if options_live:
+            for strike, sides in options_live.items():
+                self[strike] = sides
+
+    def _allocate(self, capacity: int) -> None:
+        values = np.zeros((len(SIDES), capacity, _NF))
+        present = np.zeros((len(SIDES), capacity), dtype=np.uint32)
+        depth = np.zeros((len(SIDES), capacity, 2, DEPTH_LEVELS, 3))
+        n = len(self._strikes)
+        if n:
+            values[:, :n] = self._values[:, :n]
+            present[:, :n] = self._present[:, :n]
+            depth[:, :n] = self._depth[:, :n]
+        self._capacity = capacity
+        self._values = values
+        self._present = present
+        self._depth = depth
+        # Scalar reads/writes through flat memoryviews are several times
+        # cheaper than NumPy item access.
+        self._v = memoryview(values.reshape(-1))
+        self._p = memoryview(present.reshape(-1))
+        self._d = memoryview(depth.reshape(-1))
+
+    # ── Rows ──────────────────────────────────────────────────────────────────
+
+    def _row(self, strike) -> int:
+        """Row for `strike`, appending it to the strike axis if new."""
+        row = self._rows.get(strike)
+        if row is None:
+            row = len(self._strikes)
+            if row == self._capacity:
+                self._allocate(self._capacity * 2)
+            self._rows[strike] = row
+            self._strikes.append(strike)
+            for timestamps in self._timestamps:
+                timestamps.append(None)
+        return row
+
+    def _clear_side(self, s: int, row: int) -> None:
+        self._values[s, row] = 0.0
+        self._p[s * self._capacity + row] = 0
+        self._depth[s, row] = 0.0
+        self._timestamps[s][row] = None
+        self._extras.pop((s, row), None)
+
+    # ── Field access (used by the views) ──────────────────────────────────────
+
+    def _has_side(self, s: int, row: int) -> bool:
+        return bool(self._p[s * self._capacity + row] & _SIDE_BIT)
+
+    def _get(self, s: int, row: int, key: str):
+        """Value of `key` on a side; raises KeyError if it was never written."""
+        mask = self._p[s * self._capacity + row]
+        f = _FIELD_INDEX.get(key)
+        if f is not None:
+            if mask & (1 << f):
+                value = self._v[(s * self._capacity + row) * _NF + f]
+                if key in INT_FIELDS and value.is_integer():
+                    return int(value)
+                return value
+        elif key == "timestamp":
+            if mask & _TIMESTAMP_BIT:
+                return self._timestamps[s][row]
+        elif key == "depth":
+            if mask & _DEPTH_BIT:
+                return self._decode_depth(s, row)
+        extras = self._extras.get((s, row))
+        if extras is not None and key in extras:
+            return extras[key]
+        raise KeyError(key)
+
+    def _get_or(self, s: int, row: int, key: str, default):
+        try:
+            return self._get(s, row, key)
+        except KeyError:
+            return default
+
+    def _set(self, s: int, row: int, key: str, value) -> None:
+        i = s * self._capacity + row
+        f = _FIELD_INDEX.get(key)
+        bit = 0
+        if f is not None and _numeric(value):
+            self._v[i * _NF + f] = value
+            bit = 1 << f
+        elif key == "timestamp":
+            self._timestamps[s][row] = value
+            bit = _TIMESTAMP_BIT
+        elif key == "depth":
+            if self._write_depth(s, row, value):
+                bit = _DEPTH_BIT
+        if bit:
+            self._p[i] |= bit | _SIDE_BIT
+            extras = self._extras.get((s, row))
+            if extras:
+                extras.pop(key, None)
+            return
+        # None, strings, odd-shaped depth, unknown keys: kept as-is.
+        self._discard(s, row, key)
+        self._extras.setdefault((s, row), {})[key] = value
+        self._p[i] |= _SIDE_BIT
+
+    def _discard(self, s: int, row: int, key: str) -> bool:
+        i = s * self._capacity + row
+        mask = self._p[i]
+        f = _FIELD_INDEX.get(key)
+        bit = (1 << f) if f is not None else _TIMESTAMP_BIT if key == "timestamp" \
+            else _DEPTH_BIT if key == "depth" else 0
+        found = bool(mask & bit)
+        if found:
+            self._p[i] = mask & ~bit
+            if f is not None:
+                self._values[s, row, f] = 0.0
+            elif key == "timestamp":
+                self._timestamps[s][row] = None
+            elif key == "depth":
+                self._depth[s, row] = 0.0
+        extras = self._extras.get((s, row))
+        if extras and key in extras:
+            del extras[key]
+            found = True
+        return found
+
+    def _keys(self, s: int, row: int) -> list[str]:
+        mask = self._p[s * self._capacity + row]
+        keys = [field for f, field in enumerate(FIELDS) if mask & (1 << f)]
+        if mask & _TIMESTAMP_BIT:
+            keys.append("timestamp")
+        if mask & _DEPTH_BIT:
+            keys.append("depth")
+        extras = self._extras.get((s, row))
+        if extras:
+            keys.extend(extras)
+        return keys
+
+    def _write_depth(self, s: int, row: int, depth) -> bool:
+        """Zerodha depth ({"buy"/"sell": 5 × {quantity, price, orders}}) into the
+        depth block. False, with the block zeroed, if it is not that shape."""
+        d = self._d
+        k = (s * self._capacity + row) * _DEPTH_SIZE
+        try:
+            buy, sell = depth["buy"], depth["sell"]
+            if len(buy) != DEPTH_LEVELS or len(sell) != DEPTH_LEVELS:
+                raise TypeError
+            for book in (buy, sell):
+                for level in book:
+                    d[k] = level["quantity"]
+                    d[k + 1] = level["price"]
+                    d[k + 2] = level["orders"]
+                    k += 3
+        except (KeyError, TypeError):
+            self._depth[s, row] = 0.0
+            return False
+        return True
+
+    def _side_dict(self, s: int, row: int) -> dict:
+        """Plain dict copy of one side, same keys and values as _get would give."""
+        mask = self._p[s * self._capacity + row]
+        values = self._values[s, row].tolist()
+        out = {}
+        for f, field in enumerate(FIELDS):
+            if mask & (1 << f):
+                value = values[f]
+                out[field] = int(value) if field in INT_FIELDS and value.is_integer() else value
+        if mask & _TIMESTAMP_BIT:
+            out["timestamp"] = self._timestamps[s][row]
+        if mask & _DEPTH_BIT:
+            out["depth"] = self._decode_depth(s, row)
+        extras = self._extras.get((s, row))
+        if extras:
+            out.update(extras)
+        return out
+
+    def _decode_depth(self, s: int, row: int) -> dict:
+        block = self._depth[s, row].tolist()
+        return {
+            book: [{"quantity": int(q), "price": p, "orders": int(o)} for q, p, o in levels]
+            for book, levels in zip(("buy", "sell"), block)
+        }
+
+    def _write_side(self, strike, side: str, data: Mapping) -> None:
+        s = _SIDE_INDEX[side]
+        row = self._row(strike)
+        self._clear_side(s, row)
+        self._p[s * self._capacity + row] = _SIDE_BIT
+        for key, value in data.items():
+            self._set(s, row, key, value)
+
+    # ── Tick writes (TickStore) ───────────────────────────────────────────────
+
+    def apply_tick(self, strike, side: str, tick: dict) -> None:
+        """TickStore.update_option_tick's full-tick write, straight into the columns.
+
+        prev_oi takes the side's previous oi; ltp/oi/volume/quantities and
+        the exchange timestamp are replaced; greeks, OHLC and depth only when
+        the tick carries them. Other keys already on the side are kept.
+        """
+        s = _SIDE_INDEX[side]
+        row = self._rows.get(strike)
+        if row is None:
+            row = self._row(strike)
+        i = s * self._capacity + row
+        extras = self._extras.get((s, row)) if self._extras else None
+        if extras and not _TICK_FIELD_NAMES.isdisjoint(extras):
+            self._apply_tick_slow(s, row, tick, self._get_or(s, row, "oi", 0))
+            return
+
+        # Non-numeric values make the memoryview writes raise TypeError;
+        # the whole group is then redone through _set.
+        get = tick.get
+        v = self._v
+        base = i * _NF
+        prev_oi = v[base + _F_OI]                   # 0.0 if oi was never set
+        try:
+            v[base + _F_LTP] = get("last_price", 0)
+            v[base + _F_OI] = get("oi", 0)
+            v[base + _F_VOLUME] = get("volume_traded", 0)
+            v[base + _F_BUY_QTY] = get("total_buy_quantity", 0)
+            v[base + _F_SELL_QTY] = get("total_sell_quantity", 0)
+        except TypeError:
+            self._apply_tick_slow(s, row, tick, int(prev_oi) if prev_oi.is_integer() else prev_oi)
+            return
+        v[base + _F_PREV_OI] = prev_oi
+        self._timestamps[s][row] = get("exchange_timestamp")
+        written = _TICK_BITS
+
+        if "delta" in tick:
+            try:
+                for f, key, default in _GREEK_FIELDS:
+                    v[base + f] = get(key, default)
+                written |= _GREEK_BITS
+            except TypeError:
+                self._p[i] |= written
+                written = 0
+                for _, key, default in _GREEK_FIELDS:
+                    self._set(s, row, key, get(key, default))
+        ohlc = get("ohlc")
+        if ohlc is not None:
+            try:
+                v[base + _F_OPEN] = ohlc.get("open", 0)
+                v[base + _F_HIGH] = ohlc.get("high", 0)
+                v[base + _F_LOW] = ohlc.get("low", 0)
+                v[base + _F_CLOSE] = ohlc.get("close", 0)
+                written |= _OHLC_BITS
+            except TypeError:
+                self._p[i] |= written
+                written = 0
+                for _, key in _OHLC_FIELDS:
+                    self._set(s, row, key, ohlc.get(key, 0))
+        self._p[i] |= written
+        if extras:
+            for key in _OPTIONAL_FIELD_NAMES.intersection(extras):
+                if self._p[i] & (1 << _FIELD_INDEX[key]):
+                    del extras[key]
+        if "depth" in tick:
+            self._set(s, row, "depth", tick["depth"])
+
+    def _apply_tick_slow(self, s: int, row: int, tick: dict, prev_oi) -> None:
+        """apply_tick through _set, for ticks or sides with non-numeric tick fields."""
+        self._set(s, row, "prev_oi", prev_oi)
+        for f, key in _TICK_FIELDS:
+            self._set(s, row, FIELDS[f], tick.get(key, 0))
+        self._set(s, row, "timestamp", tick.get("exchange_timestamp"))
+        if "delta" in tick:
+            for _, key, default in _GREEK_FIELDS:
+                self._set(s, row, key, tick.get(key, default))
+        ohlc = tick.get("ohlc")
+        if ohlc is not None:
+            for _, key in _OHLC_FIELDS:
+                self._set(s, row, key, ohlc.get(key, 0))
+        if "depth" in tick:
+            self._set(s, row, "depth", tick["depth"])
+
+    def oi(self, strike, side: str) -> tuple:
+        """(oi, prev_oi) for a strike/side, 0 where unset or not numeric."""
+        row = self._rows.get(strike)
+        if row is None:
+            return 0, 0
+        base = (_SIDE_INDEX[side] * self._capacity + row) * _NF
+        oi, prev_oi = self._v[base + _F_OI], self._v[base + _F_PREV_OI]
+        return (int(oi) if oi.is_integer() else oi), (int(prev_oi) if prev_oi.is_integer() else prev_oi)
+
+    def merge(self, strike, side: str, values: Mapping) -> bool:
+        """Write only the keys in `values` onto an existing side. False if the side is absent."""
+        row = self._rows.get(strike)
+        s = _SIDE_INDEX.get(side)
+        if row is None or s is None or not self._has_side(s, row):
+            return False
+        for key, value in values.items():
+            self._set(s, row, key, value)
+        return True
+
+    # ── Columnar access ───────────────────────────────────────────────────────
+
+    def strikes(self) -> np.ndarray:
+        """Strike axis in row (first-seen) order."""
+        return np.array(self._strikes, dtype=float)
+
+    def column(self, side: str, field: str) -> np.ndarray:
+        """Read-only view of `field` for `side` in row order (0.0 where unset).
+
+        The view is only valid until the next new strike grows the store.
+        """
+        col = self._values[_SIDE_INDEX[side], :len(self._strikes), _FIELD_INDEX[field]]
+        col.flags.writeable = False
+        return col
+
+    def depth_block(self, side: str) -> np.ndarray:
+        """Read-only [row, buy/sell, level, (quantity, price, orders)] view for `side`."""
+        block = self._depth[_SIDE_INDEX[side], :len(self._strikes)]
+        block.flags.writeable = False
+        return block
+
+    def nbytes(self) -> int:
+        """Bytes held by the column blocks (capacity, not just used rows)."""
+        return self._values.nbytes + self._present.nbytes + self._depth.nbytes
+
+    # ── Mapping API ───────────────────────────────────────────────────────────
+
+    def __getitem__(self, strike) -> "StrikeView":
+        if strike not in self._rows:
+            raise KeyError(strike)
+        return StrikeView(self, strike)
+
+    def __setitem__(self, strike, sides: Mapping) -> None:
+        row = self._row(strike)
+        for s in range(len(SIDES)):
+            self._clear_side(s, row)
+        for side, data in sides.items():
+            self._write_side(strike, side, data)
+
+    def __delitem__(self, strike) -> None:
+        row = self._rows.pop(strike)
+        # Close the gap so rows stay dense and in first-seen order.
+        n = len(self._strikes)
+        for block in (self._values, self._present, self._depth):
+            block[:, row:n - 1] = block[:, row + 1:n]
+            block[:, n - 1] = 0
+        for timestamps in self._timestamps:
+            del timestamps[row]
+        self._extras = {
+            (s, r - 1 if r > row else r): extras
+            for (s, r), extras in self._extras.items() if r != row
+        }
+        del self._strikes[row]
+        for strike_after in self._strikes[row:]:
+            self._rows[strike_after] -= 1
+
+    def __iter__(self):
+        return iter(list(self._rows))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, strike) -> bool:
+        return strike in self._rows
+
+    def setdefault(self, strike, default=None) -> "StrikeView":
+        if strike not in self._rows:
+            self[strike] = default or {}
+        return self[strike]
+
+    def to_dict(self) -> dict:
+        """Plain nested-dict copy, as options_live used to be."""
+        return {strike: view.to_dict() for strike, view in self.items()}
+
+    def __repr__(self) -> str:
+        return f"OptionChainStore({len(self._rows)} strikes)"
+
+
+class StrikeView(MutableMapping):
+    """`{"CE": {...}, "PE": {...}}` for one strike of an OptionChainStore."""
+
+    __slots__ = ("_store", "_strike")
+
+    def __init__(self, store: OptionChainStore, strike):
+        self._store = store
+        self._strike = strike
+
+    def _row(self):
+        return self._store._rows.get(self._strike)
+
+    def __getitem__(self, side: str) -> "SideView":
+        row = self._row()
+        s = _SIDE_INDEX.get(side)
+        if row is None or s is None or not self._store._has_side(s, row):
+            raise KeyError(side)
+        return SideView(self._store, self._strike, s)
+
+    def __setitem__(self, side: str, data: Mapping) -> None:
+        if side not in _SIDE_INDEX:
+            raise KeyError(f"option side must be one of {SIDES}, not {side!r}")
+        self._store._write_side(self._strike, side, data)
+
+    def __delitem__(self, side: str) -> None:
+        row = self._row()
+        s = _SIDE_INDEX.get(side)
+        if row is None or s is None or not self._store._has_side(s, row):
+            raise KeyError(side)
+        self._store._clear_side(s, row)
+
+    def __iter__(self):
+        row = self._row()
+        if row is None:
+            return iter(())
+        return iter([side for s, side in enumerate(SIDES) if self._store._has_side(s, row)])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def setdefault(self, side: str, default=None) -> "SideView":
+        if side not in self:
+            self[side] = default or {}
+        return self[side]
+
+    def to_dict(self) -> dict:
+        return {side: view.to_dict() for side, view in self.items()}
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class SideView(MutableMapping):
+    """The tick dict for one strike/side of an OptionChainStore."""
+
+    __slots__ = ("_store", "_strike", "_s")
+
+    def __init__(self, store: OptionChainStore, strike, s: int):
+        self._store = store
+        self._strike = strike
+        self._s = s
+
+    def _row(self) -> int:
+        row = self._store._rows.get(self._strike)
+        if row is None or not self._store._has_side(self._s, row):
+            raise KeyError(self._strike)
+        return row
+
+    def __getitem__(self, key: str):
+        return self._store._get(self._s, self._row(), key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self._store._get(self._s, self._row(), key)
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, value) -> None:
+        self._store._set(self._s, self._row(), key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if not self._store._discard(self._s, self._row(), key):
+            raise KeyError(key)
+
+    def __iter__(self):
+        try:
+            return iter(self._store._keys(self._s, self._row()))
+        except KeyError:
+            return iter(())
+
+    def __len__(self) -> int:
+        try:
+            return len(self._store._keys(self._s, self._row()))
+        except KeyError:
+            return 0
+
+    def copy(self) -> dict:
+        return self.to_dict()
+
+    def to_dict(self) -> dict:
+        try:
+            return self._store._side_dict(self._s, self._row())
+        except KeyError:
+            return {}
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
@@ -0,0 +1,226 @@
+"""
+TickDispatcher — sharded, coalescing hand-off from the WebSocket threads to
+the TickStore writers.
+
+Ticks are assigned to one of N shards by a caller-supplied key (the parent
+symbol in ZerodhaTickerManager), and each shard has one worker thread, so all
+ticks for one stock are applied in arrival order by the same thread.
+
+Within a shard, pending ticks are kept per instrument token, latest-wins: a
+tick that arrives while an older one for the same token is still waiting
+replaces it instead of queueing behind it. Memory is therefore bounded by
+the number of subscribed tokens, nothing is ever dropped, and under a burst
+the workers apply the freshest price rather than working through a backlog
+of stale ones. Fields the newer packet does not carry (an LTP-mode packet
+after a full one) are kept from the older tick, and the day-cumulative
+`volume_traded` never goes backwards.
+
+stats() reports per-shard depth, received/coalesced/processed counts and
+tick-age percentiles: exchange_timestamp → handler done ("age") and
+WebSocket receive → handler done ("latency").
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Hashable, Iterable
+
+from lib.logging_util import get_logger
+from services.common.percentiles import percentiles
+logger = get_logger("zerodha")
+
+# Day-cumulative counters: the coalesced tick keeps the largest value seen.
+CUMULATIVE_FIELDS = ("volume_traded",)
+
+
+def coalesce_tick(older: dict, newer: dict) -> dict:
+    """Merge two ticks for the same token, newest values winning."""
+    merged = {**older, **newer}
+    for field in CUMULATIVE_FIELDS:
+        if field in older and field in newer:
+            merged[field] = max(older[field], newer[field])
+    return merged
+
+
+def _epoch(ts) -> float | None:
+    if ts is None:
+        return None
+    if isinstance(ts, datetime):
+        return ts.timestamp()
+    try:
+        return float(ts)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Shard:
+    def __init__(self, index: int, samples: int):
+        self.index = index
+        self.cond = threading.Condition(threading.Lock())
+        self.pending: dict[Hashable, tuple[dict, float]] = {}   # token -> (tick, first receive time)
+        self.received = 0
+        self.coalesced = 0
+        self.processed = 0
+        self.errors = 0
+        self.ages: deque = deque(maxlen=samples)       # seconds, exchange_timestamp → applied
+        self.latencies: deque = deque(maxlen=samples)  # seconds, received → applied
+        self.thread: threading.Thread | None = None
+
+
+class TickDispatcher:
+    """Route ticks to `handler` on `shards` worker threads, coalescing per token."""
+
+    def __init__(
+        self,
+        handler: Callable[[dict], None],
+        shard_key: Callable[[int], Hashable] | None = None,
+        shards: int = 4,
+        samples: int = 2048,
+        name: str = "tick-dispatch",
+    ):
+        self.handler = handler
+        self.shard_key = shard_key or (lambda token: token)
+        self.name = name
+        self._shards = [_Shard(i, samples) for i in range(max(1, shards))]
+        self._running = False
+
+    # ── Producer side (WebSocket threads) ─────────────────────────────────────
+
+    def _shard_for(self, token) -> _Shard:
+        try:
+            key = self.shard_key(token)
+        except Exception:
+            key = token
+        return self._shards[hash(key) % len(self._shards)]
+
+    def submit(self, ticks: Iterable[dict]) -> None:
+        """Queue ticks for their shards. Never blocks on the handlers and never drops."""
+        now = time.time()
+        by_shard: dict[int, list] = {}
+        for tick in ticks:
+            token = tick.get("instrument_token")
+            if token is None:
+                continue
+            by_shard.setdefault(self._shard_for(token).index, []).append((token, tick))
+
+        for index, items in by_shard.items():
+            shard = self._shards[index]
+            with shard.cond:
+                pending = shard.pending
+                for token, tick in items:
+                    shard.received += 1
+                    waiting = pending.get(token)
+                    if waiting is None:
+                        pending[token] = (tick, now)
+                    else:
+                        shard.coalesced += 1
+                        pending[token] = (coalesce_tick(waiting[0], tick), waiting[1])
+                shard.cond.notify()
+
+    # ── Workers ───────────────────────────────────────────────────────────────
+
+    def _run(self, shard: _Shard) -> None:
+        while True:
+            with shard.cond:
+                while not shard.pending and self._running:
+                    shard.cond.wait(timeout=1.0)
+                if not shard.pending and not self._running:
+                    return
+                batch, shard.pending = shard.pending, {}
+
+            for tick, received_at in batch.values():
+                try:
+                    self.handler(tick)
+                except Exception as e:
+                    shard.errors += 1
+                    logger.error(f"Error processing tick: {e}")
+                    continue
+                done = time.time()
+                shard.processed += 1
+                shard.latencies.append(done - received_at)
+                exchange_ts = _epoch(tick.get("exchange_timestamp"))
+                if exchange_ts:
+                    shard.ages.append(done - exchange_ts)
+
+            if not self._running:
+                return
+
+    def start(self) -> None:
+        if self.is_alive():
+            if self._running:
+                return
+            self.stop(timeout=3)   # previous workers still finishing after signal_stop()
+        self._running = True
+        for shard in self._shards:
+            shard.thread = threading.Thread(
+                target=self._run, args=(shard,), name=f"{self.name}-{shard.index}", daemon=True,
+            )
+            shard.thread.start()
+
+    def signal_stop(self) -> None:
+        """Ask workers to exit after the batch they are on; pending ticks stay queued."""
+        self._running = False
+        for shard in self._shards:
+            with shard.cond:
+                shard.cond.notify()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.signal_stop()
+        deadline = time.monotonic() + timeout
+        for shard in self._shards:
+            if shard.thread is not None:
+                shard.thread.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    def is_alive(self) -> bool:
+        return any(s.thread is not None and s.thread.is_alive() for s in self._shards)
+
+    def clear(self) -> int:
+        """Discard every pending tick (e.g. stale ticks after a reconnect). Returns the count."""
+        dropped = 0
+        for shard in self._shards:
+            with shard.cond:
+                dropped += len(shard.pending)
+                shard.pending = {}
+        return dropped
+
+    # ── Introspection ─────────────────────────────────────────────────────────
+
+    def depth(self) -> int:
+        """Ticks waiting across all shards (at most one per token)."""
+        return sum(len(s.pending) for s in self._shards)
+
+    @property
+    def received(self) -> int:
+        """Ticks submitted, counted before coalescing."""
+        return sum(s.received for s in self._shards)
+
+    @property
+    def processed(self) -> int:
+        return sum(s.processed for s in self._shards)
+
+    def stats(self) -> dict:
+        ages: list[float] = []
+        latencies: list[float] = []
+        shards = []
+        for s in self._shards:
+            ages.extend(s.ages)
+            latencies.extend(s.latencies)
+            shards.append({
+                "depth": len(s.pending),
+                "received": s.received,
+                "coalesced": s.coalesced,
+                "processed": s.processed,
+                "errors": s.errors,
+            })
+        return {
+            "shards": shards,
+            "depth": sum(s["depth"] for s in shards),
+            "received": sum(s["received"] for s in shards),
+            "coalesced": sum(s["coalesced"] for s in shards),
+            "processed": sum(s["processed"] for s in shards),
+            "age_ms": {k: v * 1000 for k, v in percentiles(ages).items()},
+            "latency_ms": {k: v * 1000 for k, v in percentiles(latencies).items()},
+        }
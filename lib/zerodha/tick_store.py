@@ -5,7 +5,8 @@ Extracted from common.Stock to give Stock a single responsibility: holding
 price/analysis data.  TickStore owns:
 
   * The raw zerodha tick snapshot (_zerodha_data) + its threading.Lock
-  * Live options tick table (options_live) and aggregate metrics (options_aggregate)
+  * Live options tick table (options_live, a columnar OptionChainStore) and
+    aggregate metrics (options_aggregate)
   * Live futures tick table (futures_live)
 
 All public methods mirror the names that previously lived on Stock so that the
@@ -13,14 +14,99 @@ Stock façade can delegate to them without any callers changing.
 """
 from __future__ import annotations
 
+import heapq
 import threading
 import time
-from typing import Optional
+from bisect import bisect_left, insort
+from typing import Mapping, Optional
 
+from lib.zerodha.option_chain_store import OptionChainStore
 from lib.logging_util import get_logger
 logger = get_logger("zerodha")
 
 
+class _OptionsIndex:
+    """Running aggregates over options_live, updated per strike/side write.
+
+    Keeps CE/PE OI totals and net OI change as sums, a lazy-deletion max-heap
+    of (oi, strike) per side for the OI walls, and a sorted strike list for
+    the ATM lookup, so reading the aggregate never walks the chain. Ties are
+    broken by the order strikes were first seen, which is options_live's own
+    dict order — the same answers the full scan gives.
+
+    Not thread-safe on its own; TickStore only touches it under _lock.
+    """
+
+    def __init__(self, options_live: Mapping | None = None) -> None:
+        self.rebuild(options_live if options_live is not None else {})
+
+    def rebuild(self, options_live: Mapping) -> None:
+        self.source = options_live
+        self.order: dict[float, int] = {}                     # strike -> first-seen sequence
+        self.strikes: list[float] = []                        # sorted
+        self.sides: dict[tuple[float, str], tuple] = {}       # (strike, side) -> (oi, prev_oi)
+        self.total_oi = {"CE": 0, "PE": 0}
+        self.net_change = {"CE": 0, "PE": 0}
+        self.heaps: dict[str, list] = {"CE": [], "PE": []}    # (-oi, seq, strike)
+        for strike, data in options_live.items():
+            self._add_strike(strike)
+            for side, entry in data.items():
+                if side in self.heaps:
+                    self.update(strike, side, entry)
+
+    def in_sync(self, options_live: Mapping) -> bool:
+        """False once options_live was replaced or grew strikes behind our back."""
+        return options_live is self.source and len(options_live) == len(self.order)
+
+    def _add_strike(self, strike: float) -> None:
+        if strike not in self.order:
+            self.order[strike] = len(self.order)
+            insort(self.strikes, strike)
+
+    def update(self, strike: float, side: str, entry) -> None:
+        """Apply the (strike, side) entry's current oi/prev_oi as a delta."""
+        self.update_oi(strike, side, entry.get("oi", 0) or 0, entry.get("prev_oi", 0) or 0)
+
+    def update_oi(self, strike: float, side: str, oi, prev_oi) -> None:
+        self._add_strike(strike)
+        old_oi, old_prev = self.sides.get((strike, side), (0, 0))
+        self.sides[(strike, side)] = (oi, prev_oi)
+        self.total_oi[side] += oi - old_oi
+        self.net_change[side] += (oi - prev_oi) - (old_oi - old_prev)
+        if oi > 0 and oi != old_oi:
+            heap = self.heaps[side]
+            heapq.heappush(heap, (-oi, self.order[strike], strike))
+            if len(heap) > 2 * len(self.order) + 64:
+                self._compact(side)
+
+    def _compact(self, side: str) -> None:
+        heap = [
+            (-oi, self.order[strike], strike)
+            for (strike, s), (oi, _) in self.sides.items()
+            if s == side and oi > 0
+        ]
+        heapq.heapify(heap)
+        self.heaps[side] = heap
+
+    def max_oi_strike(self, side: str):
+        """Strike with the highest positive OI on `side`, or None."""
+        heap = self.heaps[side]
+        while heap:
+            neg_oi, _, strike = heap[0]
+            if self.sides.get((strike, side), (0, 0))[0] == -neg_oi:
+                return strike
+            heapq.heappop(heap)   # stale: OI has moved since this was pushed
+        return None
+
+    def nearest_strike(self, price: float):
+        """Strike closest to `price`; the first-seen strike wins an exact tie."""
+        i = bisect_left(self.strikes, price)
+        candidates = self.strikes[max(0, i - 1):i + 1]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda s: (abs(s - price), self.order[s]))
+
+
 class TickStore:
     """Thread-safe container for live WebSocket tick data."""
 
@@ -30,6 +116,7 @@ class TickStore:
         # Tick counters — incremented on each WS update, read by snapshot publisher
         self.tick_count = 0
         self.option_tick_count = 0
+        self.futures_tick_count = 0
 
         # Raw equity / index tick snapshot
         self._zerodha_data: dict = {
@@ -48,7 +135,24 @@ class TickStore:
 
         # Live options tick data from WebSocket (keyed by strike -> CE/PE)
         # { 24000: { "CE": {ltp, oi, prev_oi, volume, …}, "PE": {…} } }
-        self.options_live: dict = {}
+        # held column-wise; see the options_live property.
+        self._options_live = OptionChainStore()
+
+        # Change tracking for the snapshot publisher. Every options_live write
+        # bumps options_version and stamps the (strike, side) with it; the
+        # publisher drains _dirty_option_sides and writes only those fields.
+        self.options_version = 0
+        self._option_side_versions: dict[tuple[float, str], int] = {}
+        self._dirty_option_sides: set[tuple[float, str]] = set()
+
+        # Running totals, OI walls and sorted strikes behind options_aggregate.
+        # Rebuilt from scratch if options_live is replaced wholesale.
+        self._options_index = _OptionsIndex(self.options_live)
+
+        # Reader side: snapshot metadata of the data:options_live hash this
+        # store was last loaded from (see stock_loader.load_options_live_from_redis).
+        self.options_snapshot_seq = 0
+        self.options_snapshot_ts = 0.0
 
         # Aggregated metrics recomputed from options_live
         self.options_aggregate: dict = {
@@ -96,6 +200,11 @@ class TickStore:
         with self._lock:
             return self._zerodha_data.copy()
 
+    def zerodha_snapshot(self) -> tuple[int, dict]:
+        """(tick_count, tick data copy) read together under the lock."""
+        with self._lock:
+            return self.tick_count, self._zerodha_data.copy()
+
     def update_zerodha_data(self, ticker_data: dict) -> None:
         """
         Thread-safe update of Zerodha tick data.
@@ -129,6 +238,18 @@ class TickStore:
     # Options ticks
     # ------------------------------------------------------------------
 
+    @property
+    def options_live(self) -> OptionChainStore:
+        """Live option chain; reads like ``{strike: {"CE": {...}, "PE": {...}}}``."""
+        return self._options_live
+
+    @options_live.setter
+    def options_live(self, options_live) -> None:
+        # Loaders assign plain nested dicts (e.g. from the Redis snapshot).
+        if not isinstance(options_live, OptionChainStore):
+            options_live = OptionChainStore(options_live)
+        self._options_live = options_live
+
     def update_option_tick(self, strike: float, option_type: str, tick: dict, merge: bool = False) -> None:
         """Update live option data from a WebSocket tick.
 
@@ -141,91 +262,111 @@ class TickStore:
         """
         with self._lock:
             self.option_tick_count += 1
+            index = self._synced_options_index()
             if merge:
                 # Enrichment-only: only update existing strikes (Zerodha-subscribed)
-                existing = self.options_live.get(strike, {}).get(option_type)
-                if existing is None:
+                if not self._options_live.merge(strike, option_type, tick):
                     logger.debug(f"[TickStore] Enrichment skip: strike {strike} {option_type} not in options_live (Zerodha not yet subscribed)")
                     return
-                existing.update(tick)
+                if option_type in index.heaps:
+                    index.update(strike, option_type, self._options_live[strike][option_type])
+                self._mark_option_dirty(strike, option_type)
                 return
 
-            if strike not in self.options_live:
-                self.options_live[strike] = {}
-
-            entry = self.options_live[strike].get(option_type, {})
-            entry["prev_oi"] = entry.get("oi", 0)
-            entry["ltp"] = tick.get("last_price", 0)
-            entry["oi"] = tick.get("oi", 0)
-            entry["volume"] = tick.get("volume_traded", 0)
-            entry["buy_qty"] = tick.get("total_buy_quantity", 0)
-            entry["sell_qty"] = tick.get("total_sell_quantity", 0)
-            entry["timestamp"] = tick.get("exchange_timestamp")
-
-            # Greeks (populated by Sensibull path; absent in Zerodha ticks)
-            if "delta" in tick:
-                entry["delta"]     = tick["delta"]
-                entry["gamma"]     = tick.get("gamma", 0.0)
-                entry["theta"]     = tick.get("theta", 0.0)
-                entry["vega"]      = tick.get("vega", 0.0)
-                entry["iv"]        = tick.get("iv", 0.0)
-                entry["iv_change"] = tick.get("iv_change", 0.0)
+            self._options_live.apply_tick(strike, option_type, tick)
+            index.update_oi(strike, option_type, *self._options_live.oi(strike, option_type))
+            self._mark_option_dirty(strike, option_type)
+        logger.debug("[TickStore] option #%d %s strike=%.0f ltp=%.2f oi=%d",
+                     self.option_tick_count, option_type, strike,
+                     tick.get("last_price", 0), tick.get("oi", 0))
+
+    def _synced_options_index(self) -> _OptionsIndex:
+        """The aggregate index, rebuilt first if options_live changed under it. Caller holds _lock."""
+        index = self._options_index
+        if not index.in_sync(self.options_live):
+            index.rebuild(self.options_live)
+        return index
+
+    def _mark_option_dirty(self, strike: float, option_type: str) -> None:
+        """Stamp a strike/side with the next options_version. Caller holds _lock."""
+        self.options_version += 1
+        key = (strike, option_type)
+        self._option_side_versions[key] = self.options_version
+        self._dirty_option_sides.add(key)
+
+    def mark_options_dirty(self, sides=None) -> None:
+        """Force strike/sides to be re-published on the next drain.
+
+        Unlike a tick write this does not bump versions — the data is the
+        same, it just has to be sent again (resync, failed write, or an
+        in-place patch right after ``update_option_tick``). The sides' oi and
+        prev_oi are re-read into the running aggregates, so code that patches
+        entries in place must call this.
 
-            if "ohlc" in tick:
-                entry["open"] = tick["ohlc"].get("open", 0)
-                entry["high"] = tick["ohlc"].get("high", 0)
-                entry["low"] = tick["ohlc"].get("low", 0)
-                entry["close"] = tick["ohlc"].get("close", 0)
+        Args:
+            sides: Iterable of ``(strike, option_type)``; ``None`` marks every
+                   side currently in options_live (full resync).
+        """
+        with self._lock:
+            if sides is None:
+                self._options_index.rebuild(self.options_live)
+                sides = [(strike, opt) for strike, data in self.options_live.items() for opt in data]
+            index = self._synced_options_index()
+            for strike, option_type in sides:
+                entry = self.options_live.get(strike, {}).get(option_type)
+                if entry is not None:
+                    self._dirty_option_sides.add((strike, option_type))
+                    if option_type in index.heaps:
+                        index.update(strike, option_type, entry)
+
+    def option_side_version(self, strike: float, option_type: str) -> int:
+        """options_version at which this strike/side was last written (0 if never)."""
+        with self._lock:
+            return self._option_side_versions.get((strike, option_type), 0)
 
-            if "depth" in tick:
-                entry["depth"] = tick["depth"]
+    def drain_dirty_options(self) -> tuple[int, dict[tuple[float, str], dict]]:
+        """Snapshot and clear the strike/sides changed since the last drain.
 
-            self.options_live[strike][option_type] = entry
-        logger.debug("[TickStore] option #%d %s strike=%.0f ltp=%.2f oi=%d",
-                     self.option_tick_count, option_type, strike,
-                     entry.get("ltp", 0), entry.get("oi", 0))
+        Returns:
+            ``(options_version, {(strike, option_type): tick_copy})`` — the
+            copies are shallow, taken under the lock, so the caller can
+            serialise them without racing the tick thread.
+        """
+        with self._lock:
+            dirty = self._dirty_option_sides
+            self._dirty_option_sides = set()
+            changed = {}
+            for strike, option_type in dirty:
+                entry = self.options_live.get(strike, {}).get(option_type)
+                if entry:
+                    changed[(strike, option_type)] = entry.to_dict()
+            return self.options_version, changed
 
     def recompute_options_aggregate(self, spot_price: Optional[float] = None) -> None:
-        """Recompute aggregate metrics from options_live data."""
+        """Publish the running option aggregates into options_aggregate.
+
+        Totals and net OI change are kept as sums by update_option_tick, the
+        max-OI strikes come off per-side heaps and the ATM strike from a
+        bisect over the sorted strikes, so this does not scan options_live.
+        """
         with self._lock:
             if not self.options_live:
                 return
+            index = self._synced_options_index()
 
-            total_ce_oi = total_pe_oi = 0
-            net_ce_oi_change = net_pe_oi_change = 0
-            max_ce_oi = max_pe_oi = 0
-            max_ce_strike = max_pe_strike = None
-
-            for strike, data in self.options_live.items():
-                ce = data.get("CE", {})
-                pe = data.get("PE", {})
-
-                ce_oi = ce.get("oi", 0)
-                pe_oi = pe.get("oi", 0)
-                total_ce_oi += ce_oi
-                total_pe_oi += pe_oi
-                net_ce_oi_change += ce_oi - ce.get("prev_oi", 0)
-                net_pe_oi_change += pe_oi - pe.get("prev_oi", 0)
-
-                if ce_oi > max_ce_oi:
-                    max_ce_oi = ce_oi
-                    max_ce_strike = strike
-                if pe_oi > max_pe_oi:
-                    max_pe_oi = pe_oi
-                    max_pe_strike = strike
-
+            total_ce_oi = index.total_oi["CE"]
+            total_pe_oi = index.total_oi["PE"]
             agg = self.options_aggregate
             agg["total_ce_oi"] = total_ce_oi
             agg["total_pe_oi"] = total_pe_oi
             agg["live_pcr"] = total_pe_oi / total_ce_oi if total_ce_oi > 0 else 0.0
-            agg["max_oi_ce_strike"] = max_ce_strike
-            agg["max_oi_pe_strike"] = max_pe_strike
-            agg["net_ce_oi_change"] = net_ce_oi_change
-            agg["net_pe_oi_change"] = net_pe_oi_change
-
-            if spot_price and self.options_live:
-                closest_strike = min(self.options_live.keys(),
-                                     key=lambda s: abs(s - spot_price))
+            agg["max_oi_ce_strike"] = index.max_oi_strike("CE")
+            agg["max_oi_pe_strike"] = index.max_oi_strike("PE")
+            agg["net_ce_oi_change"] = index.net_change["CE"]
+            agg["net_pe_oi_change"] = index.net_change["PE"]
+
+            if spot_price:
+                closest_strike = index.nearest_strike(spot_price)
                 agg["atm_strike"] = closest_strike
                 atm_data = self.options_live.get(closest_strike, {})
                 agg["atm_straddle_premium"] = (
@@ -245,6 +386,7 @@ class TickStore:
     def update_futures_tick(self, expiry_key: str, tick: dict) -> None:
         """Update live futures data from a WebSocket tick."""
         with self._lock:
+            self.futures_tick_count += 1
             entry = self.futures_live.get(expiry_key, {})
             entry["prev_oi"] = entry.get("oi", 0)
             entry["ltp"] = tick.get("last_price", 0)
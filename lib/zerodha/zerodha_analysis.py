@@ -1,14 +1,16 @@
 from .zerodha_ticker import KiteTicker
+from .tick_dispatcher import TickDispatcher
+import common.constants as constant
 import common.shared as shared
 import time
 from common.Stock import Stock
-from lib.logging_util import get_logger
+from lib.logging_util import get_logger, limit_rate
 logger = get_logger("zerodha")
+limit_rate(logger, per_second=5.0, burst=20)   # per-tick DEBUG sites
 from common.token_registry import (
     TokenType, OptionZone, TokenRegistry, TokenInfo,
 )
 import threading
-import queue
 from collections import defaultdict
 from lib.notification.Notification import TELEGRAM_NOTIFICATIONS
 import requests
@@ -37,9 +39,12 @@ class ZerodhaTickerManager:
 
         self.max_retries = 50
         self.retry_delay = 5
-        self.tick_queue = queue.Queue(maxsize=5000)
-        self.processor_thread = None
-        self.stop_processor = False
+        self.tick_dispatcher = TickDispatcher(
+            self._route_tick,
+            shard_key=self._shard_key,
+            shards=constant.TICK_DISPATCH_SHARDS,
+            name="zerodha-ticks",
+        )
         self.notification_cooldown = 300
         self.last_notification_time = defaultdict(float)
         self.is_enctoken_updated = False
@@ -47,7 +52,6 @@ class ZerodhaTickerManager:
         self._unknown_tokens: set = set()
         self._reauth_lock = threading.Lock()
         self._is_reauthing = False
-        self._tick_count = 0
         self._options_subscribed_once = False
 
         self._last_atm: dict = {}
@@ -55,6 +59,8 @@ class ZerodhaTickerManager:
 
         self.live_options_engine = None
         self.live_stock_engine: object | None = None
+        # services.market_data.ws_capture.WSRecorder; taps raw frames of both WS when set.
+        self.ws_recorder = None
 
         # When True: skip equity tokens in WS1 (LIVE_OPTIONS_ONLY mode).
         # No longer needed for the 500-limit workaround since options are on WS2.
@@ -96,6 +102,10 @@ class ZerodhaTickerManager:
         self._kt_base.on_ticks = self.on_ticks
         self._kt_base.on_reconnect = self.on_reconnect_base
         self._kt_base.on_noreconnect = self.on_noreconnect_base
+        if self.ws_recorder is not None:
+            self._kt_base.on_message = self.ws_recorder.kite_hook("ws1")
+        # Nothing downstream reads market depth; skip decoding it.
+        self._kt_base.depth_tokens = frozenset()
 
     def _init_kite_ticker_options(self):
         self._kt_options = KiteTicker(self.apiKey, self.username, self.encToken, root=self.root,
@@ -106,6 +116,9 @@ class ZerodhaTickerManager:
         self._kt_options.on_ticks = self.on_ticks
         self._kt_options.on_reconnect = self.on_reconnect_options
         self._kt_options.on_noreconnect = self.on_noreconnect_options
+        if self.ws_recorder is not None:
+            self._kt_options.on_message = self.ws_recorder.kite_hook("ws2")
+        self._kt_options.depth_tokens = frozenset()
 
     def connect(self):
         """Connect both WS (base + options). Returns True if base connected."""
@@ -152,24 +165,14 @@ class ZerodhaTickerManager:
     def update_enctoken(self, new_enctoken):
         self.encToken = new_enctoken
 
-        # Stop the tick processor and wait for it to exit BEFORE closing WS.
-        # close_connection() fires on_close_base() → signal_tick_processor_stop()
-        # on the same thread, but the processor thread won't notice the flag
-        # until its tick_queue.get(timeout=1) returns.  If we then call
-        # connect() → on_connect_base() → start_tick_processor() before the
-        # old thread has exited, start_tick_processor() sees the old thread
-        # alive and returns early — leaving stop_processor=True and no new
-        # thread.  By stopping + joining here we guarantee the old thread is
-        # dead before the new WS fires on_connect.
+        # Stop the tick dispatch workers and wait for them to exit BEFORE
+        # closing WS, so no worker is still applying old-session ticks when
+        # the new WS fires on_connect → start_tick_processor().
         self.stop_tick_processor()
 
-        # Drain any stale ticks left in the queue from the old WS session
+        # Drop any stale ticks still pending from the old WS session
         # so they don't get routed to Stock objects after the reconnect.
-        while not self.tick_queue.empty():
-            try:
-                self.tick_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.tick_dispatcher.clear()
 
         self.close_connection()
         self._init_kite_ticker_base()
@@ -215,35 +218,30 @@ class ZerodhaTickerManager:
 
     # ─── Tick Processing ────────────────────────────────────────────────
 
+    @property
+    def _tick_count(self) -> int:
+        """Ticks received from the WebSockets (coalesced ticks still count)."""
+        return self.tick_dispatcher.received
+
+    @property
+    def _processed_tick_count(self) -> int:
+        """Ticks actually applied by the dispatch workers."""
+        return self.tick_dispatcher.processed
+
     def start_tick_processor(self):
-        if self.processor_thread and self.processor_thread.is_alive():
-            if not self.stop_processor:
-                return
-            self.processor_thread.join(timeout=3)
-        self.stop_processor = False
-        self.processor_thread = threading.Thread(target=self.process_ticks, daemon=True)
-        self.processor_thread.start()
+        self.tick_dispatcher.start()
 
     def signal_tick_processor_stop(self):
-        self.stop_processor = True
+        self.tick_dispatcher.signal_stop()
 
     def stop_tick_processor(self):
-        self.stop_processor = True
-        if self.processor_thread:
-            self.processor_thread.join(timeout=5)
-
-    def process_ticks(self):
-        while not self.stop_processor:
-            try:
-                tick = self.tick_queue.get(timeout=1)
-                self._route_tick(tick)
-                self._tick_count += 1
-                if self._tick_count % 500 == 0:
-                    logger.debug(f"[ZerodhaWS] processed {self._tick_count} ticks, queue depth={self.tick_queue.qsize()}")
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error processing tick: {e}")
+        self.tick_dispatcher.stop()
+
+    def _shard_key(self, token):
+        """Parent symbol for a token, so one stock's ticks always share a shard."""
+        registry = self.token_registry
+        info = registry.lookup(token) if registry is not None else None
+        return info.parent_symbol if info is not None else token
 
     def _route_tick(self, tick):
         token = tick.get("instrument_token")
@@ -325,11 +323,9 @@ class ZerodhaTickerManager:
 
             agg = parent.options_aggregate
             logger.debug(
-                f"[ZerodhaWS] {info.parent_symbol} aggregate updated — "
-                f"strikes={len(parent.options_live)}, spot={spot}, "
-                f"pcr={agg.get('live_pcr', 0):.3f}, "
-                f"atm_strike={agg.get('atm_strike')}, "
-                f"straddle={agg.get('atm_straddle_premium', 0):.1f}"
+                "[ZerodhaWS] %s aggregate updated — strikes=%d, spot=%s, pcr=%.3f, atm_strike=%s, straddle=%.1f",
+                info.parent_symbol, len(parent.options_live), spot, agg.get("live_pcr", 0),
+                agg.get("atm_strike"), agg.get("atm_straddle_premium", 0),
             )
 
             if self.live_options_engine and spot:
@@ -610,14 +606,7 @@ class ZerodhaTickerManager:
         import common.shared as shared
         logger.debug(f"Received {len(ticks)} ticks")
         shared.app_ctx.last_equity_tick_time = time.time()
-        for tick in ticks:
-            try:
-                self.tick_queue.put_nowait(tick)
-            except queue.Full:
-                token = tick.get("instrument_token")
-                info = self.token_registry.lookup(token) if self.token_registry else None
-                symbol = info.parent_symbol if info else "unknown"
-                logger.warning(f"[ZerodhaWS] tick_queue full — dropping tick for token {token} ({symbol})")
+        self.tick_dispatcher.submit(ticks)
 
     # ─── Re-auth (shared — both WS share the same enctoken) ────────────
 
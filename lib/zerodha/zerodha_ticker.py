@@ -13,6 +13,7 @@ import time
 import json
 import struct
 import threading
+from collections import namedtuple
 from datetime import datetime
 from twisted.internet import reactor, ssl
 from twisted.python import log as twisted_log
@@ -26,6 +27,49 @@ import lib.logging_util  # noqa: E402
 log = lib.logging_util.get_logger("zerodha")
 
 
+# Precompiled packet layouts (big-endian), keyed by packet length.
+_U16 = struct.Struct(">H")
+_LTP_PACKET = struct.Struct(">2I")              # 8: token, ltp
+_INDEX_QUOTE_PACKET = struct.Struct(">6I")      # 28: token, ltp, high, low, open, close (+ 4 unused)
+_INDEX_FULL_PACKET = struct.Struct(">6I4xI")    # 32: ... + exchange timestamp
+_QUOTE_PACKET = struct.Struct(">11I")           # 44: token .. ohlc
+_FULL_PACKET = struct.Struct(">16I")            # 184: quote + ltt, oi, oi high/low, timestamp
+_DEPTH = struct.Struct(">" + "IIH2x" * 10)      # 184: 10 x (quantity, price, orders) from byte 64
+
+# Segment constant (instrument_token & 0xff) -> price divisor; indices are not tradable.
+_SEGMENT_CDS = 3
+_SEGMENT_BCD = 6
+_SEGMENT_INDICES = 9
+
+
+def _segment_info(instrument_token):
+    """(price divisor, tradable) for the instrument's segment."""
+    segment = instrument_token & 0xff
+    if segment == _SEGMENT_CDS:
+        return 10000000.0, True
+    if segment == _SEGMENT_BCD:
+        return 10000.0, True
+    return 100.0, segment != _SEGMENT_INDICES
+
+
+def _timestamp(epoch):
+    try:
+        return datetime.fromtimestamp(epoch)
+    except Exception:
+        return None
+
+
+TickRecord = namedtuple("TickRecord", [
+    "instrument_token", "mode", "tradable", "last_price",
+    "last_traded_quantity", "average_traded_price", "volume_traded",
+    "total_buy_quantity", "total_sell_quantity",
+    "open", "high", "low", "close", "change",
+    "last_trade_time", "oi", "oi_day_high", "oi_day_low", "exchange_timestamp",
+    "depth",
+])
+_EMPTY_QUOTE = (None,) * (len(TickRecord._fields) - 4)
+
+
 class KiteTickerClientProtocol(WebSocketClientProtocol):
     """Kite ticker autobahn WebSocket protocol."""
 
@@ -474,6 +518,12 @@ class KiteTicker(object):
         # List of current subscribed tokens
         self.subscribed_tokens = {}
 
+        # Tokens whose full-mode market depth is parsed (None = every token).
+        self.depth_tokens: frozenset | None = None
+
+        # Deliver ticks to `on_ticks` as TickRecord tuples instead of dicts.
+        self.tick_records = False
+
     def _create_connection(self, url, **kwargs):
         """Create a WebSocket client connection."""
         self.factory = KiteTickerClientFactory(url, **kwargs)
@@ -722,127 +772,186 @@ class KiteTicker(object):
             self._on_error(self, 0, data.get("data"))
 
     def _parse_binary(self, bin):
-        """Parse binary data to a (list of) ticks structure."""
-        packets = self._split_packets(bin)  # split data to individual ticks packet
-        data = []
-
-        for packet in packets:
-            instrument_token = self._unpack_int(packet, 0, 4)
-            segment = instrument_token & 0xff  # Retrive segment constant from instrument_token
-
-            # Add price divisor based on segment
-            if segment == self.EXCHANGE_MAP["cds"]:
-                divisor = 10000000.0
-            elif segment == self.EXCHANGE_MAP["bcd"]:
-                divisor = 10000.0
-            else:
-                divisor = 100.0
+        """Parse binary data to a (list of) ticks structure.
+
+        Each packet is decoded with one precompiled ``struct.Struct`` for its
+        length via ``unpack_from`` on a single memoryview of the frame, so no
+        per-packet or per-field slices are made. Market depth of full-mode
+        packets is only built for tokens in ``depth_tokens`` (all when None).
+        With ``tick_records`` set, ticks are returned as ``TickRecord`` tuples
+        instead of dicts.
+        """
+        if self.tick_records:
+            return self._parse_records(bin)
+        if len(bin) < 2:
+            return []
 
-            # All indices are not tradable
-            tradable = False if segment == self.EXCHANGE_MAP["indices"] else True
+        view = memoryview(bin)
+        end = len(view)
+        number_of_packets = _U16.unpack_from(view, 0)[0]
+        depth_tokens = self.depth_tokens
+        data = []
+        append = data.append
 
-            # LTP packets
-            if len(packet) == 8:
-                data.append({
+        j = 2
+        for _ in range(number_of_packets):
+            packet_length = _U16.unpack_from(view, j)[0]
+            p = j + 2
+            j = p + packet_length
+            if j > end:
+                break
+
+            if packet_length == 8:
+                token, ltp = _LTP_PACKET.unpack_from(view, p)
+                divisor, tradable = _segment_info(token)
+                append({
                     "tradable": tradable,
                     "mode": self.MODE_LTP,
-                    "instrument_token": instrument_token,
-                    "last_price": self._unpack_int(packet, 4, 8) / divisor
+                    "instrument_token": token,
+                    "last_price": ltp / divisor
                 })
-            # Indices quote and full mode
-            elif len(packet) == 28 or len(packet) == 32:
-                mode = self.MODE_QUOTE if len(packet) == 28 else self.MODE_FULL
 
+            # Indices quote and full mode
+            elif packet_length == 28 or packet_length == 32:
+                if packet_length == 28:
+                    token, ltp, high, low, open_, close = _INDEX_QUOTE_PACKET.unpack_from(view, p)
+                else:
+                    token, ltp, high, low, open_, close, ts = _INDEX_FULL_PACKET.unpack_from(view, p)
+                divisor, tradable = _segment_info(token)
+                last_price = ltp / divisor
+                close = close / divisor
                 d = {
                     "tradable": tradable,
-                    "mode": mode,
-                    "instrument_token": instrument_token,
-                    "last_price": self._unpack_int(packet, 4, 8) / divisor,
+                    "mode": self.MODE_QUOTE if packet_length == 28 else self.MODE_FULL,
+                    "instrument_token": token,
+                    "last_price": last_price,
                     "ohlc": {
-                        "high": self._unpack_int(packet, 8, 12) / divisor,
-                        "low": self._unpack_int(packet, 12, 16) / divisor,
-                        "open": self._unpack_int(packet, 16, 20) / divisor,
-                        "close": self._unpack_int(packet, 20, 24) / divisor
-                    }
+                        "high": high / divisor,
+                        "low": low / divisor,
+                        "open": open_ / divisor,
+                        "close": close
+                    },
+                    "change": (last_price - close) * 100 / close if close != 0 else 0
                 }
+                if packet_length == 32:
+                    d["exchange_timestamp"] = _timestamp(ts)
+                append(d)
 
-                # Compute the change price using close price and last price
-                d["change"] = 0
-                if (d["ohlc"]["close"] != 0):
-                    d["change"] = (d["last_price"] - d["ohlc"]["close"]) * 100 / d["ohlc"]["close"]
-
-                # Full mode with timestamp
-                if len(packet) == 32:
-                    try:
-                        timestamp = datetime.fromtimestamp(self._unpack_int(packet, 28, 32))
-                    except Exception:
-                        timestamp = None
-
-                    d["exchange_timestamp"] = timestamp
-
-                data.append(d)
             # Quote and full mode
-            elif len(packet) == 44 or len(packet) == 184:
-                mode = self.MODE_QUOTE if len(packet) == 44 else self.MODE_FULL
-
+            elif packet_length == 44 or packet_length == 184:
+                if packet_length == 44:
+                    (token, ltp, ltq, atp, volume, buy_qty, sell_qty,
+                     open_, high, low, close) = _QUOTE_PACKET.unpack_from(view, p)
+                else:
+                    (token, ltp, ltq, atp, volume, buy_qty, sell_qty, open_, high, low, close,
+                     ltt, oi, oi_high, oi_low, ts) = _FULL_PACKET.unpack_from(view, p)
+                divisor, tradable = _segment_info(token)
+                last_price = ltp / divisor
+                close = close / divisor
                 d = {
                     "tradable": tradable,
-                    "mode": mode,
-                    "instrument_token": instrument_token,
-                    "last_price": self._unpack_int(packet, 4, 8) / divisor,
-                    "last_traded_quantity": self._unpack_int(packet, 8, 12),
-                    "average_traded_price": self._unpack_int(packet, 12, 16) / divisor,
-                    "volume_traded": self._unpack_int(packet, 16, 20),
-                    "total_buy_quantity": self._unpack_int(packet, 20, 24),
-                    "total_sell_quantity": self._unpack_int(packet, 24, 28),
+                    "mode": self.MODE_QUOTE if packet_length == 44 else self.MODE_FULL,
+                    "instrument_token": token,
+                    "last_price": last_price,
+                    "last_traded_quantity": ltq,
+                    "average_traded_price": atp / divisor,
+                    "volume_traded": volume,
+                    "total_buy_quantity": buy_qty,
+                    "total_sell_quantity": sell_qty,
                     "ohlc": {
-                        "open": self._unpack_int(packet, 28, 32) / divisor,
-                        "high": self._unpack_int(packet, 32, 36) / divisor,
-                        "low": self._unpack_int(packet, 36, 40) / divisor,
-                        "close": self._unpack_int(packet, 40, 44) / divisor
-                    }
+                        "open": open_ / divisor,
+                        "high": high / divisor,
+                        "low": low / divisor,
+                        "close": close
+                    },
+                    "change": (last_price - close) * 100 / close if close != 0 else 0
                 }
+                if packet_length == 184:
+                    d["last_trade_time"] = _timestamp(ltt)
+                    d["oi"] = oi
+                    d["oi_day_high"] = oi_high
+                    d["oi_day_low"] = oi_low
+                    d["exchange_timestamp"] = _timestamp(ts)
+                    if depth_tokens is None or token in depth_tokens:
+                        levels = _DEPTH.unpack_from(view, p + 64)
+                        entries = [
+                            {"quantity": levels[k], "price": levels[k + 1] / divisor, "orders": levels[k + 2]}
+                            for k in range(0, 30, 3)
+                        ]
+                        d["depth"] = {"buy": entries[:5], "sell": entries[5:]}
+                append(d)
+
+        return data
+
+    def _parse_records(self, bin):
+        """Parse binary data to a list of ``TickRecord`` tuples.
 
-                # Compute the change price using close price and last price
-                d["change"] = 0
-                if (d["ohlc"]["close"] != 0):
-                    d["change"] = (d["last_price"] - d["ohlc"]["close"]) * 100 / d["ohlc"]["close"]
-
-                # Parse full mode
-                if len(packet) == 184:
-                    try:
-                        last_trade_time = datetime.fromtimestamp(self._unpack_int(packet, 44, 48))
-                    except Exception:
-                        last_trade_time = None
-
-                    try:
-                        timestamp = datetime.fromtimestamp(self._unpack_int(packet, 60, 64))
-                    except Exception:
-                        timestamp = None
-
-                    d["last_trade_time"] = last_trade_time
-                    d["oi"] = self._unpack_int(packet, 48, 52)
-                    d["oi_day_high"] = self._unpack_int(packet, 52, 56)
-                    d["oi_day_low"] = self._unpack_int(packet, 56, 60)
-                    d["exchange_timestamp"] = timestamp
-
-                    # Market depth entries.
-                    depth = {
-                        "buy": [],
-                        "sell": []
-                    }
-
-                    # Compile the market depth lists.
-                    for i, p in enumerate(range(64, len(packet), 12)):
-                        depth["sell" if i >= 5 else "buy"].append({
-                            "quantity": self._unpack_int(packet, p, p + 4),
-                            "price": self._unpack_int(packet, p + 4, p + 8) / divisor,
-                            "orders": self._unpack_int(packet, p + 8, p + 10, byte_format="H")
-                        })
-
-                    d["depth"] = depth
-
-                data.append(d)
+        Fields a packet does not carry are None; timestamps are left as epoch
+        seconds and depth as a flat ``(quantity, price, orders) * 10`` tuple
+        (five buy levels, then five sell levels).
+        """
+        if len(bin) < 2:
+            return []
+
+        view = memoryview(bin)
+        end = len(view)
+        number_of_packets = _U16.unpack_from(view, 0)[0]
+        depth_tokens = self.depth_tokens
+        data = []
+        append = data.append
+
+        j = 2
+        for _ in range(number_of_packets):
+            packet_length = _U16.unpack_from(view, j)[0]
+            p = j + 2
+            j = p + packet_length
+            if j > end:
+                break
+
+            if packet_length == 8:
+                token, ltp = _LTP_PACKET.unpack_from(view, p)
+                divisor, tradable = _segment_info(token)
+                append(TickRecord(token, self.MODE_LTP, tradable, ltp / divisor, *_EMPTY_QUOTE))
+            elif packet_length == 28 or packet_length == 32:
+                if packet_length == 28:
+                    token, ltp, high, low, open_, close = _INDEX_QUOTE_PACKET.unpack_from(view, p)
+                    ts = None
+                else:
+                    token, ltp, high, low, open_, close, ts = _INDEX_FULL_PACKET.unpack_from(view, p)
+                divisor, tradable = _segment_info(token)
+                last_price = ltp / divisor
+                close = close / divisor
+                append(TickRecord(
+                    token, self.MODE_QUOTE if packet_length == 28 else self.MODE_FULL, tradable, last_price,
+                    None, None, None, None, None,
+                    open_ / divisor, high / divisor, low / divisor, close,
+                    (last_price - close) * 100 / close if close != 0 else 0,
+                    None, None, None, None, ts, None,
+                ))
+            elif packet_length == 44 or packet_length == 184:
+                if packet_length == 44:
+                    (token, ltp, ltq, atp, volume, buy_qty, sell_qty,
+                     open_, high, low, close) = _QUOTE_PACKET.unpack_from(view, p)
+                    ltt = oi = oi_high = oi_low = ts = None
+                else:
+                    (token, ltp, ltq, atp, volume, buy_qty, sell_qty, open_, high, low, close,
+                     ltt, oi, oi_high, oi_low, ts) = _FULL_PACKET.unpack_from(view, p)
+                divisor, tradable = _segment_info(token)
+                last_price = ltp / divisor
+                close = close / divisor
+                depth = None
+                if packet_length == 184 and (depth_tokens is None or token in depth_tokens):
+                    levels = _DEPTH.unpack_from(view, p + 64)
+                    depth = tuple(
+                        v / divisor if k % 3 == 1 else v for k, v in enumerate(levels)
+                    )
+                append(TickRecord(
+                    token, self.MODE_QUOTE if packet_length == 44 else self.MODE_FULL, tradable, last_price,
+                    ltq, atp / divisor, volume, buy_qty, sell_qty,
+                    open_ / divisor, high / divisor, low / divisor, close,
+                    (last_price - close) * 100 / close if close != 0 else 0,
+                    ltt, oi, oi_high, oi_low, ts, depth,
+                ))
 
         return data
 
@@ -34,6 +34,7 @@ from collections import namedtuple
 from statistics import mean, stdev
 
 from .Analyser import BaseAnalyzer
+from .OptionChainFrame import OptionChainFrame
 from common.Stock import Stock
 from lib.logging_util import get_logger
 logger = get_logger("analyser")
@@ -135,10 +136,8 @@ class GEXAnalyser(BaseAnalyzer):
             return False
         if not stock.options_live:
             return False
-        has_gamma = any(
-            data.get("CE", {}).get("gamma", 0.0) or data.get("PE", {}).get("gamma", 0.0)
-            for data in stock.options_live.values()
-        )
+        frame = OptionChainFrame.for_stock(stock, "options_live")
+        has_gamma = frame is not None and frame.has_gamma()
         if not has_gamma:
             n_strikes = len(stock.options_live)
             logger.debug(
@@ -166,74 +165,36 @@ class GEXAnalyser(BaseAnalyzer):
         #   - OI from Zerodha WS is in absolute shares (not lots), so no lot_size
         #   - 0.01 normalises to a 1% move in spot (standard GEX convention)
         #   - /1e7 converts rupees → ₹ crores
-        normaliser = 1e7
-
-        total_gex_ce = 0.0
-        total_gex_pe = 0.0
-        gex_by_strike: dict[float, float] = {}
-
-        for strike, data in stock.options_live.items():
-            ce = data.get("CE", {})
-            pe = data.get("PE", {})
-
-            ce_gamma = ce.get("gamma", 0.0) or 0.0
-            pe_gamma = pe.get("gamma", 0.0) or 0.0
-            ce_oi    = ce.get("oi", 0) or 0
-            pe_oi    = pe.get("oi", 0) or 0
-
-            gex_ce = ce_gamma * ce_oi * (spot ** 2) * 0.01 / normaliser
-            gex_pe = pe_gamma * pe_oi * (spot ** 2) * 0.01 / normaliser
+        frame = OptionChainFrame.for_stock(stock, "options_live")
+        if frame is None:
+            return 0.0, 0.0, 0.0, {}, None
 
-            strike_gex = gex_ce - gex_pe
-            gex_by_strike[float(strike)] = strike_gex
-            total_gex_ce += gex_ce
-            total_gex_pe += gex_pe
+        gex_ce, gex_pe = frame.gex(spot)
+        net = gex_ce - gex_pe
+        total_gex_ce = float(gex_ce.sum())
+        total_gex_pe = float(gex_pe.sum())
+        gex_by_strike: dict[float, float] = dict(zip(frame.strikes.tolist(), net.tolist()))
 
         gex_total = total_gex_ce - total_gex_pe
-        flip_level = self._find_flip_level(spot, gex_by_strike, gex_total)
+        flip_level = self._find_flip_level(spot, frame, net, gex_total)
 
         return gex_total, total_gex_ce, total_gex_pe, gex_by_strike, flip_level
 
+    @staticmethod
     def _find_flip_level(
-        self,
         spot: float,
-        gex_by_strike: dict[float, float],
+        frame: OptionChainFrame,
+        net_gex,
         gex_total: float,
     ) -> float | None:
         """
         Find the strike where cumulative GEX crosses zero.
-        Scans from ATM outward, alternating above/below spot.
+        Scans from ATM outward, first below spot then above.
         Returns None if no zero-crossing found within subscribed strikes.
         """
-        if not gex_by_strike or gex_total == 0.0:
+        if not len(frame) or gex_total == 0.0:
             return None
-
-        strikes_sorted = sorted(gex_by_strike.keys())
-        if not strikes_sorted:
-            return None
-
-        atm = min(strikes_sorted, key=lambda s: abs(s - spot))
-        atm_idx = strikes_sorted.index(atm)
-
-        cumulative = 0.0
-        prev_cumulative = 0.0
-        for i in range(atm_idx, -1, -1):
-            s = strikes_sorted[i]
-            prev_cumulative = cumulative
-            cumulative += gex_by_strike[s]
-            if prev_cumulative * cumulative < 0:
-                return s
-
-        cumulative = 0.0
-        prev_cumulative = 0.0
-        for i in range(atm_idx, len(strikes_sorted)):
-            s = strikes_sorted[i]
-            prev_cumulative = cumulative
-            cumulative += gex_by_strike[s]
-            if prev_cumulative * cumulative < 0:
-                return s
-
-        return None
+        return frame.flip_level(spot, net_gex)
 
     @staticmethod
     def _magnitude(gex_total: float) -> str:
@@ -0,0 +1,482 @@
+"""
+IndicatorState
+──────────────
+Incremental indicator state for TechnicalAnalyser, carried across cycles.
+
+Every cycle used to recompute RSI, ADX, MACD, the trend EMAs, Bollinger, ATR,
+stochastic and supertrend over the whole priceData frame although only one
+bar had been appended. IndicatorState keeps the running accumulators for one
+symbol/timeframe — EWM means, Wilder averages, ring buffers for the rolling
+windows, supertrend bands — and advances them in O(1) per appended bar.
+
+Bar model:
+  - Every bar but the last one in priceData is *committed* into the state.
+  - The last bar is the candle still forming (yfinance returns the live
+    5-min / daily bar). It is applied to a throwaway copy on each update, so
+    revisions of the forming bar never touch the committed accumulators.
+  - The match is anchored on the last committed bar: it must still be in
+    priceData with the same timestamp and H/L/C, and everything after it is
+    appended. Callers feed a rolling window (e.g. the last 2y of bars) whose
+    first bar moves every day; that alone does not force a replay.
+  - If the last committed bar is gone or revised, or the parameters changed,
+    the state is rebuilt by replaying the whole frame.
+
+Because the window start is not re-seeded, the EWM / Wilder accumulators
+keep the influence of bars that have since left the window. Versus a full
+recompute over the current window that difference is the seed's decayed
+weight, (1 - alpha)^k after k bars — negligible once the state has run
+for a few hundred bars. Ring-buffer (rolling) indicators are exact.
+
+The update rules replicate the pandas/numpy expressions in TechnicalAnalyser
+step by step (ewm(adjust=False) weighting, NaN propagation, x/0 → inf/NaN),
+so the values match a full recompute over the same frame. Rolling means and
+standard deviations are recomputed from their ring buffer, which can differ
+from pandas' online rolling kernels in the last ulp.
+
+Persisted by the analysis-engine worker in `data:indicators:{symbol}`, one
+JSON field per timeframe (`intraday`, `positional`).
+"""
+
+import json
+import math
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+NAN = float("nan")
+
+
+class IndicatorParams(NamedTuple):
+    rsi_period:            int    # RSI_LOOKUP_PERIOD
+    rsi_window:            int    # analyse_rsi recomputes RSI over the last N closes
+    divergence_lookback:   int    # analyse_rsi_divergence swing-search window
+    trend_fast:            int    # pandas-EMA trend filter (RSI / BB / divergence)
+    trend_slow:            int
+    fast_ema:              int    # TradingView-style EMA crossover
+    slow_ema:              int
+    adx_period:            int
+    macd_fast:             int
+    macd_slow:             int
+    macd_signal:           int
+    bb_window:             int
+    bb_num_std:            float
+    atr_period:            int
+    atr_trend_periods:     int
+    supertrend_period:     int
+    supertrend_multiplier: float
+    stoch_k:               int
+    stoch_d:               int
+
+
+# ── pandas-compatible scalar kernels ─────────────────────────────────────────
+
+def _span_alpha(span: float) -> float:
+    """Smoothing factor pandas derives for ``ewm(span=span)``."""
+    return 1.0 / (1.0 + (span - 1) / 2)
+
+
+def _alpha(alpha: float) -> float:
+    """Smoothing factor pandas derives for ``ewm(alpha=alpha)`` (via com)."""
+    return 1.0 / (1.0 + (1 - alpha) / alpha)
+
+
+def _ewm_step(acc: list, x: float, alpha: float) -> float:
+    """One step of ``Series.ewm(alpha=alpha, adjust=False).mean()``.
+
+    ``acc`` is ``[weighted, old_wt]``, starting at ``[nan, 1.0]``. Mirrors the
+    pandas ewma kernel (ignore_na=False), including how NaN inputs decay the
+    previous mean's weight.
+    """
+    weighted, old_wt = acc
+    is_observation = x == x
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if is_observation:
+            if weighted != x:
+                weighted = old_wt * weighted + alpha * x
+                weighted /= old_wt + alpha
+            old_wt = 1.0
+    elif is_observation:
+        weighted = x
+    acc[0] = weighted
+    acc[1] = old_wt
+    return weighted
+
+
+def _div(a: float, b: float) -> float:
+    """``a / b`` with numpy semantics: inf or NaN instead of ZeroDivisionError."""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    rs = _div(avg_gain, avg_loss)
+    return 100 - (100 / (1 + rs))
+
+
+def _tv_ema_step(seed: list, value: float, x: float, length: int) -> float:
+    """TradingView EMA: SMA of the first ``length`` values, then recursive."""
+    if len(seed) < length:
+        seed.append(x)
+        if len(seed) < length:
+            return NAN
+        return float(np.mean(np.asarray(seed, dtype=float)))
+    alpha = 2 / (length + 1)
+    return (x - value) * alpha + value
+
+
+def _window_mean_std(values) -> tuple[float, float]:
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, math.sqrt(var)
+
+
+class IndicatorState:
+    """
+    Running indicator accumulators for one symbol and timeframe.
+
+    Call ``update(priceData, params)`` each cycle; it commits newly closed bars
+    and returns a view (a copy with the forming bar applied) whose ``*_tail``
+    rings hold the most recent indicator values, newest last.
+    """
+
+    VERSION = 2
+
+    def __init__(self) -> None:
+        self.rebuilds = 0       # full replays forced by revised history / new params
+        self.dirty = False      # committed state changed since load → persist
+        self._view = None
+        self._view_key = None
+        self._reset(None)
+
+    # ── lifecycle ────────────────────────────────────────────────────────────
+
+    def _reset(self, params: IndicatorParams | None) -> None:
+        self.params = params
+        self.count = 0
+        self.last_ts: str | None = None
+        self.last_bar: list | None = None   # [high, low, close] of last committed bar
+        if params is None:
+            return
+        p = params
+
+        self.closes = deque(maxlen=max(p.rsi_window, p.divergence_lookback, 2))
+        self.prev_high = NAN
+        self.prev_low = NAN
+
+        # Trend filter EMAs (pandas ewm span, adjust=False)
+        self.trend_fast = [NAN, 1.0]
+        self.trend_slow = [NAN, 1.0]
+        self.trend_tail = deque(maxlen=5)              # (ema_fast, ema_slow)
+
+        # Full-history RSI (analyse_rsi_divergence)
+        self.rsi_gain = [NAN, 1.0]
+        self.rsi_loss = [NAN, 1.0]
+        self.rsi_tail = deque(maxlen=p.divergence_lookback)
+
+        # MACD
+        self.macd_fast = [NAN, 1.0]
+        self.macd_slow = [NAN, 1.0]
+        self.macd_signal = [NAN, 1.0]
+        self.macd_tail = deque(maxlen=3)               # (macd, signal, histogram)
+
+        # Bollinger bands
+        self.bb_window = deque(maxlen=p.bb_window)
+        self.bb_tail = deque(maxlen=5)                 # (close, sma, upper, lower)
+
+        # ATR (simple rolling mean of true range, analyse_atr)
+        self.tr_window = deque(maxlen=p.atr_period)
+        self.atr_tail = deque(maxlen=p.atr_trend_periods + 1)
+
+        # TradingView EMA crossover
+        self.tv_fast_seed: list = []
+        self.tv_fast = NAN
+        self.tv_slow_seed: list = []
+        self.tv_slow = NAN
+        self.tv_tail = deque(maxlen=3)                 # (fast, slow)
+
+        # ADX (Wilder smoothing via ewm alpha=1/period)
+        self.adx_tr = [NAN, 1.0]
+        self.adx_plus = [NAN, 1.0]
+        self.adx_minus = [NAN, 1.0]
+        self.adx_dx = [NAN, 1.0]
+        self.adx = NAN
+
+        # Supertrend
+        self.st_seed: list = []
+        self.st_atr = 0.0
+        self.st_upper = 0.0
+        self.st_lower = 0.0
+        self.st_dir = 0
+        self.st_value = 0.0
+        self.st_tail = deque(maxlen=2)                 # (direction, supertrend)
+
+        # Stochastic
+        self.stoch_highs = deque(maxlen=p.stoch_k)
+        self.stoch_lows = deque(maxlen=p.stoch_k)
+        self.stoch_k_window = deque(maxlen=p.stoch_d)
+        self.stoch_tail = deque(maxlen=2)              # (%K, %D)
+
+    def update(self, price_data: pd.DataFrame, params: IndicatorParams) -> "IndicatorState | None":
+        """Bring the state up to ``price_data`` and return the current view.
+
+        The view is cached, so every analyse_* method of one cycle shares it.
+        Returns None for an empty frame.
+        """
+        n = len(price_data)
+        if n == 0:
+            return None
+        index = price_data.index
+        high = price_data["High"].to_numpy(dtype=float)
+        low = price_data["Low"].to_numpy(dtype=float)
+        close = price_data["Close"].to_numpy(dtype=float)
+
+        key = (params, n, str(index[0]), str(index[-1]),
+               float(high[-1]), float(low[-1]), float(close[-1]))
+        anchor = self._anchor(index, high, low, close) if params == self.params else None
+        if anchor is not None and self._view is not None and self._view_key == key:
+            return self._view
+
+        if anchor is None:
+            if self.count:
+                self.rebuilds += 1
+            self._reset(params)
+            anchor = -1
+
+        for i in range(anchor + 1, n - 1):
+            self._push(float(high[i]), float(low[i]), float(close[i]))
+        if n - 2 > anchor:
+            last = n - 2
+            self.last_ts = str(index[last])
+            self.last_bar = [float(high[last]), float(low[last]), float(close[last])]
+            self.dirty = True
+
+        view = self._clone()
+        view._push(float(high[-1]), float(low[-1]), float(close[-1]))
+        self._view, self._view_key = view, key
+        return view
+
+    def _anchor(self, index, high, low, close) -> int | None:
+        """Position of the last committed bar in ``index`` (-1 if nothing is
+        committed), or None if it is missing or revised.
+
+        Scans back from the forming bar, so the steady-state cost is a step
+        or two regardless of the history length.
+        """
+        if self.count == 0:
+            return -1
+        for i in range(len(index) - 2, -1, -1):
+            if str(index[i]) == self.last_ts:
+                return i if [float(high[i]), float(low[i]), float(close[i])] == self.last_bar else None
+        return None
+
+    def _clone(self) -> "IndicatorState":
+        new = object.__new__(IndicatorState)
+        for name, value in self.__dict__.items():
+            if isinstance(value, deque):
+                value = deque(value, value.maxlen)
+            elif isinstance(value, list):
+                value = list(value)
+            new.__dict__[name] = value
+        new._view = None
+        new._view_key = None
+        return new
+
+    # ── per-bar step ─────────────────────────────────────────────────────────
+
+    def _push(self, h: float, l: float, c: float) -> None:
+        p = self.params
+        first = self.count == 0
+        prev_close = NAN if first else self.closes[-1]
+
+        # Trend EMAs
+        ema_fast = _ewm_step(self.trend_fast, c, _span_alpha(p.trend_fast))
+        ema_slow = _ewm_step(self.trend_slow, c, _span_alpha(p.trend_slow))
+        self.trend_tail.append((ema_fast, ema_slow))
+
+        # RSI over the full history: close.diff().dropna()
+        if not first:
+            delta = c - prev_close
+            if delta == delta:
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+                rsi_alpha = _span_alpha(p.rsi_period)
+                avg_gain = _ewm_step(self.rsi_gain, gain, rsi_alpha)
+                avg_loss = _ewm_step(self.rsi_loss, loss, rsi_alpha)
+                self.rsi_tail.append(_rsi(avg_gain, avg_loss))
+
+        # MACD
+        fast = _ewm_step(self.macd_fast, c, _span_alpha(p.macd_fast))
+        slow = _ewm_step(self.macd_slow, c, _span_alpha(p.macd_slow))
+        macd = fast - slow
+        signal = _ewm_step(self.macd_signal, macd, _span_alpha(p.macd_signal))
+        self.macd_tail.append((macd, signal, macd - signal))
+
+        # Bollinger bands
+        self.bb_window.append(c)
+        if len(self.bb_window) == p.bb_window:
+            sma, std = _window_mean_std(self.bb_window)
+            self.bb_tail.append((c, sma, sma + p.bb_num_std * std, sma - p.bb_num_std * std))
+        else:
+            self.bb_tail.append((c, NAN, NAN, NAN))
+
+        # True range (first bar: high - low, as the NaN-skipping row max gives)
+        if first:
+            tr = h - l
+        else:
+            tr = max(h - l, abs(h - prev_close), abs(l - prev_close))
+
+        # ATR as simple rolling mean
+        self.tr_window.append(tr)
+        if len(self.tr_window) == p.atr_period:
+            self.atr_tail.append(sum(self.tr_window) / p.atr_period)
+        else:
+            self.atr_tail.append(NAN)
+
+        # ADX
+        up_move = h - self.prev_high
+        down_move = self.prev_low - l
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+        adx_alpha = _alpha(1 / p.adx_period)
+        atr = _ewm_step(self.adx_tr, tr, adx_alpha)
+        plus_di = _div(100 * _ewm_step(self.adx_plus, plus_dm, adx_alpha), atr)
+        minus_di = _div(100 * _ewm_step(self.adx_minus, minus_dm, adx_alpha), atr)
+        di_sum = plus_di + minus_di
+        dx = NAN if di_sum == 0 else _div(100 * abs(plus_di - minus_di), di_sum)
+        self.adx = _ewm_step(self.adx_dx, dx, adx_alpha)
+
+        # TradingView EMA crossover
+        self.tv_fast = _tv_ema_step(self.tv_fast_seed, self.tv_fast, c, p.fast_ema)
+        self.tv_slow = _tv_ema_step(self.tv_slow_seed, self.tv_slow, c, p.slow_ema)
+        self.tv_tail.append((self.tv_fast, self.tv_slow))
+
+        # Supertrend (Wilder ATR seeded with the SMA of the first `period` TRs)
+        self._push_supertrend(h, l, c, prev_close)
+
+        # Stochastic
+        self.stoch_highs.append(h)
+        self.stoch_lows.append(l)
+        k_value = NAN
+        if len(self.stoch_highs) == p.stoch_k:
+            lowest = min(self.stoch_lows)
+            denom = max(self.stoch_highs) - lowest
+            if denom != 0:
+                k_value = ((c - lowest) / denom) * 100
+        self.stoch_k_window.append(k_value)
+        d_value = NAN
+        if len(self.stoch_k_window) == p.stoch_d:
+            d_value = sum(self.stoch_k_window) / p.stoch_d
+        self.stoch_tail.append((k_value, d_value))
+
+        self.closes.append(c)
+        self.prev_high = h
+        self.prev_low = l
+        self.count += 1
+
+    def _push_supertrend(self, h: float, l: float, c: float, prev_close: float) -> None:
+        p = self.params
+        period = p.supertrend_period
+        if prev_close != prev_close:
+            prev_close = c
+        tr = max(h - l, max(abs(h - prev_close), abs(l - prev_close)))
+        hl2 = (h + l) / 2.0
+
+        if len(self.st_seed) < period:
+            self.st_seed.append(tr)
+            if len(self.st_seed) == period:
+                self.st_atr = float(np.mean(np.asarray(self.st_seed, dtype=float)))
+                self.st_upper = hl2 + p.supertrend_multiplier * self.st_atr
+                self.st_lower = hl2 - p.supertrend_multiplier * self.st_atr
+                self.st_value = self.st_upper
+                self.st_dir = -1
+            self.st_tail.append((self.st_dir, self.st_value))
+            return
+
+        self.st_atr = (self.st_atr * (period - 1) + tr) / period
+        upper_basic = hl2 + p.supertrend_multiplier * self.st_atr
+        lower_basic = hl2 - p.supertrend_multiplier * self.st_atr
+
+        if upper_basic < self.st_upper or prev_close > self.st_upper:
+            upper = upper_basic
+        else:
+            upper = self.st_upper
+        if lower_basic > self.st_lower or prev_close < self.st_lower:
+            lower = lower_basic
+        else:
+            lower = self.st_lower
+
+        if self.st_dir == -1:
+            if c > upper:
+                self.st_dir, self.st_value = 1, lower
+            else:
+                self.st_dir, self.st_value = -1, upper
+        else:
+            if c < lower:
+                self.st_dir, self.st_value = -1, upper
+            else:
+                self.st_dir, self.st_value = 1, lower
+        self.st_upper, self.st_lower = upper, lower
+        self.st_tail.append((self.st_dir, self.st_value))
+
+    # ── derived series ───────────────────────────────────────────────────────
+
+    def window_rsi(self) -> list[float]:
+        """RSI over the last ``rsi_window`` closes, seeded at the window start.
+
+        Matches ``_compute_rsi(close.iloc[-rsi_window:])``; cost depends on the
+        window, not on the length of the history.
+        """
+        closes = list(self.closes)[-self.params.rsi_window:]
+        alpha = _span_alpha(self.params.rsi_period)
+        gain_acc, loss_acc = [NAN, 1.0], [NAN, 1.0]
+        out = []
+        for prev, cur in zip(closes, closes[1:]):
+            delta = cur - prev
+            if delta != delta:
+                continue
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            out.append(_rsi(_ewm_step(gain_acc, gain, alpha), _ewm_step(loss_acc, loss, alpha)))
+        return out
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    _META = ("params", "rebuilds", "dirty", "_view", "_view_key")
+
+    def to_json(self) -> str:
+        fields = {}
+        for name, value in self.__dict__.items():
+            if name in self._META:
+                continue
+            fields[name] = list(value) if isinstance(value, deque) else value
+        return json.dumps({
+            "v": self.VERSION,
+            "params": list(self.params) if self.params is not None else None,
+            "fields": fields,
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "IndicatorState":
+        """Restore a persisted state; anything unreadable yields a fresh state."""
+        state = cls()
+        try:
+            data = json.loads(raw)
+            if data.get("v") != cls.VERSION or data.get("params") is None:
+                return state
+            state._reset(IndicatorParams(*data["params"]))
+            for name, value in data["fields"].items():
+                current = getattr(state, name)
+                if isinstance(current, deque):
+                    current.extend(tuple(v) if isinstance(v, list) else v for v in value)
+                else:
+                    setattr(state, name, value)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return cls()
+        return state
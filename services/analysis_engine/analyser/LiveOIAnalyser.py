@@ -3,7 +3,7 @@ from lib.logging_util import get_logger
 logger = get_logger("analyser")
 from .LiveAlertFormatter import F
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Mapping
 if TYPE_CHECKING:
     from .LiveOptionsHistory import LiveOptionsHistory
 
@@ -167,7 +167,7 @@ class LiveOIAnalyser:
     def check_oi_wall_breach(
         self,
         agg: dict,
-        options_live: dict,
+        options_live: Mapping,
         spot: float,
         history: "LiveOptionsHistory | None" = None,
     ) -> tuple[str, str] | None:
@@ -8,11 +8,31 @@ and retains up to 375 entries (one full 6h 15min trading day).
 
 Used by LiveOIAnalyser and LiveStraddleAnalyser to look back over minutes
 instead of just the last few ticks.
+
+Persistence (when constructed with a Redis client)
+──────────────────────────────────────────────────
+Each recorded snapshot is also appended as one fixed-width binary record
+(``_RECORD``, 92 bytes) to the string ``live_options:history:{symbol}:{date}``,
+about 34 KiB for a full day. ``load()`` replays today's records into the
+buffer, so a market-data restart keeps the PCR-sustained, wall-breach and
+IV-trend lookbacks.
+
+Other processes (bot commands, analysis workers) use ``SharedOptionsHistory``.
+It has the same query API, but each query reads only the trailing records it
+needs with GETRANGE, never the whole day. The Redis client must be binary
+(``decode_responses=False``).
 """
 
+import math
+import struct
 import time
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
+from datetime import date
+from typing import Mapping
+
+from lib.logging_util import get_logger
+logger = get_logger("analyser")
 
 
 @dataclass
@@ -34,12 +54,43 @@ class OptionsSnapshot:
     iv_skew:          float = 0.0   # (PE IV − CE IV) × 100; positive = put-skewed / fear
 
 
+# ts, spot | pcr, straddle, atm_strike | total CE/PE OI | CE/PE wall | wall OI |
+# net CE/PE OI change | atm_iv, iv_skew.  Missing strikes are stored as NaN.
+_RECORD = struct.Struct(">dd3f2q2f2q2q2f")
+_HISTORY_TTL = 2 * 86400
+
+
+def history_key(symbol: str, day: date | None = None) -> str:
+    return f"live_options:history:{symbol}:{day or date.today()}"
+
+
+def _pack(snap: OptionsSnapshot) -> bytes:
+    values = list(astuple(snap))
+    for i in (4, 7, 8):                  # atm_strike, ce_wall, pe_wall
+        if values[i] is None:
+            values[i] = math.nan
+    return _RECORD.pack(*values)
+
+
+def _unpack(raw: bytes) -> list[OptionsSnapshot]:
+    snaps = []
+    for values in _RECORD.iter_unpack(raw[:len(raw) - len(raw) % _RECORD.size]):
+        values = list(values)
+        for i in (4, 7, 8):
+            if math.isnan(values[i]):
+                values[i] = None
+        snaps.append(OptionsSnapshot(*values))
+    return snaps
+
+
 class LiveOptionsHistory:
     """
     Per-symbol circular history buffer.
 
     Records one snapshot per SAMPLE_INTERVAL seconds.
     Retains at most MAX_SNAPSHOTS entries (≈ one trading day at 1-min samples).
+    With a (binary) Redis client, every snapshot is also appended to today's
+    per-symbol series and ``load()`` restores it after a restart.
 
     Query methods return plain lists — no pandas, no external deps.
     """
@@ -47,14 +98,40 @@ class LiveOptionsHistory:
     MAX_SNAPSHOTS    = 375   # 375 min = full trading day (9:15 – 15:30 IST)
     SAMPLE_INTERVAL  = 60    # seconds between samples
 
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, redis=None):
         self.symbol = symbol
+        self.redis = redis
         self._buf: deque[OptionsSnapshot] = deque(maxlen=self.MAX_SNAPSHOTS)
         self._last_ts: float = 0.0
 
+    def load(self) -> int:
+        """Warm restart: replay today's persisted snapshots. Returns the number loaded (fail-safe)."""
+        if self.redis is None:
+            return 0
+        try:
+            raw = self.redis.get(history_key(self.symbol)) or b""
+        except Exception as e:
+            logger.warning(f"[LiveOptionsHistory] {self.symbol}: load failed: {e}")
+            return 0
+        snaps = _unpack(raw)[-self.MAX_SNAPSHOTS:]
+        self._buf.extend(snaps)
+        if snaps:
+            self._last_ts = snaps[-1].ts
+        return len(snaps)
+
+    def _persist(self, snap: OptionsSnapshot) -> None:
+        key = history_key(self.symbol)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.append(key, _pack(snap))
+            pipe.expire(key, _HISTORY_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.debug(f"[LiveOptionsHistory] {self.symbol}: persist failed: {e}")
+
     # ── recording ────────────────────────────────────────────────────────────
 
-    def record(self, agg: dict, options_live: dict, spot: float) -> bool:
+    def record(self, agg: dict, options_live: Mapping, spot: float) -> bool:
         """
         Attempt to record a new snapshot.
         Returns True if a snapshot was saved, False if the interval hasn't elapsed.
@@ -85,6 +162,8 @@ class LiveOptionsHistory:
         )
         self._buf.append(snap)
         self._last_ts = now
+        if self.redis is not None:
+            self._persist(snap)
         return True
 
     # ── basic accessors ───────────────────────────────────────────────────────
@@ -93,9 +172,10 @@ class LiveOptionsHistory:
         return len(self._buf)
 
     def minutes_of_data(self) -> float:
-        if len(self._buf) < 2:
+        oldest, latest = self.oldest(), self.latest()
+        if oldest is None or latest is None:
             return 0.0
-        return (self._buf[-1].ts - self._buf[0].ts) / 60.0
+        return (latest.ts - oldest.ts) / 60.0
 
     def all(self) -> list[OptionsSnapshot]:
         return list(self._buf)
@@ -212,3 +292,61 @@ class LiveOptionsHistory:
         num = sum((i - x_mean) * (y - y_mean) for i, y in enumerate(series))
         den = sum((i - x_mean) ** 2 for i in range(n))
         return num / den if den > 0 else None
+
+
+class SharedOptionsHistory(LiveOptionsHistory):
+    """
+    Read-only view of another process's persisted history (same query API).
+
+    Queries read only the trailing records they need: samples are at least
+    SAMPLE_INTERVAL apart, so ``since(seconds)`` needs at most
+    ``seconds / SAMPLE_INTERVAL + 1`` records from the end of the series.
+    Fail-safe: Redis errors read as an empty history.
+    """
+
+    def __init__(self, symbol: str, redis):
+        super().__init__(symbol, redis)
+
+    def record(self, agg: dict, options_live: Mapping, spot: float) -> bool:
+        return False
+
+    def load(self) -> int:
+        return 0
+
+    def _tail(self, n: int, count: int | None = None) -> list[OptionsSnapshot]:
+        """`count` records (default all) starting `n` records from the end."""
+        if n <= 0:
+            return []
+        start = -n * _RECORD.size
+        end = -1 if count is None else min(start + count * _RECORD.size - 1, -1)
+        try:
+            raw = self.redis.getrange(history_key(self.symbol), start, end) or b""
+        except Exception as e:
+            logger.debug(f"[SharedOptionsHistory] {self.symbol}: read failed: {e}")
+            return []
+        return _unpack(raw[len(raw) % _RECORD.size:])
+
+    def size(self) -> int:
+        try:
+            return min(self.redis.strlen(history_key(self.symbol)) // _RECORD.size, self.MAX_SNAPSHOTS)
+        except Exception:
+            return 0
+
+    def all(self) -> list[OptionsSnapshot]:
+        return self._tail(self.MAX_SNAPSHOTS)
+
+    def latest(self) -> OptionsSnapshot | None:
+        tail = self._tail(1)
+        return tail[-1] if tail else None
+
+    def oldest(self) -> OptionsSnapshot | None:
+        first = self._tail(self.size(), count=1)
+        return first[0] if first else None
+
+    def since(self, seconds: float) -> list[OptionsSnapshot]:
+        cutoff = time.time() - seconds
+        n = min(int(seconds // self.SAMPLE_INTERVAL) + 2, self.MAX_SNAPSHOTS)
+        return [s for s in self._tail(n) if s.ts >= cutoff]
+
+    def last_n(self, n: int) -> list[OptionsSnapshot]:
+        return self._tail(min(n, self.MAX_SNAPSHOTS))
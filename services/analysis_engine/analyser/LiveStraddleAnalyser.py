@@ -4,7 +4,7 @@ from lib.logging_util import get_logger
 logger = get_logger("analyser")
 from .LiveAlertFormatter import F
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Mapping
 if TYPE_CHECKING:
     from .LiveOptionsHistory import LiveOptionsHistory
 
@@ -221,7 +221,7 @@ class LiveStraddleAnalyser:
     def check_iv_skew_reversal(
         self,
         agg: dict,
-        options_live: dict,
+        options_live: Mapping,
         spot: float,
     ) -> tuple[str, str] | None:
         """
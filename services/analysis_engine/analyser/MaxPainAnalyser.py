@@ -1,5 +1,6 @@
 import traceback
 from .Analyser import BaseAnalyzer
+from .OptionChainFrame import OptionChainFrame
 from common.Stock import Stock
 from lib.logging_util import get_logger
 logger = get_logger("analyser")
@@ -16,8 +17,9 @@ class MaxPainAnalyser(BaseAnalyzer):
     Theory: Price tends to gravitate toward max pain as expiry approaches due to
     options writers (market makers) hedging their positions.
     
-    Data Source: Uses pre-calculated max pain from Sensibull API instead of
-    calculating from raw option chain data.
+    Data Source: Uses pre-calculated max pain from Sensibull API. When the
+    nearest expiry has none, falls back to max pain computed from the OI chain
+    snapshot of the same expiry (OptionChainFrame, shared with OIChainAnalyser).
     """
     
     # Threshold values
@@ -43,6 +45,15 @@ class MaxPainAnalyser(BaseAnalyzer):
             f"STRONG_DEVIATION={MaxPainAnalyser.MAX_PAIN_STRONG_DEVIATION}"
         )
 
+    @staticmethod
+    def _chain_max_pain(stock: Stock, expiry: str):
+        """Max pain strike from the OI chain snapshot, if it is for `expiry`."""
+        oi_chain = stock.sensibull_ctx.get("oi_chain") or {}
+        if str(oi_chain.get("expiry")) != str(expiry):
+            return None
+        frame = OptionChainFrame.for_stock(stock, "oi_chain")
+        return frame.max_pain() if frame is not None else None
+
     @BaseAnalyzer.both
     @BaseAnalyzer.index_both
     def analyse_max_pain_deviation(self, stock: Stock):
@@ -82,8 +93,14 @@ class MaxPainAnalyser(BaseAnalyzer):
             pcr = expiry_data.get("pcr")
 
             if max_pain_strike is None:
-                logger.debug(f"[MP_DEV] {stock.stock_symbol} — no max_pain_strike for expiry={nearest_expiry}, skip")
-                return False
+                max_pain_strike = self._chain_max_pain(stock, nearest_expiry)
+                if max_pain_strike is None:
+                    logger.debug(f"[MP_DEV] {stock.stock_symbol} — no max_pain_strike for expiry={nearest_expiry}, skip")
+                    return False
+                logger.debug(
+                    f"[MP_DEV] {stock.stock_symbol} — Sensibull max_pain_strike missing, "
+                    f"using OI chain max pain={max_pain_strike}"
+                )
 
             # ── Expiry proximity gate: Max Pain theory is only reliable near expiry ──
             # Intraday: 7d gate (weekly options — only relevant within the expiry week)
@@ -7,6 +7,15 @@ import common.shared as shared
 from collections import namedtuple
 import pandas as pd
 import numpy as np
+from .OptionChainFrame import OptionChainFrame
+
+# per_strike_data key → OptionChainFrame (side, field)
+_OI_KEYS = {
+    "call_oi":      ("CE", "oi"),
+    "put_oi":       ("PE", "oi"),
+    "prev_call_oi": ("CE", "prev_oi"),
+    "prev_put_oi":  ("PE", "prev_oi"),
+}
 
 
 class OIChainAnalyser(BaseAnalyzer):
@@ -237,14 +246,8 @@ class OIChainAnalyser(BaseAnalyzer):
         Find the strike with maximum OI for a given key (call_oi or put_oi).
         Returns (strike, oi_value) or (None, 0).
         """
-        max_oi = 0
-        max_strike = None
-        for strike_str, data in per_strike_data.items():
-            oi = data.get(oi_key, 0)
-            if oi > max_oi:
-                max_oi = oi
-                max_strike = float(strike_str)
-        return max_strike, max_oi
+        side, field = _OI_KEYS[oi_key]
+        return OptionChainFrame.of_per_strike_data(per_strike_data).max_oi(side, field)
 
     @staticmethod
     def _expiry_guard(per_strike_data: dict) -> bool:
@@ -259,16 +262,11 @@ class OIChainAnalyser(BaseAnalyzer):
         Fires when total OI across all strikes dropped > OI_EXPIRY_TOTAL_DROP_GUARD_PCT
         compared to yesterday's total (prev_call_oi + prev_put_oi).
         """
-        prev_total = sum(
-            d.get("prev_call_oi", 0) + d.get("prev_put_oi", 0)
-            for d in per_strike_data.values()
-        )
+        frame = OptionChainFrame.of_per_strike_data(per_strike_data)
+        prev_total = frame.total("CE", "prev_oi") + frame.total("PE", "prev_oi")
         if prev_total == 0:
             return False
-        curr_total = sum(
-            d.get("call_oi", 0) + d.get("put_oi", 0)
-            for d in per_strike_data.values()
-        )
+        curr_total = frame.total("CE") + frame.total("PE")
         drop_pct = (prev_total - curr_total) / prev_total * 100
         if drop_pct > OIChainAnalyser.OI_EXPIRY_TOTAL_DROP_GUARD_PCT:
             logger.debug(
@@ -299,34 +297,10 @@ class OIChainAnalyser(BaseAnalyzer):
 
         Returns (strike: float, oi: int) or (None, 0) if no qualifying wall found.
         """
-        oi_values = [d.get(oi_key, 0) for d in per_strike_data.values() if d.get(oi_key, 0) > 0]
-        if len(oi_values) < 5:
-            return None, 0
-
-        mean_oi = np.mean(oi_values)
-        std_oi  = np.std(oi_values)
-        threshold = mean_oi + std_multiplier * std_oi
-
-        is_call = oi_key in ("call_oi", "prev_call_oi")
-        best_strike = None
-        best_oi     = 0
-
-        for strike_str, data in per_strike_data.items():
-            strike  = float(strike_str)
-            oi      = data.get(oi_key, 0)
-            dist    = abs(strike - spot) / spot * 100
-
-            if dist < min_dist_pct or dist > max_dist_pct:
-                continue
-            if is_call and strike < spot:
-                continue
-            if not is_call and strike > spot:
-                continue
-            if oi > threshold and oi > best_oi:
-                best_strike = strike
-                best_oi     = oi
-
-        return best_strike, best_oi
+        side, field = _OI_KEYS[oi_key]
+        return OptionChainFrame.of_per_strike_data(per_strike_data).dominant_wall(
+            side, spot, std_multiplier, min_dist_pct, max_dist_pct, field,
+        )
 
     # ──────────────────────────────────────────────────────────────────────────
     # 1. OI-Based Support & Resistance
@@ -367,33 +341,13 @@ class OIChainAnalyser(BaseAnalyzer):
             )
 
             # Collect OI data and find max strikes
-            max_call_oi = 0
-            max_call_oi_strike = None
-            max_put_oi = 0
-            max_put_oi_strike = None
-            call_oi_list = []
-            put_oi_list = []
-            all_call_ois = []
-            all_put_ois = []
-            
-            for strike_str, data in per_strike_data.items():
-                strike = float(strike_str)
-                call_oi = data.get("call_oi", 0)
-                put_oi = data.get("put_oi", 0)
-                
-                if call_oi > 0:
-                    call_oi_list.append((strike, call_oi))
-                    all_call_ois.append(call_oi)
-                if put_oi > 0:
-                    put_oi_list.append((strike, put_oi))
-                    all_put_ois.append(put_oi)
-                
-                if call_oi > max_call_oi:
-                    max_call_oi = call_oi
-                    max_call_oi_strike = strike
-                if put_oi > max_put_oi:
-                    max_put_oi = put_oi
-                    max_put_oi_strike = strike
+            frame = OptionChainFrame.of_per_strike_data(per_strike_data)
+            max_call_oi_strike, max_call_oi = frame.max_oi("CE")
+            max_put_oi_strike, max_put_oi = frame.max_oi("PE")
+            call_oi_list = frame.positive_oi("CE")
+            put_oi_list = frame.positive_oi("PE")
+            all_call_ois = [oi for _, oi in call_oi_list]
+            all_put_ois = [oi for _, oi in put_oi_list]
             
             if max_call_oi_strike is None or max_put_oi_strike is None:
                 logger.debug(f"[OI_SR] {stock.stock_symbol} — no call or put OI found, skip")
@@ -839,37 +793,17 @@ class OIChainAnalyser(BaseAnalyzer):
                 f"expiry={meta.get('expiry')}"
             )
 
-            call_ois = []
-            put_ois = []
-            strike_data_list = []
-            
-            for strike_str, data in per_strike_data.items():
-                strike = float(strike_str)
-                call_oi = data.get("call_oi", 0)
-                put_oi = data.get("put_oi", 0)
-                
-                if call_oi > 0:
-                    call_ois.append(call_oi)
-                if put_oi > 0:
-                    put_ois.append(put_oi)
-                
-                strike_data_list.append({
-                    "strike": strike, "call_oi": call_oi, "put_oi": put_oi,
-                    "distance_pct": ((strike - current_ltp) / current_ltp) * 100
-                })
+            frame = OptionChainFrame.of_per_strike_data(per_strike_data)
+            n_call, avg_call_oi, std_call_oi = frame.positive_oi_stats("CE")
+            n_put, avg_put_oi, std_put_oi = frame.positive_oi_stats("PE")
             
-            if len(call_ois) < 5 or len(put_ois) < 5:
+            if n_call < 5 or n_put < 5:
                 logger.debug(
                     f"[OI_WALL] {stock.stock_symbol} — insufficient OI data "
-                    f"(call_strikes={len(call_ois)} put_strikes={len(put_ois)}, need 5 each), skip"
+                    f"(call_strikes={n_call} put_strikes={n_put}, need 5 each), skip"
                 )
                 return False
 
-            avg_call_oi = np.mean(call_ois)
-            avg_put_oi = np.mean(put_ois)
-            std_call_oi = np.std(call_ois)
-            std_put_oi = np.std(put_ois)
-
             # ── Statistical outlier threshold: mean + N * std ──
             call_wall_threshold = avg_call_oi + OIChainAnalyser.OI_WALL_STD_MULTIPLIER * std_call_oi
             put_wall_threshold = avg_put_oi + OIChainAnalyser.OI_WALL_STD_MULTIPLIER * std_put_oi
@@ -884,23 +818,11 @@ class OIChainAnalyser(BaseAnalyzer):
             )
 
             max_dist = OIChainAnalyser.OI_WALL_MAX_DISTANCE_PCT
-            
-            call_walls = []
-            put_walls = []
-            
             min_dist = OIChainAnalyser.OI_WALL_MIN_DISTANCE_PCT
 
-            for sd in strike_data_list:
-                dist_abs = abs(sd["distance_pct"])
-                # ── Gate: Only within max distance and beyond min distance (exclude ATM) ──
-                if dist_abs > max_dist or dist_abs < min_dist:
-                    continue
-
-                if sd["call_oi"] > call_wall_threshold:
-                    call_walls.append((sd["strike"], sd["call_oi"], sd["distance_pct"]))
-
-                if sd["put_oi"] > put_wall_threshold:
-                    put_walls.append((sd["strike"], sd["put_oi"], sd["distance_pct"]))
+            # ── Gate: Only within max distance and beyond min distance (exclude ATM) ──
+            call_walls = frame.outliers("CE", call_wall_threshold, current_ltp, min_dist, max_dist)
+            put_walls = frame.outliers("PE", put_wall_threshold, current_ltp, min_dist, max_dist)
             
             logger.debug(
                 f"[OI_WALL] {stock.stock_symbol} | "
@@ -1491,15 +1413,7 @@ class OIChainAnalyser(BaseAnalyzer):
             )
 
             # ── Compute strike width for minimum migration threshold ───────────
-            sorted_strikes = sorted(float(s) for s in per_strike_data.keys())
-            if len(sorted_strikes) >= 2:
-                strike_width = min(
-                    sorted_strikes[i + 1] - sorted_strikes[i]
-                    for i in range(len(sorted_strikes) - 1)
-                    if sorted_strikes[i + 1] - sorted_strikes[i] > 0
-                )
-            else:
-                strike_width = 1.0
+            strike_width = OptionChainFrame.of_per_strike_data(per_strike_data).strike_width() or 1.0
             min_migration = strike_width * OIChainAnalyser.OI_WALL_MIGRATION_MIN_POINTS
 
             std_mult  = OIChainAnalyser.OI_WALL_STD_MULTIPLIER
@@ -0,0 +1,296 @@
+"""
+OptionChainFrame — columnar view of one option-chain snapshot.
+
+OIChainAnalyser, GEXAnalyser and MaxPainAnalyser all walk the same chain in
+the same job: Sensibull's `oi_chain["per_strike_data"]` ({strike: {call_oi,
+put_oi, prev_call_oi, prev_put_oi}}) or the live `options_live`
+({strike: {"CE": {...}, "PE": {...}}}). The frame turns that dict into a
+sorted strike array plus CE/PE NumPy columns once, and the analysers read
+walls, max pain, GEX and the flip level from it instead of re-sorting and
+re-scanning the dict in each method.
+
+    frame = OptionChainFrame.of_per_strike_data(per_strike_data)
+    strike, oi = frame.max_oi("CE")
+    gex_ce, gex_pe = frame.gex(spot)
+
+In the monolith options_live is TickStore's columnar OptionChainStore, and
+the frame is sliced straight from its columns.
+
+Frames are cached by source-object identity (plus length, and for
+options_live the TickStore version), so every analyser that asks for the
+same snapshot during a job gets the same frame — they cannot disagree on the
+chain they looked at. Missing or None values are treated as 0.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Mapping
+
+import numpy as np
+
+from lib.zerodha.option_chain_store import OptionChainStore
+
+_SIDES = ("CE", "PE")
+_FIELDS = ("oi", "prev_oi", "ltp", "iv", "gamma", "delta")
+
+# per_strike_data key → (side, field)
+_PER_STRIKE_KEYS = {
+    "call_oi":      ("CE", "oi"),
+    "put_oi":       ("PE", "oi"),
+    "prev_call_oi": ("CE", "prev_oi"),
+    "prev_put_oi":  ("PE", "prev_oi"),
+}
+
+_CACHE_SIZE = 16
+
+
+def _num(value) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _scalar(value):
+    """NumPy scalar → int when integral (OI counts), else float."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class OptionChainFrame:
+    """Sorted strikes with per-side OI, prev OI, LTP, IV, gamma and delta columns."""
+
+    def __init__(self, strikes: np.ndarray, columns: dict[tuple[str, str], np.ndarray]):
+        self.strikes = strikes
+        self._columns = columns
+        n = len(strikes)
+        for side in _SIDES:
+            for field in _FIELDS:
+                columns.setdefault((side, field), np.zeros(n))
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    def column(self, side: str, field: str = "oi") -> np.ndarray:
+        """Column for `side` ("CE"/"PE") and `field` in strike order."""
+        return self._columns[(side, field)]
+
+    # ── Construction ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_per_strike_data(cls, per_strike_data: dict) -> "OptionChainFrame":
+        rows = sorted((float(s), d or {}) for s, d in per_strike_data.items())
+        strikes = np.array([s for s, _ in rows], dtype=float)
+        columns = {
+            col: np.array([_num(d.get(key)) for _, d in rows], dtype=float)
+            for key, col in _PER_STRIKE_KEYS.items()
+        }
+        return cls(strikes, columns)
+
+    @classmethod
+    def from_options_live(cls, options_live: dict) -> "OptionChainFrame":
+        if isinstance(options_live, OptionChainStore):
+            return cls.from_chain_store(options_live)
+        rows = sorted((float(s), d or {}) for s, d in options_live.items())
+        strikes = np.array([s for s, _ in rows], dtype=float)
+        columns = {}
+        for side in _SIDES:
+            legs = [d.get(side) or {} for _, d in rows]
+            for field in _FIELDS:
+                columns[(side, field)] = np.array([_num(leg.get(field)) for leg in legs], dtype=float)
+        return cls(strikes, columns)
+
+    @classmethod
+    def from_chain_store(cls, store: OptionChainStore) -> "OptionChainFrame":
+        """Frame straight from TickStore's columns — no per-strike dict walk."""
+        strikes = store.strikes()
+        order = np.argsort(strikes, kind="stable")
+        columns = {
+            (side, field): store.column(side, field)[order]
+            for side in _SIDES for field in _FIELDS
+        }
+        return cls(strikes[order], columns)
+
+    _cache: OrderedDict = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    @classmethod
+    def _cached(cls, kind: str, source: Mapping, stamp: Hashable, build) -> "OptionChainFrame":
+        key = (kind, id(source))
+        with cls._cache_lock:
+            hit = cls._cache.get(key)
+            # Holding `source` in the entry keeps its id from being reused.
+            if hit is not None and hit[0] is source and hit[1] == stamp:
+                cls._cache.move_to_end(key)
+                return hit[2]
+        frame = build(source)
+        with cls._cache_lock:
+            cls._cache[key] = (source, stamp, frame)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > _CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return frame
+
+    @classmethod
+    def of_per_strike_data(cls, per_strike_data: dict) -> "OptionChainFrame":
+        """Shared frame for a Sensibull per_strike_data snapshot."""
+        return cls._cached("oi_chain", per_strike_data, len(per_strike_data), cls.from_per_strike_data)
+
+    @classmethod
+    def of_options_live(cls, options_live: Mapping, version: Hashable = 0) -> "OptionChainFrame":
+        """Shared frame for an options_live dict.
+
+        `version` must change whenever the dict is mutated in place (the
+        monolith's TickStore updates options_live per tick; pass its
+        options_version). The analysis engine loads a fresh dict per job.
+        """
+        return cls._cached("options_live", options_live, (len(options_live), version), cls.from_options_live)
+
+    @classmethod
+    def for_stock(cls, stock, source: str = "oi_chain") -> "OptionChainFrame | None":
+        """Frame for `stock`'s current oi_chain or options_live, or None if empty."""
+        if source == "options_live":
+            options_live = stock.options_live
+            if not options_live:
+                return None
+            ts = stock._tick_store
+            version = (ts.options_version, getattr(ts, "options_snapshot_seq", None))
+            return cls.of_options_live(options_live, version)
+        oi_chain = stock.sensibull_ctx.get("oi_chain") or {}
+        per_strike_data = oi_chain.get("per_strike_data")
+        if not per_strike_data:
+            return None
+        return cls.of_per_strike_data(per_strike_data)
+
+    # ── Primitives ────────────────────────────────────────────────────────────
+
+    def total(self, side: str, field: str = "oi") -> float:
+        return float(self.column(side, field).sum())
+
+    def nearest_index(self, price: float) -> int:
+        """Index of the strike closest to `price` (lower strike on ties)."""
+        return int(np.argmin(np.abs(self.strikes - price)))
+
+    def strike_width(self) -> float:
+        """Smallest gap between adjacent strikes (0.0 with fewer than two)."""
+        gaps = np.diff(self.strikes)
+        gaps = gaps[gaps > 0]
+        return float(gaps.min()) if len(gaps) else 0.0
+
+    def cumulative_oi(self, side: str, field: str = "oi") -> np.ndarray:
+        """Running OI total from the lowest strike up."""
+        return np.cumsum(self.column(side, field))
+
+    def max_oi(self, side: str, field: str = "oi"):
+        """(strike, oi) with the highest positive OI, or (None, 0). Lowest strike wins ties."""
+        oi = self.column(side, field)
+        if not len(oi):
+            return None, 0
+        i = int(np.argmax(oi))
+        if oi[i] <= 0:
+            return None, 0
+        return float(self.strikes[i]), _scalar(oi[i])
+
+    def positive_oi(self, side: str, field: str = "oi") -> list[tuple[float, float]]:
+        """(strike, oi) for every strike with OI > 0, in strike order."""
+        oi = self.column(side, field)
+        return [(float(self.strikes[i]), _scalar(oi[i])) for i in np.flatnonzero(oi > 0)]
+
+    def positive_oi_stats(self, side: str, field: str = "oi") -> tuple[int, float, float]:
+        """(count, mean, population std) over strikes with OI > 0."""
+        oi = self.column(side, field)
+        positive = oi[oi > 0]
+        if not len(positive):
+            return 0, 0.0, 0.0
+        return len(positive), float(positive.mean()), float(positive.std())
+
+    def outliers(
+        self,
+        side: str,
+        threshold: float,
+        spot: float,
+        min_dist_pct: float,
+        max_dist_pct: float,
+        field: str = "oi",
+    ) -> list[tuple[float, float, float]]:
+        """(strike, oi, signed distance %) for OI > threshold within the distance band."""
+        oi = self.column(side, field)
+        dist = (self.strikes - spot) / spot * 100
+        dist_abs = np.abs(dist)
+        mask = (oi > threshold) & (dist_abs >= min_dist_pct) & (dist_abs <= max_dist_pct)
+        return [
+            (float(self.strikes[i]), _scalar(oi[i]), float(dist[i]))
+            for i in np.flatnonzero(mask)
+        ]
+
+    def dominant_wall(
+        self,
+        side: str,
+        spot: float,
+        std_multiplier: float,
+        min_dist_pct: float,
+        max_dist_pct: float,
+        field: str = "oi",
+    ):
+        """Largest statistical-outlier OI strike on the far side of spot.
+
+        Needs at least five strikes with OI; the threshold is mean + k·std of
+        those. Call walls must be at or above spot, put walls at or below.
+        Returns (strike, oi) or (None, 0).
+        """
+        count, mean_oi, std_oi = self.positive_oi_stats(side, field)
+        if count < 5:
+            return None, 0
+        threshold = mean_oi + std_multiplier * std_oi
+
+        oi = self.column(side, field)
+        dist = np.abs(self.strikes - spot) / spot * 100
+        mask = (oi > threshold) & (dist >= min_dist_pct) & (dist <= max_dist_pct)
+        mask &= (self.strikes >= spot) if side == "CE" else (self.strikes <= spot)
+        if not mask.any():
+            return None, 0
+        candidates = np.flatnonzero(mask)
+        i = candidates[int(np.argmax(oi[candidates]))]
+        return float(self.strikes[i]), _scalar(oi[i])
+
+    def max_pain(self) -> float | None:
+        """Expiry strike at which option writers pay out the least."""
+        if not len(self.strikes):
+            return None
+        # payout[e, s]: what strike s's OI pays if the underlying settles at strike e
+        diff = self.strikes[None, :] - self.strikes[:, None]
+        pain = (np.clip(diff, 0, None) * self.column("CE")).sum(axis=1) \
+            + (np.clip(-diff, 0, None) * self.column("PE")).sum(axis=1)
+        return float(self.strikes[int(np.argmin(pain))])
+
+    def has_gamma(self) -> bool:
+        return bool(self.column("CE", "gamma").any() or self.column("PE", "gamma").any())
+
+    def gex(self, spot: float) -> tuple[np.ndarray, np.ndarray]:
+        """Per-strike CE and PE gamma exposure in ₹ crores for a 1% move.
+
+        gamma × OI × spot² × 0.01 / 1e7 — OI in absolute shares, as published
+        on Zerodha WS, so no lot-size factor.
+        """
+        gex_ce = self.column("CE", "gamma") * self.column("CE", "oi") * (spot ** 2) * 0.01 / 1e7
+        gex_pe = self.column("PE", "gamma") * self.column("PE", "oi") * (spot ** 2) * 0.01 / 1e7
+        return gex_ce, gex_pe
+
+    def flip_level(self, spot: float, net_gex: np.ndarray) -> float | None:
+        """Strike where cumulative net GEX, summed outward from ATM, changes sign.
+
+        Scans from the ATM strike down first, then up; None when neither
+        direction crosses zero.
+        """
+        if not len(self.strikes):
+            return None
+        atm = self.nearest_index(spot)
+        for order in (np.arange(atm, -1, -1), np.arange(atm, len(self.strikes))):
+            cumulative = np.cumsum(net_gex[order])
+            prev = np.concatenate(([0.0], cumulative[:-1]))
+            crossed = np.flatnonzero(prev * cumulative < 0)
+            if len(crossed):
+                return float(self.strikes[order[crossed[0]]])
+        return None
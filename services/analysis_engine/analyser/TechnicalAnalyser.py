@@ -9,6 +9,7 @@ from datetime import datetime
 from common.helperFunctions import percentageChange
 import numpy as np
 import common.shared as shared
+from .IndicatorState import IndicatorParams, IndicatorState
 
 class TechnicalAnalyser(BaseAnalyzer):
 
@@ -19,6 +20,11 @@ class TechnicalAnalyser(BaseAnalyzer):
     RSI_TREND_PERIODS = 5
     RSI_STRENGTH_THRESHOLD = 2
     RSI_MOMENTUM_THRESHOLD = 2
+    RSI_WINDOW = 100  # analyse_rsi computes RSI over the last N closes
+
+    # EMA trend filter shared by RSI, Bollinger and RSI divergence
+    TREND_EMA_FAST = 20
+    TREND_EMA_SLOW = 50
 
     VWAP_DEVIATION_PERCENTAGE = 2
     VWAP_DAYS = 10
@@ -183,6 +189,40 @@ class TechnicalAnalyser(BaseAnalyzer):
 
         return adx
 
+    def _indicator_params(self) -> IndicatorParams:
+        return IndicatorParams(
+            rsi_period=self.RSI_LOOKUP_PERIOD,
+            rsi_window=self.RSI_WINDOW,
+            divergence_lookback=self.RSI_DIVERGENCE_LOOKBACK,
+            trend_fast=self.TREND_EMA_FAST,
+            trend_slow=self.TREND_EMA_SLOW,
+            fast_ema=self.FAST_EMA_PERIOD,
+            slow_ema=self.SLOW_EMA_PERIOD,
+            adx_period=self.ADX_PERIOD,
+            macd_fast=self.MACD_FAST_PERIOD,
+            macd_slow=self.MACD_SLOW_PERIOD,
+            macd_signal=self.MACD_SIGNAL_PERIOD,
+            bb_window=self.BB_WINDOW,
+            bb_num_std=self.BB_NUM_STD,
+            atr_period=self.ATR_PERIOD,
+            atr_trend_periods=self.ATR_TREND_PERIODS,
+            supertrend_period=self.SUPERTREND_PERIOD,
+            supertrend_multiplier=self.SUPERTREND_MULTIPLIER,
+            stoch_k=self.STOCHASTIC_K_PERIOD,
+            stoch_d=self.STOCHASTIC_D_PERIOD,
+        )
+
+    def _indicators(self, stock: Stock) -> IndicatorState | None:
+        """
+        Incremental indicator view for this cycle, or None when the stock has
+        no attached IndicatorState (backtests, ad-hoc calls) — callers then
+        fall back to the full pandas recompute.
+        """
+        state = getattr(stock, "indicator_state", None)
+        if not isinstance(state, IndicatorState):
+            return None
+        return state.update(stock.priceData, self._indicator_params())
+
     @BaseAnalyzer.both
     @BaseAnalyzer.index_both
     def analyse_rsi(self, stock: Stock):
@@ -202,22 +242,27 @@ class TechnicalAnalyser(BaseAnalyzer):
         try : 
             logger.debug(f'Inside analyse_rsi for stock {stock.stock_symbol}')
             close = stock.priceData["Close"]
-            
+
             # Need enough data for RSI + EMA trend filter
-            if len(close) < 100:
+            if len(close) < self.RSI_WINDOW:
                 return False
-            
-            rsi_series = self._compute_rsi(close.iloc[-100:])
-            
-            # Calculate trend using EMA 20/50
-            ema_20 = close.ewm(span=20, adjust=False).mean()
-            ema_50 = close.ewm(span=50, adjust=False).mean()
-            
-            ema_20_curr = ema_20.iloc[-1]
-            ema_50_curr = ema_50.iloc[-1]
-            ema_20_prev = ema_20.iloc[-2]
-            ema_50_prev = ema_50.iloc[-2]
-            
+
+            ind = self._indicators(stock)
+            if ind is not None:
+                rsi_series = ind.window_rsi()
+                (ema_20_prev, ema_50_prev), (ema_20_curr, ema_50_curr) = ind.trend_tail[-2], ind.trend_tail[-1]
+            else:
+                rsi_series = self._compute_rsi(close.iloc[-self.RSI_WINDOW:]).tolist()
+
+                # Calculate trend using EMA 20/50
+                ema_20 = close.ewm(span=self.TREND_EMA_FAST, adjust=False).mean()
+                ema_50 = close.ewm(span=self.TREND_EMA_SLOW, adjust=False).mean()
+
+                ema_20_curr = ema_20.iloc[-1]
+                ema_50_curr = ema_50.iloc[-1]
+                ema_20_prev = ema_20.iloc[-2]
+                ema_50_prev = ema_50.iloc[-2]
+
             # Determine trend
             if ema_20_curr > ema_50_curr and ema_20_prev > ema_50_prev:
                 trend = "BULLISH"
@@ -226,8 +271,8 @@ class TechnicalAnalyser(BaseAnalyzer):
             else:
                 trend = "NEUTRAL"
             
-            current_rsi = rsi_series.iloc[-1]
-            previous_rsi = rsi_series.iloc[-2]
+            current_rsi = rsi_series[-1]
+            previous_rsi = rsi_series[-2]
 
             trend_found = False
 
@@ -235,7 +280,7 @@ class TechnicalAnalyser(BaseAnalyzer):
                 # Count how many candles RSI has been in overbought zone
                 overbought_candles = 0
                 for i in range(len(rsi_series) - 1, -1, -1):
-                    if rsi_series.iloc[i] > TechnicalAnalyser.RSI_UPPER_THRESHOLD:
+                    if rsi_series[i] > TechnicalAnalyser.RSI_UPPER_THRESHOLD:
                         overbought_candles += 1
                     else:
                         break
@@ -260,7 +305,7 @@ class TechnicalAnalyser(BaseAnalyzer):
                 # Count how many candles RSI has been in oversold zone
                 oversold_candles = 0
                 for i in range(len(rsi_series) - 1, -1, -1):
-                    if rsi_series.iloc[i] < TechnicalAnalyser.RSI_LOWER_THRESHOLD:
+                    if rsi_series[i] < TechnicalAnalyser.RSI_LOWER_THRESHOLD:
                         oversold_candles += 1
                     else:
                         break
@@ -327,20 +372,11 @@ class TechnicalAnalyser(BaseAnalyzer):
                 
                 return sma, upper, lower
             
-            def get_trend(close_series, fast_period=20, slow_period=50):
+            def get_trend(fast_latest, slow_latest):
                 """
-                Determine the dominant trend using EMA crossover.
+                Determine the dominant trend from the latest fast/slow EMA values.
                 Returns: 'BULLISH', 'BEARISH', or 'NEUTRAL'
                 """
-                if len(close_series) < slow_period:
-                    return 'NEUTRAL'
-                
-                fast_ema = close_series.ewm(span=fast_period, adjust=False).mean()
-                slow_ema = close_series.ewm(span=slow_period, adjust=False).mean()
-                
-                fast_latest = fast_ema.iloc[-1]
-                slow_latest = slow_ema.iloc[-1]
-                
                 # Check trend strength (percentage difference)
                 pct_diff = ((fast_latest - slow_latest) / slow_latest) * 100
                 
@@ -354,29 +390,40 @@ class TechnicalAnalyser(BaseAnalyzer):
             logger.debug(f'Inside analyse_Bolinger_band for stock {stock.stock_symbol}')
             
             close_series = stock.priceData['Close']
-            
-            # Compute Bollinger Bands for entire series
-            sma_series, upper_series, lower_series = compute_bollinger_bands(
-                close_series, 
-                window=TechnicalAnalyser.BB_WINDOW, 
-                num_std=TechnicalAnalyser.BB_NUM_STD
-            )
-            
-            if sma_series is None or len(sma_series) < 3:
+            if len(close_series) < max(TechnicalAnalyser.BB_WINDOW, 3):
                 return False
+
+            # Last (up to) 5 candles of close / bands, oldest first
+            ind = self._indicators(stock)
+            if ind is not None:
+                closes, smas, uppers, lowers = (list(col) for col in zip(*ind.bb_tail))
+                fast_latest, slow_latest = ind.trend_tail[-1]
+            else:
+                # Compute Bollinger Bands for entire series
+                sma_series, upper_series, lower_series = compute_bollinger_bands(
+                    close_series, 
+                    window=TechnicalAnalyser.BB_WINDOW, 
+                    num_std=TechnicalAnalyser.BB_NUM_STD
+                )
+                closes = close_series.iloc[-5:].tolist()
+                smas = sma_series.iloc[-5:].tolist()
+                uppers = upper_series.iloc[-5:].tolist()
+                lowers = lower_series.iloc[-5:].tolist()
+                fast_latest = close_series.ewm(span=self.TREND_EMA_FAST, adjust=False).mean().iloc[-1]
+                slow_latest = close_series.ewm(span=self.TREND_EMA_SLOW, adjust=False).mean().iloc[-1]
             
             curr_data = stock.current_equity_data
             curr_close = curr_data['Close']
             
             # Get latest band values
-            upper_band = upper_series.iloc[-1]
-            lower_band = lower_series.iloc[-1]
-            sma = sma_series.iloc[-1]
+            upper_band = uppers[-1]
+            lower_band = lowers[-1]
+            sma = smas[-1]
             
             # Get previous candle values for confirmation filter
-            prev_close = close_series.iloc[-2]
-            prev_upper = upper_series.iloc[-2]
-            prev_lower = lower_series.iloc[-2]
+            prev_close = closes[-2]
+            prev_upper = uppers[-2]
+            prev_lower = lowers[-2]
             
             BBAnalysis = namedtuple("BBAnalysis", [
                 "close", "upper_band", "lower_band", "sma", 
@@ -384,7 +431,10 @@ class TechnicalAnalyser(BaseAnalyzer):
             ])
             
             # Determine dominant trend
-            trend = get_trend(close_series)
+            if len(close_series) < self.TREND_EMA_SLOW:
+                trend = 'NEUTRAL'
+            else:
+                trend = get_trend(fast_latest, slow_latest)
             
             # ==========================================
             # FILTER 1: Confirmation Filter
@@ -407,8 +457,8 @@ class TechnicalAnalyser(BaseAnalyzer):
             if above_upper_curr and above_upper_prev:
                 confirmation_candles = 2
                 # Check for more confirmation candles
-                for i in range(3, min(6, len(close_series) + 1)):
-                    if close_series.iloc[-i] > upper_series.iloc[-i]:
+                for i in range(3, len(closes) + 1):
+                    if closes[-i] > uppers[-i]:
                         confirmation_candles += 1
                     else:
                         break
@@ -429,8 +479,8 @@ class TechnicalAnalyser(BaseAnalyzer):
             elif below_lower_curr and below_lower_prev:
                 confirmation_candles = 2
                 # Check for more confirmation candles
-                for i in range(3, min(6, len(close_series) + 1)):
-                    if close_series.iloc[-i] < lower_series.iloc[-i]:
+                for i in range(3, len(closes) + 1):
+                    if closes[-i] < lowers[-i]:
                         confirmation_candles += 1
                     else:
                         break
@@ -587,20 +637,26 @@ class TechnicalAnalyser(BaseAnalyzer):
             logger.debug(f'Analyzing MACD for stock {stock.stock_symbol}')
             # Get the stock's price data
             price_data = stock.priceData
+            CONSECUTIVE_CHANGES = 3
             
             # Calculate latest MACD values
-            macd_data = calculate_latest_macd(price_data, fast_period=TechnicalAnalyser.MACD_FAST_PERIOD, slow_period=TechnicalAnalyser.MACD_SLOW_PERIOD, signal_period=TechnicalAnalyser.MACD_SIGNAL_PERIOD)
+            ind = self._indicators(stock)
+            if ind is not None:
+                macd_tail = [dict(zip(("MACD", "Signal", "Histogram"), row)) for row in ind.macd_tail]
+            else:
+                macd_data = calculate_latest_macd(price_data, fast_period=TechnicalAnalyser.MACD_FAST_PERIOD, slow_period=TechnicalAnalyser.MACD_SLOW_PERIOD, signal_period=TechnicalAnalyser.MACD_SIGNAL_PERIOD)
+                macd_tail = macd_data.iloc[-CONSECUTIVE_CHANGES:].to_dict("records")
             
-            latest_macd = macd_data.iloc[-1]
-            previous_macd = macd_data.iloc[-2]
+            latest_macd = macd_tail[-1]
+            previous_macd = macd_tail[-2]
             
             # 1. Minimum histogram value change
             MIN_HISTOGRAM_CHANGE = 0.1  # Adjust this value as needed
             histogram_change = abs(latest_macd['Histogram'] - previous_macd['Histogram'])
 
             # 2. Check for consecutive histogram changes
-            CONSECUTIVE_CHANGES = 3
-            histogram_values = macd_data['Histogram'].iloc[-CONSECUTIVE_CHANGES:]
+            histogram_values = [row['Histogram'] for row in macd_tail]
+            hist_pairs = list(zip(histogram_values, histogram_values[1:]))
 
             # 5. Trend strength
             TREND_STRENGTH_THRESHOLD = 0.02  # 2% change
@@ -609,7 +665,7 @@ class TechnicalAnalyser(BaseAnalyzer):
             if (latest_macd['MACD'] > latest_macd['Signal'] and 
                 previous_macd['MACD'] <= previous_macd['Signal'] and
                 histogram_change > MIN_HISTOGRAM_CHANGE and
-                histogram_values.is_monotonic_increasing and
+                all(a <= b for a, b in hist_pairs) and
                 (latest_macd['MACD'] - latest_macd['Signal']) / latest_macd['Signal'] > TREND_STRENGTH_THRESHOLD):
                 stock.set_analysis("BULLISH", "MACD", "Strong Bullish crossover")
                 return True
@@ -618,7 +674,7 @@ class TechnicalAnalyser(BaseAnalyzer):
             elif (latest_macd['MACD'] < latest_macd['Signal'] and 
                 previous_macd['MACD'] >= previous_macd['Signal'] and
                 histogram_change > MIN_HISTOGRAM_CHANGE and
-                 histogram_values.is_monotonic_decreasing and
+                 all(a >= b for a, b in hist_pairs) and
                 (latest_macd['Signal'] - latest_macd['MACD']) / latest_macd['Signal'] > TREND_STRENGTH_THRESHOLD):
                 
                 stock.set_analysis("BEARISH", "MACD", "Strong Bearish crossover")
@@ -644,12 +700,17 @@ class TechnicalAnalyser(BaseAnalyzer):
                 true_range = np.max(ranges, axis=1)
                 return true_range.rolling(period).mean()
             logger.debug(f'Inside analyse_atr for stock {stock.stock_symbol}')
-            # Calculate ATR
-            atr = calculate_atr(stock.priceData['High'], stock.priceData['Low'], stock.priceData['Close'])
+            # Calculate ATR (last ATR_TREND_PERIODS + 1 values)
+            ind = self._indicators(stock)
+            if ind is not None:
+                atr_tail = list(ind.atr_tail)
+            else:
+                atr = calculate_atr(stock.priceData['High'], stock.priceData['Low'], stock.priceData['Close'])
+                atr_tail = atr.iloc[-(self.ATR_TREND_PERIODS + 1):].tolist()
             
             # Get the latest price data
             latest_close = stock.priceData['Close'].iloc[-1]
-            latest_atr = atr.iloc[-1]
+            latest_atr = atr_tail[-1]
             
             # Calculate the ATR percentage
             atr_percentage = (latest_atr / latest_close) * 100
@@ -658,7 +719,8 @@ class TechnicalAnalyser(BaseAnalyzer):
             is_high_volatility = atr_percentage > self.ATR_THRESHOLD
             
             # Check for ATR expansion
-            is_atr_expanding = all(atr.diff().iloc[-self.ATR_TREND_PERIODS:] > 0)
+            atr_diffs = [b - a for a, b in zip(atr_tail, atr_tail[1:])]
+            is_atr_expanding = all(d > 0 for d in atr_diffs[-self.ATR_TREND_PERIODS:])
             
             ATRAnalysis = namedtuple("ATRAnalysis", ["atr_value", "atr_percentage", "volatility", "breakout"])
 
@@ -727,17 +789,21 @@ class TechnicalAnalyser(BaseAnalyzer):
                     out.append(prev)
                 return pd.Series(out, index=series.index)
 
-            fast_ema = tv_ema(close, TechnicalAnalyser.FAST_EMA_PERIOD)
-            slow_ema = tv_ema(close, TechnicalAnalyser.SLOW_EMA_PERIOD)
-            # fast_ema = close.ewm(span=TechnicalAnalyser.FAST_EMA_PERIOD, adjust=False).mean()
-            # slow_ema = close.ewm(span=TechnicalAnalyser.SLOW_EMA_PERIOD, adjust=False).mean()
-
-            fast_now = fast_ema.iloc[-1]
-            slow_now = slow_ema.iloc[-1]
-            fast_prev = fast_ema.iloc[-2]
-            slow_prev = slow_ema.iloc[-2]
-            fast_prev2 = fast_ema.iloc[-3]
-            slow_prev2 = slow_ema.iloc[-3]
+            ind = self._indicators(stock)
+            if ind is not None:
+                (fast_prev2, slow_prev2), (fast_prev, slow_prev), (fast_now, slow_now) = ind.tv_tail
+            else:
+                fast_ema = tv_ema(close, TechnicalAnalyser.FAST_EMA_PERIOD)
+                slow_ema = tv_ema(close, TechnicalAnalyser.SLOW_EMA_PERIOD)
+                # fast_ema = close.ewm(span=TechnicalAnalyser.FAST_EMA_PERIOD, adjust=False).mean()
+                # slow_ema = close.ewm(span=TechnicalAnalyser.SLOW_EMA_PERIOD, adjust=False).mean()
+
+                fast_now = fast_ema.iloc[-1]
+                slow_now = slow_ema.iloc[-1]
+                fast_prev = fast_ema.iloc[-2]
+                slow_prev = slow_ema.iloc[-2]
+                fast_prev2 = fast_ema.iloc[-3]
+                slow_prev2 = slow_ema.iloc[-3]
 
             if any(pd.isna(x) for x in [fast_now, slow_now, fast_prev, slow_prev]):
                 return False
@@ -749,8 +815,10 @@ class TechnicalAnalyser(BaseAnalyzer):
             slow_slope_prev = slow_prev - slow_prev2
 
             # ADX gate — only signal in confirmed trending markets
-            adx_series = self._compute_adx(stock.priceData)
-            adx_value = adx_series.iloc[-1]
+            if ind is not None:
+                adx_value = ind.adx
+            else:
+                adx_value = self._compute_adx(stock.priceData).iloc[-1]
             if pd.isna(adx_value) or adx_value < self.ADX_TREND_THRESHOLD:
                 logger.debug(
                     f"EMA crossover skipped for {stock.stock_symbol}: "
@@ -822,71 +890,76 @@ class TechnicalAnalyser(BaseAnalyzer):
             if n < period + 2:
                 return False
 
-            high = price_data['High'].values
-            low = price_data['Low'].values
-            close = price_data['Close'].values
-
-            # True Range
-            prev_close = np.roll(close, 1)
-            prev_close[0] = close[0]
-            tr = np.maximum(high - low,
-                            np.maximum(np.abs(high - prev_close),
-                                       np.abs(low - prev_close)))
-
-            # ATR using Wilder's smoothing (RMA)
-            atr = np.zeros(n)
-            atr[period - 1] = np.mean(tr[:period])
-            for i in range(period, n):
-                atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
-
-            hl2 = (high + low) / 2.0
-            upper_basic = hl2 + multiplier * atr
-            lower_basic = hl2 - multiplier * atr
-
-            upper_band = np.zeros(n)
-            lower_band = np.zeros(n)
-            supertrend = np.zeros(n)
-            direction = np.zeros(n, dtype=int)  # 1 = bullish, -1 = bearish
-
-            # Initialise at first valid ATR bar
-            upper_band[period - 1] = upper_basic[period - 1]
-            lower_band[period - 1] = lower_basic[period - 1]
-            supertrend[period - 1] = upper_basic[period - 1]
-            direction[period - 1] = -1
-
-            for i in range(period, n):
-                # Adjust upper band
-                if upper_basic[i] < upper_band[i - 1] or close[i - 1] > upper_band[i - 1]:
-                    upper_band[i] = upper_basic[i]
-                else:
-                    upper_band[i] = upper_band[i - 1]
-
-                # Adjust lower band
-                if lower_basic[i] > lower_band[i - 1] or close[i - 1] < lower_band[i - 1]:
-                    lower_band[i] = lower_basic[i]
-                else:
-                    lower_band[i] = lower_band[i - 1]
-
-                # Direction and supertrend value
-                if direction[i - 1] == -1:          # was bearish
-                    if close[i] > upper_band[i]:
-                        direction[i] = 1            # flip bullish
-                        supertrend[i] = lower_band[i]
-                    else:
-                        direction[i] = -1
-                        supertrend[i] = upper_band[i]
-                else:                               # was bullish
-                    if close[i] < lower_band[i]:
-                        direction[i] = -1           # flip bearish
-                        supertrend[i] = upper_band[i]
+            ind = self._indicators(stock)
+            if ind is not None:
+                (prev_dir, _), (curr_dir, curr_st) = ind.st_tail
+                curr_close = ind.closes[-1]
+            else:
+                high = price_data['High'].values
+                low = price_data['Low'].values
+                close = price_data['Close'].values
+
+                # True Range
+                prev_close = np.roll(close, 1)
+                prev_close[0] = close[0]
+                tr = np.maximum(high - low,
+                                np.maximum(np.abs(high - prev_close),
+                                           np.abs(low - prev_close)))
+
+                # ATR using Wilder's smoothing (RMA)
+                atr = np.zeros(n)
+                atr[period - 1] = np.mean(tr[:period])
+                for i in range(period, n):
+                    atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
+
+                hl2 = (high + low) / 2.0
+                upper_basic = hl2 + multiplier * atr
+                lower_basic = hl2 - multiplier * atr
+
+                upper_band = np.zeros(n)
+                lower_band = np.zeros(n)
+                supertrend = np.zeros(n)
+                direction = np.zeros(n, dtype=int)  # 1 = bullish, -1 = bearish
+
+                # Initialise at first valid ATR bar
+                upper_band[period - 1] = upper_basic[period - 1]
+                lower_band[period - 1] = lower_basic[period - 1]
+                supertrend[period - 1] = upper_basic[period - 1]
+                direction[period - 1] = -1
+
+                for i in range(period, n):
+                    # Adjust upper band
+                    if upper_basic[i] < upper_band[i - 1] or close[i - 1] > upper_band[i - 1]:
+                        upper_band[i] = upper_basic[i]
                     else:
-                        direction[i] = 1
-                        supertrend[i] = lower_band[i]
+                        upper_band[i] = upper_band[i - 1]
 
-            curr_dir = direction[-1]
-            prev_dir = direction[-2]
-            curr_st = supertrend[-1]
-            curr_close = close[-1]
+                    # Adjust lower band
+                    if lower_basic[i] > lower_band[i - 1] or close[i - 1] < lower_band[i - 1]:
+                        lower_band[i] = lower_basic[i]
+                    else:
+                        lower_band[i] = lower_band[i - 1]
+
+                    # Direction and supertrend value
+                    if direction[i - 1] == -1:          # was bearish
+                        if close[i] > upper_band[i]:
+                            direction[i] = 1            # flip bullish
+                            supertrend[i] = lower_band[i]
+                        else:
+                            direction[i] = -1
+                            supertrend[i] = upper_band[i]
+                    else:                               # was bullish
+                        if close[i] < lower_band[i]:
+                            direction[i] = -1           # flip bearish
+                            supertrend[i] = upper_band[i]
+                        else:
+                            direction[i] = 1
+                            supertrend[i] = lower_band[i]
+
+                curr_dir = direction[-1]
+                prev_dir = direction[-2]
+                curr_st = supertrend[-1]
+                curr_close = close[-1]
 
             SupertrendAnalysis = namedtuple("SupertrendAnalysis", [
                 "close", "supertrend_value", "direction", "signal"
@@ -931,7 +1004,7 @@ class TechnicalAnalyser(BaseAnalyzer):
             close = stock.priceData['Close']
             
             # Enhanced parameters
-            lookback = 50  # Balanced lookback
+            lookback = self.RSI_DIVERGENCE_LOOKBACK  # Balanced lookback
             order = 3  # Increased from 2 for significant swings
             min_rsi_diff = 3  # Minimum RSI difference for valid divergence
             rsi_overbought = 75  # Relaxed zone for bearish divergence
@@ -940,26 +1013,34 @@ class TechnicalAnalyser(BaseAnalyzer):
             if len(close) < lookback + self.RSI_LOOKUP_PERIOD + 1:
                 return False
 
-            # Compute RSI using shared method
-            rsi = self._compute_rsi(close)
-
-            # Work on the recent window (reset index for simple integer indexing)
-            recent_close = close.iloc[-lookback:].reset_index(drop=True)
-            recent_rsi = rsi.iloc[-lookback:].reset_index(drop=True)
-            
-            # Calculate trend using EMA
-            ema_20 = close.ewm(span=20, adjust=False).mean()
-            ema_50 = close.ewm(span=50, adjust=False).mean()
+            ind = self._indicators(stock)
+            if ind is not None:
+                recent_close = pd.Series(list(ind.closes)[-lookback:])
+                recent_rsi = pd.Series(list(ind.rsi_tail))
+                (ema_20_prev, ema_50_prev), (ema_20_curr, ema_50_curr) = ind.trend_tail[-5], ind.trend_tail[-1]
+            else:
+                # Compute RSI using shared method
+                rsi = self._compute_rsi(close)
+
+                # Work on the recent window (reset index for simple integer indexing)
+                recent_close = close.iloc[-lookback:].reset_index(drop=True)
+                recent_rsi = rsi.iloc[-lookback:].reset_index(drop=True)
+
+                # Calculate trend using EMA
+                ema_20 = close.ewm(span=self.TREND_EMA_FAST, adjust=False).mean()
+                ema_50 = close.ewm(span=self.TREND_EMA_SLOW, adjust=False).mean()
+                ema_20_curr, ema_50_curr = ema_20.iloc[-1], ema_50.iloc[-1]
+                ema_20_prev, ema_50_prev = ema_20.iloc[-5], ema_50.iloc[-5]
             
             # Determine trend - check if EMAs are converging (trend weakening)
-            ema_diff_curr = abs(ema_20.iloc[-1] - ema_50.iloc[-1])
-            ema_diff_prev = abs(ema_20.iloc[-5] - ema_50.iloc[-5])
+            ema_diff_curr = abs(ema_20_curr - ema_50_curr)
+            ema_diff_prev = abs(ema_20_prev - ema_50_prev)
             trend_weakening = ema_diff_curr < ema_diff_prev
             
             # Determine trend direction
-            if ema_20.iloc[-1] > ema_50.iloc[-1]:
+            if ema_20_curr > ema_50_curr:
                 trend = "BULLISH"
-            elif ema_20.iloc[-1] < ema_50.iloc[-1]:
+            elif ema_20_curr < ema_50_curr:
                 trend = "BEARISH"
             else:
                 trend = "NEUTRAL"
@@ -1071,24 +1152,28 @@ class TechnicalAnalyser(BaseAnalyzer):
             if len(price_data) < k_period + d_period + 1:
                 return False
 
-            high = price_data['High']
-            low = price_data['Low']
-            close = price_data['Close']
-
-            # %K = (Close - Lowest Low_n) / (Highest High_n - Lowest Low_n) * 100
-            lowest_low = low.rolling(window=k_period).min()
-            highest_high = high.rolling(window=k_period).max()
-            denom = highest_high - lowest_low
-            denom = denom.replace(0, np.nan)
-            k_line = ((close - lowest_low) / denom) * 100
-
-            # %D = SMA of %K
-            d_line = k_line.rolling(window=d_period).mean()
-
-            curr_k = k_line.iloc[-1]
-            curr_d = d_line.iloc[-1]
-            prev_k = k_line.iloc[-2]
-            prev_d = d_line.iloc[-2]
+            ind = self._indicators(stock)
+            if ind is not None:
+                (prev_k, prev_d), (curr_k, curr_d) = ind.stoch_tail
+            else:
+                high = price_data['High']
+                low = price_data['Low']
+                close = price_data['Close']
+
+                # %K = (Close - Lowest Low_n) / (Highest High_n - Lowest Low_n) * 100
+                lowest_low = low.rolling(window=k_period).min()
+                highest_high = high.rolling(window=k_period).max()
+                denom = highest_high - lowest_low
+                denom = denom.replace(0, np.nan)
+                k_line = ((close - lowest_low) / denom) * 100
+
+                # %D = SMA of %K
+                d_line = k_line.rolling(window=d_period).mean()
+
+                curr_k = k_line.iloc[-1]
+                curr_d = d_line.iloc[-1]
+                prev_k = k_line.iloc[-2]
+                prev_d = d_line.iloc[-2]
 
             if any(pd.isna(x) for x in [curr_k, curr_d, prev_k, prev_d]):
                 return False
@@ -5,7 +5,9 @@ Consumes analysis jobs from orchestrator:analysis_jobs Redis Stream,
 runs all analysers on each stock, publishes results to analysis:results.
 
 Horizontal scaling: start N processes, all join the same analysis-workers
-consumer group. Redis distributes jobs round-robin.
+consumer group. Redis distributes jobs round-robin. On one host, prefer
+`python -m services.analysis_engine.supervisor`, which pre-forks N of these workers
+and restarts any that crash.
 """
 
 import argparse
@@ -28,7 +30,7 @@ from .analyser.OIChainAnalyser import OIChainAnalyser
 from .analyser.GEXAnalyser import GEXAnalyser
 from .analyser.PanicModeAnalyser import PanicModeAnalyser
 from .analyser.OptionSellerCompositeAnalyser import OptionSellerCompositeAnalyser
-from services.analysis_engine.worker import process_job
+from services.analysis_engine.worker import process_batch
 from services.common.redis_proxy import RedisProxy
 from services.common.version import BUILD_LABEL, GIT_COMMIT, GIT_DIRTY
 from services.market_data.signal_publisher import RedisSignalBus
@@ -62,13 +64,85 @@ def _update_heartbeat(redis: RedisProxy, worker_name: str):
     redis.expire(f"service:registry:analysis-engine:{worker_name}", 120)
 
 
-def main():
+def build_orchestrator() -> AnalyserOrchestrator:
+    orchestrator = AnalyserOrchestrator()
+    orchestrator.register(VolumeAnalyser())
+    orchestrator.register(TechnicalAnalyser())
+    orchestrator.register(CandleStickAnalyser())
+    orchestrator.register(IVAnalyser())
+    orchestrator.register(FuturesAnalyser())
+    orchestrator.register(PCRAnalyser())
+    orchestrator.register(MaxPainAnalyser())
+    orchestrator.register(OIChainAnalyser())
+    orchestrator.register(GEXAnalyser())
+    orchestrator.register(PanicModeAnalyser())
+    orchestrator.register(OptionSellerCompositeAnalyser())
+    return orchestrator
+
+
+def _entries(messages) -> list:
+    return messages[0][1] if isinstance(messages, list) and messages else []
+
+
+def _process_recovered(redis: RedisProxy, orchestrator: AnalyserOrchestrator, entries: list) -> int:
+    """Process re-delivered jobs, acking (not running) those from an older cycle."""
+    cycle_id = redis.hget("orchestrator:state", "cycle_id")
+    live, stale = [], []
+    for msg_id, fields in entries:
+        if not fields or (cycle_id and fields.get("cycle_id") != cycle_id):
+            stale.append(msg_id)
+        else:
+            live.append((msg_id, fields))
+    if stale:
+        redis.xack(constant.ANALYSIS_JOBS_STREAM, constant.ANALYSIS_JOBS_GROUP, *stale)
+        logger.info(f"[analysis-engine] Dropped {len(stale)} recovered jobs from earlier cycles")
+    if live:
+        process_batch(redis, orchestrator, live, should_continue=lambda: _running)
+    return len(live)
+
+
+def recover_pending(redis: RedisProxy, orchestrator: AnalyserOrchestrator, worker_name: str,
+                    batch_size: int, min_idle_ms: int) -> int:
+    """Finish jobs left pending by a crashed consumer.
+
+    First re-reads this consumer's own pending entries (a worker restarted
+    under the same name after a crash), then XAUTOCLAIMs entries that any
+    consumer has held for longer than `min_idle_ms`. Returns the number of
+    jobs re-run.
+    """
+    recovered = 0
+    last_id = "0"
+    while _running:
+        entries = _entries(redis.xreadgroup(
+            constant.ANALYSIS_JOBS_GROUP, worker_name,
+            {constant.ANALYSIS_JOBS_STREAM: last_id}, count=batch_size,
+        ))
+        if not entries:
+            break
+        last_id = entries[-1][0]
+        recovered += _process_recovered(redis, orchestrator, entries)
+
+    start_id = "0-0"
+    while _running:
+        start_id, entries = redis.xautoclaim(
+            constant.ANALYSIS_JOBS_STREAM, constant.ANALYSIS_JOBS_GROUP, worker_name,
+            min_idle_ms, start_id=start_id, count=batch_size,
+        )
+        if entries:
+            recovered += _process_recovered(redis, orchestrator, entries)
+        if start_id in ("0-0", "0"):
+            break
+
+    if recovered:
+        logger.info(f"[analysis-engine] {worker_name}: recovered {recovered} pending jobs")
+    return recovered
+
+
+def run_worker(worker_name: str, batch_size: int = constant.ANALYSIS_JOBS_BATCH,
+               reclaim_idle_ms: int = 60_000) -> int:
+    """Run one analysis worker until SIGTERM/SIGINT. Returns the exit code."""
     global _running
-
-    parser = argparse.ArgumentParser(description="StockAnalysis Analysis Engine")
-    parser.add_argument("--worker-name", default="worker-1", help="Consumer name for this worker instance")
-    args = parser.parse_args()
-    worker_name = args.worker_name
+    _running = True
 
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
@@ -82,7 +156,7 @@ def main():
         logger.info(f"[analysis-engine] v{BUILD_LABEL} starting")
     except Exception as e:
         logger.error(f"[analysis-engine] Cannot connect to Redis at {redis_url}: {e}")
-        sys.exit(1)
+        return 1
 
     from services.common.crash_handler import install_crash_handler
     install_crash_handler("analysis-engine")
@@ -97,18 +171,7 @@ def main():
     # signals never reach intelligence:signals for cross-layer confluence.
     shared.app_ctx.signal_bus = RedisSignalBus(redis)
 
-    orchestrator = AnalyserOrchestrator()
-    orchestrator.register(VolumeAnalyser())
-    orchestrator.register(TechnicalAnalyser())
-    orchestrator.register(CandleStickAnalyser())
-    orchestrator.register(IVAnalyser())
-    orchestrator.register(FuturesAnalyser())
-    orchestrator.register(PCRAnalyser())
-    orchestrator.register(MaxPainAnalyser())
-    orchestrator.register(OIChainAnalyser())
-    orchestrator.register(GEXAnalyser())
-    orchestrator.register(PanicModeAnalyser())
-    orchestrator.register(OptionSellerCompositeAnalyser())
+    orchestrator = build_orchestrator()
 
     logger.info(
         f"[analysis-engine] Started worker={worker_name}, "
@@ -117,6 +180,11 @@ def main():
 
     _update_heartbeat(redis, worker_name)
 
+    try:
+        recover_pending(redis, orchestrator, worker_name, batch_size, reclaim_idle_ms)
+    except Exception as e:
+        logger.error(f"[analysis-engine] Pending-job recovery failed: {e}")
+
     heartbeat_counter = 0
 
     while _running:
@@ -125,7 +193,7 @@ def main():
                 constant.ANALYSIS_JOBS_GROUP,
                 worker_name,
                 {constant.ANALYSIS_JOBS_STREAM: ">"},
-                count=10,
+                count=batch_size,
                 block=5000,
             )
         except Exception as e:
@@ -137,37 +205,22 @@ def main():
             heartbeat_counter += 1
             if heartbeat_counter % 6 == 0:
                 _update_heartbeat(redis, worker_name)
+                try:
+                    recover_pending(redis, orchestrator, worker_name, batch_size, reclaim_idle_ms)
+                except Exception as e:
+                    logger.error(f"[analysis-engine] Pending-job recovery failed: {e}")
                 gc.collect()
             continue
 
-        entries = messages[0][1] if isinstance(messages, list) and messages else []
-        for msg_id, fields in entries:
-            if not _running:
-                break
-
-            try:
-                job_fields = {k: v for k, v in fields.items()}
-                result = process_job(redis, orchestrator, job_fields)
-                redis.xadd(constant.ANALYSIS_RESULTS_STREAM, result, maxlen=500)
-            except Exception as e:
-                logger.exception(f"[analysis-engine] Error processing job {msg_id}: {e}")
-                redis.xadd(constant.ANALYSIS_RESULTS_STREAM, {
-                    "job_id": fields.get("job_id", ""),
-                    "cycle_id": fields.get("cycle_id", ""),
-                    "symbol": fields.get("symbol", ""),
-                    "result": "ERROR",
-                    "error": str(e),
-                    "timestamp": str(time.time()),
-                }, maxlen=500)
-            finally:
-                try:
-                    redis.xack(constant.ANALYSIS_JOBS_STREAM, constant.ANALYSIS_JOBS_GROUP, msg_id)
-                except Exception:
-                    pass
+        entries = _entries(messages)
+        try:
+            process_batch(redis, orchestrator, entries, should_continue=lambda: _running)
+        except Exception as e:
+            # Un-acked jobs stay pending and are picked up by recover_pending.
+            logger.exception(f"[analysis-engine] Error publishing batch of {len(entries)} jobs: {e}")
 
         heartbeat_counter += 1
         _update_heartbeat(redis, worker_name)
-        gc.collect()
 
     logger.info(f"[analysis-engine] Worker {worker_name} shutting down...")
     redis.hset(f"service:registry:analysis-engine:{worker_name}", mapping={
@@ -175,6 +228,18 @@ def main():
         "last_heartbeat": str(time.time()),
     })
     redis.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StockAnalysis Analysis Engine")
+    parser.add_argument("--worker-name", default="worker-1", help="Consumer name for this worker instance")
+    parser.add_argument("--batch-size", type=int, default=constant.ANALYSIS_JOBS_BATCH,
+                        help="Jobs read per XREADGROUP")
+    parser.add_argument("--reclaim-idle-ms", type=int, default=60_000,
+                        help="Claim jobs other consumers have held pending this long")
+    args = parser.parse_args()
+    sys.exit(run_worker(args.worker_name, args.batch_size, args.reclaim_idle_ms))
 
 
 if __name__ == "__main__":
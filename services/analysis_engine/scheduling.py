@@ -0,0 +1,86 @@
+"""
+Analysis Engine — Job Scheduling
+
+Orders a cycle's analysis jobs so that the cycle finishes as early as possible
+when several workers each pull `ANALYSIS_JOBS_BATCH` consecutive stream
+entries at a time.
+
+Cost per symbol is the exponentially-weighted mean of the `duration_ms` the
+workers report back; symbols not yet observed fall back to a static prior
+(live-options indices > other indices > stocks). Jobs are dealt heaviest-first
+across the cycle's batches in snake order, so the heaviest symbols land in
+different batches, those batches are dispatched first, and each batch starts
+with its heaviest job.
+"""
+from __future__ import annotations
+
+import math
+from typing import Callable, Sequence, TypeVar
+
+import common.constants as constant
+
+T = TypeVar("T")
+
+# Relative cost of symbols with no observed duration yet, as a multiple of
+# the median observed cost (or of 1.0 before anything has been observed).
+PRIOR_LIVE_OPTIONS_INDEX = 4.0
+PRIOR_INDEX = 2.0
+PRIOR_STOCK = 1.0
+
+
+class JobCostModel:
+    """Per-symbol EWMA of observed analysis duration (ms)."""
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self._cost: dict[str, float] = {}
+
+    def observe(self, symbol: str, duration_ms) -> None:
+        try:
+            duration = float(duration_ms)
+        except (TypeError, ValueError):
+            return
+        if not symbol or duration <= 0:
+            return
+        prev = self._cost.get(symbol)
+        self._cost[symbol] = duration if prev is None else prev + self.alpha * (duration - prev)
+
+    def cost(self, symbol: str, is_index: bool = False) -> float:
+        if symbol in self._cost:
+            return self._cost[symbol]
+        if symbol in constant.LIVE_OPTIONS_INDICES:
+            prior = PRIOR_LIVE_OPTIONS_INDEX
+        elif is_index:
+            prior = PRIOR_INDEX
+        else:
+            prior = PRIOR_STOCK
+        return prior * self._median()
+
+    def _median(self) -> float:
+        if not self._cost:
+            return 1.0
+        values = sorted(self._cost.values())
+        mid = len(values) // 2
+        return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2
+
+
+def order_jobs(items: Sequence[T], cost: Callable[[T], float], batch_size: int) -> list[T]:
+    """Return `items` in dispatch order for workers reading `batch_size` at a time.
+
+    Items are sorted by descending cost and dealt in snake order across
+    ceil(n / batch_size) batches. Batches are emitted heaviest-total first and
+    each batch is heaviest-first. Ties keep the input order.
+    """
+    n = len(items)
+    if n == 0:
+        return []
+    n_batches = max(1, math.ceil(n / max(1, batch_size)))
+    ranked = sorted(range(n), key=lambda i: -cost(items[i]))
+
+    batches: list[list[int]] = [[] for _ in range(n_batches)]
+    for rank, i in enumerate(ranked):
+        lap, pos = divmod(rank, n_batches)
+        batches[pos if lap % 2 == 0 else n_batches - 1 - pos].append(i)
+
+    batches.sort(key=lambda b: -sum(cost(items[i]) for i in b))
+    return [items[i] for batch in batches for i in batch]
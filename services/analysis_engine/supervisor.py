@@ -0,0 +1,199 @@
+"""
+Analysis Engine — Supervisor
+
+Pre-forks N analysis workers (services/analysis_engine/main.py::run_worker)
+after importing every analyser once, so children start warm and share the
+imported module pages copy-on-write. Each child joins the analysis-workers
+consumer group as `{name_prefix}-{i}`.
+
+A child that exits for any reason other than a supervisor shutdown is
+restarted under the same consumer name after a backoff (1s doubling to 30s,
+reset once a child has stayed up for a minute). The restarted worker re-reads
+its own pending entries and XAUTOCLAIMs jobs idle in other consumers, so jobs
+in flight at the time of a crash are not lost for the cycle.
+
+Usage:
+    python -m services.analysis_engine.supervisor --workers 4 --name-prefix prod
+"""
+
+import argparse
+import gc
+import os
+import signal
+import sys
+import time
+
+import common.constants as constant
+from services.analysis_engine.main import run_worker
+from services.common import metrics
+from lib.logging_util import disable_async_logging, get_logger
+logger = get_logger("analysis-engine")
+
+
+class Supervisor:
+    """Fork, watch and restart a fixed set of worker processes."""
+
+    def __init__(
+        self,
+        workers: int,
+        name_prefix: str = "worker",
+        target=run_worker,
+        target_kwargs: dict | None = None,
+        min_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        stable_after: float = 60.0,
+        poll_interval: float = 0.5,
+    ):
+        self.names = [f"{name_prefix}-{i + 1}" for i in range(max(1, workers))]
+        self.target = target
+        self.target_kwargs = target_kwargs or {}
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.poll_interval = poll_interval
+
+        self.children: dict[int, str] = {}          # pid -> worker name
+        self.restarts: dict[str, int] = {}
+        self._started_at: dict[str, float] = {}
+        self._backoff: dict[str, float] = {}
+        self._pending: dict[str, float] = {}        # name -> monotonic restart time
+        self._running = False
+
+    # ── Children ──────────────────────────────────────────────────────────────
+
+    def _spawn(self, name: str) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                code = self.target(name, **self.target_kwargs) or 0
+            except BaseException:
+                logger.exception(f"[supervisor] {name} crashed")
+            finally:
+                # os._exit skips atexit, so send buffered metric writes and
+                # drain the async-logging queue (crash traceback) first.
+                try:
+                    metrics.flush()
+                    disable_async_logging()
+                except BaseException:
+                    pass
+                os._exit(code)
+        self.children[pid] = name
+        self._started_at[name] = time.monotonic()
+        logger.info(f"[supervisor] Started {name} (pid {pid})")
+        return pid
+
+    def _reap(self) -> None:
+        """Collect exited children and schedule restarts for unexpected exits."""
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            name = self.children.pop(pid, None)
+            if name is None:
+                continue
+            if not self._running:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            uptime = time.monotonic() - self._started_at.get(name, 0.0)
+            if uptime >= self.stable_after:
+                self._backoff[name] = self.min_backoff
+            delay = self._backoff.get(name, self.min_backoff)
+            self._backoff[name] = min(delay * 2, self.max_backoff)
+            self._pending[name] = time.monotonic() + delay
+            self.restarts[name] = self.restarts.get(name, 0) + 1
+            logger.warning(
+                f"[supervisor] {name} (pid {pid}) exited with {code} after {uptime:.0f}s; "
+                f"restarting in {delay:.0f}s"
+            )
+
+    def _restart_due(self) -> None:
+        now = time.monotonic()
+        for name, at in list(self._pending.items()):
+            if at <= now:
+                del self._pending[name]
+                self._spawn(name)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        self._running = True
+        for name in self.names:
+            self._spawn(name)
+
+    def poll(self) -> None:
+        self._reap()
+        if self._running:
+            self._restart_due()
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+        self.start()
+        while self._running:
+            self.poll()
+            time.sleep(self.poll_interval)
+        self.shutdown()
+        return 0
+
+    def _on_signal(self, signum, frame):
+        logger.info(f"[supervisor] Received signal {signum}, stopping {len(self.children)} workers...")
+        self._running = False
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """SIGTERM every child, wait up to `timeout`, then SIGKILL stragglers."""
+        self._running = False
+        self._pending.clear()
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + timeout
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid, name in list(self.children.items()):
+            logger.warning(f"[supervisor] {name} (pid {pid}) did not stop; killing")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.children.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StockAnalysis Analysis Engine supervisor")
+    parser.add_argument("--workers", type=int, default=len(os.sched_getaffinity(0)),
+                        help="Worker processes to run (default: usable CPUs)")
+    parser.add_argument("--name-prefix", default="worker", help="Consumer name prefix for workers")
+    parser.add_argument("--batch-size", type=int, default=constant.ANALYSIS_JOBS_BATCH,
+                        help="Jobs each worker reads per XREADGROUP")
+    parser.add_argument("--reclaim-idle-ms", type=int, default=60_000,
+                        help="Claim jobs other consumers have held pending this long")
+    args = parser.parse_args()
+
+    # Everything imported so far is shared with the children; freezing it keeps
+    # the cyclic GC from touching (and so copying) those pages in each child.
+    gc.collect()
+    gc.freeze()
+
+    supervisor = Supervisor(
+        args.workers,
+        args.name_prefix,
+        target_kwargs={"batch_size": args.batch_size, "reclaim_idle_ms": args.reclaim_idle_ms},
+    )
+    logger.info(f"[supervisor] Starting {len(supervisor.names)} analysis workers")
+    sys.exit(supervisor.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,14 @@ Metrics — lightweight per-stock + system-wide counters in Redis.
 All functions are fail-safe: they never raise. If Redis is unavailable,
 the impact is a single log line \u2014 business logic is never affected.
 
+Writes are buffered: the module-level writers add to one process-wide
+MetricsAggregator, which sums counter deltas, keeps the last value of
+``set_*`` fields and sends everything in one pipeline from a background
+thread every METRICS_FLUSH_MS (default 500) or every 1000 writes, and once
+more at interpreter exit. Readers flush first, so a process reads its own
+writes. ``flush()`` forces a synchronous flush; ``client_stats()`` reports
+flush latency and dropped writes.
+
 Usage:
     from services.common.metrics import incr_stock, set_stock, incr_system
 
@@ -23,6 +31,12 @@ Usage:
     all_stats = get_all_stock_stats()
     top = get_top_stocks("alerts_total", limit=10)
 
+    # Coalesce a burst of writes into one pipeline, sent on flush()
+    batch = MetricsBatch()
+    batch.incr_stock("RELIANCE", "analysis_count")
+    batch.incr_system("analysis_runs")
+    batch.flush()
+
 Redis keys written:
     stats:stock:{symbol}     \u2014 per-stock counters (HASH)
     stats:system             \u2014 system-wide counters (HASH)
@@ -30,10 +44,13 @@ Redis keys written:
 """
 from __future__ import annotations
 
+import atexit
 import os
+import threading
 import time
 from datetime import date
 
+from common.constants import ENV_METRICS_FLUSH_MS
 from lib.logging_util import get_logger
 logger = get_logger("common")
 
@@ -68,71 +85,229 @@ def _today() -> str:
 
 
 def incr_stock(symbol: str, field: str, amount: int = 1) -> None:
-    if not symbol:
-        return
-    _r = _get_redis()
-    if _r is None:
-        return
-    try:
-        _r.hincrby(_key(symbol), field, amount)
-    except Exception as exc:
-        logger.debug(f"[metrics] incr_stock({symbol}, {field}) failed: {exc}")
+    _aggregator.incr_stock(symbol, field, amount)
 
 
 def set_stock(symbol: str, **fields) -> None:
-    if not symbol:
-        return
-    _r = _get_redis()
-    if _r is None or not fields:
-        return
-    try:
-        _r.hset(_key(symbol), mapping={k: str(v) for k, v in fields.items()})
-    except Exception as exc:
-        logger.debug(f"[metrics] set_stock({symbol}, ...) failed: {exc}")
+    _aggregator.set_stock(symbol, **fields)
 
 
 def incr_system(field: str, amount: int = 1) -> None:
-    _r = _get_redis()
-    if _r is None:
-        return
-    try:
-        pipe = _r.pipeline()
-        pipe.hincrby("stats:system", field, amount)
-        pipe.hset("stats:system", "last_updated", str(time.time()))
-        pipe.execute()
-    except Exception as exc:
-        logger.debug(f"[metrics] incr_system({field}) failed: {exc}")
+    _aggregator.incr_system(field, amount)
 
 
 def set_system(**fields) -> None:
-    _r = _get_redis()
-    if _r is None or not fields:
-        return
-    try:
-        fields["last_updated"] = str(time.time())
-        _r.hset("stats:system", mapping={k: str(v) for k, v in fields.items()})
-    except Exception as exc:
-        logger.debug(f"[metrics] set_system(...) failed: {exc}")
+    _aggregator.set_system(**fields)
 
 
 def incr_daily(field: str, amount: int = 1) -> None:
-    _r = _get_redis()
-    if _r is None:
-        return
-    key = f"stats:daily:{_today()}"
-    try:
-        pipe = _r.pipeline()
-        pipe.hincrby(key, field, amount)
-        pipe.expire(key, 86400 * 30)
-        pipe.execute()
-    except Exception as exc:
-        logger.debug(f"[metrics] incr_daily({field}) failed: {exc}")
+    _aggregator.incr_daily(field, amount)
+
+
+def flush() -> None:
+    """Send buffered writes now (e.g. before a short-lived script exits)."""
+    _aggregator.flush()
+
+
+def client_stats() -> dict:
+    """This process's buffered-writer stats: flushes, latency, pending and dropped writes."""
+    return _aggregator.stats()
+
+
+def get_aggregator() -> "MetricsAggregator":
+    """The process-wide aggregator, for callers that take a MetricsBatch."""
+    return _aggregator
+
+
+class MetricsBatch:
+    """Collects metric writes in memory and sends them in one pipeline.
+
+    Exposes the same writer functions as the module. Counter deltas for the
+    same (key, field) are summed and ``set_*`` fields keep the last value, so
+    a batch of N analysis jobs costs one round-trip instead of ~8N.
+    ``flush()`` is fail-safe like the module-level helpers.
+    """
+
+    def __init__(self):
+        self._incr: dict[tuple[str, str], int] = {}
+        self._set: dict[str, dict[str, str]] = {}
+        self._daily_keys: set[str] = set()
+
+    def incr_stock(self, symbol: str, field: str, amount: int = 1) -> None:
+        if symbol:
+            self._add(_key(symbol), field, amount)
+
+    def set_stock(self, symbol: str, **fields) -> None:
+        if symbol and fields:
+            self._put(_key(symbol), fields)
+
+    def incr_system(self, field: str, amount: int = 1) -> None:
+        self._add("stats:system", field, amount)
+
+    def set_system(self, **fields) -> None:
+        if fields:
+            self._put("stats:system", fields)
+
+    def incr_daily(self, field: str, amount: int = 1) -> None:
+        key = f"stats:daily:{_today()}"
+        self._daily_keys.add(key)
+        self._add(key, field, amount)
+
+    def _add(self, key: str, field: str, amount: int) -> None:
+        self._incr[(key, field)] = self._incr.get((key, field), 0) + amount
+
+    def _put(self, key: str, fields: dict) -> None:
+        self._set.setdefault(key, {}).update({k: str(v) for k, v in fields.items()})
+
+    def _take(self):
+        incr, sets, daily_keys = self._incr, self._set, self._daily_keys
+        self._incr, self._set, self._daily_keys = {}, {}, set()
+        return incr, sets, daily_keys
+
+    def flush(self) -> None:
+        if not self._incr and not self._set:
+            return
+        self._send(*self._take())
+
+    @staticmethod
+    def _send(incr: dict, sets: dict, daily_keys: set) -> bool:
+        """Write one batch in a single pipeline; False if it could not be written."""
+        _r = _get_redis()
+        if _r is None:
+            return False
+        if any(key == "stats:system" for key, _ in incr) or "stats:system" in sets:
+            sets.setdefault("stats:system", {})["last_updated"] = str(time.time())
+        try:
+            pipe = _r.pipeline(transaction=False)
+            for (key, field), amount in incr.items():
+                pipe.hincrby(key, field, amount)
+            for key, mapping in sets.items():
+                pipe.hset(key, mapping=mapping)
+            for key in daily_keys:
+                pipe.expire(key, 86400 * 30)
+            pipe.execute()
+            return True
+        except Exception as exc:
+            logger.debug(f"[metrics] batch flush ({len(incr)} counters) failed: {exc}")
+            return False
+
+
+class MetricsAggregator(MetricsBatch):
+    """Thread-safe MetricsBatch flushed by a background thread.
+
+    Flushes every `interval` seconds, or sooner once `max_events` writes are
+    buffered. Writes are dropped (and counted) while `max_pending` distinct
+    fields are already waiting, and a failed flush counts its fields as
+    dropped; nothing is retried, as with the unbuffered writers.
+    """
+
+    def __init__(self, interval: float = 0.5, max_events: int = 1000, max_pending: int = 100_000):
+        super().__init__()
+        self.interval = interval
+        self.max_events = max_events
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._events = 0
+        self._pending = 0
+
+        self.flushes = 0
+        self.dropped = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def _add(self, key: str, field: str, amount: int) -> None:
+        with self._lock:
+            if (key, field) not in self._incr:
+                if self._pending >= self.max_pending:
+                    self.dropped += 1
+                    return
+                self._pending += 1
+            self._incr[(key, field)] = self._incr.get((key, field), 0) + amount
+            self._written()
+
+    def _put(self, key: str, fields: dict) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += len(fields)
+                return
+            current = self._set.setdefault(key, {})
+            for k, v in fields.items():
+                if k not in current:
+                    self._pending += 1
+                current[k] = str(v)
+            self._written()
+
+    def _written(self) -> None:
+        """Count one write (lock held); start the flusher or wake it early."""
+        self._events += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="metrics-flush")
+            self._thread.start()
+        elif self._events >= self.max_events:
+            self._wake.set()
+
+    def _take(self):
+        with self._lock:
+            self._events = 0
+            self._pending = 0
+            return super()._take()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            if not self._incr and not self._set:
+                return
+            incr, sets, daily_keys = self._take()
+            writes = len(incr) + sum(len(m) for m in sets.values())
+            start = time.perf_counter()
+            ok = self._send(incr, sets, daily_keys)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.flushes += 1
+            self.last_flush_ms = elapsed
+            self.max_flush_ms = max(self.max_flush_ms, elapsed)
+            if not ok:
+                self.dropped += writes
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.debug(f"[metrics] background flush failed: {exc}")
+
+    def _after_fork(self) -> None:
+        """In a forked child: the parent's flusher thread and pending writes stay with the parent."""
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._incr, self._set, self._daily_keys = {}, {}, set()
+        self._events = self._pending = 0
+
+    def stats(self) -> dict:
+        return {
+            "flushes": self.flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "pending": self._pending,
+            "dropped": self.dropped,
+        }
+
+
+_aggregator = MetricsAggregator(interval=int(os.environ.get(ENV_METRICS_FLUSH_MS, 500)) / 1000)
+atexit.register(_aggregator.flush)
+os.register_at_fork(after_in_child=_aggregator._after_fork)
 
 
 # ── Reader helpers (for bot commands / debugging) ─────────────────────────────
 
 
 def get_stock_stats(symbol: str) -> dict:
+    _aggregator.flush()
     _r = _get_redis()
     if _r is None:
         return {}
@@ -143,6 +318,7 @@ def get_stock_stats(symbol: str) -> dict:
 
 
 def get_system_stats() -> dict:
+    _aggregator.flush()
     _r = _get_redis()
     if _r is None:
         return {}
@@ -153,6 +329,7 @@ def get_system_stats() -> dict:
 
 
 def get_all_stock_stats() -> dict[str, dict]:
+    _aggregator.flush()
     _r = _get_redis()
     if _r is None:
         return {}
@@ -0,0 +1,22 @@
+"""
+Nearest-rank latency percentiles for in-process stats.
+
+Shared by the notification dispatcher, the tick dispatcher and the
+market-data replay tool, which all report p50/p95/p99/max over a bounded
+window of samples.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+_QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+
+
+def percentiles(samples: Iterable[float]) -> dict[str, float]:
+    """p50/p95/p99/max of `samples` (all 0.0 when there are none)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {name: 0.0 for name, _ in _QUANTILES}
+    last = len(ordered) - 1
+    return {name: ordered[round(q * last)] for name, q in _QUANTILES}
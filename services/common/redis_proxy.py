@@ -65,6 +65,17 @@ class RedisProxy:
                 return None
             raise
 
+    def xautoclaim(self, stream: str, groupname: str, consumername: str, min_idle_time: int,
+                   start_id: str = "0-0", count: int | None = None) -> tuple[str, list]:
+        """Claim entries pending longer than ``min_idle_time`` ms.
+
+        Returns ``(next_start_id, entries)``; ``next_start_id == "0-0"`` once the
+        whole pending list has been scanned.
+        """
+        reply = self._client.xautoclaim(stream, groupname, consumername, min_idle_time,
+                                        start_id=start_id, count=count)
+        return reply[0], reply[1]
+
     def xack(self, stream: str, groupname: str, *ids: str) -> int:
         return self._client.xack(stream, groupname, *ids)
 
@@ -77,6 +88,10 @@ class RedisProxy:
     def scan(self, cursor: int = 0, match: str | None = None, count: int | None = None) -> tuple:
         return self._client.scan(cursor, match=match, count=count)
 
+    def pipeline(self, transaction: bool = True):
+        """Raw redis-py pipeline. ``transaction=True`` wraps it in MULTI/EXEC."""
+        return self._client.pipeline(transaction=transaction)
+
     def pubsub(self):
         return self._client.pubsub()
 
@@ -89,5 +104,8 @@ class RedisProxy:
     def xread(self, streams: dict, count: int | None = None, block: int | None = None) -> list | None:
         return self._client.xread(streams, count=count, block=block)
 
+    def xrange(self, stream: str, min: str = "-", max: str = "+", count: int | None = None) -> list:
+        return self._client.xrange(stream, min=min, max=max, count=count)
+
     def close(self):
         self._client.close()
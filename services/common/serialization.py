@@ -1,30 +1,258 @@
 """
 Serialization helpers for transmitting pandas DataFrames and nested dicts over Redis.
 
-DataFrames use pandas' built-in JSON serialization (orient='split') which is compact
-and preserves dtypes. Nested dicts use standard json.dumps with default=str for
-datetime/numpy types.
+DataFrames are written with a compact binary columnar codec ("frame codec"):
+a small JSON header describing the index and columns, followed by contiguous
+little-endian column buffers (float64 / int64 / bool / datetime64[ns]). The
+payload is base64-armoured with a versioned text prefix because every Redis
+client in the stack uses ``decode_responses=True``. Decoding maps the column
+buffers straight into NumPy with ``np.frombuffer`` — no per-value parsing.
+
+Timezone-aware datetimes decoded from Redis values come back in UTC, as
+they did when these fields were read with ``pd.read_json``; analysers that
+compare wall-clock fields rely on that. ``decode_frame_payload`` (binary
+file sinks such as the OHLCV store) keeps the stored zone.
+
+Values written by older builds (pandas ``orient='split'`` JSON) are still
+readable: anything without the codec prefix falls back to ``pd.read_json``.
+Frames the codec cannot represent (MultiIndex, non-scalar column labels,
+non-JSON object columns) are written as JSON as well.
+
+Nested dicts use standard json.dumps with default=str for datetime/numpy types.
 """
 
 from __future__ import annotations
 
+import base64
+import io
 import json
+import struct
+import numpy as np
 import pandas as pd
 from typing import Any
 
+FRAME_CODEC_VERSION = 1
+FRAME_CODEC_PREFIX = f"saf{FRAME_CODEC_VERSION}:"
+
+_HEADER_LEN = struct.Struct("<I")
+_ALIGN = 8
+_BUFFER_KINDS = frozenset("fiubM")
+
 
 def dataframe_to_json(df: pd.DataFrame) -> str:
-    """Serialize a DataFrame to a JSON string for Redis storage."""
+    """Serialize a DataFrame to a string for Redis storage.
+
+    Uses the binary frame codec when the frame is representable, otherwise
+    pandas' ``orient='split'`` JSON. Empty frames are stored as ``"{}"``.
+    """
     if df is None or df.empty:
         return "{}"
-    return df.to_json(orient="split", date_format="iso")
+    try:
+        return encode_frame(df)
+    except (TypeError, ValueError):
+        return df.to_json(orient="split", date_format="iso")
 
 
 def dataframe_from_json(json_str: str) -> pd.DataFrame:
-    """Deserialize a JSON string back to a DataFrame."""
+    """Deserialize a string written by ``dataframe_to_json`` back to a DataFrame.
+
+    Accepts both codec payloads and legacy ``orient='split'`` JSON.
+    """
     if not json_str or json_str == "{}":
         return pd.DataFrame()
-    return pd.read_json(json_str, orient="split")
+    if is_encoded_frame(json_str):
+        return decode_frame(json_str)
+    return pd.read_json(io.StringIO(json_str), orient="split")
+
+
+# ── Binary frame codec ───────────────────────────────────────────────────────
+
+
+def is_encoded_frame(value: str | bytes | None) -> bool:
+    """True if ``value`` carries the frame codec prefix (any version)."""
+    if not value:
+        return False
+    if isinstance(value, bytes):
+        return value[:3] == b"saf" and value[3:4].isdigit()
+    return value[:3] == "saf" and value[3:4].isdigit()
+
+
+def encode_frame(df: pd.DataFrame) -> str:
+    """Encode a DataFrame with the binary frame codec.
+
+    Raises:
+        TypeError / ValueError: the frame has a shape the codec does not
+            support (callers fall back to JSON).
+    """
+    return FRAME_CODEC_PREFIX + base64.b64encode(encode_frame_payload(df)).decode("ascii")
+
+
+def encode_frame_payload(df: pd.DataFrame) -> bytes:
+    """Encode a DataFrame to the raw (un-armoured, unprefixed) codec payload.
+
+    For binary-safe sinks such as files; ``encode_frame`` wraps this for Redis.
+    The payload does not carry a version, so callers must record
+    ``FRAME_CODEC_VERSION`` alongside it.
+    """
+    if isinstance(df.columns, pd.MultiIndex) or isinstance(df.index, pd.MultiIndex):
+        raise TypeError("MultiIndex frames are not supported by the frame codec")
+    if not df.columns.is_unique:
+        raise TypeError("duplicate column labels are not supported by the frame codec")
+
+    buffers: list[bytes] = []
+    offset = 0
+
+    def _add_buffer(arr: np.ndarray) -> dict:
+        nonlocal offset
+        data = np.ascontiguousarray(arr).tobytes()
+        entry = {"dtype": arr.dtype.str, "offset": offset, "nbytes": len(data)}
+        pad = (-len(data)) % _ALIGN
+        buffers.append(data + b"\x00" * pad)
+        offset += len(data) + pad
+        return entry
+
+    header = {
+        "n": len(df),
+        "index": _encode_array_spec(df.index, _add_buffer, is_index=True),
+        "columns": [],
+    }
+    for name in df.columns:
+        if not isinstance(name, (str, int)) or isinstance(name, bool):
+            raise TypeError(f"unsupported column label {name!r}")
+        spec = _encode_array_spec(df[name], _add_buffer)
+        spec["name"] = name
+        header["columns"].append(spec)
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    header_pad = (-(_HEADER_LEN.size + len(header_bytes))) % _ALIGN
+    return b"".join([
+        _HEADER_LEN.pack(len(header_bytes)),
+        header_bytes,
+        b" " * header_pad,
+        *buffers,
+    ])
+
+
+def decode_frame_arrays(value: str | bytes) -> tuple[np.ndarray | pd.Index, dict[Any, np.ndarray]]:
+    """Decode a codec payload into ``(index, {column: ndarray})``.
+
+    Numeric and datetime columns are read-only ``np.frombuffer`` views over
+    the decoded payload (no copy). Use this on hot paths that only need the
+    raw arrays; ``decode_frame`` builds a regular, writeable DataFrame.
+    """
+    if isinstance(value, bytes):
+        value = value.decode("ascii")
+    prefix, _, body = value.partition(":")
+    version = int(prefix[3:])
+    if version != FRAME_CODEC_VERSION:
+        raise ValueError(f"unsupported frame codec version {version}")
+
+    return decode_frame_payload_arrays(base64.b64decode(body), keep_tz=False)
+
+
+def decode_frame_payload_arrays(
+    payload: bytes, keep_tz: bool = True,
+) -> tuple[np.ndarray | pd.Index, dict[Any, np.ndarray]]:
+    """``decode_frame_arrays`` for a raw payload from ``encode_frame_payload``.
+
+    Tz-aware datetimes are returned in their stored zone, or in UTC with
+    ``keep_tz=False`` (the Redis read semantics).
+    """
+    (header_len,) = _HEADER_LEN.unpack_from(payload, 0)
+    header_start = _HEADER_LEN.size
+    header = json.loads(payload[header_start:header_start + header_len])
+    data_start = header_start + header_len
+    data_start += (-data_start) % _ALIGN
+    n = header["n"]
+
+    index = _decode_array_spec(header["index"], payload, data_start, n, is_index=True, keep_tz=keep_tz)
+    columns = {
+        spec["name"]: _decode_array_spec(spec, payload, data_start, n, keep_tz=keep_tz)
+        for spec in header["columns"]
+    }
+    return index, columns
+
+
+def decode_frame(value: str | bytes) -> pd.DataFrame:
+    """Decode a codec payload into a DataFrame (tz-aware datetimes in UTC)."""
+    return _owned_frame(*decode_frame_arrays(value))
+
+
+def decode_frame_payload(payload: bytes) -> pd.DataFrame:
+    """Decode a raw payload from ``encode_frame_payload`` into a DataFrame."""
+    return _owned_frame(*decode_frame_payload_arrays(payload))
+
+
+def _owned_frame(index, columns: dict[Any, np.ndarray]) -> pd.DataFrame:
+    # Copy each buffer view once so the frame owns writeable memory, then let
+    # pandas adopt the arrays as-is (copy=False skips a second consolidation copy).
+    owned = {name: np.array(arr, copy=True) for name, arr in columns.items()}
+    return pd.DataFrame(owned, index=index, copy=False)
+
+
+def _encode_array_spec(values, add_buffer, is_index: bool = False) -> dict:
+    if is_index and isinstance(values, pd.RangeIndex):
+        return {"kind": "range", "start": values.start, "step": values.step, "name": values.name}
+
+    spec: dict[str, Any] = {}
+    if is_index:
+        spec["name"] = values.name
+    dtype = values.dtype
+
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        spec["kind"] = "datetime"
+        spec["tz"] = str(dtype.tz)
+        spec.update(add_buffer(pd.DatetimeIndex(values).as_unit("ns").asi8))
+        return spec
+
+    if isinstance(dtype, np.dtype) and dtype.kind in _BUFFER_KINDS:
+        arr = values.to_numpy()
+        if dtype.kind == "M":
+            spec["kind"] = "datetime"
+            spec["tz"] = None
+            arr = arr.astype("datetime64[ns]").view("<i8")
+        else:
+            spec["kind"] = "buffer"
+            arr = arr.astype(arr.dtype.newbyteorder("<"), copy=False)
+        spec.update(add_buffer(arr))
+        return spec
+
+    items = values.tolist()
+    try:
+        json.dumps(items)
+    except (TypeError, ValueError) as e:
+        raise TypeError(f"non-JSON values in {'index' if is_index else 'column'}: {e}") from e
+    spec["kind"] = "values"
+    spec["values"] = items
+    return spec
+
+
+def _decode_array_spec(spec: dict, payload: bytes, data_start: int, n: int, is_index: bool = False,
+                       keep_tz: bool = True):
+    kind = spec["kind"]
+    if kind == "range":
+        start, step = spec["start"], spec["step"]
+        return pd.RangeIndex(start, start + step * n, step, name=spec.get("name"))
+
+    if kind == "values":
+        values = spec["values"]
+        return pd.Index(values, name=spec.get("name")) if is_index else np.asarray(values, dtype=object)
+
+    dtype = np.dtype(spec["dtype"])
+    arr = np.frombuffer(payload, dtype=dtype, count=n, offset=data_start + spec["offset"])
+    if kind == "datetime":
+        if spec.get("tz"):
+            stamps = pd.DatetimeIndex(
+                arr.view("datetime64[ns]"), dtype=pd.DatetimeTZDtype("ns", "UTC"), name=spec.get("name"),
+            )
+            if keep_tz:
+                stamps = stamps.tz_convert(spec["tz"])
+        else:
+            stamps = pd.DatetimeIndex(arr.view("datetime64[ns]"), name=spec.get("name"))
+        return stamps if is_index else stamps.array
+    if is_index:
+        return pd.Index(arr, name=spec.get("name"))
+    return arr
 
 
 def safe_json_dumps(obj: Any) -> str:
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import pandas as pd
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Protocol
+
+import common.constants as constant
 
 if TYPE_CHECKING:
     from common.Stock import Stock
@@ -17,6 +19,16 @@ from services.common.serialization import (
 )
 
 
+class HashReader(Protocol):
+    """What the tick/price loaders need: a sync ``hgetall``.
+
+    Satisfied by RedisProxy, a redis client, and the bot's prefetched
+    snapshot hashes (lib/notification/commands/_cache.Prefetched).
+    """
+
+    def hgetall(self, name: str, /) -> Any: ...
+
+
 def load_stock_from_redis(redis: RedisProxy, symbol: str, is_index: bool = False) -> Stock | None:
     from common.Stock import Stock
 
@@ -62,7 +74,7 @@ def load_stock_from_redis(redis: RedisProxy, symbol: str, is_index: bool = False
 
 
 def load_price_data_from_redis(
-    redis: RedisProxy, stock_objs: list[Stock], index_objs: list[Stock],
+    redis: HashReader, stock_objs: list[Stock], index_objs: list[Stock],
     commodity_objs: list[Stock] | None = None,
     global_indices_objs: list[Stock] | None = None,
 ) -> int:
@@ -206,12 +218,16 @@ def load_zerodha_from_redis(redis: RedisProxy, stock: Stock) -> bool:
     return True
 
 
-def load_options_live_from_redis(redis: RedisProxy, stock: Stock) -> bool:
+def load_options_live_from_redis(redis: HashReader, stock: Stock) -> bool:
     """Load live options tick data from Redis into Stock's TickStore.
 
     Reads `data:options_live:{symbol}` hash (published by market-data service)
     and populates `stock._tick_store.options_live` with per-strike
     CE/PE tick dicts including gamma/oi from WS2 + Sensibull.
+
+    The snapshot sequence number (`_seq`) and publish time (`_ts`) are kept on
+    the TickStore so callers can detect a stale snapshot or a torn read
+    across two loads.
     """
     raw = redis.hgetall(f"data:options_live:{stock.stock_symbol}")
     if not raw:
@@ -219,6 +235,8 @@ def load_options_live_from_redis(redis: RedisProxy, stock: Stock) -> bool:
 
     options_live: dict[float, dict] = {}
     for key, value in raw.items():
+        if key.startswith(constant.OPTIONS_LIVE_META_PREFIX):
+            continue
         parts = key.rsplit("_", 1)
         if len(parts) != 2:
             continue
@@ -232,12 +250,15 @@ def load_options_live_from_redis(redis: RedisProxy, stock: Stock) -> bool:
         options_live[strike][opt_type] = safe_json_loads(value) or {}
 
     if options_live:
-        stock._tick_store.options_live = options_live
+        ts = stock._tick_store
+        ts.options_live = options_live
+        ts.options_snapshot_seq = _safe_int(raw.get(constant.OPTIONS_LIVE_SEQ_FIELD))
+        ts.options_snapshot_ts = _safe_float(raw.get(constant.OPTIONS_LIVE_TS_FIELD))
         return True
     return False
 
 
-def load_tick_from_redis(redis: RedisProxy, stock: Stock) -> bool:
+def load_tick_from_redis(redis: HashReader, stock: Stock) -> bool:
     """Load live tick data (equity + options aggregate) from Redis into TickStore.
 
     Reads `data:tick:{symbol}` and `data:options_agg:{symbol}` hashes published
@@ -286,6 +307,20 @@ def load_tick_from_redis(redis: RedisProxy, stock: Stock) -> bool:
     return loaded
 
 
+def _safe_int(val: Any) -> int:
+    try:
+        return int(val)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _safe_float(val: Any) -> float:
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return 0.0
+
+
 def _dict_to_df(data: Any) -> pd.DataFrame:
     if data is None:
         return None
@@ -14,6 +14,8 @@ import pandas as pd
 from redis.asyncio import Redis
 from typing import TYPE_CHECKING
 
+import common.constants as constant
+
 if TYPE_CHECKING:
     from common.Stock import Stock
 
@@ -96,6 +98,8 @@ class StockProxy:
         raw = await redis.hgetall(f"data:options_live:{symbol}")
         options_live = {}
         for key, value in raw.items():
+            if key.startswith(constant.OPTIONS_LIVE_META_PREFIX):
+                continue
             parts = key.rsplit("_", 1)
             if len(parts) == 2:
                 strike = float(parts[0])
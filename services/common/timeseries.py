@@ -0,0 +1,257 @@
+"""
+Ring-buffer time series in Redis strings.
+
+Each metric is stored at several resolutions ("tiers"). Each tier is a
+fixed-size ring of fixed-width binary slots in one Redis string. A sample at
+time ``ts`` lives in slot ``(ts // step) % slots`` at byte offset
+``slot * width``. Slots are written with SETRANGE and read with GETRANGE, so
+Redis never parses, sorts or prunes anything. A slot from an earlier lap of
+the ring is recognised by its stored bucket time and skipped.
+
+    tier   step    slots   retention   slot layout (big-endian)
+    raw    30 s    2880    24 h        I ts, f value                       8 B
+    1m     60 s    2880    48 h        I bucket, H count, f min, f max,
+    15m    15 min  1344    14 d          f sum, f last                    22 B
+    1d     1 day   400     ~13 mo
+
+A fully populated metric takes about 122 KiB across all tiers. The ZSET
+layout this replaces used roughly 120 bytes per sample (member string,
+skiplist node and dict entry), or about 330 KiB for 24 h of raw samples. To
+measure both on a live server, run tools/benchmarks/bench_timeseries.py.
+
+Rollups (min/max/avg/last) are accumulated in the writer process. Every
+flush rewrites the current bucket's slot, so a reader sees the partial
+bucket. After a restart, the writer resumes a bucket from its stored slot.
+
+Keys are ``{prefix}:{metric}:{tier}`` (default prefix ``sys:ring``). Each key
+gets a TTL of its tier's retention, so metrics that stop reporting disappear.
+
+Slots are binary, so the Redis client passed in must be created with
+``decode_responses=False``.
+
+Usage:
+    writer = RingWriter(redis)
+    writer.add("cpu", time.time(), 12.5)
+    writer.add("rss:market-data", time.time(), 412.0)
+    writer.flush()                                   # one pipeline
+
+    points = query(redis, "cpu", now - 86400, now, step=3600)   # hourly, from the 15m tier
+    [(p.ts, p.avg, p.max) for p in points]
+"""
+from __future__ import annotations
+
+import struct
+from typing import NamedTuple
+
+from lib.logging_util import get_logger
+logger = get_logger("common")
+
+DEFAULT_PREFIX = "sys:ring"
+
+
+class Tier(NamedTuple):
+    name: str
+    step: int       # seconds per slot
+    slots: int
+
+    @property
+    def retention(self) -> int:
+        return self.step * self.slots
+
+
+RAW = Tier("raw", 30, 2880)
+TIERS = (
+    RAW,
+    Tier("1m", 60, 2880),
+    Tier("15m", 900, 1344),
+    Tier("1d", 86400, 400),
+)
+TIERS_BY_NAME = {t.name: t for t in TIERS}
+
+_RAW_SLOT = struct.Struct(">If")
+_ROLLUP_SLOT = struct.Struct(">IHffff")
+
+
+class Point(NamedTuple):
+    ts: float        # bucket start (raw: sample time)
+    min: float
+    max: float
+    avg: float
+    last: float
+    count: int
+
+
+def ring_key(metric: str, tier: Tier, prefix: str = DEFAULT_PREFIX) -> str:
+    return f"{prefix}:{metric}:{tier.name}"
+
+
+def _width(tier: Tier) -> int:
+    return _RAW_SLOT.size if tier is RAW else _ROLLUP_SLOT.size
+
+
+# ── Writer ────────────────────────────────────────────────────────────────────
+
+class RingWriter:
+    """Buffer samples and write them, with their rollups, in one pipeline per flush."""
+
+    def __init__(self, redis, prefix: str = DEFAULT_PREFIX, tiers: tuple[Tier, ...] = TIERS):
+        self.redis = redis
+        self.prefix = prefix
+        self.tiers = tiers
+        self._samples: list[tuple[str, float, float]] = []
+        # (metric, tier name) -> [bucket, count, min, max, sum, last]
+        self._rollups: dict[tuple[str, str], list] = {}
+
+    def add(self, metric: str, ts: float, value: float) -> None:
+        self._samples.append((metric, ts, float(value)))
+
+    def flush(self) -> None:
+        """Write buffered samples. Fail-safe: errors are logged and the samples dropped."""
+        samples, self._samples = self._samples, []
+        if not samples:
+            return
+        try:
+            self._resume(samples)
+            pipe = self.redis.pipeline(transaction=False)
+            touched: set[tuple[str, Tier]] = set()
+            for metric, ts, value in samples:
+                for tier in self.tiers:
+                    bucket = int(ts) // tier.step * tier.step
+                    offset = (bucket // tier.step) % tier.slots * _width(tier)
+                    if tier is RAW:
+                        data = _RAW_SLOT.pack(int(ts), value)
+                    else:
+                        acc = self._accumulate(metric, tier, bucket, value)
+                        data = _ROLLUP_SLOT.pack(*acc)
+                    pipe.setrange(ring_key(metric, tier, self.prefix), offset, data)
+                    touched.add((metric, tier))
+            for metric, tier in touched:
+                pipe.expire(ring_key(metric, tier, self.prefix), tier.retention)
+            pipe.execute()
+        except Exception as e:
+            logger.debug(f"[timeseries] flush of {len(samples)} samples failed: {e}")
+
+    def _accumulate(self, metric: str, tier: Tier, bucket: int, value: float) -> list:
+        acc = self._rollups.get((metric, tier.name))
+        if acc is None or acc[0] != bucket:
+            acc = self._rollups[(metric, tier.name)] = [bucket, 0, value, value, 0.0, value]
+        acc[1] += 1
+        acc[2] = min(acc[2], value)
+        acc[3] = max(acc[3], value)
+        acc[4] += value
+        acc[5] = value
+        return acc
+
+    def _resume(self, samples) -> None:
+        """Load the stored slot of any rollup bucket this process has not seen yet (restart)."""
+        wanted = {}
+        for metric, ts, _ in samples:
+            for tier in self.tiers:
+                if tier is RAW or (metric, tier.name) in self._rollups:
+                    continue
+                bucket = int(ts) // tier.step * tier.step
+                wanted.setdefault((metric, tier.name), (tier, bucket))
+        if not wanted:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for (metric, _), (tier, bucket) in wanted.items():
+            offset = (bucket // tier.step) % tier.slots * _ROLLUP_SLOT.size
+            pipe.getrange(ring_key(metric, tier, self.prefix), offset, offset + _ROLLUP_SLOT.size - 1)
+        for ((metric, name), (tier, bucket)), raw in zip(wanted.items(), pipe.execute()):
+            if raw and len(raw) == _ROLLUP_SLOT.size:
+                stored = list(_ROLLUP_SLOT.unpack(raw))
+                if stored[0] == bucket and stored[1] > 0:
+                    self._rollups[(metric, name)] = stored
+
+
+# ── Reader ────────────────────────────────────────────────────────────────────
+
+def pick_tier(start: float, end: float, step: float | None = None, now: float | None = None) -> Tier:
+    """Coarsest tier no coarser than `step` that still holds `start` (finest that does, if none)."""
+    now = end if now is None else now
+    covering = [t for t in TIERS if now - start <= t.retention]
+    if not covering:
+        return TIERS[-1]
+    if step:
+        fine_enough = [t for t in covering if t.step <= step]
+        if fine_enough:
+            return fine_enough[-1]
+    return covering[0]
+
+
+def read_tier(redis, metric: str, tier: Tier, start: float, end: float,
+              prefix: str = DEFAULT_PREFIX) -> list[Point]:
+    """Stored points of one tier overlapping [start, end], oldest first."""
+    first = int(max(start, end - tier.retention + tier.step)) // tier.step
+    last = int(end) // tier.step
+    if last < first:
+        return []
+    width = _width(tier)
+    key = ring_key(metric, tier, prefix)
+
+    # The bucket range maps onto one or two (wrapped) slot ranges.
+    ranges = []
+    bucket = first
+    while bucket <= last:
+        slot = bucket % tier.slots
+        n = min(last - bucket + 1, tier.slots - slot)
+        ranges.append((bucket, slot, n))
+        bucket += n
+    pipe = redis.pipeline(transaction=False)
+    for _, slot, n in ranges:
+        pipe.getrange(key, slot * width, (slot + n) * width - 1)
+    chunks = pipe.execute()
+
+    points = []
+    for (bucket0, _, n), raw in zip(ranges, chunks):
+        raw = raw or b""
+        for i in range(min(n, len(raw) // width)):
+            expected = (bucket0 + i) * tier.step
+            if tier is RAW:
+                ts, value = _RAW_SLOT.unpack_from(raw, i * width)
+                if ts // tier.step * tier.step != expected or ts < start or ts > end:
+                    continue
+                points.append(Point(float(ts), value, value, value, value, 1))
+            else:
+                b, count, lo, hi, total, last_value = _ROLLUP_SLOT.unpack_from(raw, i * width)
+                if b != expected or count == 0:
+                    continue
+                points.append(Point(float(b), lo, hi, total / count, last_value, count))
+    return points
+
+
+def resample(points: list[Point], step: float) -> list[Point]:
+    """Merge points into `step`-second buckets (count-weighted avg)."""
+    out: list[Point] = []
+    for p in points:
+        bucket = p.ts // step * step
+        if out and out[-1].ts == bucket:
+            q = out[-1]
+            count = q.count + p.count
+            out[-1] = Point(bucket, min(q.min, p.min), max(q.max, p.max),
+                            (q.avg * q.count + p.avg * p.count) / count, p.last, count)
+        else:
+            out.append(p._replace(ts=bucket))
+    return out
+
+
+def query(redis, metric: str, start: float, end: float, step: float | None = None,
+          prefix: str = DEFAULT_PREFIX) -> list[Point]:
+    """Points of `metric` in [start, end], from the best tier, resampled to `step` if given.
+
+    Fail-safe: returns [] on any Redis error.
+    """
+    try:
+        tier = pick_tier(start, end, step)
+        points = read_tier(redis, metric, tier, start, end, prefix)
+    except Exception as e:
+        logger.debug(f"[timeseries] query {metric} failed: {e}")
+        return []
+    if step and step > tier.step:
+        points = resample(points, step)
+    return points
+
+
+def memory_bytes(tiers: tuple[Tier, ...] = TIERS) -> int:
+    """Payload bytes of one fully populated metric across `tiers`."""
+    return sum(t.slots * _width(t) for t in tiers)
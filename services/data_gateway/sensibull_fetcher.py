@@ -22,6 +22,7 @@ from lib.logging_util import get_logger
 logger = get_logger("data-gateway")
 from services.common.stock_proxy import StockProxy
 from services.common.rate_limiter import get_sensibull_limiter, retry_on_429
+from services.common.serialization import dataframe_to_json, dataframe_from_json
 
 
 SENSIBULL_BASE = "https://oxide.sensibull.com/v1/compute"
@@ -676,11 +677,11 @@ def publish_to_redis(redis_proxy, symbol: str, current_data: dict | None,
     mapping = {
         "last_fetch_time": str(ctx.get("last_fetch_time", "")),
         "current_json": json.dumps(ctx.get("current", {}), default=str),
-        "historical_data_json": ctx.get("historical_data", pd.DataFrame()).to_json(orient="split", date_format="iso") if isinstance(ctx.get("historical_data"), pd.DataFrame) else "{}",
+        "historical_data_json": dataframe_to_json(ctx.get("historical_data")) if isinstance(ctx.get("historical_data"), pd.DataFrame) else "{}",
         "oi_chain_json": json.dumps(ctx.get("oi_chain"), default=str) if ctx.get("oi_chain") else "null",
         "oi_chain_history_json": json.dumps(ctx.get("oi_chain_history", []), default=str),
-        "iv_chart_history_json": ctx.get("iv_chart_history", pd.DataFrame()).to_json(orient="split", date_format="iso") if isinstance(ctx.get("iv_chart_history"), pd.DataFrame) else "{}",
-        "oi_history_json": ctx.get("oi_history", pd.DataFrame()).to_json(orient="split", date_format="iso") if isinstance(ctx.get("oi_history"), pd.DataFrame) else "{}",
+        "iv_chart_history_json": dataframe_to_json(ctx.get("iv_chart_history")) if isinstance(ctx.get("iv_chart_history"), pd.DataFrame) else "{}",
+        "oi_history_json": dataframe_to_json(ctx.get("oi_history")) if isinstance(ctx.get("oi_history"), pd.DataFrame) else "{}",
     }
 
     redis_proxy.hset(f"data:sensibull:{symbol}", mapping=mapping)
@@ -849,7 +850,7 @@ def _deserialize_sensibull_ctx(raw: dict) -> dict:
     ctx["last_fetch_time"] = raw.get("last_fetch_time")
 
     hist_json = raw.get("historical_data_json", "{}")
-    ctx["historical_data"] = pd.read_json(hist_json, orient="split") if hist_json != "{}" else pd.DataFrame()
+    ctx["historical_data"] = dataframe_from_json(hist_json)
 
     oi_chain_raw = raw.get("oi_chain_json", "null")
     ctx["oi_chain"] = json.loads(oi_chain_raw) if oi_chain_raw != "null" else None
@@ -858,9 +859,9 @@ def _deserialize_sensibull_ctx(raw: dict) -> dict:
     ctx["oi_chain_history"] = json.loads(hist_list_raw) if hist_list_raw != "[]" else []
 
     iv_chart_raw = raw.get("iv_chart_history_json", "{}")
-    ctx["iv_chart_history"] = pd.read_json(iv_chart_raw, orient="split") if iv_chart_raw != "{}" else pd.DataFrame()
+    ctx["iv_chart_history"] = dataframe_from_json(iv_chart_raw)
 
     oi_hist_raw = raw.get("oi_history_json", "{}")
-    ctx["oi_history"] = pd.read_json(oi_hist_raw, orient="split") if oi_hist_raw != "{}" else pd.DataFrame()
+    ctx["oi_history"] = dataframe_from_json(oi_hist_raw)
 
     return ctx
@@ -22,6 +22,7 @@ from lib.logging_util import get_logger
 logger = get_logger("data-gateway")
 from common.helperFunctions import get_stock_objects_from_json
 from services.common.stock_proxy import StockProxy
+from services.common.serialization import dataframe_to_json
 
 
 def _get_prev_day_row(df: pd.DataFrame):
@@ -245,7 +246,7 @@ def _fetch_index_initial(redis_proxy, index_list, is_intraday):
                 daily_hv = float(returns.std() * (252 ** 0.5) * 100) if len(returns) > 1 else None
 
                 mapping = {
-                    "priceData_json": idx_data.to_json(orient="split", date_format="iso"),
+                    "priceData_json": dataframe_to_json(idx_data),
                     "prevDayOHLCV_json": __import__("json").dumps(prev_day, default=str),
                     "ltp": "",
                     "ltp_change_perc": "",
@@ -307,7 +308,7 @@ def _fetch_stock_initial(redis_proxy, stock_list, is_intraday):
                 daily_hv = float(returns.std() * (252 ** 0.5) * 100) if len(returns) > 1 else None
 
                 mapping = {
-                    "priceData_json": stk_data.to_json(orient="split", date_format="iso"),
+                    "priceData_json": dataframe_to_json(stk_data),
                     "prevDayOHLCV_json": __import__("json").dumps(prev_day, default=str),
                     "ltp": "",
                     "ltp_change_perc": "",
@@ -362,7 +363,7 @@ def _fetch_commodity_initial(redis_proxy, commodity_list, is_intraday):
                 )
                 sym_data = sym_data.dropna(how="all")
                 mapping = {
-                    "priceData_json": sym_data.to_json(orient="split", date_format="iso"),
+                    "priceData_json": dataframe_to_json(sym_data),
                     "prevDayOHLCV_json": __import__("json").dumps(prev_day, default=str),
                     "ltp": "",
                     "ltp_change_perc": "",
@@ -416,7 +417,7 @@ def _fetch_global_indices_initial(redis_proxy, global_indices_list, is_intraday)
                 )
                 sym_data = sym_data.dropna(how="all")
                 mapping = {
-                    "priceData_json": sym_data.to_json(orient="split", date_format="iso"),
+                    "priceData_json": dataframe_to_json(sym_data),
                     "prevDayOHLCV_json": __import__("json").dumps(prev_day, default=str),
                     "ltp": "",
                     "ltp_change_perc": "",
@@ -518,7 +519,7 @@ def _download_group(redis_proxy, symbols: list[str], period: str, interval: str,
             else:
                 stock_key = symbol.replace(".NS", "")
             mapping = {
-                "priceData_json": sym_data.to_json(orient="split", date_format="iso"),
+                "priceData_json": dataframe_to_json(sym_data),
                 "last_price_update": str(pd.Timestamp.now(tz="Asia/Kolkata")),
             }
             redis_proxy.hset(f"data:price:{stock_key}", mapping=mapping)
@@ -23,6 +23,7 @@ logger = get_logger("data-gateway")
 from lib.zerodha.zerodha_connect import KiteConnect
 from common import constants as constant
 from services.common.rate_limiter import get_zerodha_limiter
+from services.common.serialization import dataframe_to_json
 
 
 AUTH_HASH = "auth:zerodha"
@@ -329,16 +330,12 @@ class ZerodhaFuturesManager:
             # Serialize and publish to Redis
             mapping = {}
             if current_result is not None and not current_result.empty:
-                mapping["futures_data_current_json"] = current_result.to_json(
-                    orient="split", date_format="iso"
-                )
+                mapping["futures_data_current_json"] = dataframe_to_json(current_result)
             else:
                 mapping["futures_data_current_json"] = "{}"
 
             if next_result is not None and not next_result.empty:
-                mapping["futures_data_next_json"] = next_result.to_json(
-                    orient="split", date_format="iso"
-                )
+                mapping["futures_data_next_json"] = dataframe_to_json(next_result)
             else:
                 mapping["futures_data_next_json"] = "{}"
 
@@ -33,6 +33,7 @@ from datetime import datetime
 from urllib.parse import quote
 
 import pandas as pd
+import redis as sync_redis
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -60,6 +61,7 @@ from lib.zerodha.zerodha_connect import KiteConnect
 from lib.zerodha.live_options_engine import LiveOptionsEngine
 from lib.zerodha.live_stock_engine import LiveStockEngine
 from .sensibull_feed import SensibullFeed
+from .ws_capture import WSRecorder
 from lib.fno.sensibull_adapter import SensibullAdapter
 from lib.notification.Notification import TELEGRAM_NOTIFICATIONS
 
@@ -329,7 +331,8 @@ def _start_auth_commands_consumer(redis: RedisProxy, tm: ZerodhaTickerManager):
 
 # ── Sensibull feed startup ─────────────────────────────────────────────────
 
-def _start_sensibull_feeds(tm: ZerodhaTickerManager, enrichment_only: bool):
+def _start_sensibull_feeds(tm: ZerodhaTickerManager, enrichment_only: bool,
+                           recorder: WSRecorder | None = None):
     """Start Sensibull WS feeds for LIVE_OPTIONS_INDICES."""
     adapter = SensibullAdapter()
     feeds = []
@@ -359,7 +362,7 @@ def _start_sensibull_feeds(tm: ZerodhaTickerManager, enrichment_only: bool):
                     logger.error(f"[market-data] Sensibull snapshot error for {stock.stock_symbol}: {exc}")
             return _on_snapshot
 
-        feed = SensibullFeed(subscriptions, on_snapshot=make_callback(captured))
+        feed = SensibullFeed(subscriptions, on_snapshot=make_callback(captured), recorder=recorder)
         feed.start()
         feeds.append(feed)
         started.append(symbol)
@@ -375,6 +378,21 @@ def _start_sensibull_feeds(tm: ZerodhaTickerManager, enrichment_only: bool):
 
 _prev_total_ticks = 0
 
+
+def _tick_dispatch_stats(tm: ZerodhaTickerManager) -> dict:
+    """stats:system fields for the tick dispatcher (depth, coalescing, tick age)."""
+    stats = tm.tick_dispatcher.stats()
+    return {
+        "tick_queue_depth": str(stats["depth"]),
+        "tick_shard_depth": ",".join(str(s["depth"]) for s in stats["shards"]),
+        "ticks_coalesced": str(stats["coalesced"]),
+        "tick_age_p50_ms": f"{stats['age_ms']['p50']:.0f}",
+        "tick_age_p99_ms": f"{stats['age_ms']['p99']:.0f}",
+        "tick_latency_p50_ms": f"{stats['latency_ms']['p50']:.1f}",
+        "tick_latency_p99_ms": f"{stats['latency_ms']['p99']:.1f}",
+    }
+
+
 def _update_heartbeat(redis: RedisProxy, tm: ZerodhaTickerManager,
                       publisher: SnapshotPublisher | None = None):
     global _prev_total_ticks
@@ -406,7 +424,11 @@ def _update_heartbeat(redis: RedisProxy, tm: ZerodhaTickerManager,
         "ws2_reconnects": str(ws2_reconnects),
         "sensibull_feeds": str(sensibull_count),
         "last_equity_tick": str(shared.app_ctx.last_equity_tick_time),
+        # Received from the WS, before per-token coalescing (a burst for one
+        # token is applied once); tick_processed counts ticks applied.
         "tick_count": str(tm._tick_count),
+        "tick_processed": str(tm._processed_tick_count),
+        "tick_queue_depth": str(tm.tick_dispatcher.depth()),
         "version": _BUILD_LABEL,
         "commit": _GIT_COMMIT,
         "dirty": str(_GIT_DIRTY),
@@ -427,6 +449,8 @@ def _update_heartbeat(redis: RedisProxy, tm: ZerodhaTickerManager,
             int(time.time() - publisher.last_publish_time)
             if publisher and publisher.last_publish_time else 0
         ),
+        **(publisher.stats() if publisher else {}),
+        **_tick_dispatch_stats(tm),
     )
 
     # ── Per-stock tick counters (batch via set_stock) ───────────────────
@@ -507,7 +531,8 @@ def main():
     shared.app_ctx.options_source = options_source
     logger.info(f"[market-data] OPTIONS_SOURCE={options_source}")
 
-    tm.live_options_engine = LiveOptionsEngine()
+    # Binary client: the engine persists per-symbol history as packed records
+    tm.live_options_engine = LiveOptionsEngine(sync_redis.from_url(redis_url))
     logger.info("[market-data] LiveOptionsEngine attached")
 
     signal_bus = RedisSignalBus(redis)
@@ -515,6 +540,16 @@ def main():
     tm.live_stock_engine = LiveStockEngine(signal_bus)
     logger.info("[market-data] LiveStockEngine attached (RedisSignalBus)")
 
+    # Optional raw-frame capture for offline replay (services/market_data/replay.py)
+    recorder = None
+    capture_dir = os.getenv(constant.ENV_WS_CAPTURE_DIR, "")
+    if capture_dir:
+        recorder = WSRecorder(capture_dir)
+        recorder.save_registry(registry, options_source=options_source,
+                               stock_expires=shared.app_ctx.stockExpires)
+        recorder.start()
+        tm.ws_recorder = recorder
+
     # 7. Connect WS
     if tm.connect():
         logger.info("[market-data] Zerodha WS1 + WS2 connected")
@@ -535,7 +570,7 @@ def main():
 
     # 9. Start Sensibull feeds
     enrichment_only = options_source == "both"
-    _start_sensibull_feeds(tm, enrichment_only=enrichment_only)
+    _start_sensibull_feeds(tm, enrichment_only=enrichment_only, recorder=recorder)
 
     # 10. Start snapshot publisher
     stock_objs = list(shared.app_ctx.stock_token_obj_dict.values())
@@ -581,6 +616,9 @@ def main():
             except Exception:
                 pass
 
+    if recorder is not None:
+        recorder.stop()
+
     redis.hset("service:registry:market-data", mapping={
         "status": "shutdown",
         "last_heartbeat": str(time.time()),
@@ -0,0 +1,239 @@
+"""
+Replay a recorded WS capture through the market-data tick path.
+
+Feeds the frames written by WSRecorder (services/market_data/ws_capture.py)
+back through the same code the live service runs: Zerodha WS1/WS2 frames go
+into KiteTicker._on_message → _parse_binary → ZerodhaTickerManager.on_ticks →
+TickDispatcher → TickStore, Sensibull frames into _decode_frame →
+SensibullAdapter.apply. The LiveOptionsEngine, LiveStockEngine (publishing to
+Redis) and SnapshotPublisher run as in production, against a scratch Redis
+database (db 15 by default) so a replay never overwrites the live services'
+data:* snapshots or signals in db 0.
+
+Frames are paced by their recorded receive times divided by --speed
+(``max`` = no pacing). At the end it reports throughput, dispatcher queue
+depth and tick latency, and snapshot-publish duration.
+
+Usage:
+    python -m services.market_data.replay data/ws_capture/20260526-091200
+    python -m services.market_data.replay <session> --speed 10 --redis-url redis://localhost:6379/14
+    python -m services.market_data.replay <session> --speed max --no-publish
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import common.shared as shared
+from common.Stock import Stock
+from common.token_registry import TokenRegistry, TokenType
+from lib.logging_util import get_logger
+from services.common.percentiles import percentiles
+from services.market_data.ws_capture import load_registry, read_frames
+logger = get_logger("market-data")
+
+# db 15, not the live services' db 0: a replay writes data:* snapshots and signals.
+DEFAULT_REDIS_URL = "redis://localhost:6379/15"
+
+_PARENT_DICTS = {
+    TokenType.EQUITY: "stock_token_obj_dict",
+    TokenType.INDEX: "index_token_obj_dict",
+    TokenType.COMMODITY: "commodity_token_obj_dict",
+    TokenType.GLOBAL_INDEX: "global_indices_token_obj_dict",
+}
+
+
+def build_context(snapshot: dict) -> TokenRegistry:
+    """Registry and parent Stock objects for a session, installed in shared.app_ctx."""
+    registry = TokenRegistry.from_dict(snapshot)
+    ctx = shared.app_ctx
+    ctx.token_registry = registry
+    meta = snapshot.get("meta", {})
+    ctx.options_source = meta.get("options_source", "zerodha")
+    ctx.stockExpires = list(meta.get("stock_expires") or [])
+
+    for entry in snapshot.get("tokens", []):
+        token_type = TokenType(entry["token_type"])
+        attr = _PARENT_DICTS.get(token_type)
+        if attr is None:
+            continue
+        symbol = entry["parent_symbol"]
+        stock = Stock(symbol, symbol, is_index=token_type != TokenType.EQUITY)
+        getattr(ctx, attr)[entry["token"]] = stock
+        registry.set_parent_object(symbol, stock)
+    return registry
+
+
+class Replayer:
+    """Drive one capture session through a ZerodhaTickerManager."""
+
+    def __init__(self, session_path: str, redis=None, speed: float = 1.0, signals: bool = True):
+        from lib.fno.sensibull_adapter import SensibullAdapter
+        from lib.zerodha.live_options_engine import LiveOptionsEngine
+        from lib.zerodha.live_stock_engine import LiveStockEngine
+        from lib.zerodha.zerodha_analysis import ZerodhaTickerManager
+        from services.market_data.signal_publisher import RedisSignalBus
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+
+        snapshot = load_registry(session_path)
+        if snapshot is None:
+            raise FileNotFoundError(f"{session_path}: no registry.json — not a WSRecorder session")
+        build_context(snapshot)
+
+        self.session_path = session_path
+        self.speed = speed
+
+        self.tm = ZerodhaTickerManager("replay", "replay", "replay")
+        shared.app_ctx.zd_ticker_manager = self.tm
+        self.tm.live_options_engine = LiveOptionsEngine()
+        if redis is not None and signals:
+            self.tm.live_stock_engine = LiveStockEngine(RedisSignalBus(redis))
+        # Offline tickers: never connected, only used for their frame handling.
+        self.tm._init_kite_ticker_base()
+        self.tm._init_kite_ticker_options()
+        self._tickers = {"ws1": self.tm._kt_base, "ws2": self.tm._kt_options}
+
+        self._adapter = SensibullAdapter()
+        self._enrichment_only = shared.app_ctx.options_source == "both"
+
+        self.publisher = None
+        if redis is not None:
+            self.publisher = SnapshotPublisher(
+                redis,
+                list(shared.app_ctx.stock_token_obj_dict.values()),
+                list(shared.app_ctx.index_token_obj_dict.values()),
+            )
+
+        self.frames = 0
+        self.bytes = 0
+        self.max_depth = 0
+        self.publish_ms: list[float] = []
+        self._last_publish_time = 0.0
+
+    def _on_sensibull(self, payload: bytes) -> None:
+        from services.market_data.sensibull_feed import _decode_frame
+        data = _decode_frame(payload)
+        if data is None:
+            return
+        token = data.pop("_underlying_token", None)
+        stock = shared.app_ctx.index_token_obj_dict.get(token)
+        if stock is None:
+            return
+        try:
+            self._adapter.apply(stock, data, self.tm.live_options_engine,
+                                enrichment_only=self._enrichment_only)
+        except Exception as e:
+            logger.error(f"[replay] Sensibull snapshot error for {stock.stock_symbol}: {e}")
+
+    def _sample(self) -> None:
+        depth = self.tm.tick_dispatcher.depth()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        publisher = self.publisher
+        if publisher is not None and publisher.last_publish_time != self._last_publish_time:
+            self._last_publish_time = publisher.last_publish_time
+            self.publish_ms.append(publisher.last_publish_duration_ms)
+
+    def run(self, limit: int | None = None) -> dict:
+        self.tm.start_tick_processor()
+        if self.publisher is not None:
+            self.publisher.start()
+
+        first_ts = None
+        start = time.perf_counter()
+        try:
+            for frame in read_frames(self.session_path):
+                if limit is not None and self.frames >= limit:
+                    break
+                if self.speed > 0:
+                    if first_ts is None:
+                        first_ts = frame.received_at
+                    delay = (frame.received_at - first_ts) / self.speed - (time.perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+
+                if frame.stream == "sensibull":
+                    self._on_sensibull(frame.payload)
+                else:
+                    ticker = self._tickers.get(frame.stream)
+                    if ticker is not None:
+                        ticker._on_message(None, frame.payload, frame.binary)
+                self.frames += 1
+                self.bytes += len(frame.payload)
+                self._sample()
+            fed = time.perf_counter() - start
+
+            while self.tm.tick_dispatcher.depth():
+                self._sample()
+                time.sleep(0.001)
+            elapsed = time.perf_counter() - start
+            if self.publisher is not None:
+                # Let one more pass publish the final state.
+                time.sleep(self.publisher.INTERVAL)
+                self._sample()
+        finally:
+            self.tm.stop_tick_processor()
+            if self.publisher is not None:
+                self.publisher.stop()
+
+        dispatch = self.tm.tick_dispatcher.stats()
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "ticks": dispatch["received"],
+            "processed": dispatch["processed"],
+            "coalesced": dispatch["coalesced"],
+            "feed_s": fed,
+            "elapsed_s": elapsed,
+            "frames_per_s": self.frames / fed if fed else 0.0,
+            "ticks_per_s": dispatch["processed"] / elapsed if elapsed else 0.0,
+            "max_queue_depth": self.max_depth,
+            "latency_ms": dispatch["latency_ms"],
+            "publish_ms": percentiles(self.publish_ms),
+            "publishes": len(self.publish_ms),
+        }
+
+
+def _parse_speed(value: str) -> float:
+    return 0.0 if value == "max" else float(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("session", help="capture session directory (or one .wscap segment)")
+    parser.add_argument("--speed", type=_parse_speed, default=1.0, help="1, N (x real time) or max")
+    parser.add_argument("--redis-url", default=DEFAULT_REDIS_URL,
+                        help=f"scratch Redis to publish into (default {DEFAULT_REDIS_URL}, not the live db 0)")
+    parser.add_argument("--no-publish", action="store_true", help="run without Redis (no snapshots/signals)")
+    parser.add_argument("--no-signals", action="store_true", help="skip LiveStockEngine")
+    parser.add_argument("--limit", type=int, default=None, help="stop after N frames")
+    args = parser.parse_args()
+    # Metric writers (services/common/metrics.py) connect via REDIS_URL; keep
+    # them on the replay database too.
+    os.environ["REDIS_URL"] = args.redis_url
+
+    redis = None
+    if not args.no_publish:
+        from services.common.redis_proxy import RedisProxy
+        redis = RedisProxy(args.redis_url)
+
+    replayer = Replayer(args.session, redis=redis, speed=args.speed, signals=not args.no_signals)
+    result = replayer.run(limit=args.limit)
+
+    speed = "max" if args.speed <= 0 else f"{args.speed:g}x"
+    print(f"\nReplayed {result['frames']:,} frames ({result['bytes'] / 1e6:.1f} MB) at {speed}")
+    print(f"  ticks              {result['ticks']:,} received, {result['processed']:,} processed, "
+          f"{result['coalesced']:,} coalesced")
+    print(f"  throughput         {result['frames_per_s']:,.0f} frames/s, {result['ticks_per_s']:,.0f} ticks/s")
+    print(f"  max queue depth    {result['max_queue_depth']:,}")
+    lat = result["latency_ms"]
+    print(f"  tick latency (ms)  p50 {lat['p50']:.2f}  p95 {lat['p95']:.2f}  p99 {lat['p99']:.2f}  max {lat['max']:.2f}")
+    if redis is not None:
+        pub = result["publish_ms"]
+        print(f"  snapshot (ms)      p50 {pub['p50']:.1f}  p95 {pub['p95']:.1f}  p99 {pub['p99']:.1f}  "
+              f"max {pub['max']:.1f}  ({result['publishes']} passes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,17 @@ Binary frame format (reverse-engineered):
   - Single byte 0xFD  → heartbeat, ignored
   - Longer frames     → [1-byte type][4-byte instrument_token BE][8-byte ASCII expiry][gzip JSON]
 
+Decoding runs off the receive thread. ``_on_message`` reads only the
+underlying token from the header and parks the raw frame in a per-underlying
+slot. A newer frame replaces an undecoded older one, since every frame is a
+full chain. A ``SensibullDecode`` thread then handles each frame:
+  - it skips frames whose content matches the previous snapshot for that
+    underlying, comparing the gzip trailer (CRC-32 and size of the JSON)
+    before decompressing;
+  - it decompresses and parses the rest;
+  - it projects the chain onto the fields ``SensibullAdapter`` reads
+    (``_compact_snapshot``) before calling ``on_snapshot``.
+
 Usage::
 
     feed = SensibullFeed(
@@ -20,9 +31,10 @@ Usage::
 """
 from __future__ import annotations
 
-import gzip
 import json
 import threading
+import time
+import zlib
 from typing import Callable
 
 import websocket
@@ -44,6 +56,10 @@ _WS_HEADERS = [
     "Pragma: no-cache",
 ]
 
+# Fields SensibullAdapter reads; everything else in the chain is dropped at decode.
+_GREEK_FIELDS = ("call_delta", "gamma", "theta", "vega", "iv")
+_LEG_FIELDS = ("last_price", "oi", "oi_change_quantity", "volume", "best_buy_price", "best_sell_price")
+
 
 class SensibullFeed:
     """
@@ -57,24 +73,48 @@ class SensibullFeed:
     on_snapshot:
         Callback fired on each decoded data frame.
         Signature: ``(underlying_token: int, data: dict) -> None``
+    recorder:
+        Optional ``WSRecorder`` (services/market_data/ws_capture.py) that
+        receives every raw frame before it is decoded.
+
+    ``on_snapshot`` runs on the decode thread, never on the WebSocket thread.
     """
 
     def __init__(
         self,
         subscriptions: list[dict],
         on_snapshot: Callable[[int, dict], None],
+        recorder=None,
     ) -> None:
         self._subscriptions = subscriptions
         self._on_snapshot = on_snapshot
+        self._recorder = recorder
         self._ws: websocket.WebSocketApp | None = None
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
 
+        # underlying token -> newest undecoded frame (full chains, so older ones are stale)
+        self._pending: dict[int, bytes] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._decoder: threading.Thread | None = None
+        self._last_content: dict[int, bytes] = {}
+
+        self.frames = 0
+        self.decoded = 0
+        self.unchanged = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.decode_ms_total = 0.0
+        self.last_decode_ms = 0.0
+
     # ── public API ────────────────────────────────────────────────────────────
 
     def start(self) -> None:
         """Launch the WebSocket in a background daemon thread."""
         self._stop_event.clear()
+        self._decoder = threading.Thread(target=self._decode_loop, daemon=True, name="SensibullDecode")
+        self._decoder.start()
         self._thread = threading.Thread(target=self._run, daemon=True, name="SensibullFeed")
         self._thread.start()
         logger.info(f"[SensibullFeed] started — {len(self._subscriptions)} subscription(s)")
@@ -82,10 +122,24 @@ class SensibullFeed:
     def stop(self) -> None:
         """Request a clean shutdown."""
         self._stop_event.set()
+        self._wake.set()
         if self._ws:
             self._ws.close()
         logger.info("[SensibullFeed] stop requested")
 
+    def stats(self) -> dict:
+        """Frame and decode counters (all since start)."""
+        return {
+            "frames": self.frames,
+            "decoded": self.decoded,
+            "unchanged": self.unchanged,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "pending": len(self._pending),
+            "decode_ms_avg": round(self.decode_ms_total / self.decoded, 2) if self.decoded else 0.0,
+            "decode_ms_last": round(self.last_decode_ms, 2),
+        }
+
     # ── internal ─────────────────────────────────────────────────────────────
 
     def _run(self) -> None:
@@ -126,15 +180,49 @@ class SensibullFeed:
         logger.info(f"[SensibullFeed] subscribed: {self._subscriptions}")
 
     def _on_message(self, ws, raw: bytes) -> None:
-        data = _decode_frame(raw)
-        if data is None:
+        if self._recorder is not None:
+            self._recorder.record("sensibull", raw, isinstance(raw, bytes))
+        if len(raw) < 5:
+            return  # heartbeat
+        self.frames += 1
+        token = int.from_bytes(raw[1:5], byteorder="big")
+        with self._pending_lock:
+            if token in self._pending:
+                self.coalesced += 1
+            self._pending[token] = raw
+        self._wake.set()
+
+    def _decode_loop(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+            for raw in batch.values():
+                self._process(raw)
+
+    def _process(self, raw: bytes) -> None:
+        t0 = time.perf_counter()
+        frame = _split_frame(raw)
+        if frame is None:
             return
-
-        # The header carries the underlying instrument_token in bytes 1–4
-        underlying_token = data.pop("_underlying_token", None)
+        underlying_token, expiry_str, gz = frame
         if underlying_token is None:
+            return  # header too short to carry the underlying's token
+        content = gz[-8:]
+        if self._last_content.get(underlying_token) == content:
+            self.unchanged += 1
+            return
+        data = _decode_payload(gz, underlying_token, expiry_str)
+        if data is None:
+            self.failed += 1
             return
+        self._last_content[underlying_token] = content
+        self.decoded += 1
+        self.last_decode_ms = (time.perf_counter() - t0) * 1000
+        self.decode_ms_total += self.last_decode_ms
 
+        data.pop("_underlying_token", None)
         try:
             self._on_snapshot(underlying_token, data)
         except Exception as exc:
@@ -160,9 +248,19 @@ def _decode_frame(raw: bytes) -> dict | None:
       - 8 bytes : ASCII expiry string "YYYYMMDD"
       - rest    : gzip-compressed JSON payload
 
-    Returns decoded dict with injected keys ``_underlying_token`` and
-    ``_header_expiry``, or None for heartbeats / decode failures.
+    Returns the compact snapshot (see ``_compact_snapshot``) with injected keys
+    ``_underlying_token`` and ``_header_expiry``, or None for heartbeats /
+    decode failures.
     """
+    frame = _split_frame(raw)
+    if frame is None:
+        return None
+    underlying_token, expiry_str, gz = frame
+    return _decode_payload(gz, underlying_token, expiry_str)
+
+
+def _split_frame(raw: bytes) -> tuple[int | None, str, bytes] | None:
+    """(underlying_token, header expiry, gzip payload), or None for heartbeats."""
     if len(raw) <= 2:
         return None  # heartbeat
 
@@ -184,12 +282,38 @@ def _decode_frame(raw: bytes) -> dict | None:
     if len(header) >= 13:
         expiry_str = header[5:13].decode("ascii", errors="replace")
 
+    return underlying_token, expiry_str, raw[idx:]
+
+
+def _decode_payload(gz: bytes, underlying_token: int | None, expiry_str: str) -> dict | None:
     try:
-        payload = gzip.decompress(raw[idx:])
-        data = json.loads(payload)
-        data["_underlying_token"] = underlying_token
-        data["_header_expiry"] = expiry_str
-        return data
+        data = _compact_snapshot(json.loads(zlib.decompress(gz, 16 + zlib.MAX_WBITS)))
     except Exception as exc:
         logger.warning(f"[SensibullFeed] decode failed: {exc}")
         return None
+    data["_underlying_token"] = underlying_token
+    data["_header_expiry"] = expiry_str
+    return data
+
+
+def _compact_snapshot(data: dict) -> dict:
+    """
+    Keep the header stats (top-level scalars) and, per strike, only the
+    fields SensibullAdapter reads: greeks (call_delta/gamma/theta/vega/iv),
+    iv_change, and ltp/oi/oi change/volume/best bid/best ask per leg.
+    """
+    out = {k: v for k, v in data.items() if not isinstance(v, (dict, list))}
+    chain = {}
+    for strike, row in (data.get("chain") or {}).items():
+        greeks = row.get("greeks") or {}
+        compact = {
+            "greeks": {k: greeks[k] for k in _GREEK_FIELDS if k in greeks},
+            "iv_change": row.get("iv_change"),
+        }
+        for side in ("call", "put"):
+            leg = row.get(side)
+            if leg:
+                compact[side] = {k: leg[k] for k in _LEG_FIELDS if k in leg}
+        chain[strike] = compact
+    out["chain"] = chain
+    return out
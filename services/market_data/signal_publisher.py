@@ -4,7 +4,8 @@ RedisSignalBus — drop-in replacement for in-memory SignalBus.
 Live engines (LiveOptionsEngine, LiveStockEngine) emit Signal objects
 to this bus instead of the in-process thread pub/sub. Signals are
 published to the Redis stream `intelligence:signals` so the monolith's
-SignalCorrelator can consume them cross-process.
+SignalCorrelator can consume them cross-process. With SIGNAL_PARTITIONS > 1
+each signal goes to its symbol's partition stream (lib/intelligence/partition.py).
 
 Implements the same interface as intelligence.signal_bus.SignalBus so
 it can be used as a transparent replacement.
@@ -21,7 +22,8 @@ if TYPE_CHECKING:
 from lib.intelligence.signal import Signal
 from lib.logging_util import get_logger
 logger = get_logger("market-data")
-from common.constants import SIGNALS_STREAM
+from lib.intelligence.partition import stream_for
+import common.constants as constant
 
 Subscriber = Callable[[Signal], None]
 
@@ -34,8 +36,9 @@ class RedisSignalBus:
     consumer group to detect cross-layer confluence.
     """
 
-    def __init__(self, redis: "RedisProxy"):
+    def __init__(self, redis: "RedisProxy", partitions: int | None = None):
         self._redis = redis
+        self._partitions = partitions or constant.SIGNAL_PARTITIONS
         self._total_emitted = 0
 
     def subscribe(self, callback: Subscriber):
@@ -43,7 +46,7 @@ class RedisSignalBus:
 
     def emit(self, signal: Signal):
         context_json = json.dumps(signal.context, default=str) if signal.context else "{}"
-        self._redis.xadd(SIGNALS_STREAM, {
+        self._redis.xadd(stream_for(signal.symbol, self._partitions), {
             "symbol": signal.symbol,
             "direction": signal.direction.name,
             "source": signal.source,
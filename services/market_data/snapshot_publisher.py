@@ -6,11 +6,27 @@ and writes to Redis hashes so that the monolith (bot commands, narrator,
 check_data_freshness) and analysis-engine workers can read live tick data
 without holding WebSocket connections.
 
+Each pass batches every data:tick / data:options_agg / data:futures_live write
+into non-transactional pipelines (PIPELINE_CHUNK commands per round trip) and
+skips symbols whose tick counters have not moved since the previous pass. The
+loop runs on a fixed-rate schedule (monotonic deadlines, not sleep-after-work),
+so a slow pass eats into its own slot instead of pushing every later one back.
+
+data:options_live is delta-published: TickStore marks each strike/side dirty
+when it is written, and every pass HSETs only the dirty fields plus the
+snapshot metadata (_seq, _version, _ts) in one MULTI/EXEC transaction. The
+hash is never deleted, so readers never observe an empty chain; _seq lets a
+reader tell whether two reads came from the same snapshot.
+
+A pass that wrote anything ends with INCR data:snapshot:seq in its last
+pipeline, so a reader that caches these hashes knows when to drop them.
+
 Redis keys written:
   data:tick:{symbol}          — equity/index tick (last_price, ohlc, volume, ...)
-  data:options_live:{symbol}  — per-strike CE/PE tick JSON (DELETE + HSET)
+  data:options_live:{symbol}  — per-strike CE/PE tick JSON (changed fields only)
   data:options_agg:{symbol}   — aggregate metrics (PCR, ATM, walls, gex_*, ...)
   data:futures_live:{symbol}  — current/next futures tick
+  data:snapshot:seq           — pass counter (SNAPSHOT_SEQ_KEY)
 """
 from __future__ import annotations
 
@@ -28,34 +44,90 @@ logger = get_logger("market-data")
 from services.common.metrics import set_stock
 
 
+class _BatchWriter:
+    """Accumulates HSETs into a non-transactional pipeline, flushing every ``chunk_size``."""
+
+    def __init__(self, redis: "RedisProxy", chunk_size: int):
+        self._redis = redis
+        self._chunk_size = chunk_size
+        self._pipe = None
+        self._pending = 0
+        self.written = 0
+
+    def hset(self, key: str, mapping: dict) -> None:
+        if self._pipe is None:
+            self._pipe = self._redis.pipeline(transaction=False)
+        self._pipe.hset(key, mapping=mapping)
+        self._pending += 1
+        self.written += 1
+        if self._pending >= self._chunk_size:
+            self.flush()
+
+    def incr(self, key: str) -> None:
+        """Queue an INCR behind the pending writes (not counted in ``written``)."""
+        if self._pipe is None:
+            self._pipe = self._redis.pipeline(transaction=False)
+        self._pipe.incr(key)
+        self._pending += 1
+
+    def flush(self) -> None:
+        if self._pipe is not None and self._pending:
+            self._pipe.execute()
+        self._pipe = None
+        self._pending = 0
+
+
 class SnapshotPublisher:
     """Publishes tick snapshots to Redis at a fixed interval."""
 
     INTERVAL = 1.0  # seconds
+    PIPELINE_CHUNK = 500  # HSETs per pipeline round trip
 
     def __init__(self, redis: "RedisProxy", stock_objs: list, index_objs: list):
         self._redis = redis
         self._stock_objs = stock_objs
         self._index_objs = index_objs
         self._running = False
+        self._stop_event = threading.Event()
         self._thread: threading.Thread | None = None
         self.publish_count = 0
         self.last_publish_time = 0.0
+        # Symbols whose data:options_live hash has been fully resynced since start
+        self._options_synced: set[str] = set()
+        self.options_fields_written = 0
+
+        # Change markers from the last successful pass — a symbol whose marker
+        # is unchanged is skipped. Cleared on any write failure (full rewrite).
+        self._last_tick_marker: dict[str, int] = {}
+        self._last_agg_marker: dict[str, tuple] = {}
+        self._last_futures_marker: dict[str, int] = {}
+
+        # Pass statistics (exported to stats:system by the heartbeat)
+        self.last_publish_duration_ms = 0.0
+        self.max_publish_duration_ms = 0.0
+        self.last_written = 0
+        self.last_skipped = 0
+        self.written_total = 0
+        self.skipped_total = 0
+        self.overruns = 0
 
     def start(self) -> None:
         if self._running:
             return
         self._running = True
+        self._stop_event.clear()
         self._thread = threading.Thread(target=self._loop, daemon=True, name="snapshot-publisher")
         self._thread.start()
-        logger.info("[snapshot] Publisher started (interval=1s)")
+        logger.info(f"[snapshot] Publisher started (interval={self.INTERVAL}s, fixed-rate)")
 
     def stop(self) -> None:
         self._running = False
+        self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=5)
 
     def _loop(self) -> None:
+        next_run = time.monotonic()
         while self._running:
             try:
                 self._publish_all()
@@ -63,23 +135,80 @@ class SnapshotPublisher:
                 self.last_publish_time = time.time()
             except Exception as e:
                 logger.error(f"[snapshot] Publish error: {e}")
-            time.sleep(self.INTERVAL)
+
+            next_run += self.INTERVAL
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                # Overran the slot: drop the missed slots rather than bursting
+                # back-to-back passes to "catch up".
+                missed = int(-delay // self.INTERVAL) + 1
+                self.overruns += 1
+                logger.debug(f"[snapshot] Pass overran interval, skipping {missed} slot(s)")
+                next_run += missed * self.INTERVAL
+                delay = next_run - time.monotonic()
+            self._stop_event.wait(delay)
 
     def _publish_all(self) -> None:
-        self._publish_equity_ticks()
-        self._publish_options()
-        self._publish_futures()
+        start = time.perf_counter()
+        batch = _BatchWriter(self._redis, self.PIPELINE_CHUNK)
+        skipped = 0
+        options_before = self.options_fields_written
+        try:
+            skipped += self._publish_equity_ticks(batch)
+            skipped += self._publish_options(batch)
+            skipped += self._publish_futures(batch)
+            if batch.written or self.options_fields_written != options_before:
+                batch.incr(constant.SNAPSHOT_SEQ_KEY)
+            batch.flush()
+        except Exception:
+            self._last_tick_marker.clear()
+            self._last_agg_marker.clear()
+            self._last_futures_marker.clear()
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.last_publish_duration_ms = duration_ms
+            self.max_publish_duration_ms = max(self.max_publish_duration_ms, duration_ms)
 
-    def _publish_equity_ticks(self) -> None:
+        self.last_written = batch.written
+        self.last_skipped = skipped
+        self.written_total += batch.written
+        self.skipped_total += skipped
+
+    def stats(self, reset_max: bool = True) -> dict[str, str]:
+        """Publisher counters for ``set_system`` (stats:system).
+
+        Args:
+            reset_max: Reset the max-duration watermark after reading, so each
+                       heartbeat reports the worst pass in its own window.
+        """
+        out = {
+            "snapshot_publish_duration_ms": f"{self.last_publish_duration_ms:.1f}",
+            "snapshot_publish_duration_max_ms": f"{self.max_publish_duration_ms:.1f}",
+            "snapshot_written": str(self.last_written),
+            "snapshot_skipped": str(self.last_skipped),
+            "snapshot_written_total": str(self.written_total),
+            "snapshot_skipped_total": str(self.skipped_total),
+            "snapshot_overruns": str(self.overruns),
+        }
+        if reset_max:
+            self.max_publish_duration_ms = 0.0
+        return out
+
+    def _publish_equity_ticks(self, batch: _BatchWriter) -> int:
+        skipped = 0
         for obj in self._stock_objs + self._index_objs:
             ts = obj._tick_store
-            zd = ts._zerodha_data
-            if zd.get("last_price", 0) <= 0:
+            if ts._zerodha_data.get("last_price", 0) <= 0:
                 continue
-            now = time.time()
-            last_ts = float(zd.get("timestamp", 0) or 0)
-            last_tick_age_s = int(now - last_ts) if last_ts > 0 else 0
-            self._redis.hset(f"data:tick:{obj.stock_symbol}", mapping={
+            symbol = obj.stock_symbol
+            if self._last_tick_marker.get(symbol) == ts.tick_count:
+                skipped += 1
+                continue
+            # Count and data from one locked read, so the marker never runs
+            # ahead of what was written.
+            tick_count, zd = ts.zerodha_snapshot()
+            batch.hset(f"data:tick:{symbol}", mapping={
                 "last_price": str(zd["last_price"]),
                 "open": str(zd["open"]),
                 "high": str(zd["high"]),
@@ -91,30 +220,27 @@ class SnapshotPublisher:
                 "average_traded_price": str(zd["average_traded_price"]),
                 "change": str(zd["change"]),
                 "timestamp": str(zd.get("timestamp", "")),
-                "tick_count": str(ts.tick_count),
+                "tick_count": str(tick_count),
             })
+            self._last_tick_marker[symbol] = tick_count
+        return skipped
 
-    def _publish_options(self) -> None:
+    def _publish_options(self, batch: _BatchWriter) -> int:
+        skipped = 0
         for idx in self._index_objs:
             if idx.stock_symbol not in constant.LIVE_OPTIONS_INDICES:
                 continue
             ts = idx._tick_store
 
             if ts.options_live:
-                mapping = {}
-                for strike, sides in ts.options_live.items():
-                    strike_key = str(float(strike))
-                    for opt_type in ("CE", "PE"):
-                        tick = sides.get(opt_type)
-                        if tick:
-                            mapping[f"{strike_key}_{opt_type}"] = json.dumps(tick, default=str)
-                if mapping:
-                    key = f"data:options_live:{idx.stock_symbol}"
-                    self._redis.delete(key)
-                    self._redis.hset(key, mapping=mapping)
+                self._publish_options_delta(idx.stock_symbol, ts)
 
             agg = ts.options_aggregate
             if agg.get("last_updated", 0) > 0:
+                marker = (agg.get("last_updated"), ts.option_tick_count, ts.tick_count)
+                if self._last_agg_marker.get(idx.stock_symbol) == marker:
+                    skipped += 1
+                    continue
                 agg_mapping = {}
                 for k, v in agg.items():
                     if k == "gex_by_strike":
@@ -122,13 +248,20 @@ class SnapshotPublisher:
                     agg_mapping[k] = str(v) if v is not None else ""
                 agg_mapping["option_tick_count"] = str(ts.option_tick_count)
                 agg_mapping["tick_count"] = str(ts.tick_count)
-                self._redis.hset(f"data:options_agg:{idx.stock_symbol}", mapping=agg_mapping)
+                batch.hset(f"data:options_agg:{idx.stock_symbol}", mapping=agg_mapping)
+                self._last_agg_marker[idx.stock_symbol] = marker
+        return skipped
 
-    def _publish_futures(self) -> None:
+    def _publish_futures(self, batch: _BatchWriter) -> int:
+        skipped = 0
         for obj in self._stock_objs + self._index_objs:
             ts = obj._tick_store
             if not ts.futures_live:
                 continue
+            symbol = obj.stock_symbol
+            if self._last_futures_marker.get(symbol) == ts.futures_tick_count:
+                skipped += 1
+                continue
             mapping = {}
             for expiry_key in ("current", "next"):
                 ft = ts.futures_live.get(expiry_key, {})
@@ -138,4 +271,49 @@ class SnapshotPublisher:
                     if ft.get(field) is not None:
                         mapping[f"{expiry_key}_{field}"] = str(ft[field])
             if mapping:
-                self._redis.hset(f"data:futures_live:{obj.stock_symbol}", mapping=mapping)
+                batch.hset(f"data:futures_live:{symbol}", mapping=mapping)
+                self._last_futures_marker[symbol] = ts.futures_tick_count
+        return skipped
+
+    def _publish_options_delta(self, symbol: str, ts) -> None:
+        """Write the strike/sides changed since the last pass in one transaction.
+
+        The first pass for a symbol is a full resync: every side is marked
+        dirty and fields left over from a previous session (strikes no
+        longer in options_live) are HDEL'd in the same transaction.
+        """
+        key = f"data:options_live:{symbol}"
+        stale_fields: list[str] = []
+        if symbol not in self._options_synced:
+            ts.mark_options_dirty()
+
+        version, changed = ts.drain_dirty_options()
+        if not changed:
+            return
+
+        mapping = {
+            f"{float(strike)}_{opt_type}": json.dumps(tick, default=str)
+            for (strike, opt_type), tick in changed.items()
+        }
+        if symbol not in self._options_synced:
+            stale_fields = [
+                f for f in self._redis.hkeys(key)
+                if f not in mapping and not f.startswith(constant.OPTIONS_LIVE_META_PREFIX)
+            ]
+        mapping[constant.OPTIONS_LIVE_VERSION_FIELD] = str(version)
+        mapping[constant.OPTIONS_LIVE_TS_FIELD] = str(time.time())
+
+        try:
+            pipe = self._redis.pipeline(transaction=True)
+            if stale_fields:
+                pipe.hdel(key, *stale_fields)
+            pipe.hset(key, mapping=mapping)
+            pipe.hincrby(key, constant.OPTIONS_LIVE_SEQ_FIELD, 1)
+            pipe.execute()
+        except Exception:
+            # The drained sides are gone from the dirty set — force a full
+            # resync next pass so nothing written in between is lost.
+            self._options_synced.discard(symbol)
+            raise
+        self._options_synced.add(symbol)
+        self.options_fields_written += len(changed)
@@ -0,0 +1,246 @@
+"""
+WS capture — record raw WebSocket frames to disk and read them back.
+
+WSRecorder taps the Zerodha WS1/WS2 sockets (KiteTicker.on_message) and the
+Sensibull relay, and appends every frame with its receive time to segment
+files under ``{root}/{session}/``. The receive thread only timestamps the
+frame and appends it to a deque; a writer thread packs and writes them, so a
+slow disk never stalls the socket. If the writer falls `max_pending` frames
+behind, new frames are counted as dropped instead of queued.
+
+Segment file (``00001.wscap``, rotated at `segment_bytes`):
+
+    header   8s  magic b"WSCAP01\\n"
+             d   session start (epoch seconds)
+    record   d   receive time (epoch seconds)
+             B   stream (1 = ws1, 2 = ws2, 3 = sensibull)
+             B   flags (bit 0: binary frame)
+             I   payload length
+             ... payload
+
+All fields big-endian. ``registry.json`` next to the segments holds the
+TokenRegistry snapshot the session was recorded with, so a replay can route
+the ticks without fetching instruments.
+
+read_frames() memory-maps the segments and yields them back in order; see
+services/market_data/replay.py for the driver.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Iterator, NamedTuple
+
+from lib.logging_util import get_logger
+logger = get_logger("market-data")
+
+MAGIC = b"WSCAP01\n"
+SEGMENT_SUFFIX = ".wscap"
+REGISTRY_FILE = "registry.json"
+
+STREAMS = {"ws1": 1, "ws2": 2, "sensibull": 3}
+STREAM_NAMES = {v: k for k, v in STREAMS.items()}
+
+_HEADER = struct.Struct(">8sd")
+_RECORD = struct.Struct(">dBBI")
+_FLAG_BINARY = 0x01
+
+
+class CapturedFrame(NamedTuple):
+    received_at: float
+    stream: str
+    binary: bool
+    payload: bytes
+
+
+class WSRecorder:
+    """Append raw WS frames to rotated segment files from a background writer."""
+
+    def __init__(
+        self,
+        root: str,
+        session: str | None = None,
+        segment_bytes: int = 256 * 1024 * 1024,
+        flush_interval: float = 0.2,
+        max_pending: int = 200_000,
+    ):
+        self.session = session or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = os.path.join(root, self.session)
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending: deque = deque()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self._file = None
+        self._file_bytes = 0
+        self._started_at = time.time()
+
+        self.frames = 0
+        self.bytes_written = 0
+        self.dropped = 0
+        self.segments = 0
+
+    # ── Receive side (WS threads) ─────────────────────────────────────────────
+
+    def record(self, stream: str, payload, binary: bool = True) -> None:
+        """Queue one frame. Cheap and non-blocking; safe from any thread."""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append((time.time(), STREAMS[stream], binary, payload))
+
+    def kite_hook(self, stream: str):
+        """Callable for KiteTicker.on_message: ``(ws, payload, is_binary)``."""
+        def on_message(ws, payload, is_binary):
+            self.record(stream, payload, is_binary)
+        return on_message
+
+    # ── Writer ────────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._running:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="ws-capture")
+        self._thread.start()
+        logger.info(f"[ws-capture] Recording to {self.path}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        logger.info(
+            f"[ws-capture] Stopped: {self.frames} frames, {self.bytes_written / 1e6:.1f} MB "
+            f"in {self.segments} segment(s), {self.dropped} dropped"
+        )
+
+    def _run(self) -> None:
+        try:
+            while self._running:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self._drain()
+            self._drain()
+        except Exception as e:
+            logger.error(f"[ws-capture] Writer stopped: {e}")
+        finally:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _drain(self) -> None:
+        pending = self._pending
+        if not pending:
+            return
+        chunk = bytearray()
+        while pending:
+            received_at, stream, binary, payload = pending.popleft()
+            if isinstance(payload, str):
+                payload = payload.encode("utf-8")
+            record_len = _RECORD.size + len(payload)
+            if self._file is None or self._file_bytes + len(chunk) + record_len > self.segment_bytes:
+                self._write(chunk)
+                chunk = bytearray()
+                self._rotate()
+            chunk += _RECORD.pack(received_at, stream, _FLAG_BINARY if binary else 0, len(payload))
+            chunk += payload
+            self.frames += 1
+        self._write(chunk)
+        self._file.flush()
+
+    def _write(self, chunk: bytearray) -> None:
+        if chunk and self._file is not None:
+            self._file.write(chunk)
+            self._file_bytes += len(chunk)
+            self.bytes_written += len(chunk)
+
+    def _rotate(self) -> None:
+        if self._file:
+            self._file.close()
+        self.segments += 1
+        name = os.path.join(self.path, f"{self.segments:05d}{SEGMENT_SUFFIX}")
+        self._file = open(name, "wb")
+        self._file.write(_HEADER.pack(MAGIC, self._started_at))
+        self._file_bytes = _HEADER.size
+
+    # ── Session metadata ──────────────────────────────────────────────────────
+
+    def save_registry(self, registry, **meta) -> None:
+        """Write the TokenRegistry snapshot replays route ticks with.
+
+        Extra keyword arguments (e.g. ``options_source``) are stored under
+        ``"meta"`` for the replay to pick up.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        snapshot = registry.to_dict()
+        snapshot["meta"] = {"session": self.session, "started_at": self._started_at, **meta}
+        with open(os.path.join(self.path, REGISTRY_FILE), "w") as f:
+            json.dump(snapshot, f)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes_written,
+            "segments": self.segments,
+            "pending": len(self._pending),
+            "dropped": self.dropped,
+        }
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+
+def segment_files(path: str) -> list[str]:
+    """Segment files for a session directory (or [path] for a single segment)."""
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.endswith(SEGMENT_SUFFIX)
+        )
+    return [path]
+
+
+def load_registry(path: str) -> dict | None:
+    """registry.json snapshot for a session directory, or None if absent."""
+    name = os.path.join(path if os.path.isdir(path) else os.path.dirname(path), REGISTRY_FILE)
+    if not os.path.exists(name):
+        return None
+    with open(name) as f:
+        return json.load(f)
+
+
+def read_frames(path: str) -> Iterator[CapturedFrame]:
+    """Yield every frame of a session (or one segment) in recorded order.
+
+    A record cut short at the end of a segment (recorder killed mid-write)
+    ends that segment quietly.
+    """
+    for name in segment_files(path):
+        with open(name, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, _ = _HEADER.unpack_from(mm, 0)
+                if magic != MAGIC:
+                    raise ValueError(f"{name}: not a WS capture segment")
+                pos, end = _HEADER.size, len(mm)
+                while pos + _RECORD.size <= end:
+                    received_at, stream, flags, length = _RECORD.unpack_from(mm, pos)
+                    pos += _RECORD.size
+                    if pos + length > end:
+                        logger.warning(f"[ws-capture] {name}: truncated record at byte {pos - _RECORD.size}")
+                        break
+                    payload = mm[pos:pos + length]
+                    pos += length
+                    binary = bool(flags & _FLAG_BINARY)
+                    yield CapturedFrame(received_at, STREAM_NAMES.get(stream, str(stream)), binary,
+                                        payload if binary else payload.decode("utf-8"))
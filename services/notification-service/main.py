@@ -1,6 +1,8 @@
 """
 Notification Service — consumes notification jobs from Redis and sends them
-to Telegram / Discord with retry logic.
+to Telegram / Discord through a NotificationDispatcher
+(lib/notification/dispatcher.py): one rate-limited lane per bot chat or
+webhook, urgent (live options / alert) jobs first, retries off the read loop.
 
 Reads from stream: notification:jobs
 Uses consumer group: notifier
@@ -16,7 +18,9 @@ Message format:
         "timestamp": "2026-06-27T12:00:00",
     }
 
-On failure: dead-letter to notification:dead after 3 retries.
+A job is acked once every destination has finished with it; jobs left
+unacked by a previous run are re-read on startup. On failure: dead-letter to
+notification:dead after 3 attempts.
 """
 
 from __future__ import annotations
@@ -48,12 +52,20 @@ from common.constants import (
     DISCORD_LIVE_OPTIONS_WEBHOOK_URL,
     ENV_PRODUCTION,
 )
-import requests
 import re
-from services.common.metrics import incr_stock, incr_system, incr_daily
+from lib.notification.dispatcher import (
+    NotificationDispatcher, Destination, DiscordDestination, TelegramDestination, TokenBucket,
+    DISCORD_WEBHOOK_RATE, DISCORD_WEBHOOK_BURST,
+    TELEGRAM_BOT_RATE, TELEGRAM_BOT_BURST, TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST,
+)
+from services.common.metrics import incr_stock, incr_system, incr_daily, set_system
 
 _running = True
 
+# Stop reading new jobs while this many are still being delivered.
+MAX_INFLIGHT = 500
+HEARTBEAT_INTERVAL = 30
+
 
 def signal_handler(signum, frame):
     global _running
@@ -117,95 +129,31 @@ def _html_to_discord(text: str) -> str:
     return text
 
 
-def _send_discord(webhook_url: str, message: str, parse_mode: str | None = None) -> bool:
-    if not webhook_url:
-        return False
+def _discord_content(message: str, parse_mode: str | None = None) -> str:
     content = _html_to_discord(message) if parse_mode and parse_mode.upper() == "HTML" else message
     if len(content) > 2000:
         content = content[:1997] + "..."
-    try:
-        resp = requests.post(
-            webhook_url,
-            json={"content": content},
-            timeout=(5, 10),
-        )
-        if resp.status_code not in (200, 204):
-            logger.error(f"Discord webhook failed: {resp.status_code}: {resp.text}")
-            return False
-        return True
-    except Exception as e:
-        logger.error(f"Discord webhook error: {e}")
-        return False
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# Telegram sender (ports TELEGRAM_NOTIFICATIONS.send_notification)
-# ═══════════════════════════════════════════════════════════════════════════
-
-def _send_telegram(token: str, chat_id: str, message: str, parse_mode: str | None = None) -> bool:
-    """Send a single Telegram message with 3x retry + exponential backoff."""
-    if not token or not chat_id:
-        logger.debug(f"[notification] Telegram token/chat_id not configured")
-        return False
-
-    payload = {"chat_id": chat_id, "text": message}
-    if parse_mode:
-        payload["parse_mode"] = parse_mode
-
-    for attempt in range(1, 4):
-        try:
-            resp = requests.post(
-                TELEGRAM_URL + token + "/sendMessage",
-                json=payload,
-                timeout=15,
-            )
-            if resp.status_code == 200:
-                return True
-            logger.error(
-                f"[notification] Telegram send failed (attempt {attempt}): "
-                f"status={resp.status_code}: {resp.text[:200]}"
-            )
-            if attempt < 3:
-                time.sleep(2 ** attempt)
-        except requests.Timeout:
-            logger.error(f"[notification] Telegram timeout (attempt {attempt})")
-            if attempt < 3:
-                time.sleep(2 ** attempt)
-        except requests.ConnectionError:
-            logger.error(f"[notification] Telegram connection error (attempt {attempt})")
-            if attempt < 3:
-                time.sleep(2 ** attempt)
-        except Exception as e:
-            logger.error(f"[notification] Telegram send failed: {e}")
-            return False
-
-    return False  # all retries exhausted
+    return content
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Notification router
 # ═══════════════════════════════════════════════════════════════════════════
 
-def dispatch_notification(job: dict) -> bool:
-    """
-    Route a notification job to the correct channel(s).
+# Destinations are built once per chat type so every job for the same bot,
+# chat or webhook lands on the same dispatcher lane and shares its rate limits.
+_destination_cache: dict[str, list[Destination]] = {}
+_bot_buckets: dict[str, TokenBucket] = {}
 
-    Args:
-        job: dict with keys: chat_type, message, parse_mode (optional)
 
-    Returns:
-        True if sent successfully to at least one channel
-    """
-    chat_type = job.get("chat_type", "intraday")
-    message = job.get("message", "")
-    parse_mode = job.get("parse_mode")
-
-    # Sanitize HTML before sending to Telegram to prevent parse errors
-    if parse_mode and parse_mode.upper() == "HTML":
-        message = _sanitize_html(message)
+def _destinations(chat_type: str) -> list[Destination]:
+    """Configured Discord / Telegram destinations for a chat type."""
+    cached = _destination_cache.get(chat_type)
+    if cached is not None:
+        return cached
 
     channel = NOTIFICATION_CHANNEL.lower()
-    sent_any = False
+    destinations: list[Destination] = []
 
     if channel in ("discord", "both"):
         webhook_map = {
@@ -214,8 +162,10 @@ def dispatch_notification(job: dict) -> bool:
             "live_options": DISCORD_LIVE_OPTIONS_WEBHOOK_URL,
         }
         webhook = webhook_map.get(chat_type)
-        if _send_discord(webhook, message, parse_mode):
-            sent_any = True
+        if webhook:
+            destinations.append(DiscordDestination(
+                webhook, TokenBucket(DISCORD_WEBHOOK_RATE, DISCORD_WEBHOOK_BURST), _discord_content,
+            ))
 
     if channel in ("telegram", "both"):
         token_map = {
@@ -224,10 +174,37 @@ def dispatch_notification(job: dict) -> bool:
             "live_options": (TELEGRAM_LIVE_OPTIONS_TOKEN, TELEGRAM_LIVE_OPTIONS_CHAT_ID),
         }
         token, chat_id = token_map.get(chat_type, ("", ""))
-        if _send_telegram(token, chat_id, message, parse_mode):
-            sent_any = True
+        if token and chat_id:
+            bot = _bot_buckets.setdefault(token, TokenBucket(TELEGRAM_BOT_RATE, TELEGRAM_BOT_BURST))
+            destinations.append(TelegramDestination(
+                TELEGRAM_URL, token, chat_id,
+                (TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST), bot),
+            ))
+        else:
+            logger.debug(f"[notification] Telegram token/chat_id not configured for {chat_type}")
+
+    _destination_cache[chat_type] = destinations
+    return destinations
+
+
+def dispatch_notification(dispatcher: NotificationDispatcher, job: dict, enqueued_at: float | None = None) -> None:
+    """
+    Queue a notification job on the dispatcher for its channel(s).
+
+    Args:
+        dispatcher: delivers the job and reports the outcome via its on_done
+        job: dict with keys: chat_type, message, parse_mode (optional)
+        enqueued_at: epoch seconds the job entered notification:jobs
+    """
+    chat_type = job.get("chat_type", "intraday")
+    message = job.get("message", "")
+    parse_mode = job.get("parse_mode")
+
+    # Sanitize HTML before sending to Telegram to prevent parse errors
+    if parse_mode and parse_mode.upper() == "HTML":
+        message = _sanitize_html(message)
 
-    return sent_any
+    dispatcher.submit(job, _destinations(chat_type), message, parse_mode, enqueued_at)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -293,30 +270,39 @@ def main():
     })
     rc.expire("service:registry:notification-service", 120)
 
+    def on_done(job: dict, success: bool, error: str):
+        msg_id = job.pop("_msg_id")
+        sym = job.get("symbol", "")
+        if success:
+            if sym:
+                incr_stock(sym, "alerts_delivered")
+            incr_system("alerts_delivered")
+            incr_daily("alerts_delivered")
+            logger.info(
+                f"[notification] Sent: {job.get('message_type', 'unknown')} "
+                f"→ {job.get('chat_type', 'unknown')}"
+            )
+        else:
+            _send_to_dead_letter(rc, job, error or "Failed to send after 3 attempts")
+            if sym:
+                incr_stock(sym, "alerts_failed")
+            incr_system("alerts_failed")
+            incr_daily("alerts_failed")
+        try:
+            rc.xack("notification:jobs", "notifier", msg_id)
+        except Exception:
+            pass
+
+    dispatcher = NotificationDispatcher(on_done)
+
     _running = True
     retry_count = 0
-    _hb_counter = 0
+    last_hb = time.time()
+    read_id = "0"  # first drain our own unacked jobs from a previous run
 
     while _running:
-        try:
-            messages = rc.xreadgroup(
-                groupname="notifier",
-                consumername=consumer_name,
-                streams={"notification:jobs": ">"},
-                count=10,
-                block=2000,
-            )
-        except Exception as e:
-            logger.error(f"[notification-service] Redis error: {e}")
-            retry_count += 1
-            time.sleep(min(retry_count * 2, 30))
-            continue
-
-        retry_count = 0  # reset on successful read
-
-        # Refresh heartbeat every ~30s (15 iterations × 2s block)
-        _hb_counter += 1
-        if _hb_counter >= 15:
+        # Refresh heartbeat and delivery stats every ~30s
+        if time.time() - last_hb >= HEARTBEAT_INTERVAL:
             try:
                 from services.common.version import BUILD_LABEL, GIT_COMMIT, GIT_DIRTY
                 rc.hset("service:registry:notification-service", mapping={
@@ -329,51 +315,55 @@ def main():
                 rc.expire("service:registry:notification-service", 120)
             except Exception:
                 pass
-            _hb_counter = 0
+            set_system(**dispatcher.stats())
+            last_hb = time.time()
+
+        # Backpressure: leave jobs in the stream while the lanes catch up
+        if dispatcher.inflight() >= MAX_INFLIGHT:
+            time.sleep(0.2)
+            continue
 
-        if not messages:
+        try:
+            messages = rc.xreadgroup(
+                groupname="notifier",
+                consumername=consumer_name,
+                streams={"notification:jobs": read_id},
+                count=50,
+                block=None if read_id == "0" else 2000,
+            )
+        except Exception as e:
+            logger.error(f"[notification-service] Redis error: {e}")
+            retry_count += 1
+            time.sleep(min(retry_count * 2, 30))
             continue
 
+        retry_count = 0  # reset on successful read
+
         entries = messages[0][1] if isinstance(messages, list) and messages else []
+        if read_id != ">":
+            # Replaying our pending entries: continue after the last one, then switch to new jobs
+            if not entries:
+                read_id = ">"
+                continue
+            read_id = entries[-1][0]
+
         for msg_id, fields in entries:
+            if not fields:  # pending entry trimmed from the stream
+                rc.xack("notification:jobs", "notifier", msg_id)
+                continue
+            job = dict(fields)
+            job["_msg_id"] = msg_id
             try:
-                job = dict(fields)
-                success = dispatch_notification(job)
-                if not success:
-                    error = f"Failed to send after 3 retries"
-                    _send_to_dead_letter(rc, job, error)
-                    sym = job.get("symbol", "")
-                    if sym:
-                        incr_stock(sym, "alerts_failed")
-                    incr_system("alerts_failed")
-                    incr_daily("alerts_failed")
-                else:
-                    sym = job.get("symbol", "")
-                    if sym:
-                        incr_stock(sym, "alerts_delivered")
-                    incr_system("alerts_delivered")
-                    incr_daily("alerts_delivered")
-                    logger.info(
-                        f"[notification] Sent: {job.get('message_type', 'unknown')} "
-                        f"→ {job.get('chat_type', 'unknown')}"
-                    )
+                enqueued_at = int(str(msg_id).split("-")[0]) / 1000
+                dispatch_notification(dispatcher, job, enqueued_at)
             except Exception as e:
-                _send_to_dead_letter(rc, dict(fields), str(e))
-                sym = dict(fields).get("symbol", "")
-                if sym:
-                    incr_stock(sym, "alerts_failed")
-                incr_system("alerts_failed")
-                incr_daily("alerts_failed")
                 logger.error(f"[notification] Error processing job {msg_id}: {e}")
-            finally:
-                try:
-                    rc.xack("notification:jobs", "notifier", msg_id)
-                except Exception:
-                    pass
-
-        # Heartbeat refreshed above (before message processing)
+                on_done(job, False, str(e))
 
-    # Shutdown
+    # Shutdown — unfinished jobs stay pending and are re-read on the next start
+    logger.info("[notification-service] Draining queued notifications...")
+    dispatcher.stop(timeout=10)
+    set_system(**dispatcher.stats())
     logger.info("[notification-service] Shutting down...")
     try:
         rc.hset("service:registry:notification-service", mapping={
@@ -39,6 +39,7 @@ from services.common.stock_loader import (
 )
 from services.common.metrics import incr_stock, incr_system, set_system, incr_daily
 from services.common.cycle_subscriber import CycleSubscriber
+from services.analysis_engine.scheduling import JobCostModel, order_jobs
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -625,8 +626,10 @@ def _publish_options_snapshot(index_objs: list) -> None:
 
     For each index in LIVE_OPTIONS_INDICES, serialises the monolith's in-memory
     options_live (WS2 + Sensibull greeks) to a Redis hash so stateless analysis
-    workers can run GEXAnalyser.  Uses DELETE + HSET to remove stale strikes
-    from WS2 re-centering.
+    workers can run GEXAnalyser.  Written like the market-data
+    SnapshotPublisher: stale strikes (WS2 re-centering) are HDEL'd and the
+    sides HSET together with the _seq/_version/_ts metadata in one MULTI/EXEC,
+    so readers never see an empty or half-written hash.
     """
     for idx in index_objs:
         if idx.stock_symbol not in constant.LIVE_OPTIONS_INDICES:
@@ -635,25 +638,41 @@ def _publish_options_snapshot(index_objs: list) -> None:
         if not ts.options_live:
             continue
 
+        version = ts.options_version
         mapping = {}
         for strike, sides in ts.options_live.items():
             strike_key = str(float(strike))
             for opt_type in ("CE", "PE"):
                 tick = sides.get(opt_type)
                 if tick:
-                    mapping[f"{strike_key}_{opt_type}"] = json.dumps(tick, default=str)
+                    mapping[f"{strike_key}_{opt_type}"] = json.dumps(dict(tick), default=str)
 
         if not mapping:
             continue
 
         key = f"data:options_live:{idx.stock_symbol}"
-        redis_proxy.delete(key)
-        redis_proxy.hset(key, mapping=mapping)
+        stale_fields = [
+            f for f in redis_proxy.hkeys(key)
+            if f not in mapping and not f.startswith(constant.OPTIONS_LIVE_META_PREFIX)
+        ]
+        mapping[constant.OPTIONS_LIVE_VERSION_FIELD] = str(version)
+        mapping[constant.OPTIONS_LIVE_TS_FIELD] = str(_time.time())
+
+        pipe = redis_proxy.pipeline(transaction=True)
+        if stale_fields:
+            pipe.hdel(key, *stale_fields)
+        pipe.hset(key, mapping=mapping)
+        pipe.hincrby(key, constant.OPTIONS_LIVE_SEQ_FIELD, 1)
+        pipe.execute()
 
     n_indices = sum(1 for i in index_objs if i.stock_symbol in constant.LIVE_OPTIONS_INDICES)
     logger.debug(f"[stream] Published options_live snapshot for {n_indices} indices")
 
 
+# Observed per-symbol analysis cost, used to order each cycle's dispatch.
+_job_costs = JobCostModel()
+
+
 def _dispatch_and_collect_stream(
     stock_objs: list, index_objs: list
 ) -> List[Tuple[MonitorResult, bool, Optional[str]]]:
@@ -680,17 +699,26 @@ def _dispatch_and_collect_stream(
 
     # options_live snapshot is now published by the market-data service every 1 second
 
+    # Heaviest symbols first, spread across worker batches. One MULTI/EXEC so
+    # workers blocked on XREADGROUP wake to the whole cycle, not a single entry.
+    ordered = order_jobs(
+        index_objs + stock_objs,
+        lambda o: _job_costs.cost(o.stock_symbol, o.is_index),
+        constant.ANALYSIS_JOBS_BATCH,
+    )
     jobs = []
-    for obj in index_objs + stock_objs:
+    pipe = redis_proxy.pipeline(transaction=True)
+    for obj in ordered:
         job_id = uuid.uuid4().hex[:8]
         jobs.append((job_id, obj))
-        redis_proxy.xadd(constant.ANALYSIS_JOBS_STREAM, {
+        pipe.xadd(constant.ANALYSIS_JOBS_STREAM, {
             "job_id": job_id,
             "cycle_id": cycle_id,
             "symbol": obj.stock_symbol,
             "is_index": str(obj.is_index).lower(),
             "mode": mode_str,
         }, maxlen=500)
+    pipe.execute()
 
     logger.info(f"[stream] Dispatched {len(jobs)} analysis jobs (cycle={cycle_id})")
     incr_system("total_jobs_dispatched", len(jobs))
@@ -734,6 +762,7 @@ def _dispatch_and_collect_stream(
                 jid = fields.get("job_id", "")
                 if jid in job_ids:
                     results_by_job[jid] = fields
+                    _job_costs.observe(fields.get("symbol", ""), fields.get("duration_ms"))
             try:
                 redis_proxy.xack(constant.ANALYSIS_RESULTS_STREAM, constant.ANALYSIS_RESULTS_GROUP, msg_id)
             except Exception:
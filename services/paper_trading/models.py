@@ -12,6 +12,8 @@ from dataclasses import asdict, dataclass, field
 from datetime import date
 from typing import Optional
 
+import common.constants as constant
+
 
 # ── Redis key schema (docs/PAPER_TRADING_DESIGN.md section 5.2) ────────────
 
@@ -104,8 +106,14 @@ def select_expiry(per_expiry_map_keys: list[str], mode: str, today: date) -> str
 
 
 def compute_strike_gap(strike_keys: list[str], default: float = 50.0) -> float:
-    """Derive strike spacing from data:options_live hash keys ("{strike}_{CE|PE}")."""
-    strikes = sorted({float(k.rsplit("_", 1)[0]) for k in strike_keys})
+    """Derive strike spacing from data:options_live hash keys ("{strike}_{CE|PE}").
+
+    Snapshot metadata fields (``_seq``, ``_ts``, ...) are ignored.
+    """
+    strikes = sorted({
+        float(k.rsplit("_", 1)[0]) for k in strike_keys
+        if not k.startswith(constant.OPTIONS_LIVE_META_PREFIX)
+    })
     if len(strikes) < 2:
         return default
     gaps = [strikes[i + 1] - strikes[i] for i in range(len(strikes) - 1)]
@@ -6,7 +6,8 @@ Runs as a standalone systemd daemon. Every 30 seconds:
   2. Discovers running services via Redis service:registry:* and collects per-process metrics
   3. Collects Redis INFO + SLOWLOG metrics
   4. Writes latest snapshots to sys:latest:* (HASH)
-  5. Appends time-series to sys:ts:* (ZSET, 24h retention)
+  5. Appends time-series to sys:ring:* ring buffers (raw 24h + 1m/15m/1d rollups,
+     see services/common/timeseries.py)
   6. Updates daily rollup sys:daily:{date} (30-day TTL)
   7. Checks alert thresholds and sends proactive alerts via notification:jobs
   8. Writes own heartbeat to service:registry:resource-monitor
@@ -35,6 +36,7 @@ load_dotenv()
 import redis as sync_redis
 from lib.logging_util import get_logger
 logger = get_logger("resource-monitor")
+from services.common.timeseries import RingWriter, query as ts_query
 
 try:
     import psutil
@@ -44,10 +46,8 @@ except ImportError:
 
 # ── Constants ──────────────────────────────────────────────────────────────
 
-SAMPLING_INTERVAL = 30          # seconds between samples
-TS_RETENTION_SECS = 86400       # 24h — prune ZSET entries older than this
+SAMPLING_INTERVAL = 30          # seconds between samples (= raw ring step in timeseries.py)
 DAILY_TTL = 30 * 86400          # 30 days for daily rollup keys
-TS_TTL = 25 * 3600              # 25h TTL on time-series keys (auto-expire if monitor dies)
 HEARTBEAT_TTL = 60              # service registry heartbeat TTL
 
 # Alert thresholds
@@ -337,16 +337,9 @@ def store_latest(rc: sync_redis.Redis, key: str, data: dict):
         logger.debug(f"[storage] hset {key} failed: {e}")
 
 
-def store_timeseries(rc: sync_redis.Redis, key: str, ts: float, value: float):
-    """Append a value to a time-series ZSET and prune old entries."""
-    try:
-        pipe = rc.pipeline()
-        pipe.zadd(key, {f"{ts:.6f}:{value}": ts})
-        pipe.zremrangebyscore(key, 0, ts - TS_RETENTION_SECS)
-        pipe.expire(key, TS_TTL)
-        pipe.execute()
-    except Exception as e:
-        logger.debug(f"[storage] zadd {key} failed: {e}")
+def store_timeseries(ring: RingWriter, metric: str, ts: float, value: float):
+    """Queue a sample for the sys:ring:{metric} ring buffers (written by ring.flush())."""
+    ring.add(metric, ts, value)
 
 
 def update_daily_rollup(rc: sync_redis.Redis, metrics: dict):
@@ -455,8 +448,13 @@ def _send_alert(rc: sync_redis.Redis, message: str, alert_name: str = ""):
         logger.error(f"[alert] Failed to send alert: {e}")
 
 
-def check_alerts(rc: sync_redis.Redis, sys_metrics: dict, services: dict, redis_metrics: dict):
-    """Check all alert thresholds and fire proactive alerts."""
+def check_alerts(rc: sync_redis.Redis, sys_metrics: dict, services: dict, redis_metrics: dict,
+                 ts_rc: sync_redis.Redis | None = None):
+    """Check all alert thresholds and fire proactive alerts.
+
+    `ts_rc` is the binary Redis client for the ring-buffer time series; the
+    RSS leak check is skipped without it.
+    """
     global _cpu_high_streak, _core_imbalance_streak
 
     # ── CPU High ────────────────────────────────────────────────────────────
@@ -526,18 +524,14 @@ def check_alerts(rc: sync_redis.Redis, sys_metrics: dict, services: dict, redis_
         pid = info.get("pid", 0)
         if pid <= 0:
             continue
-        rss_key = f"sys:ts:rss:{name}"
         try:
             ts_now = time.time()
-            # Get samples from last hour
-            samples = rc.zrangebyscore(rss_key, ts_now - 3600, ts_now, withscores=True)
+            # Raw samples from the last hour
+            samples = ts_query(ts_rc, f"rss:{name}", ts_now - 3600, ts_now) if ts_rc is not None else []
             if len(samples) >= ALERT_RSS_LEAK_SAMPLES:
                 # Calculate slope (MB/hour)
-                # Member format: "{ts}:{value}" — parse value after colon
-                first_val = float(samples[0][0].split(":", 1)[-1])
-                first_ts = samples[0][1]
-                last_val = float(samples[-1][0].split(":", 1)[-1])
-                last_ts = samples[-1][1]
+                first_val, first_ts = samples[0].last, samples[0].ts
+                last_val, last_ts = samples[-1].last, samples[-1].ts
                 if last_ts > first_ts:
                     time_diff_hr = (last_ts - first_ts) / 3600
                     if time_diff_hr > 0:
@@ -691,6 +685,8 @@ def main():
 
     redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
     rc = sync_redis.from_url(redis_url, decode_responses=True)
+    ts_rc = sync_redis.from_url(redis_url)   # binary: ring-buffer slots
+    ring = RingWriter(ts_rc)
 
     try:
         rc.ping()
@@ -717,10 +713,10 @@ def main():
             store_latest(rc, "sys:latest:system", sys_metrics)
 
             # Time-series for system
-            store_timeseries(rc, "sys:ts:cpu", ts, float(sys_metrics.get("cpu_percent", 0)))
-            store_timeseries(rc, "sys:ts:ram", ts, float(sys_metrics.get("ram_percent", 0)))
-            store_timeseries(rc, "sys:ts:cpu_core_avg", ts, float(sys_metrics.get("cpu_core_avg", 0)))
-            store_timeseries(rc, "sys:ts:cpu_core_max", ts, float(sys_metrics.get("cpu_core_max", 0)))
+            store_timeseries(ring, "cpu", ts, float(sys_metrics.get("cpu_percent", 0)))
+            store_timeseries(ring, "ram", ts, float(sys_metrics.get("ram_percent", 0)))
+            store_timeseries(ring, "cpu_core_avg", ts, float(sys_metrics.get("cpu_core_avg", 0)))
+            store_timeseries(ring, "cpu_core_max", ts, float(sys_metrics.get("cpu_core_max", 0)))
 
             # 2. Discover services
             services = discover_services(rc)
@@ -733,13 +729,14 @@ def main():
                 proc_metrics = collect_process(pid)
                 if proc_metrics:
                     store_latest(rc, f"sys:latest:{name}", proc_metrics)
-                    store_timeseries(rc, f"sys:ts:rss:{name}", ts, float(proc_metrics.get("rss_mb", 0)))
-                    store_timeseries(rc, f"sys:ts:cpu:{name}", ts, float(proc_metrics.get("cpu_percent", 0)))
+                    store_timeseries(ring, f"rss:{name}", ts, float(proc_metrics.get("rss_mb", 0)))
+                    store_timeseries(ring, f"cpu:{name}", ts, float(proc_metrics.get("cpu_percent", 0)))
 
             # 4. Collect Redis metrics
             redis_metrics = collect_redis(rc)
             store_latest(rc, "sys:latest:redis", redis_metrics)
-            store_timeseries(rc, "sys:ts:redis_mem", ts, float(redis_metrics.get("used_memory_mb", 0)))
+            store_timeseries(ring, "redis_mem", ts, float(redis_metrics.get("used_memory_mb", 0)))
+            ring.flush()
 
             # 5. Update daily rollup
             rollup_data = {**sys_metrics, **{
@@ -748,7 +745,7 @@ def main():
             update_daily_rollup(rc, rollup_data)
 
             # 6. Check alerts
-            check_alerts(rc, sys_metrics, services, redis_metrics)
+            check_alerts(rc, sys_metrics, services, redis_metrics, ts_rc)
 
             # 7. Write heartbeat
             write_heartbeat(rc)
@@ -774,6 +771,7 @@ def main():
 
     logger.info("[resource-monitor] Shutting down...")
     rc.close()
+    ts_rc.close()
 
 
 if __name__ == "__main__":
@@ -5,11 +5,18 @@ Consumes intelligence:signals (LIVE from market-data, INTRADAY/POSITIONAL
 from analysis-engine + monolith) and detects cross-layer confluence via a
 single, process-lifetime SignalCorrelator instance.
 
-IMPORTANT: run exactly ONE instance of this service. Unlike analysis-engine,
-this is NOT horizontally scalable -- a symbol's signals across layers must
-land in the same in-memory correlator buffer to detect confluence. Running
-multiple consumers in the same consumer group would let Redis round-robin
-a symbol's signals across processes and silently break detection.
+IMPORTANT: run exactly ONE instance per partition. A symbol's signals across
+layers must land in the same in-memory correlator buffer to detect
+confluence, so scaling is by symbol partition, not by consumer group:
+producers route each signal to intelligence:signals:{p} by a stable symbol
+hash (SIGNAL_PARTITIONS, lib/intelligence/partition.py), and the process
+started with SIGNAL_PARTITION=p owns that stream. Two consumers on the same
+partition would let Redis round-robin a symbol's signals across processes
+and silently break detection. With SIGNAL_PARTITIONS=1 (default) this is the
+single consumer of intelligence:signals.
+
+The correlator is snapshotted to Redis (PartitionConsumer) so a restart
+keeps the 6-hour POSITIONAL window and confluence cooldowns.
 """
 
 import gc
@@ -23,13 +30,11 @@ import common.shared as shared
 from lib.intelligence.correlator import SignalCorrelator
 from services.common.redis_proxy import RedisProxy
 from services.common.version import BUILD_LABEL, GIT_COMMIT, GIT_DIRTY
-from services.signal_intelligence.worker import reconstruct_signal, make_on_confluence
+from services.signal_intelligence.worker import PartitionConsumer, make_on_confluence
 from lib.notification.Notification import TELEGRAM_NOTIFICATIONS
 from lib.logging_util import get_logger
 logger = get_logger("signal-intelligence")
 
-CONSUMER_NAME = "signal-intelligence-1"
-
 _running = True
 
 
@@ -39,18 +44,27 @@ def signal_handler(signum, frame):
     _running = False
 
 
-def _update_heartbeat(redis: RedisProxy, total_confluences: int):
-    redis.hset("service:registry:signal-intelligence", mapping={
+def _registry_key(consumer: PartitionConsumer) -> str:
+    if consumer.partitions <= 1:
+        return "service:registry:signal-intelligence"
+    return f"service:registry:signal-intelligence-{consumer.partition}"
+
+
+def _update_heartbeat(redis: RedisProxy, consumer: PartitionConsumer):
+    key = _registry_key(consumer)
+    redis.hset(key, mapping={
         "name": "signal-intelligence",
         "pid": str(os.getpid()),
         "status": "healthy",
         "last_heartbeat": str(time.time()),
-        "total_confluences": str(total_confluences),
+        "total_confluences": str(consumer.correlator.total_confluences),
+        "partition": f"{consumer.partition}/{consumer.partitions}",
+        "signals_processed": str(consumer.processed),
         "version": BUILD_LABEL,
         "commit": GIT_COMMIT,
         "dirty": str(GIT_DIRTY),
     })
-    redis.expire("service:registry:signal-intelligence", 120)
+    redis.expire(key, 120)
 
 
 def main():
@@ -78,62 +92,44 @@ def main():
     TELEGRAM_NOTIFICATIONS.is_production = os.getenv(constant.ENV_PRODUCTION, "0") == "1"
     TELEGRAM_NOTIFICATIONS.is_intraday = True
 
-    try:
-        redis.xgroup_create(constant.SIGNALS_GROUP, constant.SIGNALS_STREAM, mkstream=True)
-    except Exception:
-        pass
+    partition = int(os.getenv(constant.ENV_SIGNAL_PARTITION, "0"))
+    if not 0 <= partition < constant.SIGNAL_PARTITIONS:
+        logger.error(f"[signal-intelligence] {constant.ENV_SIGNAL_PARTITION}={partition} outside "
+                     f"0..{constant.SIGNAL_PARTITIONS - 1}")
+        sys.exit(1)
 
     correlator = SignalCorrelator(on_confluence=make_on_confluence(redis))
     shared.app_ctx.correlator = correlator
+    consumer = PartitionConsumer(redis, correlator, partition=partition)
+    consumer.start()
 
-    logger.info("[signal-intelligence] Started, correlator initialised")
+    logger.info(f"[signal-intelligence] Started, consuming {consumer.stream} "
+                f"(partition {partition}/{consumer.partitions})")
 
-    _update_heartbeat(redis, correlator.total_confluences)
+    _update_heartbeat(redis, consumer)
     heartbeat_counter = 0
 
     while _running:
         try:
-            messages = redis.xreadgroup(
-                constant.SIGNALS_GROUP,
-                CONSUMER_NAME,
-                {constant.SIGNALS_STREAM: ">"},
-                count=50,
-                block=5000,
-            )
+            read = consumer.poll(count=50, block=5000)
         except Exception as e:
             logger.error(f"[signal-intelligence] Redis xreadgroup error: {e}")
             time.sleep(2)
             continue
 
-        if not messages:
-            heartbeat_counter += 1
+        heartbeat_counter += 1
+        if not read:
             if heartbeat_counter % 6 == 0:
-                _update_heartbeat(redis, correlator.total_confluences)
+                _update_heartbeat(redis, consumer)
                 gc.collect()
             continue
 
-        entries = messages[0][1] if isinstance(messages, list) and messages else []
-        for msg_id, fields in entries:
-            if not _running:
-                break
-
-            try:
-                signal_obj = reconstruct_signal(fields)
-                correlator.on_signal(signal_obj)
-            except Exception as e:
-                logger.exception(f"[signal-intelligence] Error processing signal {msg_id}: {e}")
-            finally:
-                try:
-                    redis.xack(constant.SIGNALS_STREAM, constant.SIGNALS_GROUP, msg_id)
-                except Exception:
-                    pass
-
-        heartbeat_counter += 1
-        _update_heartbeat(redis, correlator.total_confluences)
+        _update_heartbeat(redis, consumer)
         gc.collect()
 
+    consumer.save()
     logger.info("[signal-intelligence] Shutting down...")
-    redis.hset("service:registry:signal-intelligence", mapping={
+    redis.hset(_registry_key(consumer), mapping={
         "status": "shutdown",
         "last_heartbeat": str(time.time()),
     })
@@ -9,14 +9,21 @@ confluence:
   2. Sends the base Telegram alert directly. This call only touches Redis
      (notification/Notification.py -> notification:jobs), so it needs no
      monolith-only state.
+
+PartitionConsumer reads one symbol partition of intelligence:signals (see
+lib/intelligence/partition.py) into its correlator and snapshots the
+correlator to Redis so a restarted partition keeps its windows and cooldowns.
 """
 from __future__ import annotations
 
 import json
+import time
 
 from lib.intelligence.signal import Signal, Direction, Layer, SignalStrength
 from lib.intelligence.correlator import Confluence
+import common.constants as constant
 from common.constants import CONFLUENCE_STREAM
+from lib.intelligence.partition import partition_stream
 from lib.logging_util import get_logger
 logger = get_logger("signal-intelligence")
 from lib.notification.Notification import TELEGRAM_NOTIFICATIONS
@@ -86,3 +93,118 @@ def make_on_confluence(redis):
         )
 
     return on_confluence
+
+
+# ── Partition consumer ─────────────────────────────────────────────────────
+
+def _stream_id(entry_id) -> tuple[int, int]:
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode()
+    ms, _, seq = str(entry_id).partition("-")
+    return int(ms), int(seq or 0)
+
+
+class PartitionConsumer:
+    """
+    Consume one signal partition into `correlator`, with warm restart.
+
+    Entries are acked only when a correlator snapshot that includes them has
+    been written to ``CORRELATOR_STATE_KEY:{partition}`` (every
+    CORRELATOR_STATE_INTERVAL seconds). After a restart the snapshot is
+    restored, and this consumer's pending entries (delivered but never
+    snapshotted) are replayed before new ones, skipping any already in the
+    snapshot. A symbol always maps to one partition, and each partition is
+    read in stream order by one consumer, so confluences for a symbol are
+    emitted in order. Confluences fired between the last snapshot and a crash
+    may fire again on replay.
+    """
+
+    def __init__(self, redis, correlator, partition: int = 0, partitions: int | None = None,
+                 state_interval: float | None = None):
+        self.redis = redis
+        self.correlator = correlator
+        self.partition = partition
+        self.partitions = partitions or constant.SIGNAL_PARTITIONS
+        self.stream = partition_stream(partition, self.partitions)
+        self.consumer = f"signal-intelligence-{partition + 1}"
+        self.state_key = f"{constant.CORRELATOR_STATE_KEY}:{partition}"
+        self.state_interval = (constant.CORRELATOR_STATE_INTERVAL
+                               if state_interval is None else state_interval)
+
+        self._last_id: tuple[int, int] | None = None   # newest entry reflected in the correlator
+        self._read_id = "0"                            # replay own pending entries first
+        self._unacked: list = []
+        self._saved_at = time.time()
+        self.processed = 0
+
+    def start(self) -> None:
+        """Create the consumer group and restore the last snapshot, if any."""
+        try:
+            self.redis.xgroup_create(constant.SIGNALS_GROUP, self.stream, mkstream=True)
+        except Exception:
+            pass
+        raw = self.redis.get(self.state_key)
+        if not raw:
+            return
+        try:
+            state = json.loads(raw)
+            self.correlator.restore(state)
+            if state.get("last_id"):
+                self._last_id = _stream_id(state["last_id"])
+            logger.info(
+                f"[signal-intelligence] Partition {self.partition} restored "
+                f"{len(state.get('symbols', {}))} symbols up to {state.get('last_id')}"
+            )
+        except Exception as e:
+            logger.error(f"[signal-intelligence] Ignoring unreadable correlator snapshot: {e}")
+
+    def poll(self, count: int = 50, block: int = 5000) -> int:
+        """Read and apply one batch. Returns the number of entries read."""
+        entries = []
+        if self._read_id != ">":
+            entries = self._read(self._read_id, count, None)
+            self._read_id = entries[-1][0] if entries else ">"
+        if self._read_id == ">":
+            entries = self._read(">", count, block)
+
+        for msg_id, fields in entries:
+            self._unacked.append(msg_id)
+            entry_id = _stream_id(msg_id)
+            if not fields or (self._last_id is not None and entry_id <= self._last_id):
+                continue    # trimmed from the stream, or already part of the restored snapshot
+            try:
+                self.correlator.on_signal(reconstruct_signal(fields))
+            except Exception as e:
+                logger.exception(f"[signal-intelligence] Error processing signal {msg_id}: {e}")
+            self._last_id = entry_id
+            self.processed += 1
+
+        if time.time() - self._saved_at >= self.state_interval:
+            self.save()
+        return len(entries)
+
+    def _read(self, read_id, count: int, block: int | None) -> list:
+        messages = self.redis.xreadgroup(
+            constant.SIGNALS_GROUP, self.consumer, {self.stream: read_id}, count=count, block=block,
+        )
+        return messages[0][1] if isinstance(messages, list) and messages else []
+
+    def save(self) -> None:
+        """Snapshot the correlator, then ack every entry it now covers."""
+        self._saved_at = time.time()
+        if not self._unacked:
+            return
+        state = self.correlator.snapshot()
+        if self._last_id is not None:
+            state["last_id"] = f"{self._last_id[0]}-{self._last_id[1]}"
+        state["saved_at"] = self._saved_at
+        try:
+            self.redis.set(self.state_key, json.dumps(state, default=str))
+        except Exception as e:
+            logger.error(f"[signal-intelligence] Correlator snapshot failed: {e}")
+            return
+        try:
+            self.redis.xack(self.stream, constant.SIGNALS_GROUP, *self._unacked)
+        except Exception:
+            pass
+        self._unacked = []
@@ -861,7 +861,7 @@ def run_intelligence_test():
     ok(len(confluences_high) == 1, "2 layers → first confluence")
 
     # Reset cooldown to allow 3-layer confluence to fire
-    corr2._last_confluence.clear()
+    corr2._buffers["RELIANCE"].last_confluence.clear()
     corr2.on_signal(Signal("RELIANCE", Direction.BEARISH, "pcr", Layer.LIVE, SignalStrength.WEAK, timestamp=now))
     ok(len(confluences_high) == 2, "3 layers → second confluence fired")
     ok(confluences_high[1].level == "HIGH", f"3-layer level = {confluences_high[1].level}")
@@ -0,0 +1,231 @@
+"""Tests for analyser/IndicatorState.py — incremental indicators vs full recompute."""
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import common.shared as shared
+from services.analysis_engine.analyser.IndicatorState import IndicatorState
+from services.analysis_engine.analyser.TechnicalAnalyser import TechnicalAnalyser
+from tests.analyser.conftest import make_stock
+
+
+def _random_df(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    high = close * (1 + rng.uniform(0, 0.01, n))
+    low = close * (1 - rng.uniform(0, 0.01, n))
+    idx = pd.date_range("2024-01-01 09:15", periods=n, freq="5min")
+    return pd.DataFrame(
+        {"Open": close, "High": high, "Low": low, "Close": close, "Volume": 1000.0},
+        index=idx,
+    )
+
+
+def _ctx(mode):
+    mock = MagicMock()
+    mock.mode = mode
+    return mock
+
+
+@pytest.fixture
+def analyser():
+    a = TechnicalAnalyser()
+    with patch("common.shared.app_ctx", _ctx(shared.Mode.POSITIONAL)):
+        a.reset_constants()
+    return a
+
+
+def _walk(df, params, start=2):
+    """Advance one state bar by bar (as successive cycles would) and return it."""
+    state = IndicatorState()
+    view = None
+    for m in range(start, len(df) + 1):
+        view = state.update(df.iloc[:m], params)
+    return state, view
+
+
+class TestIndicatorValues:
+    def test_ewm_indicators_match_pandas(self, analyser):
+        df = _random_df()
+        _, view = _walk(df, analyser._indicator_params())
+        close = df["Close"]
+
+        ema20 = close.ewm(span=20, adjust=False).mean().iloc[-1]
+        ema50 = close.ewm(span=50, adjust=False).mean().iloc[-1]
+        assert view.trend_tail[-1] == (ema20, ema50)
+
+        rsi = analyser._compute_rsi(close).iloc[-50:].tolist()
+        assert list(view.rsi_tail) == rsi
+        assert view.window_rsi() == analyser._compute_rsi(close.iloc[-100:]).tolist()
+
+        assert view.adx == analyser._compute_adx(df).iloc[-1]
+
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = macd.ewm(span=9, adjust=False).mean()
+        assert view.macd_tail[-1][:2] == (macd.iloc[-1], signal.iloc[-1])
+
+    def test_rolling_indicators_match_pandas(self, analyser):
+        df = _random_df()
+        _, view = _walk(df, analyser._indicator_params())
+        close, high, low = df["Close"], df["High"], df["Low"]
+
+        sma = close.rolling(20).mean()
+        upper = sma + 2.0 * close.rolling(20).std()
+        _, v_sma, v_upper, _ = view.bb_tail[-1]
+        assert v_sma == pytest.approx(sma.iloc[-1], rel=1e-12)
+        assert v_upper == pytest.approx(upper.iloc[-1], rel=1e-12)
+
+        k = ((close - low.rolling(5).min()) / (high.rolling(5).max() - low.rolling(5).min())) * 100
+        d = k.rolling(5).mean()
+        assert view.stoch_tail[-1][0] == pytest.approx(k.iloc[-1], rel=1e-12)
+        assert view.stoch_tail[-1][1] == pytest.approx(d.iloc[-1], rel=1e-12)
+
+    def test_not_enough_bars_gives_nan(self, analyser):
+        df = _random_df(10)
+        _, view = _walk(df, analyser._indicator_params())
+        assert np.isnan(view.bb_tail[-1][1])
+        assert np.isnan(view.atr_tail[-1])
+
+
+class TestSignalParity:
+    METHODS = [
+        "analyse_rsi", "analyse_Bolinger_band", "analyze_macd", "analyse_atr",
+        "analyse_ema_crossover", "analyse_supertrend", "analyse_rsi_divergence",
+        "analyse_stochastic",
+    ]
+
+    @pytest.mark.parametrize("mode", [shared.Mode.POSITIONAL, shared.Mode.INTRADAY])
+    def test_signals_identical_to_full_recompute(self, mode):
+        df = _random_df(260, seed=3)
+        analyser = TechnicalAnalyser()
+        state = IndicatorState()
+        fired = 0
+        with patch("common.shared.app_ctx", _ctx(mode)):
+            analyser.reset_constants()
+            for m in range(120, len(df) + 1):
+                frame = df.iloc[:m]
+                full, incr = make_stock(), make_stock()
+                full.priceData = frame
+                incr.priceData = frame
+                incr.indicator_state = state
+                for name in self.METHODS:
+                    got_full = getattr(analyser, name)(full)
+                    got_incr = getattr(analyser, name)(incr)
+                    assert got_full == got_incr, f"{name} diverged at bar {m}"
+                    fired += got_full
+                for sentiment in ("BULLISH", "BEARISH", "NEUTRAL"):
+                    assert full.analysis[sentiment].keys() == incr.analysis[sentiment].keys()
+                    for key, value in full.analysis[sentiment].items():
+                        other = incr.analysis[sentiment][key]
+                        if isinstance(value, tuple):
+                            for a, b in zip(value, other):
+                                if isinstance(a, float):
+                                    assert a == pytest.approx(b, rel=1e-9, nan_ok=True)
+                                else:
+                                    assert a == b
+        assert fired > 0
+        assert state.rebuilds == 0
+
+
+class TestRevisionHandling:
+    def test_forming_bar_revision_does_not_touch_committed_state(self, analyser):
+        params = analyser._indicator_params()
+        df = _random_df(150)
+        state, _ = _walk(df, params)
+        committed = state.count
+
+        revised = df.copy()
+        revised.iloc[-1, revised.columns.get_loc("Close")] *= 1.05
+        view = state.update(revised, params)
+
+        assert state.count == committed
+        assert state.rebuilds == 0
+        assert view.closes[-1] == revised["Close"].iloc[-1]
+
+    def test_revised_committed_bar_forces_rebuild(self, analyser):
+        params = analyser._indicator_params()
+        df = _random_df(150)
+        state, _ = _walk(df, params)
+
+        revised = df.copy()
+        revised.iloc[-2, revised.columns.get_loc("High")] *= 1.05
+        view = state.update(revised, params)
+
+        assert state.rebuilds == 1
+        _, fresh = _walk(revised, params, start=len(revised))
+        assert view.adx == fresh.adx
+        assert list(view.rsi_tail) == list(fresh.rsi_tail)
+
+    def test_rolling_window_continues_without_rebuild(self, analyser):
+        params = analyser._indicator_params()
+        df = _random_df(150)
+        state, _ = _walk(df.iloc[:140], params)
+        committed = state.count
+
+        view = state.update(df.iloc[10:], params)       # window start moved, 10 bars appended
+
+        assert state.rebuilds == 0
+        assert state.count == committed + 10
+        _, continuous = _walk(df, params)
+        assert view.trend_tail[-1] == continuous.trend_tail[-1]
+        assert view.bb_tail[-1] == continuous.bb_tail[-1]
+
+    def test_last_committed_bar_dropped_forces_rebuild(self, analyser):
+        params = analyser._indicator_params()
+        df = _random_df(150)
+        state, _ = _walk(df.iloc[:100], params)
+
+        view = state.update(df.iloc[110:], params)
+
+        assert state.rebuilds == 1
+        assert view.trend_tail[-1][0] == df["Close"].iloc[110:].ewm(span=20, adjust=False).mean().iloc[-1]
+
+    def test_param_change_forces_rebuild(self, analyser):
+        df = _random_df(150)
+        state, _ = _walk(df, analyser._indicator_params())
+        state.update(df, analyser._indicator_params()._replace(stoch_k=14))
+        assert state.rebuilds == 1
+
+    def test_view_cached_for_same_frame(self, analyser):
+        params = analyser._indicator_params()
+        df = _random_df(150)
+        state = IndicatorState()
+        assert state.update(df, params) is state.update(df, params)
+
+
+class TestPersistence:
+    def test_json_roundtrip_continues_identically(self, analyser):
+        params = analyser._indicator_params()
+        df = _random_df(200)
+        state, _ = _walk(df.iloc[:150], params)
+
+        restored = IndicatorState.from_json(state.to_json())
+        for m in range(151, len(df) + 1):
+            a = state.update(df.iloc[:m], params)
+            b = restored.update(df.iloc[:m], params)
+
+        assert restored.rebuilds == 0
+        assert json.loads(a.to_json())["fields"] == json.loads(b.to_json())["fields"]
+
+    def test_dirty_only_when_bars_committed(self, analyser):
+        params = analyser._indicator_params()
+        df = _random_df(150)
+        state, _ = _walk(df, params)
+
+        restored = IndicatorState.from_json(state.to_json())
+        restored.update(df, params)
+        assert restored.dirty is False
+
+    @pytest.mark.parametrize("raw", ["not json", '{"v": 99}', '{"v": 1, "params": [1]}'])
+    def test_unreadable_state_starts_fresh(self, raw):
+        state = IndicatorState.from_json(raw)
+        assert state.count == 0
+        assert state.params is None
+
+    def test_analyser_without_state_uses_full_recompute(self, analyser):
+        stock = make_stock()
+        stock.priceData = _random_df(150)
+        assert analyser._indicators(stock) is None
@@ -217,3 +217,122 @@ class TestWallOiTrend:
         h = LiveOptionsHistory("NIFTY")
         _force_snapshot(h, _make_agg(), _make_options_live(), 20000.0)
         assert h.wall_oi_trend("CE", minutes=10000) is None
+
+
+class BinaryRedis:
+    """Minimal binary Redis for strings: append / get / getrange / strlen / expire, pipelined."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.ttl: dict[str, int] = {}
+        self.bytes_read = 0
+
+    def append(self, key, value):
+        self.data[key] = self.data.get(key, b"") + value
+        return len(self.data[key])
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def getrange(self, key, start, end):
+        buf = self.data.get(key, b"")
+        n = len(buf)
+        start = max(n + start, 0) if start < 0 else start
+        end = n + end if end < 0 else end
+        out = buf[start:end + 1]
+        self.bytes_read += len(out)
+        return out
+
+    def strlen(self, key):
+        return len(self.data.get(key, b""))
+
+    def expire(self, key, seconds):
+        self.ttl[key] = seconds
+
+    def pipeline(self, transaction=True):
+        redis, calls = self, []
+
+        class _Pipe:
+            def __getattr__(self, name):
+                return lambda *a, **kw: calls.append((name, a, kw))
+
+            def execute(self):
+                return [getattr(redis, name)(*a, **kw) for name, a, kw in calls]
+        return _Pipe()
+
+
+class TestPersistence:
+    """Append-only binary day series, warm restart and SharedOptionsHistory reads."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1_750_000_000.0]
+        monkeypatch.setattr(time, "time", lambda: now[0])
+        return now
+
+    def _fill(self, h, clock, n, step=60):
+        for i in range(n):
+            h.record(_make_agg(pcr=1.0 + i / 100, ce_oi=100_000 + i), _make_options_live(ce_wall_oi=60_000 + i),
+                     20000.0 + i)
+            clock[0] += step
+
+    def test_records_appended_with_ttl(self, clock):
+        from services.analysis_engine.analyser.LiveOptionsHistory import _RECORD, history_key
+        redis = BinaryRedis()
+        h = LiveOptionsHistory("NIFTY", redis)
+        self._fill(h, clock, 3)
+        key = history_key("NIFTY")
+        assert len(redis.data[key]) == 3 * _RECORD.size
+        assert redis.ttl[key] == 2 * 86400
+
+    def test_warm_restart_restores_buffer_and_throttle(self, clock):
+        redis = BinaryRedis()
+        self._fill(LiveOptionsHistory("NIFTY", redis), clock, 5)
+        restarted = LiveOptionsHistory("NIFTY", redis)
+        assert restarted.load() == 5
+        assert restarted.size() == 5
+        assert restarted.latest().spot == 20004.0
+        assert restarted.latest().pcr == pytest.approx(1.04)
+        clock[0] -= 30                                    # less than SAMPLE_INTERVAL after the last one
+        assert restarted.record(_make_agg(), _make_options_live(), 20000.0) is False
+
+    def test_missing_strikes_round_trip(self, clock):
+        redis = BinaryRedis()
+        h = LiveOptionsHistory("NIFTY", redis)
+        h.record(_make_agg(atm_strike=None, ce_wall=None, pe_wall=None), {}, 20000.0)
+        restored = LiveOptionsHistory("NIFTY", redis)
+        restored.load()
+        snap = restored.latest()
+        assert (snap.atm_strike, snap.ce_wall, snap.pe_wall) == (None, None, None)
+
+    def test_shared_view_matches_writer(self, clock):
+        from services.analysis_engine.analyser.LiveOptionsHistory import SharedOptionsHistory
+        redis = BinaryRedis()
+        writer = LiveOptionsHistory("NIFTY", redis)
+        self._fill(writer, clock, 30)
+        shared = SharedOptionsHistory("NIFTY", redis)
+        assert shared.size() == writer.size() == 30
+        assert [s.ts for s in shared.since(600)] == [s.ts for s in writer.since(600)]
+        assert [s.ts for s in shared.last_n(4)] == [s.ts for s in writer.last_n(4)]
+        assert shared.oldest().ts == writer.oldest().ts
+        assert shared.latest().ts == writer.latest().ts
+        assert shared.minutes_of_data() == writer.minutes_of_data()
+        assert shared.wall_oi_trend("CE", 10) == writer.wall_oi_trend("CE", 10)
+        assert shared.record(_make_agg(), _make_options_live(), 1.0) is False
+
+    def test_shared_reads_only_the_tail(self, clock):
+        from services.analysis_engine.analyser.LiveOptionsHistory import _RECORD, SharedOptionsHistory
+        redis = BinaryRedis()
+        self._fill(LiveOptionsHistory("NIFTY", redis), clock, 300)
+        shared = SharedOptionsHistory("NIFTY", redis)
+        assert len(shared.since(15 * 60)) == 15
+        assert redis.bytes_read <= 17 * _RECORD.size
+
+    def test_shared_fail_safe(self):
+        from unittest.mock import MagicMock
+        from services.analysis_engine.analyser.LiveOptionsHistory import SharedOptionsHistory
+        broken = MagicMock()
+        broken.getrange.side_effect = ConnectionError("down")
+        broken.strlen.side_effect = ConnectionError("down")
+        shared = SharedOptionsHistory("NIFTY", broken)
+        assert shared.size() == 0 and shared.since(600) == [] and shared.latest() is None
@@ -128,3 +128,12 @@ class TestResetConstants:
             a.reset_constants()
             assert MaxPainAnalyser.MAX_PAIN_DEVIATION_THRESHOLD == 3.0
             assert MaxPainAnalyser.MAX_PAIN_STRONG_DEVIATION == 5.0
+
+
+class TestAnalysisRegistration:
+    def test_analyses_collected_for_stocks_and_indices(self):
+        a = MaxPainAnalyser()
+        names = ("analyse_max_pain_deviation", "analyse_max_pain_trend", "analyse_max_pain_alignment")
+        for collected in (a._intraday_methods, a._positional_methods,
+                          a._intraday_index_methods, a._positional_index_methods):
+            assert sorted(m.__name__ for m in collected) == sorted(names)
@@ -0,0 +1,160 @@
+"""Tests for analyser/OptionChainFrame.py — vectorised primitives vs the dict loops they replace."""
+import numpy as np
+import pytest
+
+from services.analysis_engine.analyser.OptionChainFrame import OptionChainFrame
+from services.data_gateway.sensibull_fetcher import _compute_max_pain
+from tests.analyser.conftest import make_oi_chain, make_stock
+
+
+def _random_chain(n=41, seed=3, spot=20000.0, step=50.0):
+    rng = np.random.default_rng(seed)
+    base = spot - (n // 2) * step
+    strikes = [base + i * step for i in range(n)]
+    rng.shuffle(strikes)   # dict order must not matter
+    psd = {}
+    for s in strikes:
+        psd[str(s)] = {
+            "call_oi": int(rng.integers(0, 200_000)),
+            "put_oi": int(rng.integers(0, 200_000)),
+            "prev_call_oi": int(rng.integers(0, 200_000)),
+            "prev_put_oi": int(rng.integers(0, 200_000)),
+        }
+    return psd
+
+
+def _random_options_live(n=31, seed=5, spot=24000.0, step=100.0):
+    rng = np.random.default_rng(seed)
+    base = spot - (n // 2) * step
+    return {
+        base + i * step: {
+            side: {"oi": int(rng.integers(0, 500_000)), "gamma": float(rng.uniform(0, 0.004)), "ltp": 100.0}
+            for side in ("CE", "PE")
+        }
+        for i in range(n)
+    }
+
+
+# Legacy per-strike loops, as they were in the analysers.
+
+def _legacy_dominant_wall(psd, oi_key, spot, k, min_dist, max_dist):
+    oi_values = [d.get(oi_key, 0) for d in psd.values() if d.get(oi_key, 0) > 0]
+    if len(oi_values) < 5:
+        return None, 0
+    threshold = np.mean(oi_values) + k * np.std(oi_values)
+    is_call = oi_key in ("call_oi", "prev_call_oi")
+    best_strike, best_oi = None, 0
+    for strike_str, data in sorted(psd.items(), key=lambda kv: float(kv[0])):
+        strike, oi = float(strike_str), data.get(oi_key, 0)
+        dist = abs(strike - spot) / spot * 100
+        if dist < min_dist or dist > max_dist:
+            continue
+        if (is_call and strike < spot) or (not is_call and strike > spot):
+            continue
+        if oi > threshold and oi > best_oi:
+            best_strike, best_oi = strike, oi
+    return best_strike, best_oi
+
+
+def _legacy_gex(options_live, spot):
+    by_strike = {}
+    for strike, data in options_live.items():
+        ce, pe = data.get("CE", {}), data.get("PE", {})
+        by_strike[float(strike)] = (
+            ce.get("gamma", 0.0) * ce.get("oi", 0) * (spot ** 2) * 0.01 / 1e7
+            - pe.get("gamma", 0.0) * pe.get("oi", 0) * (spot ** 2) * 0.01 / 1e7
+        )
+    return by_strike
+
+
+def _legacy_flip(spot, gex_by_strike):
+    strikes = sorted(gex_by_strike)
+    atm_idx = strikes.index(min(strikes, key=lambda s: abs(s - spot)))
+    for order in (range(atm_idx, -1, -1), range(atm_idx, len(strikes))):
+        cumulative = 0.0
+        for i in order:
+            prev, cumulative = cumulative, cumulative + gex_by_strike[strikes[i]]
+            if prev * cumulative < 0:
+                return strikes[i]
+    return None
+
+
+class TestConstruction:
+    def test_per_strike_data_sorted_with_zero_defaults(self):
+        frame = OptionChainFrame.from_per_strike_data({
+            "20100": {"call_oi": 5, "put_oi": None},
+            19900.0: {"call_oi": 7},
+        })
+        assert frame.strikes.tolist() == [19900.0, 20100.0]
+        assert frame.column("CE").tolist() == [7.0, 5.0]
+        assert frame.column("PE").tolist() == [0.0, 0.0]
+        assert frame.column("CE", "gamma").tolist() == [0.0, 0.0]
+
+    def test_options_live_columns(self):
+        frame = OptionChainFrame.from_options_live({
+            24100.0: {"CE": {"oi": 10, "gamma": 0.001, "iv": 12.5}},
+            24000.0: {"CE": {"oi": 20}, "PE": {"oi": 30, "delta": -0.5}},
+        })
+        assert frame.strikes.tolist() == [24000.0, 24100.0]
+        assert frame.column("CE").tolist() == [20.0, 10.0]
+        assert frame.column("PE", "delta").tolist() == [-0.5, 0.0]
+        assert frame.column("CE", "iv").tolist() == [0.0, 12.5]
+
+    def test_cached_per_snapshot(self):
+        psd = _random_chain()
+        assert OptionChainFrame.of_per_strike_data(psd) is OptionChainFrame.of_per_strike_data(psd)
+        assert OptionChainFrame.of_per_strike_data(dict(psd)) is not OptionChainFrame.of_per_strike_data(psd)
+
+    def test_options_live_cache_tracks_version(self):
+        stock = make_stock(symbol="NIFTY")
+        stock._tick_store.options_live = _random_options_live()
+        first = OptionChainFrame.for_stock(stock, "options_live")
+        assert OptionChainFrame.for_stock(stock, "options_live") is first
+        stock._tick_store.options_version += 1
+        assert OptionChainFrame.for_stock(stock, "options_live") is not first
+
+    def test_for_stock_without_chain(self):
+        stock = make_stock()
+        assert OptionChainFrame.for_stock(stock) is None
+        assert OptionChainFrame.for_stock(stock, "options_live") is None
+
+
+class TestParity:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_max_oi(self, seed):
+        psd = _random_chain(seed=seed)
+        frame = OptionChainFrame.from_per_strike_data(psd)
+        for key, side in (("call_oi", "CE"), ("put_oi", "PE")):
+            best = max(psd.items(), key=lambda kv: (kv[1][key], -float(kv[0])))
+            assert frame.max_oi(side) == (float(best[0]), best[1][key])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_dominant_wall(self, seed):
+        psd = _random_chain(seed=seed)
+        frame = OptionChainFrame.from_per_strike_data(psd)
+        for key, side, field in (("call_oi", "CE", "oi"), ("put_oi", "PE", "oi"),
+                                 ("prev_call_oi", "CE", "prev_oi"), ("prev_put_oi", "PE", "prev_oi")):
+            for k in (0.0, 0.5, 1.0):
+                assert frame.dominant_wall(side, 20010.0, k, 0.5, 5.0, field) == \
+                    _legacy_dominant_wall(psd, key, 20010.0, k, 0.5, 5.0)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_max_pain(self, seed):
+        psd = _random_chain(seed=seed)
+        assert OptionChainFrame.from_per_strike_data(psd).max_pain() == _compute_max_pain(psd, 20000.0)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_gex_and_flip_level(self, seed):
+        options_live = _random_options_live(seed=seed)
+        spot = 24030.0
+        frame = OptionChainFrame.from_options_live(options_live)
+        gex_ce, gex_pe = frame.gex(spot)
+        legacy = _legacy_gex(options_live, spot)
+        assert (gex_ce - gex_pe).tolist() == [legacy[s] for s in frame.strikes.tolist()]
+        assert frame.flip_level(spot, gex_ce - gex_pe) == _legacy_flip(spot, legacy)
+
+    def test_strike_width_and_cumulative_oi(self):
+        frame = OptionChainFrame.from_per_strike_data(make_oi_chain()["per_strike_data"])
+        assert frame.strike_width() == 200.0
+        assert frame.cumulative_oi("CE").tolist() == [10_000, 40_000, 100_000]
+        assert frame.nearest_index(20090) == 1
@@ -370,3 +370,27 @@ class TestThreadSafety:
         [t.start() for t in threads]
         [t.join() for t in threads]
         assert errors == []
+
+
+# ── to_dict / from_dict ───────────────────────────────────────────────────────
+
+class TestSnapshot:
+    def test_round_trip_through_json(self):
+        import json
+        reg = make_registry()
+        reg.register(make_equity_info(1001, "RELIANCE"))
+        opt = make_option_info(2001, "NIFTY", 21000.0, "PE")
+        opt.zone = OptionZone.CORE
+        opt.is_subscribed = True
+        reg.register(opt)
+        reg.set_strike_gap("NIFTY", 50)
+        reg._current_atm["NIFTY"] = 21000.0
+
+        restored = TokenRegistry.from_dict(json.loads(json.dumps(reg.to_dict())))
+
+        assert restored.lookup(1001) == reg.lookup(1001)
+        assert restored.lookup(2001) == reg.lookup(2001)
+        assert restored.get_option_tokens_for("NIFTY") == {21000.0: {"PE": 2001}}
+        assert restored.get_strike_gap("NIFTY") == 50
+        assert restored.get_current_atm("NIFTY") == 21000.0
+        assert restored.get_all_subscribed_tokens() == [2001]
@@ -37,7 +37,7 @@ def setup_ctx(monkeypatch):
     tm.connected = True
     tm._tick_count = 1500
     tm.reconnect_attempts = 1
-    tm.tick_queue.qsize.return_value = 5
+    tm.tick_dispatcher.depth.return_value = 5
     tm._unknown_tokens = {"UNKNOWN1"}
     ctx.zd_ticker_manager = tm
 
@@ -0,0 +1,292 @@
+"""
+Unit tests for lib/notification/dispatcher.py
+
+Covers:
+- job_priority(): live options / alerts urgent, positional bulk
+- priority ordering within a lane, FIFO within a priority
+- per-destination lanes: a slow destination does not delay another
+- retries: rescheduled off the lane, other messages keep flowing, give-up
+- 429 handling: retry_after honoured, bucket paused
+- TokenBucket rate limiting
+- Telegram/Discord response classification
+- stats(): queue depth and latency percentiles
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from lib.notification.dispatcher import (
+    NotificationDispatcher, Destination, DiscordDestination, TelegramDestination, TokenBucket,
+    SendResult, job_priority, PRIORITY_URGENT, PRIORITY_NORMAL, PRIORITY_BULK,
+)
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────
+
+class FakeDestination(Destination):
+    """Records sends; `results` is consumed per send (default: success)."""
+
+    def __init__(self, name, results=None, delay=0.0, buckets=(), gate=None):
+        self.key = ("fake", name)
+        self.name = name
+        self.results = list(results or [])
+        self.delay = delay
+        self.buckets = buckets
+        self.gate = gate
+        self.sent = []
+        self.times = []
+
+    def send(self, session, message, parse_mode):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.delay:
+            time.sleep(self.delay)
+        self.sent.append(message)
+        self.times.append(time.monotonic())
+        return self.results.pop(0) if self.results else SendResult(True)
+
+    def __repr__(self):
+        return self.name
+
+
+class Collector:
+    def __init__(self):
+        self.done = []
+        self.event = threading.Event()
+        self.expected = 1
+
+    def __call__(self, job, ok, error):
+        self.done.append((job, ok, error))
+        if len(self.done) >= self.expected:
+            self.event.set()
+
+    def wait(self, n, timeout=5):
+        self.expected = n
+        if len(self.done) >= n:
+            return True
+        return self.event.wait(timeout)
+
+
+@pytest.fixture
+def collector():
+    return Collector()
+
+
+@pytest.fixture
+def dispatcher(collector):
+    d = NotificationDispatcher(collector, backoff=0.05)
+    yield d
+    d.stop(timeout=1)
+
+
+def _response(status, json_body=None, text=""):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.text = text
+    resp.headers = {}
+    resp.json.return_value = json_body or {}
+    return resp
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# job_priority()
+# ════════════════════════════════════════════════════════════════════════════
+
+class TestJobPriority:
+
+    @pytest.mark.parametrize("job", [
+        {"chat_type": "live_options"},
+        {"chat_type": "intraday", "message_type": "crash"},
+        {"chat_type": "intraday", "message_type": "auth_alert"},
+        {"chat_type": "positional", "priority": "critical"},
+    ])
+    def test_urgent(self, job):
+        assert job_priority(job) == PRIORITY_URGENT
+
+    def test_intraday_normal(self):
+        assert job_priority({"chat_type": "intraday", "message_type": "general"}) == PRIORITY_NORMAL
+
+    def test_positional_and_reports_bulk(self):
+        assert job_priority({"chat_type": "positional"}) == PRIORITY_BULK
+        assert job_priority({"chat_type": "intraday", "message_type": "report"}) == PRIORITY_BULK
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# Ordering and lanes
+# ════════════════════════════════════════════════════════════════════════════
+
+class TestOrdering:
+
+    def test_urgent_jumps_the_queue(self, dispatcher, collector):
+        gate = threading.Event()
+        dest = FakeDestination("tg", gate=gate)
+        dispatcher.submit({"chat_type": "intraday"}, [dest], "first")      # picked up, held at the gate
+        time.sleep(0.05)
+        dispatcher.submit({"chat_type": "positional"}, [dest], "bulk")
+        dispatcher.submit({"chat_type": "intraday"}, [dest], "normal-1")
+        dispatcher.submit({"chat_type": "intraday"}, [dest], "normal-2")
+        dispatcher.submit({"chat_type": "live_options"}, [dest], "urgent")
+        gate.set()
+        assert collector.wait(5)
+        assert dest.sent == ["first", "urgent", "normal-1", "normal-2", "bulk"]
+
+    def test_slow_destination_does_not_block_another(self, dispatcher, collector):
+        slow = FakeDestination("slow", delay=0.5)
+        fast = FakeDestination("fast")
+        start = time.monotonic()
+        dispatcher.submit({"chat_type": "intraday"}, [slow], "a")
+        dispatcher.submit({"chat_type": "live_options"}, [fast], "b")
+        assert collector.wait(1, timeout=2)
+        assert collector.done[0][0]["chat_type"] == "live_options"
+        assert fast.times[0] - start < 0.3
+
+    def test_fan_out_completes_once(self, dispatcher, collector):
+        a, b = FakeDestination("a"), FakeDestination("b", results=[SendResult(False, error="bad chat")])
+        dispatcher.submit({"chat_type": "intraday"}, [a, b], "hello")
+        assert collector.wait(1)
+        time.sleep(0.05)
+        assert len(collector.done) == 1
+        job, ok, error = collector.done[0]
+        assert ok is True                     # delivered to at least one destination
+        assert "bad chat" in error
+
+    def test_no_destinations_fails_immediately(self, dispatcher, collector):
+        dispatcher.submit({"chat_type": "intraday"}, [], "hello")
+        assert collector.done == [({"chat_type": "intraday"}, False, "no destination configured")]
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# Retries and rate limits
+# ════════════════════════════════════════════════════════════════════════════
+
+class TestRetries:
+
+    def test_retry_does_not_hold_the_lane(self, dispatcher, collector):
+        dest = FakeDestination("tg", results=[SendResult(False, True, error="timeout")])
+        dispatcher.backoff = 0.3
+        dispatcher.submit({"chat_type": "intraday", "n": 1}, [dest], "flaky")
+        dispatcher.submit({"chat_type": "intraday", "n": 2}, [dest], "next")
+        assert collector.wait(2)
+        assert dest.sent == ["flaky", "next", "flaky"]
+        assert [ok for _, ok, _ in collector.done] == [True, True]
+        assert dispatcher.retries == 1
+
+    def test_gives_up_after_max_attempts(self, dispatcher, collector):
+        dest = FakeDestination("tg", results=[SendResult(False, True, error="status=502")] * 3)
+        dispatcher.submit({"chat_type": "intraday"}, [dest], "x")
+        assert collector.wait(1)
+        assert len(dest.sent) == 3
+        assert collector.done[0][1] is False
+        assert dispatcher.failed == 1
+
+    def test_non_retryable_fails_once(self, dispatcher, collector):
+        dest = FakeDestination("tg", results=[SendResult(False, False, error="status=400")])
+        dispatcher.submit({"chat_type": "intraday"}, [dest], "x")
+        assert collector.wait(1)
+        assert len(dest.sent) == 1
+        assert dispatcher.retries == 0
+
+    def test_429_honours_retry_after(self, dispatcher, collector):
+        bucket = TokenBucket(100, 10)
+        dest = FakeDestination("tg", results=[SendResult(False, True, retry_after=0.3, error="status=429")],
+                               buckets=(bucket,))
+        dispatcher.submit({"chat_type": "intraday"}, [dest], "x")
+        assert collector.wait(1)
+        assert dest.times[1] - dest.times[0] >= 0.25
+        assert dispatcher.rate_limited == 1
+
+    def test_bucket_limits_send_rate(self, dispatcher, collector):
+        dest = FakeDestination("tg", buckets=(TokenBucket(rate=20, burst=2),))
+        for i in range(6):
+            dispatcher.submit({"chat_type": "intraday"}, [dest], str(i))
+        assert collector.wait(6)
+        # 2 burst, then 4 at 20/s ≈ 0.2 s
+        assert dest.times[-1] - dest.times[0] >= 0.15
+
+
+class TestTokenBucket:
+
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        now = time.monotonic()
+        for _ in range(2):
+            assert bucket.delay(now) == 0
+            bucket.take(now)
+        assert bucket.delay(now) == pytest.approx(0.1, abs=0.01)
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.pause(1.0)
+        assert bucket.delay(time.monotonic()) > 0.9
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# Destinations
+# ════════════════════════════════════════════════════════════════════════════
+
+class TestDestinations:
+
+    def test_telegram_success(self):
+        session = MagicMock()
+        session.post.return_value = _response(200)
+        dest = TelegramDestination("https://api.telegram.org/bot", "TOKEN", "123", ())
+        assert dest.send(session, "hi", "HTML").ok
+        url = session.post.call_args[0][0]
+        assert url == "https://api.telegram.org/botTOKEN/sendMessage"
+        assert session.post.call_args[1]["json"] == {"chat_id": "123", "text": "hi", "parse_mode": "HTML"}
+
+    def test_telegram_429_reads_retry_after(self):
+        session = MagicMock()
+        session.post.return_value = _response(429, {"parameters": {"retry_after": 7}})
+        result = TelegramDestination("u/", "T", "1", ()).send(session, "hi", None)
+        assert (result.ok, result.retryable, result.retry_after) == (False, True, 7.0)
+
+    def test_telegram_400_not_retryable(self):
+        session = MagicMock()
+        session.post.return_value = _response(400, text="can't parse entities")
+        result = TelegramDestination("u/", "T", "1", ()).send(session, "hi", None)
+        assert not result.ok and not result.retryable
+
+    def test_timeout_retryable(self):
+        session = MagicMock()
+        session.post.side_effect = requests.Timeout()
+        result = TelegramDestination("u/", "T", "1", ()).send(session, "hi", None)
+        assert result.retryable and result.error == "timeout"
+
+    def test_discord_renders_content(self):
+        session = MagicMock()
+        session.post.return_value = _response(204)
+        dest = DiscordDestination("https://discord/webhook", TokenBucket(1, 1), lambda m, p: m.upper())
+        assert dest.send(session, "hi", "HTML").ok
+        assert session.post.call_args[1]["json"] == {"content": "HI"}
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# stats()
+# ════════════════════════════════════════════════════════════════════════════
+
+class TestStats:
+
+    def test_latency_from_enqueue_time(self, dispatcher, collector):
+        dest = FakeDestination("tg")
+        dispatcher.submit({"chat_type": "live_options"}, [dest], "x", enqueued_at=time.time() - 2.0)
+        assert collector.wait(1)
+        stats = dispatcher.stats()
+        assert 1900 <= int(stats["notify_latency_p99_ms"]) < 3000
+        assert stats["notify_latency_urgent_p99_ms"] == stats["notify_latency_p99_ms"]
+        assert stats["notify_delivered"] == "1"
+        assert stats["notify_inflight"] == "0"
+
+    def test_queue_depth(self, dispatcher, collector):
+        gate = threading.Event()
+        dest = FakeDestination("tg", gate=gate)
+        for i in range(4):
+            dispatcher.submit({"chat_type": "intraday"}, [dest], str(i))
+        time.sleep(0.05)
+        assert dispatcher.stats()["notify_queue_depth"] == "3"
+        assert dispatcher.inflight() == 4
+        gate.set()
+        assert collector.wait(4)
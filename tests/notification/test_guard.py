@@ -8,6 +8,8 @@ from lib.notification.commands._guard import (
     chat_allowed,
     debug_chat_only,
     guard,
+    command_latency_stats,
+    _latencies,
 )
 
 
@@ -84,6 +86,25 @@ class TestGuardDecorator:
         await handler(_make_update(-100), None)
         assert called is True
 
+    @pytest.mark.asyncio
+    async def test_guard_records_latency_per_command(self, monkeypatch):
+        monkeypatch.setenv("TELEGRAM_ALLOWED_CHAT_IDS", "-100")
+        monkeypatch.setenv("TELEGRAM_DEBUG_CHAT_ID", "")
+        init_guard()
+        _latencies.clear()
+
+        @guard
+        async def cmd_ltp(update, context):
+            pass
+
+        await cmd_ltp(_make_update(-100), None)
+        await cmd_ltp(_make_update(-100), None)
+        await cmd_ltp(_make_update(999), None)      # blocked: not timed
+        stats = command_latency_stats()
+        assert stats["cmd_ltp_count"] == "2"
+        assert {"cmd_ltp_p50_ms", "cmd_ltp_p95_ms", "cmd_ltp_p99_ms"} <= stats.keys()
+        _latencies.clear()
+
 
 def _make_update(chat_id: int) -> MagicMock:
     update = MagicMock()
@@ -0,0 +1,133 @@
+"""
+Unit tests for lib/notification/commands/_cache.py.
+
+Covers:
+- misses are fetched in one pipeline, repeats are served from memory
+- a snapshot sequence change drops data:* entries but keeps stats:*
+- keys outside data:* / stats:* are never cached
+- Redis errors and a missing client read as empty hashes
+- Prefetched serves hgetall from fetched hashes
+- the async client is closed on its own loop, and a client left from a
+  closed loop has its pooled sockets shut down when it is replaced
+"""
+import asyncio
+import socket
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from common.constants import SNAPSHOT_SEQ_KEY
+from lib.notification.commands import _cache as cache_mod
+from lib.notification.commands._cache import Prefetched, SnapshotCache
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hgetall(self, key):
+        self.keys.append(key)
+
+    async def execute(self):
+        self.redis.pipelines.append(list(self.keys))
+        if self.redis.fail:
+            raise ConnectionError("down")
+        return [dict(self.redis.hashes.get(k, {})) for k in self.keys]
+
+
+class FakeAsyncRedis:
+    def __init__(self, hashes=None):
+        self.hashes = hashes or {}
+        self.strings = {}
+        self.pipelines = []
+        self.fail = False
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+def _cache(redis):
+    return SnapshotCache(client_factory=lambda: redis, seq_check_interval=0.0)
+
+
+class TestSnapshotCache:
+
+    async def test_misses_fetched_in_one_pipeline_then_cached(self):
+        redis = FakeAsyncRedis({"data:NIFTY": {"ltp": "22500"}, "stats:system": {"total_ticks": "5"}})
+        cache = _cache(redis)
+        first = await cache.hgetall_many(["data:NIFTY", "stats:system", "data:GONE"])
+        assert first == {"data:NIFTY": {"ltp": "22500"}, "stats:system": {"total_ticks": "5"}, "data:GONE": {}}
+        assert redis.pipelines == [["data:NIFTY", "stats:system", "data:GONE"]]
+        again = await cache.hgetall_many(["data:NIFTY", "stats:system"])
+        assert again == {"data:NIFTY": {"ltp": "22500"}, "stats:system": {"total_ticks": "5"}}
+        assert len(redis.pipelines) == 1
+        assert cache.stats() == {"entries": 3, "hits": 2, "misses": 3, "invalidations": 0}
+
+    async def test_seq_change_drops_data_entries_only(self):
+        redis = FakeAsyncRedis({"data:NIFTY": {"ltp": "1"}, "stats:system": {"total_ticks": "5"}})
+        redis.strings[SNAPSHOT_SEQ_KEY] = "7"
+        cache = _cache(redis)
+        await cache.hgetall_many(["data:NIFTY", "stats:system"])
+        redis.hashes["data:NIFTY"] = {"ltp": "2"}
+        redis.strings[SNAPSHOT_SEQ_KEY] = "8"
+        out = await cache.hgetall_many(["data:NIFTY", "stats:system"])
+        assert out["data:NIFTY"] == {"ltp": "2"}
+        assert redis.pipelines[-1] == ["data:NIFTY"]
+        assert cache.invalidations == 1
+
+    async def test_other_prefixes_not_cached(self):
+        redis = FakeAsyncRedis({"service:registry:market_data": {"status": "up"}})
+        cache = _cache(redis)
+        await cache.hgetall_many(["service:registry:market_data"])
+        await cache.hgetall_many(["service:registry:market_data"])
+        assert len(redis.pipelines) == 2
+        assert cache.stats()["entries"] == 0
+
+    async def test_fail_safe(self):
+        redis = FakeAsyncRedis({"data:NIFTY": {"ltp": "1"}})
+        redis.fail = True
+        assert await _cache(redis).hgetall_many(["data:NIFTY"]) == {"data:NIFTY": {}}
+        assert await SnapshotCache(client_factory=lambda: None).hgetall_many(["data:X"]) == {"data:X": {}}
+
+
+def test_prefetched_hgetall():
+    fetched = Prefetched({"data:NIFTY": {"ltp": "1"}, "data:EMPTY": {}})
+    assert fetched.hgetall("data:NIFTY") == {"ltp": "1"}
+    assert fetched.hgetall("data:EMPTY") == {}
+    assert fetched.hgetall("data:MISSING") == {}
+
+
+class TestAsyncClient:
+
+    async def test_close_async_redis_closes_running_loops_client(self, monkeypatch):
+        client = SimpleNamespace(aclose=AsyncMock())
+        loop = asyncio.get_running_loop()
+        monkeypatch.setattr(cache_mod, "_clients", {id(loop): (loop, client)})
+        await cache_mod.close_async_redis()
+        client.aclose.assert_awaited_once()
+        assert cache_mod._clients == {}
+
+    async def test_client_from_closed_loop_released(self, monkeypatch):
+        old_loop = asyncio.new_event_loop()
+        old_loop.close()
+        sock = MagicMock()
+        conn = SimpleNamespace(_writer=SimpleNamespace(get_extra_info=lambda name: sock))
+        pool = SimpleNamespace(_available_connections=[conn], _in_use_connections=set())
+        old = SimpleNamespace(connection_pool=pool, aclose=AsyncMock())
+        monkeypatch.setattr(cache_mod, "_clients", {id(old_loop): (old_loop, old)})
+
+        client = cache_mod.get_async_redis()
+        assert client is not None and client is not old
+        sock.shutdown.assert_called_once_with(socket.SHUT_RDWR)
+        old.aclose.assert_not_called()
+        assert list(cache_mod._clients.values()) == [(asyncio.get_running_loop(), client)]
+        await cache_mod.close_async_redis()
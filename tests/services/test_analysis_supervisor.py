@@ -0,0 +1,213 @@
+"""Tests for the analysis-engine supervisor, pending-job recovery and job ordering."""
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+# ── order_jobs / JobCostModel ───────────────────────────────────────────────
+
+class TestOrderJobs:
+
+    def test_heaviest_jobs_lead_separate_batches(self):
+        from services.analysis_engine.scheduling import order_jobs
+        items = [("S%d" % i, 1.0) for i in range(17)] + [("H1", 9.0), ("H2", 8.0), ("H3", 7.0)]
+        ordered = order_jobs(items, lambda it: it[1], batch_size=10)
+
+        assert sorted(ordered) == sorted(items)
+        batches = [ordered[:10], ordered[10:]]
+        # The two heaviest jobs start separate batches.
+        assert {batches[0][0][0], batches[1][0][0]} == {"H1", "H2"}
+        # The heavier batch is dispatched first.
+        assert sum(c for _, c in batches[0]) >= sum(c for _, c in batches[1])
+
+    def test_batches_are_balanced(self):
+        from services.analysis_engine.scheduling import order_jobs
+        items = list(range(40))
+        ordered = order_jobs(items, float, batch_size=10)
+        totals = [sum(ordered[i:i + 10]) for i in range(0, 40, 10)]
+        assert max(totals) - min(totals) <= 4
+        assert totals == sorted(totals, reverse=True)
+
+    def test_empty(self):
+        from services.analysis_engine.scheduling import order_jobs
+        assert order_jobs([], float, 10) == []
+
+
+class TestJobCostModel:
+
+    def test_priors_rank_live_indices_first(self):
+        from services.analysis_engine.scheduling import JobCostModel
+        model = JobCostModel()
+        assert model.cost("NIFTY", True) > model.cost("NIFTYIT", True) > model.cost("INFY")
+
+    def test_observed_durations_are_smoothed(self):
+        from services.analysis_engine.scheduling import JobCostModel
+        model = JobCostModel(alpha=0.5)
+        model.observe("INFY", "100")
+        model.observe("INFY", "200")
+        assert model.cost("INFY") == 150
+        model.observe("INFY", "bad")
+        assert model.cost("INFY") == 150
+        # Unobserved symbols scale with the observed median.
+        assert model.cost("TCS") == 150
+
+
+# ── recover_pending ─────────────────────────────────────────────────────────
+
+def _entry(msg_id, cycle="c2", symbol="INFY"):
+    return (msg_id, {"job_id": msg_id, "cycle_id": cycle, "symbol": symbol,
+                     "is_index": "false", "mode": "intraday"})
+
+
+class TestRecoverPending:
+
+    def _redis(self, own, claimed):
+        redis = MagicMock()
+        redis.hget.return_value = "c2"
+        own_pages = [[("orchestrator:analysis_jobs", own)]] if own else []
+        redis.xreadgroup.side_effect = own_pages + [[]]
+        redis.xautoclaim.return_value = ("0-0", claimed)
+        return redis
+
+    def test_own_and_claimed_jobs_rerun_stale_cycles_acked(self):
+        from services.analysis_engine import main as engine
+        redis = self._redis(own=[_entry("1-0"), _entry("2-0", cycle="c1")], claimed=[_entry("3-0")])
+
+        with patch.object(engine, "process_batch") as process_batch:
+            n = engine.recover_pending(redis, MagicMock(), "w-1", batch_size=10, min_idle_ms=60_000)
+
+        assert n == 2
+        rerun = [e[0] for call in process_batch.call_args_list for e in call.args[2]]
+        assert rerun == ["1-0", "3-0"]
+        redis.xack.assert_called_once_with("orchestrator:analysis_jobs", "analysis-workers", "2-0")
+        redis.xautoclaim.assert_called_once_with(
+            "orchestrator:analysis_jobs", "analysis-workers", "w-1", 60_000, start_id="0-0", count=10)
+        # Own pending list is paged from the last id seen.
+        second = redis.xreadgroup.call_args_list[1]
+        assert second.args[2] == {"orchestrator:analysis_jobs": "2-0"}
+
+    def test_nothing_pending(self):
+        from services.analysis_engine import main as engine
+        redis = self._redis(own=[], claimed=[])
+        with patch.object(engine, "process_batch") as process_batch:
+            assert engine.recover_pending(redis, MagicMock(), "w-1", 10, 60_000) == 0
+        process_batch.assert_not_called()
+        redis.xack.assert_not_called()
+
+
+# ── Supervisor ──────────────────────────────────────────────────────────────
+
+def _crash_once(marker_dir):
+    def target(name):
+        marker = os.path.join(marker_dir, name)
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            return 3
+        while True:
+            time.sleep(0.05)
+    return target
+
+
+class _FilePipeline:
+    """Redis pipeline stand-in that appends hincrby calls to a file the parent can read."""
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = []
+
+    def hincrby(self, key, field, amount):
+        self.calls.append(f"{key} {field} {amount}\n")
+
+    def hset(self, key, mapping):
+        pass
+
+    def expire(self, key, ttl):
+        pass
+
+    def execute(self):
+        with open(self.path, "a") as f:
+            f.writelines(self.calls)
+
+
+def _raise(name):
+    raise RuntimeError(f"boom in {name}")
+
+
+def _count_and_exit(name):
+    from services.common import metrics
+    metrics.incr_system(f"jobs_{name}", 7)
+    return 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+class TestSupervisor:
+
+    def _wait(self, sup, cond, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not cond() and time.monotonic() < deadline:
+            sup.poll()
+            time.sleep(0.02)
+        return cond()
+
+    def test_crashed_worker_restarted_under_same_name(self, tmp_path):
+        from services.analysis_engine.supervisor import Supervisor
+        sup = Supervisor(2, "t", target=_crash_once(str(tmp_path)), min_backoff=0.01)
+        try:
+            sup.start()
+            assert self._wait(sup, lambda: sup.restarts == {"t-1": 1, "t-2": 1} and len(sup.children) == 2)
+            assert sorted(sup.children.values()) == ["t-1", "t-2"]
+        finally:
+            sup.shutdown(timeout=5)
+        assert sup.children == {}
+
+    def test_shutdown_does_not_restart(self, tmp_path):
+        from services.analysis_engine.supervisor import Supervisor
+        for name in ("t-1",):
+            open(tmp_path / name, "w").close()
+        sup = Supervisor(1, "t", target=_crash_once(str(tmp_path)), min_backoff=0.01)
+        sup.start()
+        sup.shutdown(timeout=5)
+        sup.poll()
+        assert sup.children == {}
+        assert sup.restarts == {}
+
+    def test_child_flushes_buffered_metrics_before_exit(self, tmp_path):
+        from services.analysis_engine.supervisor import Supervisor
+        out = tmp_path / "writes"
+        client = MagicMock()
+        client.pipeline.side_effect = lambda transaction=False: _FilePipeline(str(out))
+        sup = Supervisor(1, "t", target=_count_and_exit)
+        with patch("services.common.metrics._get_redis", return_value=client):
+            pid = sup._spawn("t-1")
+            _, status = os.waitpid(pid, 0)
+        sup.children.clear()
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert out.read_text() == "stats:system jobs_t-1 7\n"
+
+    def test_child_drains_async_logging_before_exit(self, tmp_path):
+        import logging
+        from lib.logging_util import async_logging
+        from services.analysis_engine.supervisor import Supervisor
+        path = tmp_path / "child.log"
+        logger = logging.getLogger("SA.test.supervisor-child")
+        logger.handlers.clear()
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(logging.FileHandler(path))
+        async_logging.enable_async_logging(capacity=100)
+        try:
+            async_logging.attach(logger)
+            sup = Supervisor(1, "t", target=_raise)
+            with patch("services.analysis_engine.supervisor.logger", logger):
+                pid = sup._spawn("t-1")
+                _, status = os.waitpid(pid, 0)
+            sup.children.clear()
+        finally:
+            async_logging.disable_async_logging()
+            for handler in logger.handlers:
+                handler.close()
+        assert os.waitstatus_to_exitcode(status) == 1
+        text = path.read_text()
+        assert "t-1 crashed" in text and "RuntimeError: boom in t-1" in text
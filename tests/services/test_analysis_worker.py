@@ -290,3 +290,129 @@ class TestProcessJob:
 
         assert result["result"] == "ERROR"
         assert "Bad data" in result["error"]
+
+
+def _batch_redis(replies=None):
+    redis = MagicMock()
+    redis.pipe = MagicMock()
+    redis.pipeline.return_value = redis.pipe
+    redis.pipe.execute.return_value = replies or []
+    return redis
+
+
+def _job(job_id, symbol, is_index="false"):
+    return (f"{job_id}-0", {"job_id": job_id, "cycle_id": "c1", "symbol": symbol,
+                            "is_index": is_index, "mode": "intraday"})
+
+
+class TestJobBatch:
+    """JobBatch prefetches a batch's hashes in one pipeline and defers writes."""
+
+    def test_prefetch_serves_reads_from_one_pipeline(self):
+        from services.analysis_engine.worker import JobBatch
+
+        redis = _batch_redis([{"ltp": "1"}, {}, {}, "state"])
+        batch = JobBatch(redis)
+        batch.prefetch([_job("1", "INFY")[1]])
+
+        redis.pipeline.assert_called_once_with(transaction=False)
+        assert [c.args[0] for c in redis.pipe.hgetall.call_args_list] == [
+            "data:price:INFY", "data:sensibull:INFY", "data:zerodha:INFY"]
+        assert batch.hgetall("data:price:INFY") == {"ltp": "1"}
+        assert batch.hgetall("data:zerodha:INFY") == {}
+        assert batch.hget("data:indicators:INFY", "intraday") == "state"
+        redis.hgetall.assert_not_called()
+        redis.hget.assert_not_called()
+
+    def test_live_options_index_prefetches_chain_and_gex_state(self):
+        from services.analysis_engine.worker import JobBatch
+
+        hashes, _ = JobBatch.job_reads(_job("1", "NIFTY", is_index="true")[1])
+        assert "data:options_live:NIFTY" in hashes
+        assert "data:gex_state:NIFTY" in hashes
+
+    def test_unprefetched_reads_fall_through(self):
+        from services.analysis_engine.worker import JobBatch
+
+        redis = _batch_redis()
+        redis.hgetall.return_value = {"x": "1"}
+        batch = JobBatch(redis)
+        assert batch.hgetall("data:other") == {"x": "1"}
+        redis.hgetall.assert_called_once_with("data:other")
+
+    def test_hset_is_deferred_and_visible_to_later_jobs(self):
+        from services.analysis_engine.worker import JobBatch
+
+        redis = _batch_redis([{}, {}, {}, None])
+        batch = JobBatch(redis)
+        batch.prefetch([_job("1", "INFY")[1]])
+        batch.hset("data:indicators:INFY", mapping={"intraday": "new"})
+
+        redis.hset.assert_not_called()
+        assert batch.hget("data:indicators:INFY", "intraday") == "new"
+
+        redis.pipe.reset_mock()
+        batch.flush([{"job_id": "1"}], ["1-0"])
+        redis.pipe.hset.assert_called_once_with("data:indicators:INFY", mapping={"intraday": "new"})
+        redis.pipe.xadd.assert_called_once()
+        redis.pipe.execute.assert_called_once()
+
+
+class TestProcessBatch:
+    """process_batch publishes and acks a whole batch together."""
+
+    def test_results_and_acks_in_one_pipeline(self, patch_app_ctx):
+        from services.analysis_engine.worker import process_batch
+
+        redis = _batch_redis()
+        orchestrator = MagicMock()
+        with patch("services.analysis_engine.worker.load_stock_from_redis", return_value=None), \
+             patch("services.common.metrics._get_redis", return_value=None):
+            results = process_batch(redis, orchestrator, [_job("1", "INFY"), _job("2", "TCS")])
+
+        assert [r["result"] for r in results] == ["NO_DATA", "NO_DATA"]
+        assert redis.pipe.xadd.call_count == 2
+        redis.pipe.xack.assert_called_once_with(
+            "orchestrator:analysis_jobs", "analysis-workers", "1-0", "2-0")
+        redis.xadd.assert_not_called()
+        redis.xack.assert_not_called()
+
+    def test_job_exception_becomes_error_result(self, patch_app_ctx):
+        from services.analysis_engine.worker import process_batch
+
+        redis = _batch_redis()
+        with patch("services.analysis_engine.worker.load_stock_from_redis", side_effect=RuntimeError("boom")), \
+             patch("services.common.metrics._get_redis", return_value=None):
+            results = process_batch(redis, MagicMock(), [_job("1", "INFY")])
+
+        assert results[0]["result"] == "ERROR"
+        assert results[0]["error"] == "boom"
+        redis.pipe.xack.assert_called_once_with("orchestrator:analysis_jobs", "analysis-workers", "1-0")
+
+    def test_stop_leaves_remaining_jobs_unacked(self, patch_app_ctx):
+        from services.analysis_engine.worker import process_batch
+
+        redis = _batch_redis()
+        calls = iter([True, False])
+        with patch("services.analysis_engine.worker.load_stock_from_redis", return_value=None), \
+             patch("services.common.metrics._get_redis", return_value=None):
+            results = process_batch(redis, MagicMock(), [_job("1", "INFY"), _job("2", "TCS")],
+                                    should_continue=lambda: next(calls))
+
+        assert len(results) == 1
+        redis.pipe.xack.assert_called_once_with("orchestrator:analysis_jobs", "analysis-workers", "1-0")
+
+    def test_metrics_coalesced_into_one_pipeline(self, patch_app_ctx):
+        from services.analysis_engine.worker import process_batch
+
+        redis = _batch_redis()
+        metrics_client = MagicMock()
+        with patch("services.analysis_engine.worker.load_stock_from_redis", return_value=None), \
+             patch("services.common.metrics._get_redis", return_value=metrics_client):
+            process_batch(redis, MagicMock(), [_job("1", "INFY"), _job("2", "INFY")])
+
+        metrics_client.pipeline.assert_called_once_with(transaction=False)
+        pipe = metrics_client.pipeline.return_value
+        pipe.execute.assert_called_once()
+        pipe.hincrby.assert_any_call("stats:stock:INFY", "analysis_count", 2)
+        pipe.hincrby.assert_any_call("stats:system", "result_no_data_count", 2)
@@ -0,0 +1,138 @@
+"""
+Unit tests for services/common/metrics.py buffered writers.
+
+Covers:
+- MetricsAggregator: counter deltas summed, last value wins for set_* fields
+- one pipeline per flush, daily TTL, stats:system last_updated
+- background flush on interval and on the event threshold
+- fail-safe: no Redis / failing pipeline count dropped writes
+- max_pending overflow drops new fields
+- module-level writers go through the process-wide aggregator
+"""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import services.common.metrics as metrics
+from services.common.metrics import MetricsAggregator
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    with patch("services.common.metrics._get_redis", return_value=client):
+        yield client
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestAggregation:
+
+    def test_one_pipeline_per_flush(self, client):
+        agg = MetricsAggregator(interval=60)
+        agg.incr_stock("infy", "tick_count")
+        agg.incr_stock("INFY", "tick_count", 4)
+        agg.set_stock("INFY", ltp=100)
+        agg.set_stock("INFY", ltp=101)
+        agg.incr_system("total_ticks")
+        agg.incr_daily("alerts_delivered")
+        agg.flush()
+
+        client.pipeline.assert_called_once_with(transaction=False)
+        pipe = client.pipeline.return_value
+        pipe.hincrby.assert_any_call("stats:stock:INFY", "tick_count", 5)
+        pipe.hincrby.assert_any_call("stats:system", "total_ticks", 1)
+        pipe.hset.assert_any_call("stats:stock:INFY", mapping={"ltp": "101"})
+        system = [c for c in pipe.hset.call_args_list if c.args[0] == "stats:system"][0]
+        assert "last_updated" in system.kwargs["mapping"]
+        daily = [c.args[0] for c in pipe.expire.call_args_list]
+        assert len(daily) == 1 and daily[0].startswith("stats:daily:")
+        pipe.execute.assert_called_once()
+        assert agg.stats()["flushes"] == 1
+        assert agg.stats()["pending"] == 0
+
+    def test_empty_flush_is_free(self, client):
+        MetricsAggregator(interval=60).flush()
+        client.pipeline.assert_not_called()
+
+    def test_blank_symbol_ignored(self, client):
+        agg = MetricsAggregator(interval=60)
+        agg.incr_stock("", "tick_count")
+        agg.set_stock(None, ltp=1)
+        agg.flush()
+        client.pipeline.assert_not_called()
+
+
+class TestBackgroundFlush:
+
+    def test_flushes_on_interval(self, client):
+        agg = MetricsAggregator(interval=0.05)
+        agg.incr_system("total_ticks")
+        assert _wait(lambda: client.pipeline.return_value.execute.called)
+
+    def test_flushes_early_on_event_threshold(self, client):
+        agg = MetricsAggregator(interval=60, max_events=10)
+        for _ in range(20):
+            agg.incr_stock("INFY", "tick_count")
+        assert _wait(lambda: client.pipeline.return_value.execute.called)
+        assert agg.stats()["flushes"] >= 1
+
+
+class TestFailSafe:
+
+    def test_no_redis_counts_dropped(self):
+        agg = MetricsAggregator(interval=60)
+        agg.incr_stock("INFY", "tick_count")
+        agg.set_stock("INFY", a=1, b=2)
+        with patch("services.common.metrics._get_redis", return_value=None):
+            agg.flush()
+        assert agg.dropped == 3
+
+    def test_pipeline_error_counts_dropped(self, client):
+        client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        agg = MetricsAggregator(interval=60)
+        agg.incr_system("total_ticks")
+        agg.flush()                       # must not raise
+        assert agg.dropped == 1
+        assert agg.stats()["last_flush_ms"] >= 0
+
+    def test_overflow_drops_new_fields_only(self, client):
+        agg = MetricsAggregator(interval=60, max_pending=2)
+        agg.incr_stock("INFY", "a")
+        agg.incr_stock("INFY", "b")
+        agg.incr_stock("INFY", "c")       # new field: dropped
+        agg.incr_stock("INFY", "a")       # existing field: still summed
+        agg.flush()
+        pipe = client.pipeline.return_value
+        pipe.hincrby.assert_any_call("stats:stock:INFY", "a", 2)
+        assert pipe.hincrby.call_count == 2
+        assert agg.dropped == 1
+
+
+class TestModuleWriters:
+
+    def test_writers_are_buffered(self, client):
+        agg = MetricsAggregator(interval=60)
+        with patch.object(metrics, "_aggregator", agg):
+            metrics.incr_stock("INFY", "alerts_delivered")
+            metrics.incr_system("alerts_delivered")
+            metrics.set_system(notify_queue_depth=3)
+            client.pipeline.assert_not_called()
+            metrics.flush()
+        client.pipeline.return_value.execute.assert_called_once()
+
+    def test_readers_flush_first(self, client):
+        agg = MetricsAggregator(interval=60)
+        client.hgetall.return_value = {"total_ticks": "1"}
+        with patch.object(metrics, "_aggregator", agg):
+            metrics.incr_system("total_ticks")
+            assert metrics.get_system_stats() == {"total_ticks": "1"}
+        client.pipeline.return_value.execute.assert_called_once()
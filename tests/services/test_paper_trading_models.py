@@ -72,6 +72,10 @@ class TestComputeStrikeGap:
     def test_returns_default_when_empty(self):
         assert compute_strike_gap([], default=50.0) == 50.0
 
+    def test_ignores_snapshot_meta_fields(self):
+        keys = ["24000.0_CE", "24050.0_PE", "_seq", "_ts", "_version"]
+        assert compute_strike_gap(keys) == 50.0
+
 
 class TestRedisKeyHelpers:
     def test_positions_closed_key(self):
@@ -0,0 +1,17 @@
+"""Tests for services/common/percentiles.py."""
+from services.common.percentiles import percentiles
+
+
+def test_empty_is_all_zero():
+    assert percentiles([]) == {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+
+def test_nearest_rank():
+    samples = list(range(101))[::-1]
+    assert percentiles(samples) == {"p50": 50, "p95": 95, "p99": 99, "max": 100}
+
+
+def test_accepts_any_iterable():
+    from collections import deque
+    assert percentiles(deque([3.0]))["p99"] == 3.0
+    assert percentiles(x for x in (1.0, 2.0))["max"] == 2.0
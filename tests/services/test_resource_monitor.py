@@ -3,7 +3,7 @@ Unit tests for the resource monitor service and /sysstats bot command.
 
 Covers:
 - Collector: system, process, redis metrics (mocked psutil + redis)
-- Storage: latest snapshot, time-series, daily rollup (mocked Redis)
+- Storage: latest snapshot, ring-buffer time-series, daily rollup (mocked Redis)
 - Alerts: CPU high, RAM high, core imbalance, service offline, RSS leak
 - Sysstats command: live, history, redis views (mocked Redis reads)
 - Sparkline rendering
@@ -181,19 +181,21 @@ class TestStorage:
         rc.hset.assert_called_once_with("sys:latest:system", mapping={"cpu_percent": "12.5"})
         rc.expire.assert_called_once_with("sys:latest:system", 120)
 
-    def test_store_timeseries_zadd_and_prune(self):
+    def test_store_timeseries_writes_ring_buffers(self):
         from services.resource_monitor.main import store_timeseries
+        from services.common.timeseries import RingWriter, query
+        from tests.services.test_timeseries import BytesRedis
 
-        rc = MagicMock()
-        pipe = MagicMock()
-        rc.pipeline.return_value = pipe
-
-        store_timeseries(rc, "sys:ts:cpu", 1000.0, 12.5)
+        ts_rc = BytesRedis()
+        ring = RingWriter(ts_rc)
+        store_timeseries(ring, "cpu", 1000.0, 12.5)
+        store_timeseries(ring, "cpu", 1030.0, 14.5)
+        assert ts_rc.data == {}                 # buffered until flush
+        ring.flush()
 
-        pipe.zadd.assert_called_once_with("sys:ts:cpu", {"1000.000000:12.5": 1000.0})
-        pipe.zremrangebyscore.assert_called_once()
-        pipe.expire.assert_called_once()
-        pipe.execute.assert_called_once()
+        points = query(ts_rc, "cpu", 990.0, 1040.0)
+        assert [(p.ts, p.last) for p in points] == [(1000.0, 12.5), (1030.0, 14.5)]
+        assert "sys:ring:cpu:1m" in ts_rc.data
 
     def test_daily_rollup_first_sample(self):
         from services.resource_monitor.main import update_daily_rollup
@@ -411,7 +413,6 @@ class TestSysstatsLive:
 
         rc.hgetall.side_effect = hgetall_side_effect
         rc.keys.return_value = []
-        rc.zrangebyscore.return_value = []
 
         text = _build_live_text(rc)
 
@@ -429,7 +430,6 @@ class TestSysstatsHistory:
         from lib.notification.commands.sysstats import _build_history_text
 
         rc = MagicMock()
-        rc.zrangebyscore.return_value = []
         rc.hgetall.return_value = {}
 
         text = _build_history_text(rc)
@@ -439,22 +439,22 @@ class TestSysstatsHistory:
 
     def test_shows_sparkline_when_data_exists(self):
         from lib.notification.commands.sysstats import _build_history_text
+        from services.common.timeseries import RingWriter
+        from tests.services.test_timeseries import BytesRedis
 
         rc = MagicMock()
 
-        # Mock ZSET data: 24 hourly values
+        # 24 hourly samples of CPU
+        ts_rc = BytesRedis()
+        ring = RingWriter(ts_rc)
         now = time.time()
-        ts_data = [(f"{10.0 + i}", now - (24 - i) * 3600) for i in range(24)]
-
-        def zrangebyscore_side_effect(key, min_score, max_score, withscores=True):
-            if "cpu" in key and "core" not in key:
-                return ts_data
-            return []
-
-        rc.zrangebyscore.side_effect = zrangebyscore_side_effect
+        for i in range(24):
+            ring.add("cpu", now - (24 - i) * 3600, 10.0 + i)
+        ring.flush()
         rc.hgetall.return_value = {}
+        rc.keys.return_value = []
 
-        text = _build_history_text(rc)
+        text = _build_history_text(rc, ts_rc)
 
         assert "CPU Total" in text
         assert "avg" in text
@@ -485,7 +485,6 @@ class TestSysstatsRedis:
             "hit_rate": "94.2", "total_keys": "2150",
             "slowlog_count": "0", "uptime_secs": "172800",
         }
-        rc.zrangebyscore.return_value = []
 
         text = _build_redis_text(rc)
 
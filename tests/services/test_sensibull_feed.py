@@ -0,0 +1,122 @@
+"""
+Unit tests for services/market_data/sensibull_feed.py frame decoding.
+
+Covers:
+- _decode_frame: header token / expiry, heartbeat and garbage frames
+- _compact_snapshot keeps header stats and only the adapter's chain fields
+- _on_message only parks frames (newest per underlying wins)
+- unchanged snapshots are skipped before decompressing
+- frames whose header has no underlying token are dropped
+- on_snapshot runs on the decode thread
+"""
+import gzip
+import json
+import threading
+
+from services.market_data.sensibull_feed import SensibullFeed, _compact_snapshot, _decode_frame
+
+NIFTY = 256265
+
+
+def _chain(ltp: float = 120.5) -> dict:
+    return {
+        "future_price": 22510.0,
+        "atm_strike": 22500,
+        "atm_iv": 0.14,
+        "atm_iv_percentile": 0.42,
+        "pcr": 0.93,
+        "per_expiry_stats": {"2026-05-26": {"dte": 12}},
+        "chain": {
+            "22500": {
+                "greeks": {"call_delta": 0.52, "gamma": 0.001, "theta": -9.1, "vega": 11.2, "iv": 0.14, "rho": 1.0},
+                "iv_change": 0.002,
+                "token": 123,
+                "call": {"last_price": ltp, "oi": 1000, "oi_change_quantity": 50, "volume": 7,
+                         "best_buy_price": 120.0, "best_sell_price": 121.0, "best_buy_qty": 75, "token": 1},
+                "put": {"last_price": 98.0, "oi": 900, "volume": 3},
+            },
+        },
+    }
+
+
+def _frame(payload: dict, token: int = NIFTY) -> bytes:
+    return b"\x01" + token.to_bytes(4, "big") + b"20260526" + gzip.compress(json.dumps(payload).encode())
+
+
+class TestDecode:
+
+    def test_header_and_compact_chain(self):
+        data = _decode_frame(_frame(_chain()))
+        assert data["_underlying_token"] == NIFTY
+        assert data["_header_expiry"] == "20260526"
+        assert data["future_price"] == 22510.0 and data["pcr"] == 0.93
+        assert "per_expiry_stats" not in data
+        row = data["chain"]["22500"]
+        assert row["greeks"] == {"call_delta": 0.52, "gamma": 0.001, "theta": -9.1, "vega": 11.2, "iv": 0.14}
+        assert row["iv_change"] == 0.002
+        assert row["call"] == {"last_price": 120.5, "oi": 1000, "oi_change_quantity": 50, "volume": 7,
+                               "best_buy_price": 120.0, "best_sell_price": 121.0}
+        assert row["put"] == {"last_price": 98.0, "oi": 900, "volume": 3}
+
+    def test_heartbeat_and_garbage(self):
+        assert _decode_frame(b"\xfd") is None
+        assert _decode_frame(b"\x01\x00\x03\xeb\x09no gzip here") is None
+        assert _decode_frame(b"\x01\x00\x03\xeb\x09" + b"\x1f\x8bbroken") is None
+
+    def test_compact_tolerates_missing_sections(self):
+        assert _compact_snapshot({"future_price": 1.0}) == {"future_price": 1.0, "chain": {}}
+
+
+class TestFeed:
+
+    def _feed(self):
+        received = []
+        feed = SensibullFeed([{"underlying": NIFTY, "expiry": "2026-05-26"}],
+                             on_snapshot=lambda token, data: received.append((token, data)))
+        return feed, received
+
+    def test_on_message_parks_newest_frame(self):
+        feed, received = self._feed()
+        feed._on_message(None, b"\xfd")
+        feed._on_message(None, _frame(_chain(100.0)))
+        feed._on_message(None, _frame(_chain(101.0)))
+        assert received == []
+        assert feed.frames == 2 and feed.coalesced == 1
+        feed._process(feed._pending.pop(NIFTY))
+        (token, data), = received
+        assert token == NIFTY
+        assert data["chain"]["22500"]["call"]["last_price"] == 101.0
+        assert "_underlying_token" not in data
+
+    def test_unchanged_snapshot_skipped(self):
+        feed, received = self._feed()
+        feed._process(_frame(_chain(100.0)))
+        feed._process(_frame(_chain(100.0)))           # same JSON, fresh gzip header
+        feed._process(_frame(_chain(100.5)))
+        assert len(received) == 2
+        assert (feed.decoded, feed.unchanged) == (2, 1)
+        assert feed.stats()["decode_ms_avg"] >= 0
+
+    def test_frame_without_token_dropped(self):
+        feed, received = self._feed()
+        feed._process(b"\x01\x00" + gzip.compress(json.dumps(_chain()).encode()))
+        assert received == []
+        assert feed.decoded == 0 and feed._last_content == {}
+
+    def test_snapshot_delivered_on_decode_thread(self):
+        threads = []
+        done = threading.Event()
+
+        def on_snapshot(token, data):
+            threads.append(threading.current_thread().name)
+            done.set()
+
+        feed = SensibullFeed([], on_snapshot=on_snapshot)
+        decoder = threading.Thread(target=feed._decode_loop, daemon=True, name="SensibullDecode")
+        decoder.start()
+        feed._on_message(None, _frame(_chain()))
+        assert done.wait(2)
+        feed.stop()
+        decoder.join(2)
+        assert threads == ["SensibullDecode"]
+        assert not decoder.is_alive()
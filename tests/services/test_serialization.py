@@ -0,0 +1,144 @@
+"""Tests for services/common/serialization.py — binary frame codec + JSON fallback."""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# ── Helpers ────────────────────────────────────────────────────────────────
+
+def _make_ohlcv(rows=10, freq="5min", tz="Asia/Kolkata"):
+    idx = pd.date_range("2025-01-06 09:15", periods=rows, freq=freq, tz=tz)
+    rng = np.random.default_rng(7)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    return pd.DataFrame({
+        "Open": close + 0.1,
+        "High": close + 0.5,
+        "Low": close - 0.5,
+        "Close": close,
+        "Volume": rng.integers(1_000, 50_000, rows),
+    }, index=idx)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# dataframe_to_json / dataframe_from_json
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestFrameCodecRoundTrip:
+    """Frames written by dataframe_to_json decode to the same data."""
+
+    def test_ohlcv_round_trip_preserves_dtypes_and_instants(self):
+        from services.common.serialization import dataframe_to_json, dataframe_from_json
+        df = _make_ohlcv()
+        out = dataframe_from_json(dataframe_to_json(df))
+        pd.testing.assert_frame_equal(out, df.tz_convert("UTC"), check_freq=False)
+        assert out["Volume"].dtype == np.int64
+
+    def test_tz_aware_reads_back_in_utc_like_legacy_json(self):
+        from services.common.serialization import dataframe_to_json, dataframe_from_json
+        df = _make_ohlcv()
+        legacy = dataframe_from_json(df.to_json(orient="split", date_format="iso"))
+        out = dataframe_from_json(dataframe_to_json(df))
+        assert str(out.index.tz) == str(legacy.index.tz) == "UTC"
+        assert (out.index.hour == legacy.index.hour).all()
+        assert out.index[0].hour == 3 and out.index[0].minute == 45
+
+    def test_payload_keeps_stored_zone(self):
+        from services.common.serialization import encode_frame_payload, decode_frame_payload
+        df = _make_ohlcv()
+        out = decode_frame_payload(encode_frame_payload(df))
+        pd.testing.assert_frame_equal(out, df, check_freq=False)
+        assert str(out.index.tz) == "Asia/Kolkata"
+
+    def test_writes_codec_prefix(self):
+        from services.common.serialization import dataframe_to_json, FRAME_CODEC_PREFIX
+        assert dataframe_to_json(_make_ohlcv()).startswith(FRAME_CODEC_PREFIX)
+
+    def test_nan_preserved(self):
+        from services.common.serialization import dataframe_to_json, dataframe_from_json
+        df = _make_ohlcv()
+        df.iloc[2, 0] = np.nan
+        out = dataframe_from_json(dataframe_to_json(df))
+        assert np.isnan(out.iloc[2, 0])
+
+    def test_range_index_and_string_column(self):
+        from services.common.serialization import dataframe_to_json, dataframe_from_json
+        df = pd.DataFrame({"pcr": [0.9, 1.1], "expiry": ["2025-01-30", "2025-02-27"]})
+        out = dataframe_from_json(dataframe_to_json(df))
+        pd.testing.assert_frame_equal(out, df)
+
+    def test_naive_datetime_index(self):
+        from services.common.serialization import dataframe_to_json, dataframe_from_json
+        df = _make_ohlcv(tz=None)
+        out = dataframe_from_json(dataframe_to_json(df))
+        pd.testing.assert_frame_equal(out, df, check_freq=False)
+
+    def test_decoded_frame_is_writeable(self):
+        from services.common.serialization import dataframe_to_json, dataframe_from_json
+        out = dataframe_from_json(dataframe_to_json(_make_ohlcv()))
+        out.iloc[0, 0] = 1.0
+        assert out.iloc[0, 0] == 1.0
+
+    def test_empty_frame_is_braces(self):
+        from services.common.serialization import dataframe_to_json, dataframe_from_json
+        assert dataframe_to_json(pd.DataFrame()) == "{}"
+        assert dataframe_to_json(None) == "{}"
+        assert dataframe_from_json("{}").empty
+        assert dataframe_from_json("").empty
+
+    def test_multiindex_columns_fall_back_to_json(self):
+        from services.common.serialization import dataframe_to_json, is_encoded_frame
+        df = pd.DataFrame(
+            np.ones((2, 2)),
+            columns=pd.MultiIndex.from_tuples([("NIFTY", "Open"), ("NIFTY", "Close")]),
+        )
+        assert not is_encoded_frame(dataframe_to_json(df))
+
+
+class TestLegacyJsonFallback:
+    """Values written by the old split-orient JSON path are still readable."""
+
+    def test_reads_split_json(self):
+        from services.common.serialization import dataframe_from_json
+        df = _make_ohlcv()
+        legacy = df.to_json(orient="split", date_format="iso")
+        out = dataframe_from_json(legacy)
+        assert len(out) == len(df)
+        assert list(out.columns) == list(df.columns)
+        np.testing.assert_allclose(out["Close"].to_numpy(), df["Close"].to_numpy())
+
+
+class TestDecodeFrameArrays:
+    """decode_frame_arrays returns zero-copy NumPy views."""
+
+    def test_numeric_columns_are_readonly_views(self):
+        from services.common.serialization import encode_frame, decode_frame_arrays
+        df = _make_ohlcv()
+        index, columns = decode_frame_arrays(encode_frame(df))
+        close = columns["Close"]
+        assert isinstance(close, np.ndarray)
+        assert not close.flags.writeable
+        assert close.base is not None
+        np.testing.assert_array_equal(close, df["Close"].to_numpy())
+        assert index.equals(df.index.tz_convert("UTC"))
+
+    def test_unknown_version_rejected(self):
+        from services.common.serialization import decode_frame_arrays
+        with pytest.raises(ValueError):
+            decode_frame_arrays("saf9:AAAA")
+
+
+class TestFramePayload:
+    """Raw payloads (no text prefix) for on-disk storage."""
+
+    def test_payload_round_trip(self):
+        from services.common.serialization import encode_frame_payload, decode_frame_payload
+        df = _make_ohlcv()
+        payload = encode_frame_payload(df)
+        assert isinstance(payload, bytes)
+        pd.testing.assert_frame_equal(decode_frame_payload(payload), df, check_freq=False)
+
+    def test_decoded_payload_frame_is_writable(self):
+        from services.common.serialization import encode_frame_payload, decode_frame_payload
+        out = decode_frame_payload(encode_frame_payload(_make_ohlcv()))
+        out.iloc[0, 0] = 1.0
+        assert out.iloc[0, 0] == 1.0
@@ -3,6 +3,8 @@
 import json
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from lib.intelligence.signal import Signal, Direction, Layer, SignalStrength
 from lib.intelligence.correlator import SignalCorrelator, Confluence
 from services.signal_intelligence.worker import (
@@ -191,3 +193,216 @@ class TestCorrelatorIntegration:
         correlator.on_signal(reconstruct_signal(_signal_fields(layer="LIVE", source="b", timestamp=now)))
 
         on_confluence.assert_not_called()
+
+
+def _legacy_confluences(signals_with_now, windows, cooldown):
+    """The list-rebuilding correlator this buffer replaced, as (now, symbol, direction, layers, score, contra, keys)."""
+    from collections import defaultdict
+    buffers, last, fired = defaultdict(list), {}, []
+    for now, signal in signals_with_now:
+        sym = signal.symbol
+        buffers[sym] = [s for s in buffers[sym] if (now - s.timestamp) < windows[s.layer]]
+        buffers[sym] = [s for s in buffers[sym] if s.key != signal.key] + [signal]
+        if len(buffers[sym]) < 2:
+            continue
+        by_direction = defaultdict(list)
+        for s in buffers[sym]:
+            if s.direction != Direction.NEUTRAL:
+                by_direction[s.direction].append(s)
+        for direction, aligned in by_direction.items():
+            layers = {s.layer for s in aligned}
+            if len(layers) < 2 or now - last.get((sym, direction), 0.0) < cooldown:
+                continue
+            opposite = Direction.BEARISH if direction == Direction.BULLISH else Direction.BULLISH
+            contra = bool(by_direction.get(opposite))
+            score = (sum(s.strength.value for s in aligned) + (len(layers) - 1) * 5
+                     + (3 if Layer.LIVE in layers else 0) - (3 if contra else 0))
+            last[(sym, direction)] = now
+            fired.append((now, sym, direction, layers, score, contra, [s.key for s in aligned]))
+    return fired
+
+
+class TestIndexedBuffer:
+    @staticmethod
+    def _random_day(seed, n=3000):
+        import random
+        rng = random.Random(seed)
+        now, out = 1_000_000.0, []
+        for _ in range(n):
+            now += rng.expovariate(1 / 20)
+            layer = rng.choice(list(Layer))
+            out.append((now, Signal(
+                symbol=rng.choice(("NIFTY", "BANKNIFTY", "INFY")),
+                direction=rng.choice(list(Direction)),
+                source=rng.choice(("vwap_cross", "rsi_divergence", "pcr_crossover", "oi_wall")),
+                layer=layer,
+                strength=rng.choice(list(SignalStrength)),
+                # producers stamp with their own (sometimes lagging) clocks
+                timestamp=now - rng.choice((0, 0, 0, rng.uniform(0, 600))),
+            )))
+        return out
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_legacy_buffer(self, seed):
+        day = self._random_day(seed)
+        clock = [0.0]
+        fired = []
+        correlator = SignalCorrelator(on_confluence=fired.append, clock=lambda: clock[0])
+        for now, signal in day:
+            clock[0] = now
+            correlator.on_signal(signal)
+
+        expected = _legacy_confluences(day, SignalCorrelator.WINDOW, SignalCorrelator.CONFLUENCE_COOLDOWN)
+        got = [(c.timestamp, c.symbol, c.direction, c.layers_involved, c.score, c.has_contradiction,
+                [s.key for s in c.signals]) for c in fired]
+        assert expected and got == expected
+        assert correlator.total_confluences == len(expected)
+
+    def test_snapshot_drops_expired_and_replaced(self):
+        clock = [1000.0]
+        correlator = SignalCorrelator(clock=lambda: clock[0])
+        live = Signal("NIFTY", Direction.BULLISH, "vwap_cross", Layer.LIVE, SignalStrength.WEAK, timestamp=1000.0)
+        pos = Signal("NIFTY", Direction.BULLISH, "bias", Layer.POSITIONAL, SignalStrength.WEAK, timestamp=1000.0)
+        correlator.on_signal(live)
+        correlator.on_signal(pos)
+        correlator.on_signal(Signal("NIFTY", Direction.BULLISH, "vwap_cross", Layer.LIVE,
+                                    SignalStrength.STRONG, timestamp=1010.0))
+        assert [s.strength for s in correlator.get_buffer_snapshot("NIFTY")] == [
+            SignalStrength.WEAK, SignalStrength.STRONG]
+        clock[0] = 1310.0   # LIVE window (300s) elapsed, POSITIONAL still active
+        assert correlator.get_buffer_snapshot("NIFTY") == [pos]
+        assert correlator.get_buffer_snapshot("UNKNOWN") == []
+
+    def test_heap_stays_bounded_under_replacement(self):
+        correlator = SignalCorrelator(clock=lambda: 0.0)
+        for i in range(5000):
+            correlator.on_signal(Signal("NIFTY", Direction.BULLISH, "vwap_cross", Layer.POSITIONAL,
+                                        SignalStrength.WEAK, timestamp=float(i)))
+        buffer = correlator._buffers["NIFTY"]
+        assert len(buffer) == 1
+        assert len(buffer.heaps[Layer.POSITIONAL]) <= 2 * len(buffer) + 65
+
+    def test_symbols_do_not_share_a_lock(self):
+        correlator = SignalCorrelator()
+        correlator.on_signal(Signal("NIFTY", Direction.BULLISH, "a", Layer.LIVE, SignalStrength.WEAK))
+        with correlator._buffers["NIFTY"].lock:
+            correlator.on_signal(Signal("INFY", Direction.BULLISH, "a", Layer.LIVE, SignalStrength.WEAK))
+        assert len(correlator.get_buffer_snapshot("INFY")) == 1
+
+
+# ── Partitioned consumption ───────────────────────────────────────────────────
+
+class _FakeStreams:
+    """Just enough of RedisProxy for one consumer group: XADD/XREADGROUP/XACK/GET/SET."""
+
+    def __init__(self):
+        self.streams: dict[str, list] = {}
+        self.pending: dict[str, list] = {}
+        self.delivered: dict[str, int] = {}
+        self.kv: dict[str, str] = {}
+
+    def xadd(self, stream, fields, maxlen=None):
+        entries = self.streams.setdefault(stream, [])
+        entry_id = f"{1000 + len(entries)}-0"
+        entries.append((entry_id, dict(fields)))
+        return entry_id
+
+    def xgroup_create(self, group, stream, mkstream=True):
+        self.streams.setdefault(stream, [])
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        (stream, read_id), = streams.items()
+        entries = self.streams.get(stream, [])
+        if read_id == ">":
+            start = self.delivered.get(stream, 0)
+            batch = entries[start:start + (count or len(entries))]
+            self.delivered[stream] = start + len(batch)
+            self.pending.setdefault(stream, []).extend(e[0] for e in batch)
+        else:
+            after = tuple(map(int, str(read_id).split("-"))) if read_id != "0" else (0, 0)
+            ids = [i for i in self.pending.get(stream, []) if tuple(map(int, i.split("-"))) > after]
+            batch = [e for e in entries if e[0] in ids][:count]
+        return [[stream, batch]] if batch else []
+
+    def xack(self, stream, group, *ids):
+        self.pending[stream] = [i for i in self.pending.get(stream, []) if i not in ids]
+
+    def get(self, key):
+        return self.kv.get(key)
+
+    def set(self, key, value):
+        self.kv[key] = value
+
+
+class TestPartitioning:
+    def test_partition_is_stable_and_in_range(self):
+        from lib.intelligence.partition import partition_for, partition_stream, stream_for
+        assert stream_for("NIFTY", 1) == "intelligence:signals"
+        import zlib
+        assert partition_for("NIFTY", 4) == zlib.crc32(b"NIFTY") % 4     # same in every process
+        assert {partition_for(f"S{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+        assert partition_stream(2, 4) == "intelligence:signals:2"
+
+    def test_bus_routes_by_symbol(self):
+        from lib.intelligence.partition import stream_for
+        from services.market_data.signal_publisher import RedisSignalBus
+        redis = _FakeStreams()
+        bus = RedisSignalBus(redis, partitions=4)
+        for symbol in ("NIFTY", "BANKNIFTY", "INFY", "TCS"):
+            bus.emit(Signal(symbol, Direction.BULLISH, "a", Layer.LIVE, SignalStrength.WEAK))
+        for stream, entries in redis.streams.items():
+            assert all(stream_for(fields["symbol"], 4) == stream for _, fields in entries)
+
+    def test_snapshot_round_trip_keeps_windows_and_cooldowns(self):
+        import json as _json
+        clock = [1000.0]
+        fired = []
+        a = SignalCorrelator(on_confluence=fired.append, clock=lambda: clock[0])
+        a.on_signal(Signal("NIFTY", Direction.BULLISH, "bias", Layer.POSITIONAL, SignalStrength.STRONG,
+                           timestamp=1000.0, context={"note": "gap up"}))
+        a.on_signal(Signal("NIFTY", Direction.BULLISH, "vwap", Layer.LIVE, SignalStrength.WEAK, timestamp=1000.0))
+        assert len(fired) == 1
+
+        b = SignalCorrelator(on_confluence=fired.append, clock=lambda: clock[0])
+        b.restore(_json.loads(_json.dumps(a.snapshot())))
+        assert b.get_buffer_snapshot("NIFTY") == a.get_buffer_snapshot("NIFTY")
+        assert b.total_confluences == 1
+
+        clock[0] = 1100.0   # still in cooldown: no refire
+        b.on_signal(Signal("NIFTY", Direction.BULLISH, "rsi", Layer.INTRADAY, SignalStrength.WEAK, timestamp=1100.0))
+        assert len(fired) == 1
+        clock[0] = 4000.0   # cooldown over, POSITIONAL bias still inside its 6h window
+        b.on_signal(Signal("NIFTY", Direction.BULLISH, "rsi", Layer.INTRADAY, SignalStrength.WEAK, timestamp=4000.0))
+        assert len(fired) == 2 and fired[-1].layers_involved == {Layer.POSITIONAL, Layer.INTRADAY}
+
+    def test_restart_resumes_from_snapshot_and_pending(self):
+        from services.market_data.signal_publisher import RedisSignalBus
+        from services.signal_intelligence.worker import PartitionConsumer
+        import time as _time
+        redis = _FakeStreams()
+        bus = RedisSignalBus(redis, partitions=1)
+        now = _time.time()
+
+        def emit(source, layer):
+            bus.emit(Signal("NIFTY", Direction.BULLISH, source, layer, SignalStrength.WEAK, timestamp=now))
+
+        first = PartitionConsumer(redis, SignalCorrelator(), partition=0, partitions=1, state_interval=3600)
+        first.start()
+        emit("bias", Layer.POSITIONAL)
+        first.poll()
+        first.save()                                # snapshot covers "bias", entry acked
+        emit("vwap", Layer.LIVE)
+        first.poll()                                # processed, then the process dies before saving
+        assert redis.pending["intelligence:signals"] == ["1001-0"]
+
+        fired = []
+        second = PartitionConsumer(redis, SignalCorrelator(on_confluence=fired.append),
+                                   partition=0, partitions=1, state_interval=3600)
+        second.start()
+        emit("rsi", Layer.INTRADAY)
+        while second.poll():
+            pass
+        assert [s.source for s in second.correlator.get_buffer_snapshot("NIFTY")] == ["bias", "vwap", "rsi"]
+        assert len(fired) == 1                      # bias + vwap replayed from pending → confluence
+        second.save()
+        assert redis.pending["intelligence:signals"] == []
@@ -0,0 +1,281 @@
+"""Tests for services/market_data/snapshot_publisher.py — batched + delta publishing."""
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from lib.zerodha.tick_store import TickStore
+
+
+def _tick(ltp=100.0, oi=1000):
+    return {"last_price": ltp, "oi": oi, "volume_traded": 10,
+            "total_buy_quantity": 5, "total_sell_quantity": 6}
+
+
+def _index(symbol="NIFTY"):
+    return SimpleNamespace(stock_symbol=symbol, _tick_store=TickStore())
+
+
+def _equity(symbol, price=100.0):
+    obj = SimpleNamespace(stock_symbol=symbol, _tick_store=TickStore())
+    obj._tick_store.update_zerodha_data({"last_price": price})
+    return obj
+
+
+@pytest.fixture
+def redis():
+    r = MagicMock()
+    r.hkeys.return_value = []
+    r.pipe = MagicMock()
+    r.pipeline.return_value = r.pipe
+    return r
+
+
+def _hset_mapping(pipe):
+    return pipe.hset.call_args.kwargs["mapping"]
+
+
+class TestOptionsDeltaPublish:
+    def test_first_pass_writes_full_chain_in_transaction(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        idx = _index()
+        idx._tick_store.update_option_tick(24000.0, "CE", _tick())
+        idx._tick_store.update_option_tick(24000.0, "PE", _tick())
+        pub = SnapshotPublisher(redis, [], [idx])
+
+        pub._publish_all()
+
+        # options transaction, then the batch pipeline carrying the snapshot seq INCR
+        assert redis.pipeline.call_args_list == [call(transaction=True), call(transaction=False)]
+        mapping = _hset_mapping(redis.pipe)
+        assert set(k for k in mapping if not k.startswith("_")) == {"24000.0_CE", "24000.0_PE"}
+        assert mapping["_version"] == "2"
+        redis.pipe.hincrby.assert_called_once_with("data:options_live:NIFTY", "_seq", 1)
+        redis.pipe.incr.assert_called_once_with("data:snapshot:seq")
+        assert redis.pipe.execute.call_count == 2
+        redis.delete.assert_not_called()
+
+    def test_second_pass_writes_only_changed_sides(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        idx = _index()
+        ts = idx._tick_store
+        ts.update_option_tick(24000.0, "CE", _tick())
+        ts.update_option_tick(24000.0, "PE", _tick())
+        pub = SnapshotPublisher(redis, [], [idx])
+        pub._publish_all()
+        redis.pipe.reset_mock()
+
+        ts.update_option_tick(24000.0, "PE", _tick(ltp=120.0))
+        pub._publish_all()
+
+        mapping = _hset_mapping(redis.pipe)
+        assert set(k for k in mapping if not k.startswith("_")) == {"24000.0_PE"}
+        assert json.loads(mapping["24000.0_PE"])["ltp"] == 120.0
+
+    def test_no_changes_no_write(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        idx = _index()
+        idx._tick_store.update_option_tick(24000.0, "CE", _tick())
+        pub = SnapshotPublisher(redis, [], [idx])
+        pub._publish_all()
+        redis.pipeline.reset_mock()
+
+        pub._publish_all()
+        redis.pipeline.assert_not_called()
+
+    def test_first_pass_removes_stale_strikes(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        redis.hkeys.return_value = ["23000.0_CE", "24000.0_CE", "_seq"]
+        idx = _index()
+        idx._tick_store.update_option_tick(24000.0, "CE", _tick())
+        pub = SnapshotPublisher(redis, [], [idx])
+
+        pub._publish_all()
+
+        redis.pipe.hdel.assert_called_once_with("data:options_live:NIFTY", "23000.0_CE")
+
+    def test_failed_write_forces_full_resync(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        idx = _index()
+        ts = idx._tick_store
+        ts.update_option_tick(24000.0, "CE", _tick())
+        ts.update_option_tick(24000.0, "PE", _tick())
+        pub = SnapshotPublisher(redis, [], [idx])
+        pub._publish_all()
+
+        ts.update_option_tick(24000.0, "CE", _tick(ltp=1.0))
+        redis.pipe.execute.side_effect = ConnectionError("down")
+        with pytest.raises(ConnectionError):
+            pub._publish_all()
+
+        redis.pipe.execute.side_effect = None
+        redis.pipe.reset_mock()
+        pub._publish_all()
+        mapping = _hset_mapping(redis.pipe)
+        assert {"24000.0_CE", "24000.0_PE"} <= set(mapping)
+
+    def test_non_live_options_index_skipped(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        idx = _index("NOT_AN_INDEX")
+        idx._tick_store.update_option_tick(24000.0, "CE", _tick())
+        SnapshotPublisher(redis, [], [idx])._publish_all()
+        redis.pipeline.assert_not_called()
+
+
+class TestBatchedPublish:
+    def test_equity_ticks_share_one_pipeline(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        stocks = [_equity(f"S{i}") for i in range(5)]
+        pub = SnapshotPublisher(redis, stocks, [])
+
+        pub._publish_all()
+
+        redis.pipeline.assert_called_once_with(transaction=False)
+        assert redis.pipe.hset.call_count == 5
+        redis.pipe.execute.assert_called_once()
+        redis.hset.assert_not_called()
+        assert pub.last_written == 5
+
+    def test_pipeline_chunked(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        stocks = [_equity(f"S{i}") for i in range(7)]
+        pub = SnapshotPublisher(redis, stocks, [])
+        pub.PIPELINE_CHUNK = 3
+
+        pub._publish_all()
+
+        assert redis.pipe.execute.call_count == 3  # 3 + 3 + 1
+
+    def test_unchanged_tick_count_skipped(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        a, b = _equity("A"), _equity("B")
+        pub = SnapshotPublisher(redis, [a, b], [])
+        pub._publish_all()
+        redis.pipe.reset_mock()
+
+        b._tick_store.update_zerodha_data({"last_price": 101.0})
+        pub._publish_all()
+
+        keys = [c.args[0] for c in redis.pipe.hset.call_args_list]
+        assert keys == ["data:tick:B"]
+        assert pub.last_written == 1
+        assert pub.last_skipped == 1
+
+    def test_tick_during_write_not_skipped_next_pass(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        a = _equity("A")
+        pub = SnapshotPublisher(redis, [a], [])
+        # A tick lands after the snapshot was taken but before the pass ends.
+        redis.pipe.hset.side_effect = lambda *args, **kwargs: (
+            a._tick_store.update_zerodha_data({"last_price": 102.0}))
+        pub._publish_all()
+        assert _hset_mapping(redis.pipe)["tick_count"] == "1"
+        assert _hset_mapping(redis.pipe)["last_price"] == "100.0"
+
+        redis.pipe.hset.side_effect = None
+        redis.pipe.reset_mock()
+        pub._publish_all()
+        assert _hset_mapping(redis.pipe)["tick_count"] == "2"
+        assert _hset_mapping(redis.pipe)["last_price"] == "102.0"
+
+    def test_write_failure_clears_skip_markers(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        a = _equity("A")
+        pub = SnapshotPublisher(redis, [a], [])
+        redis.pipe.execute.side_effect = ConnectionError("down")
+        with pytest.raises(ConnectionError):
+            pub._publish_all()
+
+        redis.pipe.execute.side_effect = None
+        redis.pipe.reset_mock()
+        pub._publish_all()
+        assert redis.pipe.hset.call_count == 1
+
+    def test_futures_skipped_until_new_tick(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        obj = _equity("A")
+        obj._tick_store.update_futures_tick("current", {"last_price": 100.5, "oi": 10})
+        pub = SnapshotPublisher(redis, [obj], [])
+        pub._publish_all()
+        redis.pipe.reset_mock()
+
+        pub._publish_all()
+        assert redis.pipe.hset.call_count == 0
+
+        obj._tick_store.update_futures_tick("current", {"last_price": 101.0, "oi": 10})
+        pub._publish_all()
+        keys = [c.args[0] for c in redis.pipe.hset.call_args_list]
+        assert keys == ["data:futures_live:A"]
+
+    def test_stats_exported_and_max_reset(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        pub = SnapshotPublisher(redis, [_equity("A")], [])
+        pub._publish_all()
+
+        stats = pub.stats()
+        assert stats["snapshot_written"] == "1"
+        assert stats["snapshot_skipped"] == "0"
+        assert float(stats["snapshot_publish_duration_ms"]) >= 0
+        assert pub.max_publish_duration_ms == 0.0
+
+
+class TestFixedRateLoop:
+    def test_overrun_skips_missed_slots(self, redis, monkeypatch):
+        from services.market_data import snapshot_publisher as sp
+        pub = sp.SnapshotPublisher(redis, [], [])
+        clock = {"t": 0.0}
+        waits = []
+
+        def fake_publish():
+            clock["t"] += 2.5  # pass takes 2.5 intervals
+            pub._running = False
+
+        monkeypatch.setattr(sp.time, "monotonic", lambda: clock["t"])
+        monkeypatch.setattr(pub, "_publish_all", fake_publish)
+        monkeypatch.setattr(pub._stop_event, "wait", lambda d: waits.append(d))
+        pub._running = True
+
+        pub._loop()
+
+        # Started at 0, finished at 2.5 → next slot is 3.0, not 1.0
+        assert waits[0] == pytest.approx(0.5)
+        assert pub.overruns == 1
+
+    def test_on_time_pass_waits_remaining_slot(self, redis, monkeypatch):
+        from services.market_data import snapshot_publisher as sp
+        pub = sp.SnapshotPublisher(redis, [], [])
+        clock = {"t": 0.0}
+        waits = []
+
+        def fake_publish():
+            clock["t"] += 0.2
+            pub._running = False
+
+        monkeypatch.setattr(sp.time, "monotonic", lambda: clock["t"])
+        monkeypatch.setattr(pub, "_publish_all", fake_publish)
+        monkeypatch.setattr(pub._stop_event, "wait", lambda d: waits.append(d))
+        pub._running = True
+
+        pub._loop()
+
+        assert waits == [pytest.approx(0.8)]
+        assert pub.overruns == 0
+
+
+class TestSnapshotSeq:
+    def test_seq_incremented_with_last_batch(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        pub = SnapshotPublisher(redis, [_equity("A"), _equity("B")], [])
+        pub._publish_all()
+        redis.pipe.incr.assert_called_once_with("data:snapshot:seq")
+        redis.pipe.execute.assert_called_once()
+        assert pub.last_written == 2
+
+    def test_no_seq_bump_when_nothing_written(self, redis):
+        from services.market_data.snapshot_publisher import SnapshotPublisher
+        pub = SnapshotPublisher(redis, [_equity("A")], [])
+        pub._publish_all()
+        redis.pipe.reset_mock()
+        pub._publish_all()
+        redis.pipe.incr.assert_not_called()
@@ -431,6 +431,23 @@ class TestLoadOptionsLiveFromRedis:
         assert result is False
         assert stock._tick_store.options_live == {}
 
+    def test_skips_meta_fields_and_records_seq(self):
+        from services.common.stock_loader import load_options_live_from_redis
+        redis = _mock_redis_hgetall({
+            "data:options_live:NIFTY": {
+                "24000.0_CE": json.dumps({"ltp": 100}),
+                "_seq": "42",
+                "_version": "9001",
+                "_ts": "1739951234.5",
+            },
+        })
+        stock = Stock("NIFTY", "NIFTY", is_index=True)
+        assert load_options_live_from_redis(redis, stock) is True
+        ts = stock._tick_store
+        assert list(ts.options_live) == [24000.0]
+        assert ts.options_snapshot_seq == 42
+        assert ts.options_snapshot_ts == 1739951234.5
+
     def test_populates_tick_store(self):
         from services.common.stock_loader import load_options_live_from_redis
         redis = _mock_redis_hgetall({
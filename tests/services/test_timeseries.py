@@ -0,0 +1,166 @@
+"""
+Unit tests for services/common/timeseries.py ring-buffer time series.
+
+Covers:
+- raw samples round-trip through SETRANGE / GETRANGE slots
+- rollup tiers: min / max / avg / last / count, partial bucket visible
+- ring wrap-around: stale slots from an earlier lap are skipped
+- writer restart resumes the current rollup bucket
+- pick_tier / query(step=...) resampling
+- one pipeline per flush, TTL per key, fail-safe flush and query
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.common.timeseries import (
+    RAW, TIERS, TIERS_BY_NAME, RingWriter, Point, memory_bytes, pick_tier, query, read_tier, ring_key,
+)
+
+
+class BytesRedis:
+    """Minimal binary Redis for strings: setrange / getrange / expire, pipelined."""
+
+    def __init__(self):
+        self.data: dict[str, bytearray] = {}
+        self.ttl: dict[str, int] = {}
+        self.pipelines = 0
+
+    def setrange(self, key, offset, value):
+        buf = self.data.setdefault(key, bytearray())
+        if len(buf) < offset:
+            buf.extend(b"\0" * (offset - len(buf)))
+        buf[offset:offset + len(value)] = value
+        return len(buf)
+
+    def getrange(self, key, start, end):
+        return bytes(self.data.get(key, b"")[start:end + 1])
+
+    def expire(self, key, seconds):
+        self.ttl[key] = seconds
+
+    def pipeline(self, transaction=True):
+        self.pipelines += 1
+        return _Pipe(self)
+
+
+class _Pipe:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+T0 = 1_750_000_000 // 86400 * 86400     # midnight UTC: every tier's bucket starts here
+
+
+@pytest.fixture
+def redis():
+    return BytesRedis()
+
+
+class TestWriteRead:
+
+    def test_raw_round_trip(self, redis):
+        writer = RingWriter(redis)
+        for i in range(10):
+            writer.add("cpu", T0 + i * 30, float(i))
+        writer.flush()
+
+        points = read_tier(redis, "cpu", RAW, T0, T0 + 300)
+        assert [p.ts for p in points] == [T0 + i * 30 for i in range(10)]
+        assert [p.last for p in points] == [float(i) for i in range(10)]
+        assert len(redis.data[ring_key("cpu", RAW)]) == 10 * 8
+
+    def test_rollups(self, redis):
+        writer = RingWriter(redis)
+        for i, v in enumerate([5.0, 1.0, 9.0, 3.0]):
+            writer.add("ram", T0 + i * 30, v)          # two 1m buckets, one 15m bucket
+            writer.flush()
+
+        one_min = read_tier(redis, "ram", TIERS_BY_NAME["1m"], T0, T0 + 120)
+        assert one_min == [Point(T0, 1.0, 5.0, 3.0, 1.0, 2), Point(T0 + 60, 3.0, 9.0, 6.0, 3.0, 2)]
+        (quarter,) = read_tier(redis, "ram", TIERS_BY_NAME["15m"], T0, T0 + 120)
+        assert (quarter.min, quarter.max, quarter.avg, quarter.last, quarter.count) == (1.0, 9.0, 4.5, 3.0, 4)
+
+    def test_one_pipeline_per_flush_with_ttl(self, redis):
+        writer = RingWriter(redis)
+        writer.add("cpu", T0, 1.0)
+        writer.add("rss:market-data", T0, 400.0)
+        writer.flush()
+        assert redis.pipelines == 2                    # resume read (first flush only) + writes
+        writer.add("cpu", T0 + 30, 2.0)
+        writer.flush()
+        assert redis.pipelines == 3
+        for tier in TIERS:
+            assert redis.ttl[ring_key("rss:market-data", tier)] == tier.retention
+
+    def test_wraparound_skips_stale_slots(self, redis):
+        writer = RingWriter(redis, tiers=(RAW,))
+        writer.add("cpu", T0, 1.0)
+        writer.add("cpu", T0 + 30, 2.0)
+        writer.add("cpu", T0 + RAW.retention, 3.0)    # same slot as T0, one lap later
+        writer.flush()
+        end = T0 + RAW.retention + 60
+        points = read_tier(redis, "cpu", RAW, end - RAW.retention, end)
+        assert [(p.ts, p.last) for p in points] == [(T0 + RAW.retention, 3.0)]
+
+    def test_restart_resumes_bucket(self, redis):
+        first = RingWriter(redis)
+        first.add("cpu", T0, 10.0)
+        first.add("cpu", T0 + 30, 20.0)
+        first.flush()
+        second = RingWriter(redis)                     # restarted writer, same 15m bucket
+        second.add("cpu", T0 + 90, 30.0)
+        second.flush()
+        (quarter,) = read_tier(redis, "cpu", TIERS_BY_NAME["15m"], T0, T0 + 120)
+        assert quarter.count == 3
+        assert quarter.avg == pytest.approx(20.0)
+
+
+class TestQuery:
+
+    def test_pick_tier(self):
+        now = T0 + 86400 * 40
+        assert pick_tier(now - 300, now) is RAW
+        assert pick_tier(now - 86400, now, step=3600).name == "15m"
+        assert pick_tier(now - 36 * 3600, now).name == "1m"
+        assert pick_tier(now - 10 * 86400, now).name == "15m"
+        assert pick_tier(now - 20 * 86400, now).name == "1d"
+        assert pick_tier(now - 100 * 86400, now).name == "1d"
+
+    def test_hourly_resample(self, redis):
+        writer = RingWriter(redis)
+        for i in range(240):                            # 2 hours at 30 s
+            writer.add("cpu", T0 + i * 30, 10.0 if i < 120 else 30.0)
+        writer.flush()
+        points = query(redis, "cpu", T0, T0 + 7200 - 1, step=3600)
+        assert [(p.ts, p.avg, p.count) for p in points] == [(T0, 10.0, 120), (T0 + 3600, 30.0, 120)]
+
+    def test_missing_metric_is_empty(self, redis):
+        assert query(redis, "nope", T0, T0 + 3600) == []
+
+    def test_query_fail_safe(self):
+        broken = MagicMock()
+        broken.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        assert query(broken, "cpu", T0, T0 + 60) == []
+
+    def test_flush_fail_safe(self):
+        broken = MagicMock()
+        broken.pipeline.return_value.execute.side_effect = ConnectionError("down")
+        writer = RingWriter(broken)
+        writer.add("cpu", T0, 1.0)
+        writer.flush()                                  # must not raise
+        assert writer._samples == []
+
+
+def test_memory_bytes():
+    assert memory_bytes((RAW,)) == 2880 * 8
+    assert memory_bytes() == 2880 * 8 + (2880 + 1344 + 400) * 22
@@ -0,0 +1,163 @@
+"""
+Unit tests for lib/logging_util/async_logging.py (queue-backed logging, rate limiting).
+
+Covers:
+- DropOldestQueue: bounded, evicts oldest, counts drops, get() timeout
+- async mode: records reach the logger's own handlers via the listener thread
+- a slow handler does not block the logging call
+- per-logger levels still gate records; disable restores the original handlers
+- RateLimitFilter: per call site, suppressed count appended, higher levels pass,
+  budget holds when several threads log from the same site
+"""
+import logging
+import threading
+import time
+from queue import Empty
+
+import pytest
+
+from lib.logging_util import async_logging
+from lib.logging_util.async_logging import DropOldestQueue, RateLimitFilter, limit_rate
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, delay: float = 0.0):
+        super().__init__()
+        self.delay = delay
+        self.messages: list[str] = []
+        self.threads: set[str] = set()
+
+    def emit(self, record):
+        time.sleep(self.delay)
+        self.messages.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+
+def _logger(name: str, handler: logging.Handler, level=logging.DEBUG) -> logging.Logger:
+    logger = logging.getLogger(f"SA.test.{name}")
+    logger.handlers.clear()
+    logger.filters.clear()
+    logger.propagate = False
+    logger.setLevel(level)
+    handler.setLevel(level)
+    logger.addHandler(handler)
+    return logger
+
+
+@pytest.fixture
+def async_mode():
+    async_logging.enable_async_logging(capacity=1000)
+    yield
+    async_logging.disable_async_logging()
+
+
+class TestDropOldestQueue:
+
+    def test_evicts_oldest_when_full(self):
+        q = DropOldestQueue(capacity=3)
+        for i in range(5):
+            q.put_nowait(i)
+        assert [q.get(block=False) for _ in range(3)] == [2, 3, 4]
+        assert (q.enqueued, q.dropped) == (5, 2)
+
+    def test_get_timeout_raises_empty(self):
+        with pytest.raises(Empty):
+            DropOldestQueue().get(timeout=0.01)
+
+
+class TestAsyncMode:
+
+    def test_records_written_by_listener(self, async_mode):
+        handler = ListHandler()
+        logger = _logger("routed", handler)
+        async_logging.attach(logger)
+        logger.info("hello %s", "world")
+        async_logging.disable_async_logging()
+        assert handler.messages == ["hello world"]
+        assert threading.current_thread().name not in handler.threads
+
+    def test_slow_handler_does_not_block_caller(self, async_mode):
+        handler = ListHandler(delay=0.05)
+        logger = _logger("slow", handler)
+        async_logging.attach(logger)
+        t0 = time.perf_counter()
+        for i in range(10):
+            logger.info("tick %d", i)
+        assert time.perf_counter() - t0 < 0.05
+        async_logging.disable_async_logging()
+        assert handler.messages == [f"tick {i}" for i in range(10)]
+
+    def test_level_gating_and_restore(self, async_mode):
+        handler = ListHandler()
+        logger = _logger("levels", handler, level=logging.INFO)
+        async_logging.attach(logger)
+        logger.debug("hidden")
+        logger.warning("shown")
+        async_logging.disable_async_logging()
+        assert handler.messages == ["shown"]
+        assert logger.handlers == [handler]
+        assert handler.level == logging.INFO
+
+    def test_stats(self, async_mode):
+        logger = _logger("stats", ListHandler())
+        async_logging.attach(logger)
+        logger.info("x")
+        stats = async_logging.async_logging_stats()
+        assert stats["enabled"] and stats["capacity"] == 1000 and stats["enqueued"] >= 1
+        async_logging.disable_async_logging()
+        assert async_logging.async_logging_stats() == {"enabled": False}
+
+
+class TestRateLimit:
+
+    def test_per_site_budget_and_suppressed_count(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(async_logging.time, "monotonic", lambda: clock[0])
+        handler = ListHandler()
+        logger = _logger("rate", handler)
+        rate = limit_rate(logger, per_second=1.0, burst=2)
+
+        def hot(i):
+            logger.debug("hot %d", i)                   # one call site
+
+        for i in range(5):
+            hot(i)
+        logger.debug("other site")
+        clock[0] += 1.0
+        hot(5)
+        assert rate.suppressed == 3
+        assert handler.messages[:3] == ["hot 0", "hot 1", "other site"]
+        assert handler.messages[3] == "hot 5 (+3 suppressed)"
+
+    def test_budget_shared_across_threads(self, monkeypatch):
+        monkeypatch.setattr(async_logging.time, "monotonic", lambda: 100.0)
+        handler = ListHandler()
+        logger = _logger("rate-threads", handler)
+        rate = limit_rate(logger, per_second=1.0, burst=5)
+
+        def hot():
+            for _ in range(500):
+                logger.debug("hot")
+
+        threads = [threading.Thread(target=hot) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(handler.messages) == 5
+        assert rate.suppressed == 8 * 500 - 5
+
+    def test_higher_levels_pass(self):
+        handler = ListHandler()
+        logger = _logger("rate-info", handler)
+        limit_rate(logger, per_second=0.001, burst=1)
+        for _ in range(3):
+            logger.info("always")
+        assert handler.messages == ["always"] * 3
+
+    def test_limit_rate_replaces_existing_filter(self):
+        logger = _logger("rate-replace", ListHandler())
+        limit_rate(logger)
+        limit_rate(logger, per_second=2.0)
+        filters = [f for f in logger.filters if isinstance(f, RateLimitFilter)]
+        assert len(filters) == 1 and filters[0].per_second == 2.0
@@ -0,0 +1,121 @@
+"""Tests for tools/backtest/backtest.py — incremental vs copy-per-bar engine."""
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import common.shared as shared
+
+pytest.importorskip("optuna")  # tools.backtest imports the optimiser eagerly
+from services.analysis_engine.analyser.IndicatorState import IndicatorState
+from services.analysis_engine.analyser.TechnicalAnalyser import TechnicalAnalyser
+from tools.backtest.backtest import Backtester
+
+
+def _fixture_df(n=320, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.012, n)))
+    idx = pd.date_range("2023-01-02", periods=n, freq="B")
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.002, n)),
+            "High": close * (1 + rng.uniform(0, 0.012, n)),
+            "Low": close * (1 - rng.uniform(0, 0.012, n)),
+            "Close": close,
+            "Volume": rng.integers(100_000, 500_000, n).astype(float),
+        },
+        index=idx,
+    )
+
+
+def _ctx():
+    mock = MagicMock()
+    mock.mode = shared.Mode.POSITIONAL
+    return mock
+
+
+METHODS = [
+    "analyse_rsi", "analyse_Bolinger_band", "analyze_macd", "analyse_atr",
+    "analyse_ema_crossover", "analyse_supertrend", "analyse_rsi_divergence",
+    "analyse_stochastic",
+]
+
+
+def _run(df, incremental, record):
+    analyser = TechnicalAnalyser()
+    bt = Backtester(
+        stock_symbols="TEST",
+        analyzer_methods=[getattr(analyser, name) for name in METHODS],
+        start_date=df.index[60],
+        end_date=df.index[-1],
+        stop_loss_pct=3.0,
+        target_pct=5.0,
+        incremental=incremental,
+    )
+    run_analysis = bt.run_analysis_on_date
+
+    def recording(stock, current_idx, full_data):
+        analysis = run_analysis(stock, current_idx, full_data)
+        record.append({k: sorted(analysis[k]) for k in ("BULLISH", "BEARISH", "NEUTRAL")})
+        return analysis
+
+    with patch("common.shared.app_ctx", _ctx()), \
+         patch.object(bt, "load_data", return_value=df.copy()), \
+         patch.object(bt, "run_analysis_on_date", side_effect=recording):
+        analyser.reset_constants()
+        return bt, bt.run_backtest("TEST")
+
+
+def _trade_key(trade):
+    # analysis_details carries indicator payloads that may differ in the last ulp
+    d = trade.to_dict()
+    d["analysis_details"] = sorted(d["analysis_details"])
+    return d
+
+
+class TestIncrementalParity:
+    def test_signals_and_trades_identical(self):
+        df = _fixture_df()
+        legacy_signals, incr_signals = [], []
+        _, legacy = _run(df, False, legacy_signals)
+        _, incr = _run(df, True, incr_signals)
+
+        assert legacy_signals == incr_signals
+        assert any(s["BULLISH"] or s["BEARISH"] for s in legacy_signals)
+        assert len(legacy.trades) > 0
+        assert [_trade_key(t) for t in legacy.trades] == [_trade_key(t) for t in incr.trades]
+        assert legacy.final_capital == pytest.approx(incr.final_capital)
+
+    def test_incremental_state_advances_without_rebuilds(self):
+        df = _fixture_df()
+        bt = Backtester("TEST", lambda s: False, df.index[60], df.index[-1])
+        stock = bt.create_stock_object("TEST", df)
+        assert isinstance(stock.indicator_state, IndicatorState)
+
+        analyser = TechnicalAnalyser()
+        bt.analyzer_methods = [analyser.analyse_rsi]
+        with patch("common.shared.app_ctx", _ctx()):
+            analyser.reset_constants()
+            for current_idx in range(60, len(df)):
+                bt.run_analysis_on_date(stock, current_idx, df)
+
+        assert stock.indicator_state.rebuilds == 0
+        assert stock.indicator_state.count == len(df) - 1
+
+    def test_as_of_view_has_no_future_bars(self):
+        df = _fixture_df(100)
+        bt = Backtester("TEST", lambda s: False, df.index[60], df.index[-1])
+        stock = bt.create_stock_object("TEST", df)
+        bt.run_analysis_on_date(stock, 70, df)
+        assert stock.priceData.index[-1] == df.index[70]
+        assert len(stock.priceData) == 71
+
+    def test_legacy_mode_copies_and_skips_state(self):
+        df = _fixture_df(100)
+        bt = Backtester("TEST", lambda s: False, df.index[60], df.index[-1], incremental=False)
+        stock = bt.create_stock_object("TEST", df)
+        assert stock.indicator_state is None
+        bt.run_analysis_on_date(stock, 70, df)
+        stock.priceData.iloc[-1, 0] = -1.0
+        assert df.iloc[70, 0] != -1.0
@@ -0,0 +1,210 @@
+"""
+Tests for tools/ml_pipeline/data/data_collector.py — partitioned dataset and bulk collect.
+
+Covers:
+- append_stock_data: only rows after the stored last date are written
+- a legacy per-symbol file is folded into the dataset on first append
+- a year partition is compacted once it holds MAX_PARTS_PER_YEAR parts
+- the manifest is persisted and read back by a new DataStorage
+- collect(): one multi-ticker download per batch, symbols without data
+  reported as None, incremental re-runs fetch only the missing days
+- collect() resumes stored symbols after their last date even when
+  start_date is later (no gap in the dataset)
+- update_all_stocks returns full frames unless new_rows_only is set
+"""
+import importlib.util
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+# ml_pipeline's package __init__ pulls in the training stack; load the module alone.
+_spec = importlib.util.spec_from_file_location(
+    "ml_data_collector",
+    Path(__file__).resolve().parents[2] / "tools" / "ml_pipeline" / "data" / "data_collector.py",
+)
+dc = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dc)
+
+_INDEX = pd.bdate_range("2024-01-01", "2025-03-31")
+
+
+def _bars(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, len(_INDEX)).cumsum()
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, len(_INDEX)).astype(float),
+        },
+        index=_INDEX,
+    )
+
+
+SOURCE = {f"S{i}.NS": _bars(i) for i in range(5)}
+
+
+class FakeDownload:
+    """yf.download stand-in: a ticker-grouped MultiIndex frame over [start, end)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbols, start, end, **kwargs):
+        self.calls.append((tuple(symbols), start, end))
+        lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+        parts = {
+            s: SOURCE[s][(SOURCE[s].index >= lo) & (SOURCE[s].index < hi)]
+            for s in symbols if s in SOURCE
+        }
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts, axis=1)
+
+
+@pytest.fixture
+def download():
+    fake = FakeDownload()
+    with patch.object(dc.yf, "download", fake):
+        yield fake
+
+
+@pytest.fixture
+def collector(tmp_path):
+    c = dc.DataCollector(data_dir=str(tmp_path))
+    c._batch_limiter = dc.RateLimiter(1, 0.001)
+    return c
+
+
+def _parts(storage, symbol, year):
+    year_dir = storage.dataset_dir / symbol.replace(".", "_") / f"year={year}"
+    return sorted(p.name for p in year_dir.glob("part-*.parquet"))
+
+
+# ── DataStorage ─────────────────────────────────────────────────────────────
+
+class TestAppend:
+
+    def test_only_new_rows_written(self, tmp_path):
+        storage = dc.DataStorage(str(tmp_path))
+        src = SOURCE["S0.NS"]
+        first = storage.append_stock_data("S0.NS", src.loc[:"2024-06-28"])
+        assert len(first) == len(src.loc[:"2024-06-28"])
+
+        new = storage.append_stock_data("S0.NS", src.loc["2024-06-01":"2024-07-31"])
+        pd.testing.assert_frame_equal(new, src.loc["2024-07-01":"2024-07-31"])
+        assert storage.append_stock_data("S0.NS", src.loc[:"2024-07-31"]).empty
+
+        entry = storage.manifest["S0.NS"]
+        assert entry["last"] == "2024-07-31"
+        assert entry["rows"] == len(src.loc[:"2024-07-31"])
+        pd.testing.assert_frame_equal(storage.load_stock_data("S0.NS"), src.loc[:"2024-07-31"], check_freq=False)
+
+    def test_legacy_file_folded_in(self, tmp_path):
+        storage = dc.DataStorage(str(tmp_path))
+        src = SOURCE["S1.NS"]
+        storage.save_stock_data("S1.NS", src.loc[:"2024-03-29"])
+
+        new = storage.append_stock_data("S1.NS", src.loc["2024-03-01":"2024-04-30"])
+        pd.testing.assert_frame_equal(new, src.loc["2024-04-01":"2024-04-30"])
+        assert storage.manifest["S1.NS"]["rows"] == len(src.loc[:"2024-04-30"])
+        pd.testing.assert_frame_equal(storage.load_stock_data("S1.NS"), src.loc[:"2024-04-30"], check_freq=False)
+
+    def test_partition_compacted_at_max_parts(self, tmp_path):
+        storage = dc.DataStorage(str(tmp_path))
+        storage.MAX_PARTS_PER_YEAR = 3
+        src = SOURCE["S2.NS"]
+        storage.append_stock_data("S2.NS", src.loc[:"2024-01-31"])
+        storage.append_stock_data("S2.NS", src.loc[:"2024-02-29"])
+        assert len(_parts(storage, "S2.NS", 2024)) == 2
+
+        storage.append_stock_data("S2.NS", src.loc[:"2024-03-29"])
+        assert _parts(storage, "S2.NS", 2024) == ["part-20240101-20240329.parquet"]
+        pd.testing.assert_frame_equal(storage.load_stock_data("S2.NS"), src.loc[:"2024-03-29"], check_freq=False)
+
+    def test_compact_partition_merges_parts(self, tmp_path):
+        storage = dc.DataStorage(str(tmp_path))
+        src = SOURCE["S3.NS"]
+        for month_end in ("2024-01-31", "2024-02-29", "2024-03-29"):
+            storage.append_stock_data("S3.NS", src.loc[:month_end])
+        year_dir = storage.dataset_dir / "S3_NS" / "year=2024"
+        storage._compact_partition(year_dir)
+        assert _parts(storage, "S3.NS", 2024) == ["part-20240101-20240329.parquet"]
+        assert not list(year_dir.glob(".*.tmp"))
+        pd.testing.assert_frame_equal(storage._read_partition(year_dir), src.loc[:"2024-03-29"], check_freq=False)
+
+    def test_manifest_round_trip(self, tmp_path):
+        storage = dc.DataStorage(str(tmp_path))
+        storage.append_stock_data("S0.NS", SOURCE["S0.NS"].loc[:"2024-05-31"])
+        storage.save_manifest()
+
+        reopened = dc.DataStorage(str(tmp_path))
+        assert reopened.manifest == storage.manifest
+        assert reopened.last_date("S0.NS") == pd.Timestamp("2024-05-31")
+        assert reopened.last_date("S4.NS") is None
+
+
+# ── DataCollector.collect ───────────────────────────────────────────────────
+
+class TestCollect:
+
+    def test_bulk_then_incremental(self, collector, download):
+        symbols = list(SOURCE) + ["MISSING.NS"]
+        results = collector.collect(symbols, start_date="2024-01-01", end_date="2025-01-01", validate=False)
+
+        assert download.calls == [(tuple(symbols), "2024-01-01", "2025-01-01")]
+        assert results["MISSING.NS"] == (None, None)
+        for symbol, src in SOURCE.items():
+            pd.testing.assert_frame_equal(results[symbol][0], src.loc[:"2024-12-31"], check_freq=False)
+        assert collector.storage.manifest["S0.NS"]["last"] == "2024-12-31"
+
+        download.calls.clear()
+        results = collector.collect(symbols, end_date="2025-01-08", validate=False)
+        assert sorted(download.calls) == sorted([
+            (tuple(SOURCE), "2025-01-01", "2025-01-08"),
+            (("MISSING.NS",), dc.DataCollector.DEFAULT_START_DATE, "2025-01-08"),
+        ])
+        pd.testing.assert_frame_equal(results["S4.NS"][0], SOURCE["S4.NS"].loc["2025-01-01":"2025-01-07"],
+                                      check_freq=False)
+
+        fresh = dc.DataCollector(data_dir=str(collector.storage.data_dir))
+        download.calls.clear()
+        results = fresh.collect(["S4.NS"], end_date="2025-01-08", validate=False)
+        assert download.calls == [] and results["S4.NS"][0].empty
+        pd.testing.assert_frame_equal(fresh.load_stock_data("S4.NS"), SOURCE["S4.NS"].loc[:"2025-01-07"],
+                                      check_freq=False)
+
+    def test_stored_symbol_resumes_after_last_date(self, collector, download):
+        collector.collect(["S0.NS"], start_date="2024-01-01", end_date="2024-03-01", validate=False)
+        download.calls.clear()
+
+        collector.collect(["S0.NS", "S1.NS"], start_date="2024-06-01", end_date="2024-07-01", validate=False)
+        assert sorted(download.calls) == [
+            (("S0.NS",), "2024-03-01", "2024-07-01"),
+            (("S1.NS",), "2024-06-01", "2024-07-01"),
+        ]
+        pd.testing.assert_frame_equal(collector.load_stock_data("S0.NS"), SOURCE["S0.NS"].loc[:"2024-06-28"],
+                                      check_freq=False)
+
+    def test_update_all_stocks_returns_full_frames(self, collector, download):
+        collector.fno_stocks = ["S0.NS", "MISSING.NS"]
+        collector.collect(["S0.NS"], start_date="2024-01-01", end_date="2024-03-01", validate=False)
+
+        with patch.object(dc, "datetime", wraps=dc.datetime) as clock:
+            clock.now.return_value = pd.Timestamp("2024-04-01").to_pydatetime()
+            full = collector.update_all_stocks()
+            clock.now.return_value = pd.Timestamp("2024-05-01").to_pydatetime()
+            new = collector.update_all_stocks(new_rows_only=True)
+
+        pd.testing.assert_frame_equal(full["S0.NS"], SOURCE["S0.NS"].loc[:"2024-03-29"], check_freq=False)
+        assert full["MISSING.NS"] is None
+        pd.testing.assert_frame_equal(new["S0.NS"], SOURCE["S0.NS"].loc["2024-04-01":"2024-04-30"],
+                                      check_freq=False)
+        assert new["MISSING.NS"] is None
@@ -0,0 +1,218 @@
+"""Tests for tools/market_data/ohlcv_store.py — persistent OHLCV store."""
+import hashlib
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.market_data.ohlcv_store import NO_BARS, OHLCVStore
+
+SOURCE = pd.DataFrame(
+    {
+        "Close": np.linspace(100, 200, 400),
+        "High": np.linspace(101, 201, 400),
+        "Low": np.linspace(99, 199, 400),
+        "Open": np.linspace(100, 200, 400),
+        "Volume": np.arange(400, dtype=np.int64) * 1000,
+    },
+    index=pd.bdate_range("2022-01-03", periods=400),
+)
+
+
+class FakeFetcher:
+    def __init__(self, source=SOURCE):
+        self.source = source
+        self.calls = []
+
+    def __call__(self, symbol, interval, start, end):
+        self.calls.append((start, end))
+        idx = self.source.index
+        tz = idx.tz
+        lo = start.tz_localize(tz) if tz is not None else start
+        hi = end.tz_localize(tz) if tz is not None else end
+        return self.source[(idx >= lo) & (idx < hi)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(root=str(tmp_path / "store"))
+
+
+class TestCoverage:
+    def test_second_request_is_served_from_disk(self, store):
+        fetch = FakeFetcher()
+        first = store.get("reliance", "day", "2022-03-01", "2022-09-01", fetch=fetch)
+        again = OHLCVStore(root=store.root).get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=fetch)
+
+        assert len(fetch.calls) == 1
+        pd.testing.assert_frame_equal(first, again, check_freq=False)
+        pd.testing.assert_frame_equal(first, SOURCE.loc["2022-03-01":"2022-08-31"], check_freq=False)
+
+    def test_only_missing_ranges_are_fetched(self, store):
+        fetch = FakeFetcher()
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=fetch)
+        df = store.get("RELIANCE", "day", "2022-01-03", "2022-12-01", fetch=fetch)
+
+        assert fetch.calls[1:] == [
+            (pd.Timestamp("2022-01-03"), pd.Timestamp("2022-03-01")),
+            (pd.Timestamp("2022-09-01"), pd.Timestamp("2022-12-01")),
+        ]
+        pd.testing.assert_frame_equal(df, SOURCE.loc["2022-01-03":"2022-11-30"], check_freq=False)
+        assert store.coverage("RELIANCE", "day") == (pd.Timestamp("2022-01-03"), pd.Timestamp("2022-12-01"))
+
+    def test_disjoint_request_fetches_the_gap(self, store):
+        fetch = FakeFetcher()
+        store.get("RELIANCE", "day", "2022-01-03", "2022-02-01", fetch=fetch)
+        store.get("RELIANCE", "day", "2022-06-01", "2022-07-01", fetch=fetch)
+        assert fetch.calls[1] == (pd.Timestamp("2022-02-01"), pd.Timestamp("2022-07-01"))
+
+    def test_coverage_stops_before_today(self, store):
+        today = pd.Timestamp.now().normalize()
+        fetch = FakeFetcher(SOURCE.set_axis(pd.bdate_range(end=today, periods=400)))
+        store.get("RELIANCE", "day", today - pd.Timedelta(days=30), today + pd.Timedelta(days=1), fetch=fetch)
+        store.get("RELIANCE", "day", today - pd.Timedelta(days=30), today + pd.Timedelta(days=1), fetch=fetch)
+
+        assert store.coverage("RELIANCE", "day")[1] == today
+        assert fetch.calls[1] == (today, today + pd.Timedelta(days=1))
+
+    def test_intervals_are_separate_keys(self, store):
+        fetch = FakeFetcher()
+        store.get("RELIANCE", "day", "2022-03-01", "2022-04-01", fetch=fetch)
+        store.get("RELIANCE", "5m", "2022-03-01", "2022-04-01", fetch=fetch)
+        assert len(fetch.calls) == 2
+
+
+class TestOfflineAndFailures:
+    def test_offline_read(self, store):
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=FakeFetcher())
+        df = store.get("RELIANCE", "day", "2022-04-01", "2022-05-01")
+        pd.testing.assert_frame_equal(df, SOURCE.loc["2022-04-01":"2022-04-30"], check_freq=False)
+        assert store.get("TCS", "day", "2022-04-01", "2022-05-01").empty
+
+    def test_failed_top_up_serves_stored_bars(self, store):
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=FakeFetcher())
+
+        def broken(*args):
+            raise ConnectionError("offline")
+
+        df = store.get("RELIANCE", "day", "2022-03-01", "2022-12-01", fetch=broken)
+        assert df.index[-1] == pd.Timestamp("2022-08-31")
+        assert store.coverage("RELIANCE", "day")[1] == pd.Timestamp("2022-09-01")
+
+    def test_failed_fetch_with_nothing_stored_raises(self, store):
+        def broken(*args):
+            raise ConnectionError("offline")
+
+        with pytest.raises(ConnectionError):
+            store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=broken)
+
+    def test_empty_first_fetch_is_not_recorded(self, store):
+        store.get("NOSUCH", "day", "2022-03-01", "2022-09-01", fetch=lambda *a: pd.DataFrame())
+        assert store.coverage("NOSUCH", "day") is None
+
+    def test_empty_top_up_is_not_covered_and_refetched(self, store):
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=FakeFetcher())
+        flaky = FakeFetcher(SOURCE.iloc[:0])
+        store.get("RELIANCE", "day", "2022-03-01", "2022-12-01", fetch=flaky)
+        assert store.coverage("RELIANCE", "day")[1] == pd.Timestamp("2022-09-01")
+
+        fetch = FakeFetcher()
+        df = store.get("RELIANCE", "day", "2022-03-01", "2022-12-01", fetch=fetch)
+        assert fetch.calls == [(pd.Timestamp("2022-09-01"), pd.Timestamp("2022-12-01"))]
+        assert df.index[-1] == pd.Timestamp("2022-11-30")
+
+    def test_no_bars_marker_is_covered(self, store):
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=FakeFetcher())
+        store.get("RELIANCE", "day", "2022-03-01", "2022-12-01", fetch=lambda *a: NO_BARS)
+        assert store.coverage("RELIANCE", "day")[1] == pd.Timestamp("2022-12-01")
+
+    def test_failed_segment_keeps_the_others(self, store):
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=FakeFetcher())
+        good = FakeFetcher()
+
+        def half_broken(symbol, interval, start, end):
+            if start < pd.Timestamp("2022-03-01"):
+                raise ConnectionError("offline")
+            return good(symbol, interval, start, end)
+
+        df = store.get("RELIANCE", "day", "2022-01-03", "2022-12-01", fetch=half_broken)
+        assert df.index[0] == pd.Timestamp("2022-03-01")
+        assert df.index[-1] == pd.Timestamp("2022-11-30")
+        assert store.coverage("RELIANCE", "day") == (pd.Timestamp("2022-03-01"), pd.Timestamp("2022-12-01"))
+
+    def test_lock_not_held_while_fetching(self, store):
+        fcntl = pytest.importorskip("fcntl")
+        fetch = FakeFetcher()
+
+        def probing(*args):
+            with open(os.path.join(store.root, ".lock"), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)   # raises if get() holds it
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            return fetch(*args)
+
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=probing)
+        assert len(fetch.calls) == 1
+
+
+class TestIntegrity:
+    def test_corrupted_object_is_refetched(self, store):
+        fetch = FakeFetcher()
+        store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=fetch)
+        objects = os.path.join(store.root, "objects")
+        (name,) = os.listdir(objects)
+        with open(os.path.join(objects, name), "r+b") as f:
+            f.seek(200)
+            f.write(b"\xff\xff\xff\xff")
+
+        df = store.get("RELIANCE", "day", "2022-03-01", "2022-09-01", fetch=fetch)
+        assert len(fetch.calls) == 2
+        pd.testing.assert_frame_equal(df, SOURCE.loc["2022-03-01":"2022-08-31"], check_freq=False)
+        with open(os.path.join(objects, name), "rb") as f:
+            assert hashlib.sha256(f.read()).hexdigest() + ".saf" == name
+
+    def test_tz_aware_intraday_roundtrip(self, store):
+        idx = pd.date_range("2024-01-01 09:15", periods=300, freq="5min", tz="Asia/Kolkata")
+        source = SOURCE.iloc[:300].set_axis(idx)
+        df = store.get("NIFTY", "5m", "2024-01-01", "2024-01-03", fetch=FakeFetcher(source))
+        pd.testing.assert_frame_equal(df, source[source.index < pd.Timestamp("2024-01-03", tz="Asia/Kolkata")], check_freq=False)
+        assert str(store.get("NIFTY", "5m", "2024-01-01", "2024-01-03").index.tz) == "Asia/Kolkata"
+
+
+class TestEviction:
+    def test_least_recently_read_entry_is_evicted(self, tmp_path):
+        store = OHLCVStore(root=str(tmp_path / "store"), max_bytes=10**9)
+        fetchers = {sym: FakeFetcher(SOURCE * i) for i, sym in enumerate(("AAA", "BBB", "CCC"), 1)}
+        for sym in ("AAA", "BBB"):
+            store.get(sym, "day", "2022-01-03", "2023-01-01", fetch=fetchers[sym])
+        store.get("AAA", "day", "2022-01-03", "2023-01-01")  # AAA now most recent
+
+        store.max_bytes = int(store.total_bytes() * 1.2)
+        store.get("CCC", "day", "2022-01-03", "2023-01-01", fetch=fetchers["CCC"])
+
+        assert store.symbols() == ["AAA", "CCC"]
+        assert store.total_bytes() <= store.max_bytes
+        assert len(os.listdir(os.path.join(store.root, "objects"))) == 2
+
+    def test_delete(self, store):
+        store.get("AAA", "day", "2022-01-03", "2022-03-01", fetch=FakeFetcher())
+        assert store.delete("AAA", "day") is True
+        assert store.symbols() == []
+        assert os.listdir(os.path.join(store.root, "objects")) == []
+
+
+class TestBacktesterIntegration:
+    def test_load_data_downloads_once(self, store):
+        pytest.importorskip("optuna")  # tools.backtest imports the optimiser eagerly
+        from tools.backtest.backtest import Backtester
+
+        fetch = FakeFetcher()
+        with patch.object(Backtester, "_download", side_effect=fetch):
+            bt = Backtester("RELIANCE", lambda s: False, "2023-01-02", "2023-06-30", data_store=store)
+            first = bt.load_data("RELIANCE")
+            second = bt.load_data("RELIANCE")
+
+        assert len(fetch.calls) == 1
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+        assert first.index[0] >= pd.Timestamp("2023-01-02") - pd.Timedelta(days=350)
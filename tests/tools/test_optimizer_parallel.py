@@ -0,0 +1,142 @@
+"""Tests for the process-parallel ThresholdOptimizer and tools/backtest/parallel.py."""
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("optuna")
+
+from tools.backtest import optimizer as optimizer_mod
+from tools.backtest.optimizer import ThresholdOptimizer
+from tools.backtest.parallel import SharedFrames, attach_frames
+
+
+def _fixture_df(seed, n=200):
+    rng = np.random.default_rng(seed)
+    close = 500 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    idx = pd.date_range("2023-01-02", periods=n, freq="B")
+    return pd.DataFrame(
+        {
+            "Close": close,
+            "High": close * (1 + rng.uniform(0, 0.012, n)),
+            "Low": close * (1 - rng.uniform(0, 0.012, n)),
+            "Open": close * (1 + rng.normal(0, 0.003, n)),
+            "Volume": rng.integers(100_000, 500_000, n),
+        },
+        index=idx,
+    )
+
+
+FRAMES = {"AAA": _fixture_df(1), "BBB": _fixture_df(2), "CCC": _fixture_df(3)}
+
+
+def _fake_get(symbol, start, end, interval="day"):
+    return FRAMES[symbol].copy()
+
+
+def _optimise(**kwargs):
+    with patch.object(optimizer_mod._data_cache, "get", side_effect=_fake_get):
+        opt = ThresholdOptimizer(
+            analyser_class_name="TechnicalAnalyser",
+            method_name="analyse_rsi",
+            stock_symbols=list(FRAMES),
+            train_start="2023-04-03",
+            train_end="2023-08-31",
+            test_start="2023-09-01",
+            test_end="2023-10-13",
+            n_trials=3,
+            **kwargs,
+        )
+        result = opt.optimize()
+    return opt, result
+
+
+def _trials(result):
+    return [(t["params"], t["value"]) for t in result["all_trials"]]
+
+
+class TestSharedFrames:
+    def test_roundtrip_preserves_values_dtypes_and_index(self):
+        df = FRAMES["AAA"].copy()
+        df.index = df.index.tz_localize("Asia/Kolkata")
+        shared = SharedFrames({"a": df})
+        try:
+            got = attach_frames(shared.specs)["a"]
+            pd.testing.assert_frame_equal(got, df)
+        finally:
+            shared.close()
+
+    def test_attached_frame_is_read_only(self):
+        shared = SharedFrames({"a": FRAMES["AAA"]})
+        try:
+            got = attach_frames(shared.specs)["a"]
+            with pytest.raises(ValueError):
+                got.iloc[0, 0] = -1.0
+            assert got.copy().iloc[0, 0] == FRAMES["AAA"].iloc[0, 0]
+        finally:
+            shared.close()
+
+    def test_rejects_object_columns(self):
+        df = FRAMES["AAA"].assign(Tag="x")
+        with pytest.raises(ValueError):
+            SharedFrames({"a": df})
+
+
+class TestSingleBacktest:
+    @pytest.mark.parametrize("incremental", [True, False])
+    def test_shared_frame_used_in_place(self, incremental):
+        from tools.backtest.backtest import Backtester
+        from services.analysis_engine.analyser.TechnicalAnalyser import TechnicalAnalyser
+
+        def run(frame):
+            bt = Backtester(stock_symbols="AAA", analyzer_methods=TechnicalAnalyser().analyse_rsi,
+                            start_date="2023-04-03", end_date="2023-08-31", incremental=incremental)
+            return ThresholdOptimizer._run_single_backtest(bt, "AAA", frame)
+
+        expected = run(FRAMES["AAA"].copy())
+        shared = SharedFrames({"a": FRAMES["AAA"]})
+        copied = []
+        original_copy = pd.DataFrame.copy
+
+        def tracking_copy(self, *args, **kwargs):
+            copied.append(len(self))
+            return original_copy(self, *args, **kwargs)
+
+        try:
+            frame = attach_frames(shared.specs)["a"]
+            with patch.object(pd.DataFrame, "copy", tracking_copy):
+                result = run(frame)
+        finally:
+            shared.close()
+        if incremental:   # the copy path copies each bar's prefix, the last one full length
+            assert len(FRAMES["AAA"]) not in copied
+        assert [(t.entry_date, t.exit_date, t.pnl) for t in result.trades] == \
+            [(t.entry_date, t.exit_date, t.pnl) for t in expected.trades]
+
+
+class TestParallelOptimizer:
+    def test_pool_matches_in_process_search(self):
+        _, serial = _optimise(workers=1)
+        _, pooled = _optimise(workers=2)
+
+        assert _trials(serial) == _trials(pooled)
+        assert serial["best_params"] == pooled["best_params"]
+        assert serial["train_trades"] == pooled["train_trades"] > 0
+        assert serial["test_summary"] == pooled["test_summary"]
+
+    def test_trial_batches_do_not_depend_on_worker_count(self):
+        _, in_process = _optimise(workers=1, trial_batch=3)
+        _, pooled = _optimise(workers=3, trial_batch=3)
+        assert _trials(in_process) == _trials(pooled)
+
+    def test_seed_changes_search(self):
+        _, a = _optimise(seed=1)
+        _, b = _optimise(seed=2)
+        assert [p for p, _ in _trials(a)] != [p for p, _ in _trials(b)]
+
+    def test_journal_storage_resumes_study(self, tmp_path):
+        path = str(tmp_path / "study.journal")
+        _optimise(storage=path)
+        opt, _ = _optimise(storage=path)
+        assert len(opt.study.trials) == 6
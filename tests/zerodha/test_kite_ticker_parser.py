@@ -0,0 +1,83 @@
+"""Tests for zerodha/zerodha_ticker.py — struct-based binary tick parser vs the per-field reference."""
+import random
+import struct
+
+import pytest
+
+from lib.zerodha.zerodha_ticker import TickRecord
+from tools.benchmarks.bench_tick_parser import (
+    legacy_parse_binary, make_frame, make_packet, make_ticker, synthetic_frames,
+)
+
+
+def _frame(*packets):
+    return make_frame(list(packets))
+
+
+class TestParseBinary:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_identical_to_reference(self, seed):
+        ticker = make_ticker()
+        for frame in synthetic_frames(50, 20, seed=seed):
+            assert ticker._parse_binary(frame) == legacy_parse_binary(ticker, frame)
+
+    @pytest.mark.parametrize("segment", [1, 3, 6, 9])
+    def test_segment_divisors(self, segment):
+        rng = random.Random(segment)
+        token = 12345 << 8 | segment
+        frame = _frame(*(make_packet(rng, n, token=token) for n in (8, 44, 184)))
+        ticker = make_ticker()
+        assert ticker._parse_binary(frame) == legacy_parse_binary(ticker, frame)
+
+    def test_zero_close_change(self):
+        packet = struct.pack(">7I", 256265, 2_000_000, 0, 0, 0, 0, 0)
+        ticks = make_ticker()._parse_binary(_frame(packet))
+        assert ticks[0]["change"] == 0
+        assert ticks[0]["tradable"] is False
+
+    def test_heartbeat_and_unknown_lengths(self):
+        ticker = make_ticker()
+        assert ticker._parse_binary(b"\x00") == []
+        frame = _frame(b"\x00" * 12, make_packet(random.Random(1), 8))
+        assert ticker._parse_binary(frame) == legacy_parse_binary(ticker, frame)
+
+    def test_truncated_trailing_packet_dropped(self):
+        frame = _frame(make_packet(random.Random(1), 8), make_packet(random.Random(2), 184))
+        assert len(make_ticker()._parse_binary(frame[:-10])) == 1
+
+    def test_depth_only_for_selected_tokens(self):
+        rng = random.Random(4)
+        frame = _frame(make_packet(rng, 184, token=101 << 8 | 2), make_packet(rng, 184, token=202 << 8 | 2))
+        ticks = make_ticker(depth_tokens={101 << 8 | 2})._parse_binary(frame)
+        assert len(ticks[0]["depth"]["buy"]) == 5 and len(ticks[0]["depth"]["sell"]) == 5
+        assert "depth" not in ticks[1]
+        full = make_ticker()._parse_binary(frame)
+        assert {k: v for k, v in full[1].items() if k != "depth"} == ticks[1]
+
+
+class TestTickRecords:
+    def test_records_match_dicts(self):
+        frames = synthetic_frames(20, 20, seed=9)
+        dict_ticker, record_ticker = make_ticker(), make_ticker(tick_records=True)
+        for frame in frames:
+            for d, r in zip(dict_ticker._parse_binary(frame), record_ticker._parse_binary(frame)):
+                assert isinstance(r, TickRecord)
+                assert (r.instrument_token, r.mode, r.tradable, r.last_price, r.change) == \
+                    (d["instrument_token"], d["mode"], d["tradable"], d["last_price"], d.get("change"))
+                if "ohlc" in d:
+                    assert (r.open, r.high, r.low, r.close) == \
+                        (d["ohlc"]["open"], d["ohlc"]["high"], d["ohlc"]["low"], d["ohlc"]["close"])
+                else:
+                    assert r.close is None
+                assert r.volume_traded == d.get("volume_traded")
+                assert r.oi == d.get("oi")
+                if "depth" in d:
+                    levels = d["depth"]["buy"] + d["depth"]["sell"]
+                    assert r.depth == tuple(v for lvl in levels for v in (lvl["quantity"], lvl["price"], lvl["orders"]))
+                    assert d["exchange_timestamp"].timestamp() == r.exchange_timestamp
+
+    def test_records_without_depth(self):
+        frame = _frame(make_packet(random.Random(3), 184))
+        record = make_ticker(depth_tokens=frozenset(), tick_records=True)._parse_binary(frame)[0]
+        assert record.depth is None
+        assert record.oi is not None
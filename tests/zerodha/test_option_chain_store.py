@@ -0,0 +1,213 @@
+"""Tests for lib/zerodha/option_chain_store.py — columnar chain vs the nested dicts it replaces."""
+import json
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from lib.zerodha.option_chain_store import OptionChainStore
+from lib.zerodha.tick_store import TickStore
+from services.analysis_engine.analyser.OptionChainFrame import OptionChainFrame
+
+
+def _depth(rng):
+    return {
+        book: [{"quantity": rng.randrange(1000), "price": rng.randrange(100, 9000) / 20,
+                "orders": rng.randrange(30)} for _ in range(5)]
+        for book in ("buy", "sell")
+    }
+
+
+def _random_tick(rng):
+    tick = {
+        "last_price": rng.randrange(5, 40000) / 20,
+        "oi": rng.choice((0, rng.randrange(1, 10**6))),
+        "volume_traded": rng.randrange(10**7),
+        "total_buy_quantity": rng.randrange(10**5),
+        "total_sell_quantity": rng.randrange(10**5),
+        "exchange_timestamp": datetime(2025, 7, 1, 10, rng.randrange(60)),
+    }
+    if rng.random() < 0.3:
+        tick.update(delta=rng.uniform(-1, 1), gamma=rng.uniform(0, 0.01), theta=-3.5,
+                    vega=rng.uniform(0, 20), iv=rng.uniform(8, 40), iv_change=0.25)
+    if rng.random() < 0.5:
+        tick["ohlc"] = {"open": 10.0, "high": 12.5, "low": 9.0, "close": 11.0}
+    if rng.random() < 0.3:
+        tick["depth"] = _depth(rng)
+    return tick
+
+
+def _legacy_update_option_tick(options_live, strike, option_type, tick):
+    """TickStore.update_option_tick's dict write, as it was."""
+    if strike not in options_live:
+        options_live[strike] = {}
+    entry = options_live[strike].get(option_type, {})
+    entry["prev_oi"] = entry.get("oi", 0)
+    entry["ltp"] = tick.get("last_price", 0)
+    entry["oi"] = tick.get("oi", 0)
+    entry["volume"] = tick.get("volume_traded", 0)
+    entry["buy_qty"] = tick.get("total_buy_quantity", 0)
+    entry["sell_qty"] = tick.get("total_sell_quantity", 0)
+    entry["timestamp"] = tick.get("exchange_timestamp")
+    if "delta" in tick:
+        entry["delta"] = tick["delta"]
+        for greek in ("gamma", "theta", "vega", "iv", "iv_change"):
+            entry[greek] = tick.get(greek, 0.0)
+    if "ohlc" in tick:
+        for field in ("open", "high", "low", "close"):
+            entry[field] = tick["ohlc"].get(field, 0)
+    if "depth" in tick:
+        entry["depth"] = tick["depth"]
+    options_live[strike][option_type] = entry
+
+
+class TestDictParity:
+    @pytest.mark.parametrize("seed", range(10))
+    def test_random_ticks_match_legacy_dicts(self, seed):
+        rng = random.Random(seed)
+        strikes = [24000.0 + 50 * i for i in range(-40, 41)]   # > initial capacity
+        store, legacy = OptionChainStore(), {}
+        for _ in range(1500):
+            strike, side = rng.choice(strikes), rng.choice(("CE", "PE"))
+            roll = rng.random()
+            if roll < 0.1 and strike in legacy and side in legacy[strike]:
+                extra = {"iv": rng.uniform(8, 40), "source": "sensibull", "iv_percentile": None}
+                assert store.merge(strike, side, extra)
+                legacy[strike][side].update(extra)
+            elif roll < 0.15 and strike in legacy and side in legacy[strike]:
+                store[strike][side]["prev_oi"] = 777
+                legacy[strike][side]["prev_oi"] = 777
+            else:
+                tick = _random_tick(rng)
+                store.apply_tick(strike, side, tick)
+                _legacy_update_option_tick(legacy, strike, side, tick)
+        assert store.to_dict() == legacy
+        assert list(store) == list(legacy)
+        for strike, sides in legacy.items():
+            for side, entry in sides.items():
+                assert dict(store[strike][side]) == entry
+                assert store.get(strike, {}).get(side, {}).get("oi", 0) == entry["oi"]
+
+    def test_counts_come_back_as_int(self):
+        store = OptionChainStore()
+        store.apply_tick(24000.0, "CE", {"last_price": 100, "oi": 1500})
+        entry = store[24000.0]["CE"]
+        assert type(entry["oi"]) is int and type(entry["prev_oi"]) is int
+        assert type(entry["ltp"]) is float
+
+    def test_missing_keys_behave_like_dicts(self):
+        store = OptionChainStore()
+        store.apply_tick(24000.0, "CE", {"last_price": 100, "oi": 1500})
+        assert "PE" not in store[24000.0]
+        assert store[24000.0].get("PE", {}).get("ltp", 0) == 0
+        assert "gamma" not in store[24000.0]["CE"]
+        assert store[24000.0]["CE"].get("gamma", 0.0) == 0.0
+        with pytest.raises(KeyError):
+            store[24000.0]["CE"]["depth"]
+        assert store.get(99999.0) is None
+
+    def test_plain_dict_assignment_and_setdefault(self):
+        store = OptionChainStore()
+        store.setdefault(21000, {})
+        store[21000]["CE"] = {"oi": 1000, "ltp": 50.0, "prev_oi": 0}
+        store.setdefault(21000, {})["PE"] = {"oi": 900, "ltp": None, "tag": "x"}
+        store[21100] = {"CE": {"oi": 5}}
+        assert store.to_dict() == {
+            21000: {"CE": {"oi": 1000, "ltp": 50.0, "prev_oi": 0}, "PE": {"oi": 900, "ltp": None, "tag": "x"}},
+            21100: {"CE": {"oi": 5}},
+        }
+        assert store[21000]["PE"] == {"oi": 900, "ltp": None, "tag": "x"}
+
+    def test_non_numeric_field_round_trips(self):
+        store = OptionChainStore()
+        store[24000.0] = {"CE": {"oi": "n/a", "ltp": 10.0}}
+        assert store[24000.0]["CE"]["oi"] == "n/a"
+        assert store.column("CE", "oi").tolist() == [0.0]
+        store.apply_tick(24000.0, "CE", {"last_price": 11.0, "oi": 40})
+        assert store[24000.0]["CE"]["prev_oi"] == "n/a"
+        assert store[24000.0]["CE"]["oi"] == 40
+
+    def test_odd_depth_kept_as_is(self):
+        store = OptionChainStore()
+        depth = {"buy": [{"quantity": 1, "price": 2.0, "orders": 1}], "sell": []}
+        store.apply_tick(24000.0, "CE", {"oi": 1, "depth": depth})
+        assert store[24000.0]["CE"]["depth"] == depth
+
+    def test_delete_strike_keeps_rows_dense(self):
+        store = OptionChainStore({s: {"CE": {"oi": int(s), "note": str(s)}} for s in (1.0, 2.0, 3.0)})
+        store[2.0]["CE"]["timestamp"] = "t2"
+        store[3.0]["CE"]["timestamp"] = "t3"
+        del store[2.0]
+        assert list(store) == [1.0, 3.0]
+        assert store.to_dict() == {1.0: {"CE": {"oi": 1, "note": "1.0"}},
+                                   3.0: {"CE": {"oi": 3, "timestamp": "t3", "note": "3.0"}}}
+        assert store.column("CE", "oi").tolist() == [1.0, 3.0]
+
+    def test_json_serialisable_copy(self):
+        store = OptionChainStore()
+        store.apply_tick(24000.0, "CE", {"last_price": 1.5, "oi": 3, "depth": _depth(random.Random(0))})
+        assert json.loads(json.dumps(dict(store[24000.0]["CE"]), default=str))["oi"] == 3
+
+
+class TestColumns:
+    def test_columns_follow_first_seen_order(self):
+        store = OptionChainStore()
+        store.apply_tick(24100.0, "PE", {"last_price": 5.0, "oi": 10})
+        store.apply_tick(24000.0, "CE", {"last_price": 7.0, "oi": 20})
+        assert store.strikes().tolist() == [24100.0, 24000.0]
+        assert store.column("CE", "oi").tolist() == [0.0, 20.0]
+        assert store.column("PE", "ltp").tolist() == [5.0, 0.0]
+        assert not store.column("PE", "ltp").flags.writeable
+
+    def test_depth_block(self):
+        store = OptionChainStore()
+        depth = _depth(random.Random(1))
+        store.apply_tick(24000.0, "PE", {"oi": 1, "depth": depth})
+        block = store.depth_block("PE")
+        assert block.shape == (1, 2, 5, 3)
+        assert block[0, 1, 4].tolist() == [depth["sell"][4]["quantity"], depth["sell"][4]["price"],
+                                           depth["sell"][4]["orders"]]
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_frame_from_store_matches_dicts(self, seed):
+        rng = random.Random(seed)
+        store = OptionChainStore()
+        strikes = [24000.0 + 100 * i for i in range(-20, 21)]
+        rng.shuffle(strikes)
+        for strike in strikes:
+            for side in ("CE", "PE"):
+                store.apply_tick(strike, side, _random_tick(rng))
+        from_store = OptionChainFrame.from_options_live(store)
+        from_dicts = OptionChainFrame.from_options_live(store.to_dict())
+        assert from_store.strikes.tolist() == from_dicts.strikes.tolist()
+        for side in ("CE", "PE"):
+            for field in ("oi", "prev_oi", "ltp", "iv", "gamma", "delta"):
+                np.testing.assert_array_equal(from_store.column(side, field), from_dicts.column(side, field))
+
+
+class TestTickStoreIntegration:
+    def test_assigned_dict_becomes_store(self):
+        ts = TickStore()
+        ts.options_live = {24000.0: {"CE": {"oi": 5, "ltp": 1.0}}}
+        assert isinstance(ts.options_live, OptionChainStore)
+        assert ts.options_live[24000.0]["CE"]["oi"] == 5
+
+    def test_store_is_smaller_than_dicts(self):
+        import sys
+        rng = random.Random(3)
+        ts = TickStore()
+        for i in range(120):
+            for side in ("CE", "PE"):
+                tick = _random_tick(rng)
+                tick["depth"] = _depth(rng)
+                ts.update_option_tick(24000.0 + 50 * i, side, tick)
+
+        def deep_size(obj):
+            if isinstance(obj, dict):
+                return sys.getsizeof(obj) + sum(deep_size(k) + deep_size(v) for k, v in obj.items())
+            if isinstance(obj, list):
+                return sys.getsizeof(obj) + sum(deep_size(v) for v in obj)
+            return sys.getsizeof(obj)
+
+        assert ts.options_live.nbytes() < deep_size(ts.options_live.to_dict()) / 2
@@ -0,0 +1,123 @@
+"""Tests for zerodha/tick_dispatcher.py — sharded, coalescing tick dispatch."""
+import threading
+import time
+from datetime import datetime
+
+from lib.zerodha.tick_dispatcher import TickDispatcher, coalesce_tick
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestCoalesceTick:
+    def test_newer_values_win(self):
+        merged = coalesce_tick({"last_price": 1.0, "oi": 10}, {"last_price": 2.0, "oi": 12})
+        assert merged == {"last_price": 2.0, "oi": 12}
+
+    def test_fields_missing_from_newer_kept(self):
+        merged = coalesce_tick({"last_price": 1.0, "oi": 10, "volume_traded": 500}, {"last_price": 2.0})
+        assert merged == {"last_price": 2.0, "oi": 10, "volume_traded": 500}
+
+    def test_cumulative_volume_never_decreases(self):
+        assert coalesce_tick({"volume_traded": 900}, {"volume_traded": 800})["volume_traded"] == 900
+
+
+class TestTickDispatcher:
+    def test_latest_wins_per_token(self):
+        seen = []
+        d = TickDispatcher(seen.append, shards=2)
+        d.submit([{"instrument_token": 1, "last_price": p} for p in range(100)])
+        d.submit([{"instrument_token": 2, "last_price": 5}])
+        assert d.depth() == 2
+        d.start()
+        try:
+            assert _wait(lambda: len(seen) == 2)
+        finally:
+            d.stop()
+        by_token = {t["instrument_token"]: t for t in seen}
+        assert by_token[1]["last_price"] == 99
+        stats = d.stats()
+        assert stats["received"] == 101 and stats["coalesced"] == 99 and stats["processed"] == 2
+        assert d.received == 101 and d.processed == 2
+
+    def test_same_key_same_shard_in_order(self):
+        applied = []
+        lock = threading.Lock()
+
+        def handler(tick):
+            with lock:
+                applied.append((threading.current_thread().name, tick["instrument_token"], tick["seq"]))
+
+        symbols = {1: "NIFTY", 2: "NIFTY", 3: "BANKNIFTY", 4: "RELIANCE"}
+        d = TickDispatcher(handler, shard_key=symbols.get, shards=3)
+        d.start()
+        try:
+            for seq in range(200):
+                d.submit([{"instrument_token": t, "seq": seq} for t in symbols])
+                time.sleep(0.0005)
+            assert _wait(lambda: d.depth() == 0)
+        finally:
+            d.stop()
+        threads_for = {}
+        last_seq = {}
+        for thread, token, seq in applied:
+            threads_for.setdefault(symbols[token], set()).add(thread)
+            assert seq > last_seq.get(token, -1)
+            last_seq[token] = seq
+        assert all(len(t) == 1 for t in threads_for.values())
+        assert all(seq == 199 for seq in last_seq.values())
+
+    def test_handler_errors_counted_and_worker_survives(self):
+        seen = []
+
+        def handler(tick):
+            if tick["instrument_token"] == 1:
+                raise ValueError("boom")
+            seen.append(tick)
+
+        d = TickDispatcher(handler, shards=1)
+        d.start()
+        try:
+            d.submit([{"instrument_token": 1}, {"instrument_token": 2}])
+            assert _wait(lambda: len(seen) == 1)
+        finally:
+            d.stop()
+        assert d.stats()["shards"][0]["errors"] == 1
+
+    def test_age_and_latency_percentiles(self):
+        d = TickDispatcher(lambda tick: None, shards=1)
+        d.start()
+        try:
+            ts = datetime.fromtimestamp(time.time() - 2)
+            d.submit([{"instrument_token": i, "exchange_timestamp": ts} for i in range(10)])
+            assert _wait(lambda: d.processed == 10)
+        finally:
+            d.stop()
+        stats = d.stats()
+        assert 1500 < stats["age_ms"]["p50"] < 5000
+        assert stats["latency_ms"]["p99"] < 1000
+
+    def test_ticks_without_token_ignored_and_clear(self):
+        d = TickDispatcher(lambda tick: None, shards=2)
+        d.submit([{"last_price": 1}, {"instrument_token": 5}])
+        assert d.depth() == 1
+        assert d.clear() == 1
+        assert d.depth() == 0
+
+    def test_restart_after_signal_stop(self):
+        seen = []
+        d = TickDispatcher(seen.append, shards=2)
+        d.start()
+        d.signal_stop()
+        d.start()
+        try:
+            assert d.is_alive()
+            d.submit([{"instrument_token": 9}])
+            assert _wait(lambda: len(seen) == 1)
+        finally:
+            d.stop()
+        assert not d.is_alive()
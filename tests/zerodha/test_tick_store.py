@@ -0,0 +1,176 @@
+"""Tests for lib/zerodha/tick_store.py — option change tracking and aggregates."""
+import random
+
+import pytest
+
+from lib.zerodha.tick_store import TickStore
+
+
+def _tick(ltp=100.0, oi=1000):
+    return {"last_price": ltp, "oi": oi, "volume_traded": 10,
+            "total_buy_quantity": 5, "total_sell_quantity": 6}
+
+
+class TestOptionChangeTracking:
+    def test_update_marks_side_dirty(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick())
+        version, changed = ts.drain_dirty_options()
+        assert version == 1
+        assert list(changed) == [(24000.0, "CE")]
+        assert changed[(24000.0, "CE")]["ltp"] == 100.0
+
+    def test_drain_clears_dirty_set(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick())
+        ts.drain_dirty_options()
+        version, changed = ts.drain_dirty_options()
+        assert version == 1
+        assert changed == {}
+
+    def test_only_changed_sides_returned(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick())
+        ts.update_option_tick(24000.0, "PE", _tick())
+        ts.update_option_tick(24100.0, "CE", _tick())
+        ts.drain_dirty_options()
+        ts.update_option_tick(24100.0, "CE", _tick(ltp=90.0))
+        _, changed = ts.drain_dirty_options()
+        assert list(changed) == [(24100.0, "CE")]
+
+    def test_side_versions_are_monotonic(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick())
+        ts.update_option_tick(24000.0, "PE", _tick())
+        ts.update_option_tick(24000.0, "CE", _tick())
+        assert ts.option_side_version(24000.0, "PE") == 2
+        assert ts.option_side_version(24000.0, "CE") == 3
+        assert ts.option_side_version(99999.0, "CE") == 0
+
+    def test_merge_update_marks_dirty(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick())
+        ts.drain_dirty_options()
+        ts.update_option_tick(24000.0, "CE", {"iv": 14.2}, merge=True)
+        _, changed = ts.drain_dirty_options()
+        assert changed[(24000.0, "CE")]["iv"] == 14.2
+
+    def test_merge_skip_does_not_mark_dirty(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", {"iv": 14.2}, merge=True)
+        _, changed = ts.drain_dirty_options()
+        assert changed == {}
+
+    def test_mark_options_dirty_all(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick())
+        ts.update_option_tick(24000.0, "PE", _tick())
+        ts.drain_dirty_options()
+        ts.mark_options_dirty()
+        _, changed = ts.drain_dirty_options()
+        assert set(changed) == {(24000.0, "CE"), (24000.0, "PE")}
+
+    def test_drained_copy_is_detached(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick())
+        _, changed = ts.drain_dirty_options()
+        changed[(24000.0, "CE")]["ltp"] = -1
+        assert ts.options_live[24000.0]["CE"]["ltp"] == 100.0
+
+
+# ── Incremental options aggregate ─────────────────────────────────────────────
+
+_AGG_KEYS = ("total_ce_oi", "total_pe_oi", "live_pcr", "max_oi_ce_strike", "max_oi_pe_strike",
+             "net_ce_oi_change", "net_pe_oi_change", "atm_strike", "atm_straddle_premium")
+
+
+def _full_scan_aggregate(options_live, spot_price):
+    """recompute_options_aggregate as a full scan of options_live (the reference)."""
+    total_ce_oi = total_pe_oi = 0
+    net_ce_oi_change = net_pe_oi_change = 0
+    max_ce_oi = max_pe_oi = 0
+    max_ce_strike = max_pe_strike = None
+    for strike, data in options_live.items():
+        ce, pe = data.get("CE", {}), data.get("PE", {})
+        ce_oi, pe_oi = ce.get("oi", 0), pe.get("oi", 0)
+        total_ce_oi += ce_oi
+        total_pe_oi += pe_oi
+        net_ce_oi_change += ce_oi - ce.get("prev_oi", 0)
+        net_pe_oi_change += pe_oi - pe.get("prev_oi", 0)
+        if ce_oi > max_ce_oi:
+            max_ce_oi, max_ce_strike = ce_oi, strike
+        if pe_oi > max_pe_oi:
+            max_pe_oi, max_pe_strike = pe_oi, strike
+    atm = min(options_live, key=lambda s: abs(s - spot_price))
+    return {
+        "total_ce_oi": total_ce_oi,
+        "total_pe_oi": total_pe_oi,
+        "live_pcr": total_pe_oi / total_ce_oi if total_ce_oi > 0 else 0.0,
+        "max_oi_ce_strike": max_ce_strike,
+        "max_oi_pe_strike": max_pe_strike,
+        "net_ce_oi_change": net_ce_oi_change,
+        "net_pe_oi_change": net_pe_oi_change,
+        "atm_strike": atm,
+        "atm_straddle_premium": options_live[atm].get("CE", {}).get("ltp", 0)
+        + options_live[atm].get("PE", {}).get("ltp", 0),
+    }
+
+
+def _aggregate(ts, spot_price):
+    ts.recompute_options_aggregate(spot_price)
+    return {k: ts.options_aggregate[k] for k in _AGG_KEYS}
+
+
+class TestIncrementalAggregate:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matches_full_scan_after_random_ticks(self, seed):
+        rng = random.Random(seed)
+        strikes = [24000.0 + 50 * i for i in range(-15, 16)]
+        rng.shuffle(strikes)                  # first-seen order decides ties
+        ts = TickStore()
+        for step in range(600):
+            strike = rng.choice(strikes[:rng.randint(1, len(strikes))])
+            side = rng.choice(("CE", "PE"))
+            # Few distinct OI values so walls tie, drop to zero and come back.
+            oi = rng.choice((0, 0, 500, 1000, 1000, 2500, 5000))
+            roll = rng.random()
+            if roll < 0.1:
+                ts.update_option_tick(strike, side, {"oi": oi, "iv": 12.0}, merge=True)
+            elif roll < 0.15 and strike in ts.options_live and side in ts.options_live[strike]:
+                # sensibull_adapter._patch_prev_oi: in-place prev_oi fix + re-mark
+                ts.options_live[strike][side]["prev_oi"] = rng.choice((0, 700, 4000))
+                ts.mark_options_dirty([(strike, side)])
+            else:
+                ts.update_option_tick(strike, side, _tick(ltp=rng.uniform(1, 300), oi=oi))
+            if step % 7 == 0 and ts.options_live:
+                # Half-strike spots hit exact ATM ties.
+                spot = rng.choice(strikes) + rng.choice((0.0, 25.0, -25.0, 10.0, 60.0, -400.0))
+                assert _aggregate(ts, spot) == _full_scan_aggregate(ts.options_live, spot)
+
+    def test_wall_moves_when_oi_falls(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick(oi=5000))
+        ts.update_option_tick(24100.0, "CE", _tick(oi=3000))
+        assert _aggregate(ts, 24000.0)["max_oi_ce_strike"] == 24000.0
+        ts.update_option_tick(24000.0, "CE", _tick(oi=1000))
+        assert _aggregate(ts, 24000.0)["max_oi_ce_strike"] == 24100.0
+        ts.update_option_tick(24100.0, "CE", _tick(oi=0))
+        ts.update_option_tick(24000.0, "CE", _tick(oi=0))
+        assert _aggregate(ts, 24000.0)["max_oi_ce_strike"] is None
+
+    def test_replaced_options_live_is_reindexed(self):
+        ts = TickStore()
+        ts.update_option_tick(24000.0, "CE", _tick(oi=5000))
+        ts.options_live = {
+            24100.0: {"CE": {"oi": 700, "prev_oi": 200, "ltp": 40.0}},
+            24200.0: {"PE": {"oi": 900, "prev_oi": 1000, "ltp": 55.0}},
+        }
+        assert _aggregate(ts, 24180.0) == _full_scan_aggregate(ts.options_live, 24180.0)
+        ts.update_option_tick(24200.0, "CE", _tick(oi=800))
+        assert _aggregate(ts, 24180.0) == _full_scan_aggregate(ts.options_live, 24180.0)
+
+    def test_heap_stays_bounded(self):
+        ts = TickStore()
+        for i in range(5000):
+            ts.update_option_tick(24000.0 + 50 * (i % 3), "CE", _tick(oi=1 + i))
+        assert len(ts._options_index.heaps["CE"]) <= 2 * 3 + 64 + 1
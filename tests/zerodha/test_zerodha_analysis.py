@@ -317,19 +317,41 @@ class TestCheckRecentering:
 # ── on_ticks ──────────────────────────────────────────────────────────────────
 
 class TestOnTicks:
-    def test_each_tick_put_on_queue(self):
+    def test_each_tick_submitted_to_dispatcher(self):
         mgr = _manager()
         ticks = [{"instrument_token": 1}, {"instrument_token": 2}]
         mgr.on_ticks(None, ticks)
-        queued = []
-        while not mgr.tick_queue.empty():
-            queued.append(mgr.tick_queue.get_nowait())
-        assert queued == ticks
+        assert mgr.tick_dispatcher.depth() == 2
 
     def test_empty_ticks_list_no_error(self):
         mgr = _manager()
         mgr.on_ticks(None, [])  # must not raise
-        assert mgr.tick_queue.empty()
+        assert mgr.tick_dispatcher.depth() == 0
+
+    def test_burst_for_one_token_coalesced_not_dropped(self):
+        mgr = _manager()
+        for price in range(10_000):
+            mgr.on_ticks(None, [{"instrument_token": 7, "last_price": price}])
+        assert mgr.tick_dispatcher.depth() == 1
+        assert mgr.tick_dispatcher.stats()["coalesced"] == 9_999
+        assert mgr._tick_count == 10_000
+        assert mgr._processed_tick_count == 0
+
+    def test_ticks_routed_by_worker(self):
+        mgr = _manager()
+        routed = []
+        mgr.tick_dispatcher.handler = routed.append
+        mgr.start_tick_processor()
+        try:
+            mgr.on_ticks(None, [{"instrument_token": 1}, {"instrument_token": 2}])
+            deadline = time.time() + 2
+            while len(routed) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            mgr.stop_tick_processor()
+        assert sorted(t["instrument_token"] for t in routed) == [1, 2]
+        assert mgr._tick_count == 2
+        assert mgr._processed_tick_count == 2
 
 
 # ── on_connect / on_close ─────────────────────────────────────────────────────
@@ -415,17 +437,23 @@ class TestSendNotification:
 # ── tick processor thread ─────────────────────────────────────────────────────
 
 class TestTickProcessor:
-    def test_start_creates_daemon_thread(self):
+    def test_start_creates_daemon_threads(self):
         mgr = _manager()
         mgr.start_tick_processor()
-        assert mgr.processor_thread is not None
-        assert mgr.processor_thread.daemon is True
+        threads = [s.thread for s in mgr.tick_dispatcher._shards]
+        assert threads and all(t.daemon and t.is_alive() for t in threads)
         mgr.stop_tick_processor()
 
-    def test_stop_sets_flag_and_joins(self):
+    def test_stop_joins_workers(self):
         mgr = _manager()
         mgr.start_tick_processor()
         mgr.stop_tick_processor()
-        assert mgr.stop_processor is True
-        # Thread should have joined (not alive)
-        assert not mgr.processor_thread.is_alive()
+        assert not mgr.tick_dispatcher.is_alive()
+
+    def test_shard_key_is_parent_symbol(self, patched_app_ctx):
+        mgr = _manager()
+        info = make_option_info(token=111, symbol="NIFTY")
+        _setup_registry(mgr, info, MagicMock())
+        with patch(_SHARED) as mock_shared:
+            mock_shared.app_ctx = mgr._ctx
+            assert mgr._shard_key(111) == "NIFTY"
@@ -14,6 +14,8 @@ from common.Stock import Stock
 from lib.logging_util import get_logger
 logger = get_logger("backtest")
 from services.analysis_engine.analyser.Analyser import BaseAnalyzer
+from services.analysis_engine.analyser.IndicatorState import IndicatorState
+from tools.market_data.ohlcv_store import OHLCVStore, get_default_store
 import common.shared as shared
 from common.helperFunctions import percentageChange
 
@@ -231,6 +233,13 @@ class Backtester:
     - Position sizing
     - Multiple signal handling
     - Detailed performance metrics
+
+    With ``incremental=True`` (the default) each bar is analysed on an
+    un-copied prefix view of the history and the stock carries an
+    IndicatorState that advances one bar per step, so TechnicalAnalyser
+    indicators are not recomputed over the whole prefix every bar. The state
+    only ever sees bars up to the current one, so there is no lookahead.
+    ``incremental=False`` keeps the original copy-and-recompute path.
     """
     
     def __init__(
@@ -248,7 +257,10 @@ class Backtester:
         allow_short: bool = True,  # Allow bearish trades
         max_positions: int = 1,  # Max concurrent positions per stock
         timeframe: str = 'positional',  # 'intraday' or 'positional'
-        interval: str = 'day'  # 'day', '5minute', etc.
+        interval: str = 'day',  # 'day', '5minute', etc.
+        incremental: bool = True,  # Prefix views + IndicatorState instead of per-bar copies
+        data_store: Optional[OHLCVStore] = None,  # Defaults to the shared on-disk store
+        use_data_store: bool = True  # False = always download, never touch the store
     ):
         self.stock_symbols = [stock_symbols] if isinstance(stock_symbols, str) else stock_symbols
         self.analyzer_methods = [analyzer_methods] if callable(analyzer_methods) else analyzer_methods
@@ -264,6 +276,11 @@ class Backtester:
         self.max_positions = max_positions
         self.timeframe = timeframe
         self.interval = interval
+        self.incremental = incremental
+        if use_data_store:
+            self.data_store = data_store if data_store is not None else get_default_store()
+        else:
+            self.data_store = None
         
         self.results: Dict[str, BacktestResult] = {}
         self.stocks: Dict[str, Stock] = {}
@@ -273,48 +290,23 @@ class Backtester:
         try:
             logger.info(f"Loading data for {stock_symbol} from {self.start_date} to {self.end_date}")
             
-            # Determine yfinance symbol
-            if stock_symbol in ["NIFTY", "BANKNIFTY", "FINNIFTY"]:
-                if stock_symbol == "NIFTY":
-                    yf_symbol = "^NSEI"
-                elif stock_symbol == "BANKNIFTY":
-                    yf_symbol = "^NSEBANK"
-                else:
-                    yf_symbol = stock_symbol + ".NS"
-            else:
-                yf_symbol = stock_symbol + ".NS"
-            
             # Download data with buffer for indicator calculation
             # 350 calendar days ≈ 245 trading days — enough to warm up a 200-period EMA
             buffer_days = 350  # Extra days for indicators
             buffer_start = self.start_date - timedelta(days=buffer_days)
+            end = self.end_date + timedelta(days=1)
             
-            data = yf.download(
-                yf_symbol,
-                start=buffer_start,
-                end=self.end_date + timedelta(days=1),
-                interval='1d' if self.interval == 'day' else self.interval,
-                progress=False
-            )
+            if self.data_store is not None:
+                # Persistent store: only ranges not already on disk are downloaded
+                data = self.data_store.get(
+                    stock_symbol, self.interval, buffer_start, end, fetch=self._download
+                )
+            else:
+                data = self._download(stock_symbol, self.interval, buffer_start, end)
             
             if data.empty:
                 raise ValueError(f"No data found for {stock_symbol}")
             
-            # Handle MultiIndex columns from yfinance (flatten if needed)
-            if isinstance(data.columns, pd.MultiIndex):
-                data.columns = data.columns.get_level_values(0)
-            
-            # Ensure proper column names (capitalize first letter)
-            data.columns = [col.capitalize() if isinstance(col, str) else col for col in data.columns]
-            
-            # For intraday, we need proper timezone handling
-            if self.interval != 'day':
-                data.index = pd.to_datetime(data.index)
-                if data.index.tz is None:
-                    data.index = data.index.tz_localize('Asia/Kolkata')
-                else:
-                    data.index = data.index.tz_convert('Asia/Kolkata')
-            
             logger.info(f"Loaded {len(data)} data points for {stock_symbol}")
             return data
             
@@ -322,11 +314,55 @@ class Backtester:
             logger.error(f"Error loading data for {stock_symbol}: {e}", exc_info=True)
             raise
     
+    @staticmethod
+    def _download(stock_symbol: str, interval: str, start, end) -> pd.DataFrame:
+        """Download [start, end) from yfinance with normalised columns and timezone"""
+        # Determine yfinance symbol
+        if stock_symbol in ["NIFTY", "BANKNIFTY", "FINNIFTY"]:
+            if stock_symbol == "NIFTY":
+                yf_symbol = "^NSEI"
+            elif stock_symbol == "BANKNIFTY":
+                yf_symbol = "^NSEBANK"
+            else:
+                yf_symbol = stock_symbol + ".NS"
+        else:
+            yf_symbol = stock_symbol + ".NS"
+        
+        data = yf.download(
+            yf_symbol,
+            start=start,
+            end=end,
+            interval='1d' if interval == 'day' else interval,
+            progress=False
+        )
+        
+        if data is None or data.empty:
+            return pd.DataFrame()
+        
+        # Handle MultiIndex columns from yfinance (flatten if needed)
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        
+        # Ensure proper column names (capitalize first letter)
+        data.columns = [col.capitalize() if isinstance(col, str) else col for col in data.columns]
+        
+        # For intraday, we need proper timezone handling
+        if interval != 'day':
+            index = pd.DatetimeIndex(data.index)
+            if index.tz is None:
+                data.index = index.tz_localize('Asia/Kolkata')
+            else:
+                data.index = index.tz_convert('Asia/Kolkata')
+        
+        return data
+    
     def create_stock_object(self, stock_symbol: str, price_data: pd.DataFrame) -> Stock:
         """Create Stock object with loaded data"""
         is_index = stock_symbol in ["NIFTY", "BANKNIFTY", "FINNIFTY"]
         stock = Stock(stock_symbol, stock_symbol, is_index=is_index)
         stock._priceData = price_data
+        if self.incremental:
+            stock.indicator_state = IndicatorState()
         
         # Set previous day OHLCV
         if len(price_data) > 1:
@@ -343,8 +379,10 @@ class Backtester:
     
     def run_analysis_on_date(self, stock: Stock, current_idx: int, full_data: pd.DataFrame) -> Dict[str, Any]:
         """Run analyzer methods on stock data up to current date"""
-        # Create a view of data up to current date (don't modify original)
-        stock._priceData = full_data.iloc[:current_idx + 1].copy()
+        # Create a view of data up to current date (don't modify original).
+        # Analysers only read priceData, so the incremental path skips the copy.
+        as_of = full_data.iloc[:current_idx + 1]
+        stock._priceData = as_of if self.incremental else as_of.copy()
         
         # Reset analysis
         stock.analysis = {
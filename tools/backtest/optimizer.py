@@ -10,25 +10,35 @@ Features:
     and VolumeAnalyser method.
   - Train / test split to guard against overfitting.
   - Multi-stock aggregation so results generalise across instruments.
-  - Parallel trial execution via Optuna's built-in support.
+  - Process-parallel execution (``workers > 1``): per-symbol backtests and
+    batches of Optuna trials run on a pool whose workers share the price
+    frames through shared memory.  Results depend only on the seed and
+    ``trial_batch``, never on the worker count.
+  - Optional on-disk study storage (SQLite or Optuna journal file) so several
+    optimiser processes can share, or resume, one study.
   - Human-readable report + JSON export of best parameters.
 
 Usage:
     from tools.backtest.optimizer import ThresholdOptimizer, SEARCH_SPACES
     opt = ThresholdOptimizer(...)
     best = opt.optimize()
+
+    python -m tools.backtest.optimizer --analyser TechnicalAnalyser \
+        --method analyse_rsi --symbols RELIANCE TCS --train 2020-01-01 2024-12-31 \
+        --workers 16 --trial-batch 4
 """
 
 import sys
 import os
 sys.path.append(os.getcwd())
 
+import argparse
 import json
 import logging
 import warnings
 from copy import deepcopy
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -43,6 +53,7 @@ except ImportError:
     )
 
 from tools.backtest.backtest import Backtester, BacktestResult
+from tools.backtest.parallel import FramePool, shared_frame
 from services.analysis_engine.analyser.TechnicalAnalyser import TechnicalAnalyser
 from services.analysis_engine.analyser.candleStickPatternAnalyser import CandleStickAnalyser
 from services.analysis_engine.analyser.VolumeAnalyser import VolumeAnalyser
@@ -237,7 +248,7 @@ def _suggest(trial: Trial, name: str, spec: dict):
 # Data cache — avoids re-downloading for every trial
 # ---------------------------------------------------------------------------
 class _DataCache:
-    """Simple in-memory cache for yfinance downloads."""
+    """In-process cache over Backtester.load_data (itself backed by the on-disk OHLCV store)."""
 
     def __init__(self):
         self._cache: Dict[str, pd.DataFrame] = {}
@@ -259,6 +270,107 @@ class _DataCache:
 _data_cache = _DataCache()
 
 
+def _frame_key(symbol: str, start: str, end: str) -> str:
+    """Key under which a symbol's frame for one date range is shared with pool workers."""
+    return f"{symbol}|{start}|{end}"
+
+
+def _make_storage(path: Optional[str]):
+    """Optuna storage for *path*: SQLite for .db/.sqlite files, a journal file otherwise."""
+    if not path:
+        return None
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return f"sqlite:///{os.path.abspath(path)}"
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:  # optuna < 4.0
+        from optuna.storages import JournalFileStorage as JournalFileBackend
+    return optuna.storages.JournalStorage(JournalFileBackend(path))
+
+
+# ---------------------------------------------------------------------------
+# Pool worker — one per-symbol backtest with one parameter set
+# ---------------------------------------------------------------------------
+class _BacktestTask(NamedTuple):
+    analyser_class_name: str
+    method_name: str
+    params: Dict[str, Any]
+    mode: str
+    symbol: str
+    frame_key: str
+    start: str
+    end: str
+    backtester_kwargs: Dict[str, Any]
+
+
+_MISSING = object()
+_worker_class_defaults: Dict[Tuple[type, str], Any] = {}
+
+
+def _worker_method(analyser_class_name: str, method_name: str, params: Dict[str, Any]) -> Callable:
+    """
+    Bound analyser method with *params* applied on top of reset_constants().
+
+    Workers run tasks from many trials (and, under BulkOptimizer, many
+    methods) in whatever order the pool hands them out, so every class
+    attribute a previous task overrode is restored first.  A task therefore
+    sees exactly the defaults + its own params, independent of history.
+    """
+    analyser_class = ANALYSER_CLASSES[analyser_class_name]
+    for (cls, attr), value in _worker_class_defaults.items():
+        if value is _MISSING:
+            if attr in cls.__dict__:
+                delattr(cls, attr)
+        else:
+            setattr(cls, attr, value)
+
+    analyser = analyser_class()
+    analyser.reset_constants()
+    for attr, value in params.items():
+        _worker_class_defaults.setdefault(
+            (analyser_class, attr), analyser_class.__dict__.get(attr, _MISSING)
+        )
+        setattr(analyser_class, attr, value)
+    return getattr(analyser, method_name)
+
+
+def _plain_details(details: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analysers build their namedtuple types inside the method, so they cannot
+    be pickled back to the parent; send them as plain tuples instead.
+    """
+    def plain(value):
+        if isinstance(value, list):
+            return [plain(v) for v in value]
+        if isinstance(value, tuple):
+            return tuple(value)
+        return value
+    return {key: plain(value) for key, value in details.items()}
+
+
+def _pool_backtest(task: _BacktestTask) -> Optional[BacktestResult]:
+    """Run one task inside a FramePool worker; None if the backtest failed."""
+    try:
+        shared.app_ctx.mode = (  # type: ignore[assignment]
+            shared.Mode.INTRADAY if task.mode == "intraday" else shared.Mode.POSITIONAL
+        )
+        method = _worker_method(task.analyser_class_name, task.method_name, task.params)
+        bt = Backtester(
+            stock_symbols=task.symbol,
+            analyzer_methods=method,
+            start_date=task.start,
+            end_date=task.end,
+            **task.backtester_kwargs,
+        )
+        result = ThresholdOptimizer._run_single_backtest(bt, task.symbol, shared_frame(task.frame_key))
+        for trade in result.trades:
+            trade.analysis_details = _plain_details(trade.analysis_details)
+        return result
+    except Exception as e:
+        logger.debug(f"Backtest failed for {task.symbol}: {e}")
+        return None
+
+
 # ---------------------------------------------------------------------------
 # Core Optimiser
 # ---------------------------------------------------------------------------
@@ -292,6 +404,22 @@ class ThresholdOptimizer:
         Override the default search space for this method.
     mode : str
         'positional' or 'intraday'.  Affects reset_constants().
+    workers : int
+        Worker processes for backtests.  1 (default) runs everything in this
+        process exactly as before.
+    trial_batch : int
+        Trials asked from the sampler and evaluated together.  1 reproduces
+        the sequential search; larger batches keep more workers busy when
+        there are few symbols.  Results depend on (seed, trial_batch) only.
+    seed : int
+        TPE sampler seed.
+    storage : str | None
+        Optional study storage path (.db/.sqlite → SQLite, else journal file).
+        The study is loaded if it already exists, so runs can resume or be
+        shared between processes.
+    pool : FramePool | None
+        Externally owned pool (used by BulkOptimizer).  Must already hold
+        this optimiser's frames under ``_frame_key`` keys.
     """
 
     def __init__(
@@ -312,6 +440,11 @@ class ThresholdOptimizer:
         allow_short: bool = True,
         custom_search_space: Optional[Dict[str, dict]] = None,
         mode: str = "positional",
+        workers: int = 1,
+        trial_batch: int = 1,
+        seed: int = 42,
+        storage: Optional[str] = None,
+        pool: Optional[FramePool] = None,
     ):
         if analyser_class_name not in ANALYSER_CLASSES:
             raise ValueError(
@@ -337,6 +470,11 @@ class ThresholdOptimizer:
         self.position_size = position_size
         self.allow_short = allow_short
         self.mode = mode
+        self.workers = max(1, int(workers))
+        self.trial_batch = max(1, int(trial_batch))
+        self.seed = seed
+        self.storage = storage
+        self._pool = pool
 
         # Resolve search space
         if custom_search_space is not None:
@@ -426,11 +564,7 @@ class ThresholdOptimizer:
                     analyzer_methods=method,
                     start_date=start,
                     end_date=end,
-                    initial_capital=self.initial_capital,
-                    position_size=self.position_size,
-                    stop_loss_pct=self.stop_loss_pct,
-                    target_pct=self.target_pct,
-                    allow_short=self.allow_short,
+                    **self._backtester_kwargs(),
                 )
                 result = self._run_single_backtest(bt, sym, full_data)
                 results[sym] = result
@@ -440,15 +574,78 @@ class ThresholdOptimizer:
         return results
 
     # ------------------------------------------------------------------
+    def _backtester_kwargs(self) -> Dict[str, Any]:
+        return {
+            "initial_capital": self.initial_capital,
+            "position_size": self.position_size,
+            "stop_loss_pct": self.stop_loss_pct,
+            "target_pct": self.target_pct,
+            "allow_short": self.allow_short,
+        }
+
+    # ------------------------------------------------------------------
+    def _run_backtests(
+        self,
+        params_list: List[Dict[str, Any]],
+        data_dict: Dict[str, pd.DataFrame],
+        start: str,
+        end: str,
+    ) -> List[Dict[str, BacktestResult]]:
+        """
+        ``_run_backtest_with_data`` for several parameter sets at once.  With a
+        pool there is one task per (params, symbol); results keep input order.
+        """
+        if self._pool is None:
+            batch_results = []
+            for params in params_list:
+                _, method = self._create_analyser_and_method(params)
+                batch_results.append(self._run_backtest_with_data(method, data_dict, start, end))
+            return batch_results
+
+        kwargs = self._backtester_kwargs()
+        tasks = [
+            _BacktestTask(
+                self.analyser_class_name, self.method_name, params, self.mode,
+                sym, _frame_key(sym, start, end), start, end, kwargs,
+            )
+            for params in params_list
+            for sym in data_dict
+        ]
+        outcomes = iter(self._pool.map(_pool_backtest, tasks))
+
+        batch_results = []
+        for _ in params_list:
+            results: Dict[str, BacktestResult] = {}
+            for sym in data_dict:
+                result = next(outcomes)
+                if result is not None:
+                    results[sym] = result
+            batch_results.append(results)
+        return batch_results
+
+    # ------------------------------------------------------------------
+    def _shared_frames(self) -> Dict[str, pd.DataFrame]:
+        """Frames this optimiser needs in a FramePool, keyed by ``_frame_key``."""
+        frames = {_frame_key(sym, self.train_start, self.train_end): df for sym, df in self._train_data.items()}
+        if self.test_start and self.test_end:
+            frames.update(
+                {_frame_key(sym, self.test_start, self.test_end): df for sym, df in self._test_data.items()}
+            )
+        return frames
+
+    # ------------------------------------------------------------------
+    @staticmethod
     def _run_single_backtest(
-        self, bt: Backtester, symbol: str, price_data: pd.DataFrame
+        bt: Backtester, symbol: str, price_data: pd.DataFrame
     ) -> BacktestResult:
         """Run backtest for a single stock using already-loaded data."""
         from common.Stock import Stock
 
         result = BacktestResult(symbol, bt.start_date, bt.end_date, bt.initial_capital)
+        # price_data may be a read-only FramePool frame; it is never written.
+        # run_analysis_on_date hands analysers a prefix view (or, with
+        # incremental=False, a copy of it), so no full copy is needed here.
         stock = bt.create_stock_object(symbol, price_data)
-        full_price_data = price_data.copy()
 
         open_positions = []
         available_capital = bt.initial_capital
@@ -479,7 +676,7 @@ class ThresholdOptimizer:
             if current_idx < 50:
                 continue
 
-            analysis = bt.run_analysis_on_date(stock, current_idx, full_price_data)
+            analysis = bt.run_analysis_on_date(stock, current_idx, price_data)
 
             has_bullish = len(analysis["BULLISH"]) > 0
             has_bearish = len(analysis["BEARISH"]) > 0 and bt.allow_short
@@ -634,9 +831,8 @@ class ThresholdOptimizer:
         }
 
     # ------------------------------------------------------------------
-    def _objective(self, trial: Trial) -> float:
-        """Single Optuna trial: suggest params → backtest → return metric."""
-        # Suggest parameters
+    def _suggest_params(self, trial: Trial) -> Optional[Dict[str, Any]]:
+        """Suggest this trial's parameters; None for an invalid combination."""
         params = {}
         for param_name, spec in self.search_space.items():
             params[param_name] = _suggest(trial, param_name, spec)
@@ -644,7 +840,15 @@ class ThresholdOptimizer:
         # Validate EMA fast < slow
         if "FAST_EMA_PERIOD" in params and "SLOW_EMA_PERIOD" in params:
             if params["FAST_EMA_PERIOD"] >= params["SLOW_EMA_PERIOD"]:
-                return -999.0  # invalid combo
+                return None
+        return params
+
+    # ------------------------------------------------------------------
+    def _objective(self, trial: Trial) -> float:
+        """Single Optuna trial: suggest params → backtest → return metric."""
+        params = self._suggest_params(trial)
+        if params is None:
+            return -999.0  # invalid combo
 
         # Create analyser and get the method, passing params to apply AFTER reset_constants()
         # This fixes the bug where reset_constants() was overwriting optimized params
@@ -697,30 +901,72 @@ class ThresholdOptimizer:
         self.study = optuna.create_study(
             direction="maximize",
             study_name=f"{self.analyser_class_name}_{self.method_name}",
-            sampler=optuna.samplers.TPESampler(seed=42),
+            sampler=optuna.samplers.TPESampler(seed=self.seed),
+            storage=_make_storage(self.storage),
+            load_if_exists=True,
         )
 
-        self.study.optimize(self._objective, n_trials=self.n_trials, show_progress_bar=True)
+        owns_pool = self._pool is None and self.workers > 1
+        if owns_pool:
+            self._pool = FramePool(self._shared_frames(), self.workers)
+        try:
+            return self._optimize_and_evaluate()
+        finally:
+            if owns_pool and self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+    # ------------------------------------------------------------------
+    def _optimize_batched(self):
+        """
+        Ask ``trial_batch`` trials, evaluate them together (on the pool when
+        there is one), tell results in trial order.  The sampler only ever sees completed trials in a fixed
+        order, so the search is reproducible for a given seed.
+        """
+        assert self.study is not None
+        remaining = self.n_trials
+        while remaining > 0:
+            trials = [self.study.ask() for _ in range(min(self.trial_batch, remaining))]
+            suggested = [self._suggest_params(t) for t in trials]
+            valid = [p for p in suggested if p is not None]
+            outcomes = iter(self._run_backtests(
+                valid, self._train_data, self.train_start, self.train_end
+            ))
+            for trial, params in zip(trials, suggested):
+                if params is None:
+                    value = -999.0  # invalid combo
+                else:
+                    results = next(outcomes)
+                    value = self._aggregate_metric(results) if results else -999.0
+                self.study.tell(trial, value)
+            remaining -= len(trials)
+            logger.info(f"Trials done: {self.n_trials - remaining}/{self.n_trials}")
+
+    # ------------------------------------------------------------------
+    def _run_best(self, data_dict: Dict[str, pd.DataFrame], start: str, end: str) -> Dict[str, BacktestResult]:
+        """Backtest ``best_params`` on one data set."""
+        return self._run_backtests([self.best_params], data_dict, start, end)[0]
+
+    # ------------------------------------------------------------------
+    def _optimize_and_evaluate(self) -> Dict[str, Any]:
+        assert self.study is not None
+        if self._pool is not None or self.trial_batch > 1:
+            self._optimize_batched()
+        else:
+            self.study.optimize(self._objective, n_trials=self.n_trials, show_progress_bar=True)
 
         # Extract best
         self.best_params = self.study.best_params
         self.best_train_metric = self.study.best_value
 
         # Re-run train with best params to get detailed metrics
-        # Note: _create_analyser_and_method() now applies best_params AFTER reset_constants()
-        _, method = self._create_analyser_and_method()
-        train_results = self._run_backtest_with_data(
-            method, self._train_data, self.train_start, self.train_end
-        )
+        train_results = self._run_best(self._train_data, self.train_start, self.train_end)
         self.train_trade_count = self._count_trades(train_results)
         self.train_summary = self._aggregate_all_metrics(train_results)
 
         # Validate on test set if available
         if self._test_data and self.test_start and self.test_end:
-            _, method = self._create_analyser_and_method()
-            test_results = self._run_backtest_with_data(
-                method, self._test_data, self.test_start, self.test_end
-            )
+            test_results = self._run_best(self._test_data, self.test_start, self.test_end)
             self.best_test_metric = self._aggregate_metric(test_results)
             self.test_trade_count = self._count_trades(test_results)
             self.test_summary = self._aggregate_all_metrics(test_results)
@@ -982,6 +1228,10 @@ class BulkOptimizer:
         all_results = bulk.optimize_all()
         bulk.print_summary()
         bulk.export_all('optimization_results.json')
+
+    With ``workers > 1`` one FramePool is started for the whole run and
+    shared by every method's optimiser, so price frames are published to
+    shared memory once.  ``storage_dir`` keeps one journal file per method.
     """
 
     def __init__(
@@ -999,6 +1249,10 @@ class BulkOptimizer:
         mode: str = "positional",
         analyser_names: Optional[List[str]] = None,
         output_file: Optional[str] = None,
+        workers: int = 1,
+        trial_batch: int = 1,
+        seed: int = 42,
+        storage_dir: Optional[str] = None,
     ):
         self.stock_symbols = stock_symbols
         self.train_start = train_start
@@ -1012,6 +1266,12 @@ class BulkOptimizer:
         self.allow_short = allow_short
         self.mode = mode
         self.output_file = output_file
+        self.workers = max(1, int(workers))
+        self.trial_batch = max(1, int(trial_batch))
+        self.seed = seed
+        self.storage_dir = storage_dir
+        if storage_dir:
+            os.makedirs(storage_dir, exist_ok=True)
 
         # Which analysers to optimise
         if analyser_names:
@@ -1084,55 +1344,85 @@ class BulkOptimizer:
         already-completed methods are skipped automatically, so you never
         lose progress.
         """
-        for analyser_name in self.analyser_names:
-            class_spaces = SEARCH_SPACES.get(analyser_name, {})
-            for method_name, space in class_spaces.items():
-                if not space:
-                    continue  # skip empty search spaces
+        pool = self._open_pool() if self.workers > 1 else None
+        try:
+            for analyser_name in self.analyser_names:
+                class_spaces = SEARCH_SPACES.get(analyser_name, {})
+                for method_name, space in class_spaces.items():
+                    if not space:
+                        continue  # skip empty search spaces
 
-                key = f"{analyser_name}.{method_name}"
+                    key = f"{analyser_name}.{method_name}"
+
+                    # --- Resume support: skip already-completed methods ---
+                    if key in self.results and "error" not in self.results[key]:
+                        print(f"\n{'━' * 60}")
+                        print(f"Skipping (already completed): {key}")
+                        print(f"{'━' * 60}")
+                        continue
 
-                # --- Resume support: skip already-completed methods ---
-                if key in self.results and "error" not in self.results[key]:
                     print(f"\n{'━' * 60}")
-                    print(f"Skipping (already completed): {key}")
+                    print(f"Optimizing: {key}")
                     print(f"{'━' * 60}")
-                    continue
 
-                print(f"\n{'━' * 60}")
-                print(f"Optimizing: {key}")
-                print(f"{'━' * 60}")
-
-                try:
-                    opt = ThresholdOptimizer(
-                        analyser_class_name=analyser_name,
-                        method_name=method_name,
-                        stock_symbols=self.stock_symbols,
-                        train_start=self.train_start,
-                        train_end=self.train_end,
-                        test_start=self.test_start,
-                        test_end=self.test_end,
-                        metric=self.metric,
-                        n_trials=self.n_trials,
-                        stop_loss_pct=self.stop_loss_pct,
-                        target_pct=self.target_pct,
-                        allow_short=self.allow_short,
-                        mode=self.mode,
-                    )
-                    result = opt.optimize()
-                    opt.print_results()
-
-                    self.optimizers[key] = opt
-                    self.results[key] = result
-                except Exception as e:
-                    logger.error(f"Optimisation failed for {key}: {e}", exc_info=True)
-                    self.results[key] = {"error": str(e)}
-
-                # Persist after every method (success or failure)
-                self._append_result(key, self.results[key])
+                    try:
+                        opt = ThresholdOptimizer(
+                            analyser_class_name=analyser_name,
+                            method_name=method_name,
+                            stock_symbols=self.stock_symbols,
+                            train_start=self.train_start,
+                            train_end=self.train_end,
+                            test_start=self.test_start,
+                            test_end=self.test_end,
+                            metric=self.metric,
+                            n_trials=self.n_trials,
+                            stop_loss_pct=self.stop_loss_pct,
+                            target_pct=self.target_pct,
+                            allow_short=self.allow_short,
+                            mode=self.mode,
+                            workers=self.workers,
+                            trial_batch=self.trial_batch,
+                            seed=self.seed,
+                            storage=(
+                                os.path.join(self.storage_dir, f"{key}.journal")
+                                if self.storage_dir else None
+                            ),
+                            pool=pool,
+                        )
+                        result = opt.optimize()
+                        opt.print_results()
+
+                        self.optimizers[key] = opt
+                        self.results[key] = result
+                    except Exception as e:
+                        logger.error(f"Optimisation failed for {key}: {e}", exc_info=True)
+                        self.results[key] = {"error": str(e)}
+
+                    # Persist after every method (success or failure)
+                    self._append_result(key, self.results[key])
+        finally:
+            if pool is not None:
+                pool.close()
 
         return self.results
 
+    # ------------------------------------------------------------------
+    def _open_pool(self) -> FramePool:
+        """Publish every symbol's train/test frame once for all methods."""
+        frames: Dict[str, pd.DataFrame] = {}
+        for sym in self.stock_symbols:
+            try:
+                frames[_frame_key(sym, self.train_start, self.train_end)] = _data_cache.get(
+                    sym, self.train_start, self.train_end
+                )
+                if self.test_start and self.test_end:
+                    frames[_frame_key(sym, self.test_start, self.test_end)] = _data_cache.get(
+                        sym, self.test_start, self.test_end
+                    )
+            except Exception as e:
+                logger.error(f"Failed to load data for {sym}: {e}", exc_info=True)
+        return FramePool(frames, self.workers)
+
     def print_summary(self):
         """Print a summary table of all optimisation results."""
         print("\n" + "=" * 130)
@@ -1216,3 +1506,78 @@ class BulkOptimizer:
             lines.append(opt.generate_constants_code())
             lines.append("")
         return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Optuna threshold optimiser for analyser methods")
+    parser.add_argument("--analyser", help="Analyser class, e.g. TechnicalAnalyser (omit with --bulk)")
+    parser.add_argument("--method", help="Analyser method, e.g. analyse_rsi (omit with --bulk)")
+    parser.add_argument("--bulk", action="store_true", help="Optimise every method of --analysers")
+    parser.add_argument("--analysers", nargs="+", help="Analysers for --bulk (default: all)")
+    parser.add_argument("--symbols", nargs="+", required=True)
+    parser.add_argument("--train", nargs=2, metavar=("START", "END"), required=True)
+    parser.add_argument("--test", nargs=2, metavar=("START", "END"))
+    parser.add_argument("--metric", default="sharpe_ratio", choices=METRIC_CHOICES)
+    parser.add_argument("--trials", type=int, default=150)
+    parser.add_argument("--mode", default="positional", choices=["positional", "intraday"])
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (default 1 = in-process, sequential)")
+    parser.add_argument("--trial-batch", type=int, default=1,
+                        help="Trials evaluated concurrently per sampler step")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--storage", help="Study storage file (.db → SQLite, else journal); "
+                                          "a directory with --bulk")
+    parser.add_argument("--output", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    test_start, test_end = args.test if args.test else (None, None)
+    if args.bulk:
+        bulk = BulkOptimizer(
+            stock_symbols=args.symbols,
+            train_start=args.train[0],
+            train_end=args.train[1],
+            test_start=test_start,
+            test_end=test_end,
+            metric=args.metric,
+            n_trials=args.trials,
+            mode=args.mode,
+            analyser_names=args.analysers,
+            output_file=args.output,
+            workers=args.workers,
+            trial_batch=args.trial_batch,
+            seed=args.seed,
+            storage_dir=args.storage,
+        )
+        bulk.optimize_all()
+        bulk.print_summary()
+        return
+
+    if not args.analyser or not args.method:
+        parser.error("--analyser and --method are required without --bulk")
+    opt = ThresholdOptimizer(
+        analyser_class_name=args.analyser,
+        method_name=args.method,
+        stock_symbols=args.symbols,
+        train_start=args.train[0],
+        train_end=args.train[1],
+        test_start=test_start,
+        test_end=test_end,
+        metric=args.metric,
+        n_trials=args.trials,
+        mode=args.mode,
+        workers=args.workers,
+        trial_batch=args.trial_batch,
+        seed=args.seed,
+        storage=args.storage,
+    )
+    opt.optimize()
+    opt.print_results()
+    if args.output:
+        opt.export_results(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Process pool with shared-memory price frames for the backtest optimiser.
+
+The optimiser runs thousands of per-symbol backtests over the same handful of
+OHLCV frames.  Pickling those frames into every task would dominate the IPC
+cost, so ``SharedFrames`` copies each column (and the index) once into a POSIX
+shared-memory block and ``FramePool`` workers rebuild read-only DataFrames
+over those buffers when they start.  Tasks then only carry a frame key and a
+few scalars.
+
+Usage:
+    with FramePool({"RELIANCE|2020-01-01|2024-12-31": df}, workers=8) as pool:
+        results = pool.map(task_fn, tasks)   # task_fn calls shared_frame(key)
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from lib.logging_util import get_logger
+logger = get_logger("backtest")
+
+
+class _BlockSpec(NamedTuple):
+    columns: Tuple[Any, ...]
+    dtype: str
+    offset: int
+
+
+class _FrameSpec(NamedTuple):
+    shm_name: str
+    nrows: int
+    blocks: Tuple[_BlockSpec, ...]
+    index_offset: int
+    index_unit: str
+    index_tz: Optional[str]
+    index_name: Any
+
+
+# ---------------------------------------------------------------------------
+# Publishing (parent process)
+# ---------------------------------------------------------------------------
+class SharedFrames:
+    """Copy DataFrames with a DatetimeIndex into shared memory, one block each."""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self._blocks: List[SharedMemory] = []
+        self.specs: Dict[str, _FrameSpec] = {}
+        try:
+            for key, df in frames.items():
+                self.specs[key] = self._publish(df)
+        except Exception:
+            self.close()
+            raise
+
+    def _publish(self, df: pd.DataFrame) -> _FrameSpec:
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("SharedFrames only supports frames with a DatetimeIndex")
+
+        # Runs of adjacent same-dtype columns become one 2-D block each, so a
+        # worker can rebuild the frame as views without consolidating (copying)
+        # and without reordering columns.
+        runs: List[Tuple[List[Any], np.dtype]] = []
+        for col, dtype in df.dtypes.items():
+            if dtype.kind not in "biuf":
+                raise ValueError(f"Column {col!r} has unsupported dtype {dtype}")
+            if runs and runs[-1][1] == dtype:
+                runs[-1][0].append(col)
+            else:
+                runs.append(([col], dtype))
+        index_arr = np.ascontiguousarray(df.index.asi8)
+        nrows = len(df)
+
+        total = sum(len(cols) * nrows * dtype.itemsize for cols, dtype in runs) + index_arr.nbytes
+        shm = SharedMemory(create=True, size=max(total, 1))
+        self._blocks.append(shm)
+
+        offset = 0
+        blocks = []
+        for cols, dtype in runs:
+            dest = np.ndarray((len(cols), nrows), dtype, buffer=shm.buf, offset=offset)
+            for i, col in enumerate(cols):
+                dest[i] = df[col].to_numpy()
+            blocks.append(_BlockSpec(tuple(cols), dtype.str, offset))
+            offset += dest.nbytes
+        np.ndarray(index_arr.shape, index_arr.dtype, buffer=shm.buf, offset=offset)[:] = index_arr
+
+        return _FrameSpec(
+            shm_name=shm.name,
+            nrows=nrows,
+            blocks=tuple(blocks),
+            index_offset=offset,
+            index_unit=df.index.unit,
+            index_tz=str(df.index.tz) if df.index.tz is not None else None,
+            index_name=df.index.name,
+        )
+
+    def close(self):
+        """Release and unlink every block.  Safe to call more than once."""
+        for shm in self._blocks:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = []
+
+
+# ---------------------------------------------------------------------------
+# Attaching (worker processes)
+# ---------------------------------------------------------------------------
+_worker_blocks: List[SharedMemory] = []
+_worker_frames: Dict[str, pd.DataFrame] = {}
+
+
+def attach_frames(specs: Dict[str, _FrameSpec]) -> Dict[str, pd.DataFrame]:
+    """Rebuild read-only DataFrames as views over the shared buffers in *specs*."""
+    frames = {}
+    for key, spec in specs.items():
+        shm = SharedMemory(name=spec.shm_name)
+        _worker_blocks.append(shm)
+
+        ints = np.ndarray((spec.nrows,), np.int64, buffer=shm.buf, offset=spec.index_offset)
+        index = pd.DatetimeIndex(ints.view(f"M8[{spec.index_unit}]"), name=spec.index_name)
+        if spec.index_tz is not None:
+            index = index.tz_localize("UTC").tz_convert(spec.index_tz)
+
+        parts = []
+        for block in spec.blocks:
+            arr = np.ndarray((len(block.columns), spec.nrows), np.dtype(block.dtype),
+                             buffer=shm.buf, offset=block.offset)
+            arr.flags.writeable = False
+            parts.append(pd.DataFrame(arr.T, index=index, columns=pd.Index(block.columns), copy=False))
+        if len(parts) == 1:
+            frames[key] = parts[0]
+        elif parts:
+            frames[key] = pd.concat(parts, axis=1, copy=False)
+        else:
+            frames[key] = pd.DataFrame(index=index)
+    return frames
+
+
+def _init_worker(specs: Dict[str, _FrameSpec]):
+    _worker_frames.update(attach_frames(specs))
+
+
+def shared_frame(key: str) -> pd.DataFrame:
+    """Return the frame published under *key* (call from a pool task)."""
+    return _worker_frames[key]
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+class FramePool:
+    """
+    ProcessPoolExecutor whose workers share a fixed set of price frames.
+
+    Workers are started with the ``spawn`` method so they never inherit the
+    parent's threads or mutated analyser class state.  ``map`` returns results
+    in task order, which keeps callers deterministic regardless of which
+    worker finished first.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], workers: int):
+        self.workers = max(1, int(workers))
+        self._shared = SharedFrames(frames)
+        try:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._shared.specs,),
+            )
+        except Exception:
+            self._shared.close()
+            raise
+        logger.info(f"FramePool started: {self.workers} workers, {len(frames)} shared frames")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._shared.specs
+
+    def map(self, fn: Callable, tasks: Iterable) -> list:
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        return list(self._executor.map(fn, tasks, chunksize=chunksize))
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._shared.close()
+
+    def __enter__(self) -> "FramePool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,5 @@
+"""
+Micro/macro benchmarks for hot paths (serialization, Redis access, tick parsing).
+
+Each module is a standalone script: ``python -m tools.benchmarks.<name>``.
+"""
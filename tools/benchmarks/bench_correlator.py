@@ -0,0 +1,217 @@
+"""
+Benchmark: SignalCorrelator indexed buffer vs the list-rebuilding buffer.
+
+Replays a day of intelligence:signals entries through the previous
+correlator (one global lock; every signal rebuilds the symbol's list twice
+and regroups it by direction) and the current per-symbol indexed buffer, and
+reports per-signal cost, peak buffered signals per symbol and whether both
+fired the same confluences. "Now" is the entry's stream-ID time, so windows
+and cooldowns behave as they did live.
+
+Signal sources:
+  --redis-url URL   XRANGE intelligence:signals[:p] (optionally --start/--end IDs)
+  --file PATH       JSONL, one stream entry's fields per line (plus optional "id")
+  (default)         synthetic day: 9:15-15:30, 200 symbols, all three layers
+
+Usage:
+    python -m tools.benchmarks.bench_correlator
+    python -m tools.benchmarks.bench_correlator --redis-url redis://localhost:6379 --start 1748835000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+
+from common.constants import SIGNAL_PARTITIONS
+from lib.intelligence.correlator import SignalCorrelator
+from lib.intelligence.partition import partition_stream
+from lib.intelligence.signal import Direction, Layer, Signal, SignalStrength
+from services.signal_intelligence.worker import reconstruct_signal
+
+SOURCES = {
+    Layer.LIVE: ("vwap_cross", "pcr_crossover", "oi_wall_shift", "iv_spike", "volume_burst"),
+    Layer.INTRADAY: ("rsi_divergence", "macd_cross", "supertrend", "bollinger_break", "ema_cross"),
+    Layer.POSITIONAL: ("morning_bias", "weekly_trend", "delivery_spike"),
+}
+
+
+class LegacyCorrelator:
+    """SignalCorrelator.on_signal before the indexed buffer (callback and logging left out)."""
+
+    def __init__(self, clock):
+        self._buffer: dict[str, list[Signal]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._last_confluence: dict[tuple[str, str], float] = {}
+        self._clock = clock
+        self.fired: list[tuple] = []
+
+    def on_signal(self, signal: Signal):
+        with self._lock:
+            symbol = signal.symbol
+            now = self._clock()
+            self._buffer[symbol] = [s for s in self._buffer[symbol]
+                                    if (now - s.timestamp) < SignalCorrelator.WINDOW[s.layer]]
+            self._buffer[symbol] = [s for s in self._buffer[symbol] if s.key != signal.key]
+            self._buffer[symbol].append(signal)
+            signals = self._buffer[symbol]
+            if len(signals) < 2:
+                return
+            by_direction: dict[Direction, list[Signal]] = defaultdict(list)
+            for s in signals:
+                if s.direction != Direction.NEUTRAL:
+                    by_direction[s.direction].append(s)
+            for direction, aligned in by_direction.items():
+                layers = {s.layer for s in aligned}
+                if len(layers) < 2:
+                    continue
+                key = (symbol, direction.value)
+                if (self._clock() - self._last_confluence.get(key, 0.0)) < SignalCorrelator.CONFLUENCE_COOLDOWN:
+                    continue
+                opposite = Direction.BEARISH if direction == Direction.BULLISH else Direction.BULLISH
+                contra = bool(by_direction.get(opposite))
+                score = (sum(s.strength.value for s in aligned) + (len(layers) - 1) * 5
+                         + (3 if Layer.LIVE in layers else 0) - (3 if contra else 0))
+                self._last_confluence[key] = self._clock()
+                self.fired.append((symbol, direction, score))
+
+
+# ── Signal sources ────────────────────────────────────────────────────────────
+
+def from_redis(url: str, start: str, end: str) -> list[tuple[float, Signal]]:
+    """Every partition stream (SIGNAL_PARTITIONS), merged in stream-ID time order."""
+    from services.common.redis_proxy import RedisProxy
+    redis = RedisProxy(url)
+    out = []
+    for partition in range(SIGNAL_PARTITIONS):
+        stream, last = partition_stream(partition, SIGNAL_PARTITIONS), start
+        while True:
+            batch = redis.xrange(stream, min=last, max=end, count=10_000)
+            if not batch:
+                break
+            for entry_id, fields in batch:
+                out.append((_id_time(entry_id), reconstruct_signal(fields)))
+            last = "(" + _decode(batch[-1][0])
+            if len(batch) < 10_000:
+                break
+    out.sort(key=lambda item: item[0])
+    return out
+
+
+def from_file(path: str) -> list[tuple[float, Signal]]:
+    out = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                fields = json.loads(line)
+                signal = reconstruct_signal(fields)
+                now = _id_time(fields["id"]) if "id" in fields else signal.timestamp
+                out.append((now, signal))
+    return out
+
+
+def synthetic_day(symbols: int, signals: int, seed: int = 11) -> list[tuple[float, Signal]]:
+    """A trading day with LIVE bursts at the open, 5-min INTRADAY cycles and morning POSITIONAL bias."""
+    rng = random.Random(seed)
+    names = [f"SYM{i:03d}" for i in range(symbols)]
+    weighted = names[: max(1, symbols // 5)] * 4 + names      # a fifth of the symbols are busy
+    open_ts = 1_750_000_000.0 + 9 * 3600 + 15 * 60
+    out = []
+    for name in names:                                  # morning bias, before the open
+        out.append((open_ts - 600, _signal(rng, name, Layer.POSITIONAL, open_ts - 600)))
+    for _ in range(signals - len(out)):
+        t = open_ts + min(rng.expovariate(1 / 3600), 6.25 * 3600)   # front-loaded
+        layer = rng.choices((Layer.LIVE, Layer.INTRADAY, Layer.POSITIONAL), (0.7, 0.27, 0.03))[0]
+        if layer == Layer.INTRADAY:
+            t -= t % 300
+        out.append((t, _signal(rng, rng.choice(weighted), layer, t)))
+    out.sort(key=lambda item: item[0])
+    return out
+
+
+def _signal(rng: random.Random, symbol: str, layer: Layer, ts: float) -> Signal:
+    return Signal(
+        symbol=symbol,
+        direction=rng.choices(list(Direction), (0.45, 0.45, 0.1))[0],
+        source=rng.choice(SOURCES[layer]),
+        layer=layer,
+        strength=rng.choice(list(SignalStrength)),
+        timestamp=ts - rng.uniform(0, 2),
+    )
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _id_time(entry_id) -> float:
+    return int(_decode(entry_id).split("-")[0]) / 1000
+
+
+# ── Run ───────────────────────────────────────────────────────────────────────
+
+def replay(day: list[tuple[float, Signal]], make) -> tuple[float, object]:
+    clock = [0.0]
+    correlator = make(lambda: clock[0])
+    start = time.perf_counter()
+    for now, signal in day:
+        clock[0] = now
+        correlator.on_signal(signal)
+    return time.perf_counter() - start, correlator
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url")
+    parser.add_argument("--start", default="-")
+    parser.add_argument("--end", default="+")
+    parser.add_argument("--file")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--signals", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)   # one INFO line per confluence would dominate the timing
+
+    if args.redis_url:
+        day = from_redis(args.redis_url, args.start, args.end)
+    elif args.file:
+        day = from_file(args.file)
+    else:
+        day = synthetic_day(args.symbols, args.signals)
+    if not day:
+        print("No signals to replay")
+        return
+
+    fired: list[tuple] = []
+
+    def make_current(clock):
+        fired.clear()
+        return SignalCorrelator(on_confluence=lambda c: fired.append((c.symbol, c.direction, c.score)),
+                                clock=clock)
+
+    t_legacy = t_current = float("inf")
+    for _ in range(args.repeat):
+        elapsed, legacy = replay(day, LegacyCorrelator)
+        t_legacy = min(t_legacy, elapsed)
+        elapsed, current = replay(day, make_current)
+        t_current = min(t_current, elapsed)
+
+    peak = max(len(signals) for signals in legacy._buffer.values())
+    symbols = len({signal.symbol for _, signal in day})
+    print(f"\n{len(day):,} signals, {symbols} symbols, "
+          f"{(day[-1][0] - day[0][0]) / 3600:.1f} h, {len(fired):,} confluences")
+    print(f"  largest symbol buffer at end   {peak}")
+    print(f"  {'':24} {'legacy':>10} {'indexed':>10} {'ratio':>8}")
+    print(f"  {'us / signal':24} {t_legacy / len(day) * 1e6:10.2f} {t_current / len(day) * 1e6:10.2f} "
+          f"{t_legacy / t_current:7.2f}x")
+    print(f"  {'signals / s':24} {len(day) / t_legacy:10,.0f} {len(day) / t_current:10,.0f}")
+    print(f"  same confluences: {legacy.fired == fired}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: binary frame codec vs split-orient JSON for Redis price frames.
+
+Compares encode time, decode time and stored bytes (the exact string that
+lands in the ``data:price:*`` hash) for the two frame shapes the analysis
+engine reads every cycle:
+
+  - 2y daily OHLCV   (~500 rows, positional mode)
+  - 5d x 5m OHLCV    (~375 rows, intraday mode)
+
+Usage:
+    python -m tools.benchmarks.bench_frame_codec
+    python -m tools.benchmarks.bench_frame_codec --repeat 500
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.common.serialization import dataframe_from_json, dataframe_to_json
+
+
+def make_daily_frame(years: int = 2) -> pd.DataFrame:
+    idx = pd.bdate_range(end="2025-06-30", periods=252 * years, tz="Asia/Kolkata")
+    return _ohlcv(idx)
+
+
+def make_intraday_frame(days: int = 5) -> pd.DataFrame:
+    sessions = pd.bdate_range(end="2025-06-30", periods=days)
+    idx = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(f"{d.date()} 09:15", periods=75, freq="5min").values for d in sessions
+    ])).tz_localize("Asia/Kolkata")
+    return _ohlcv(idx)
+
+
+def _ohlcv(idx: pd.DatetimeIndex) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    close = 2500 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx))))
+    spread = close * rng.uniform(0.001, 0.02, len(idx))
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 1, len(idx)),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, len(idx)),
+    }, index=idx)
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench(name: str, df: pd.DataFrame, repeat: int) -> None:
+    legacy = df.to_json(orient="split", date_format="iso")
+    codec = dataframe_to_json(df)
+
+    json_enc = _time(lambda: df.to_json(orient="split", date_format="iso"), repeat)
+    json_dec = _time(lambda: pd.read_json(io.StringIO(legacy), orient="split"), repeat)
+    codec_enc = _time(lambda: dataframe_to_json(df), repeat)
+    codec_dec = _time(lambda: dataframe_from_json(codec), repeat)
+
+    print(f"\n{name}  ({len(df)} rows x {len(df.columns)} cols)")
+    print(f"  {'':8} {'encode µs':>12} {'decode µs':>12} {'redis bytes':>12}")
+    print(f"  {'json':8} {json_enc:12.1f} {json_dec:12.1f} {len(legacy):12,d}")
+    print(f"  {'codec':8} {codec_enc:12.1f} {codec_dec:12.1f} {len(codec):12,d}")
+    print(f"  {'speedup':8} {json_enc / codec_enc:11.1f}x {json_dec / codec_dec:11.1f}x "
+          f"{len(legacy) / len(codec):11.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    bench("2y daily", make_daily_frame(), args.repeat)
+    bench("5d x 5m", make_intraday_frame(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Benchmark: per-job Redis loading vs batched prefetch in the analysis engine.
+
+Runs `process_job` (one job at a time, as the worker loop used to) and
+`process_batch` (prefetch + one write pipeline per batch of 10) against an
+in-process Redis stand-in that charges a fixed round-trip time per command or
+pipeline. Analysers are replaced by a stub that burns a fixed amount of CPU,
+so the difference between the two rows is purely Redis round-trips.
+
+Usage:
+    python -m tools.benchmarks.bench_job_loader
+    python -m tools.benchmarks.bench_job_loader --rtt-ms 0.5 --analyse-ms 20 --jobs 200
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import common.constants as constant
+import services.common.metrics as metrics
+from services.analysis_engine.worker import process_batch, process_job
+from services.common.serialization import dataframe_to_json
+from tools.benchmarks.bench_frame_codec import make_intraday_frame
+
+
+class LatencyRedis:
+    """In-memory hash/stream store that sleeps `rtt` seconds per round-trip.
+
+    Implements the subset of the RedisProxy and redis-py client API used by the
+    analysis worker and the metrics helpers.
+    """
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.round_trips = 0
+        self.hashes: dict[str, dict] = {}
+        self.streams: dict[str, list] = {}
+
+    def _rt(self):
+        self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    # Commands (each one round-trip)
+    def hgetall(self, name):
+        self._rt()
+        return self._hgetall(name)
+
+    def hget(self, name, key):
+        self._rt()
+        return self._hget(name, key)
+
+    def hset(self, name, key=None, value=None, mapping=None):
+        self._rt()
+        return self._hset(name, key, value, mapping)
+
+    def hincrby(self, name, key, amount=1):
+        self._rt()
+        return self._hincrby(name, key, amount)
+
+    def expire(self, name, seconds):
+        self._rt()
+        return True
+
+    def xadd(self, stream, fields, maxlen=None):
+        self._rt()
+        return self._xadd(stream, fields)
+
+    def xack(self, stream, group, *ids):
+        self._rt()
+        return len(ids)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    # Storage
+    def _hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+    def _hget(self, name, key):
+        return self.hashes.get(name, {}).get(key)
+
+    def _hset(self, name, key=None, value=None, mapping=None):
+        h = self.hashes.setdefault(name, {})
+        if key is not None:
+            h[key] = str(value)
+        h.update({k: str(v) for k, v in (mapping or {}).items()})
+        return 1
+
+    def _hincrby(self, name, key, amount=1):
+        h = self.hashes.setdefault(name, {})
+        h[key] = str(int(h.get(key, 0)) + amount)
+        return int(h[key])
+
+    def _xadd(self, stream, fields, maxlen=None):
+        self.streams.setdefault(stream, []).append(dict(fields))
+        return f"{len(self.streams[stream])}-0"
+
+
+class _Pipeline:
+    def __init__(self, redis: LatencyRedis):
+        self._redis = redis
+        self._ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self._redis._rt()
+        ops, self._ops = self._ops, []
+        out = []
+        for name, args, kwargs in ops:
+            if name in ("expire", "xack"):
+                out.append(True)
+            else:
+                out.append(getattr(self._redis, f"_{name}")(*args, **kwargs))
+        return out
+
+
+class StubOrchestrator:
+    """Stands in for AnalyserOrchestrator: burns `analyse_s` of CPU per job."""
+
+    analysers = []
+
+    def __init__(self, analyse_s: float):
+        self.analyse_s = analyse_s
+
+    def reset_all_constants(self):
+        pass
+
+    def _run(self, stock, index=False):
+        end = time.perf_counter() + self.analyse_s
+        while time.perf_counter() < end:
+            pass
+        return False, None
+
+    run_all_intraday = _run
+    run_all_positional = _run
+
+
+def seed(redis: LatencyRedis, symbols: list[str]) -> None:
+    frame = dataframe_to_json(make_intraday_frame())
+    for sym in symbols:
+        redis._hset(f"data:price:{sym}", mapping={
+            "priceData_json": frame, "ltp": "2500", "ltp_change_perc": "1.2",
+            "prevDayOHLCV_json": '{"OPEN": 2480, "HIGH": 2520, "LOW": 2470, "CLOSE": 2490, "VOLUME": 1000000}',
+        })
+        redis._hset(f"data:sensibull:{sym}", mapping={"last_fetch_time": str(time.time()), "current_json": "{}"})
+        redis._hset(f"data:zerodha:{sym}", mapping={"futures_mdata_json": "{}"})
+
+
+def make_jobs(symbols: list[str], n: int) -> list[tuple[str, dict]]:
+    return [
+        (f"{i}-0", {"job_id": str(i), "cycle_id": "bench", "symbol": symbols[i % len(symbols)],
+                    "is_index": "false", "mode": "intraday"})
+        for i in range(n)
+    ]
+
+
+def run_per_job(redis, orchestrator, entries) -> None:
+    for msg_id, fields in entries:
+        result = process_job(redis, orchestrator, dict(fields))
+        redis.xadd(constant.ANALYSIS_RESULTS_STREAM, result, maxlen=500)
+        redis.xack(constant.ANALYSIS_JOBS_STREAM, constant.ANALYSIS_JOBS_GROUP, msg_id)
+
+
+def run_batched(redis, orchestrator, entries, count: int = 10) -> None:
+    for i in range(0, len(entries), count):
+        process_batch(redis, orchestrator, entries[i:i + count])
+
+
+def bench(label: str, fn, rtt: float, orchestrator, entries, symbols) -> tuple[float, int]:
+    redis = LatencyRedis(rtt)
+    seed(redis, symbols)
+    metrics._REDIS_CLIENT = redis
+    start = time.perf_counter()
+    fn(redis, orchestrator, entries)
+    elapsed = time.perf_counter() - start
+    n = len(entries)
+    print(f"  {label:10} {elapsed * 1000 / n:10.2f} {n / elapsed:10.1f} {redis.round_trips / n:10.1f}")
+    return elapsed, redis.round_trips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="simulated Redis round-trip time")
+    parser.add_argument("--analyse-ms", type=float, default=5.0, help="stub analyser CPU time per job")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)   # Stock warns about stale ticks for every synthetic symbol
+
+    symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+    entries = make_jobs(symbols, args.jobs)
+    orchestrator = StubOrchestrator(args.analyse_ms / 1000)
+    rtt = args.rtt_ms / 1000
+
+    print(f"\n{args.jobs} jobs, rtt={args.rtt_ms}ms, analyse={args.analyse_ms}ms")
+    print(f"  {'':10} {'ms/job':>10} {'jobs/s':>10} {'RTT/job':>10}")
+    per_job, _ = bench("per-job", run_per_job, rtt, orchestrator, entries, symbols)
+    batched, _ = bench("batched", run_batched, rtt, orchestrator, entries, symbols)
+    print(f"  {'speedup':10} {per_job / batched:9.2f}x")
+    metrics._REDIS_CLIENT = None
+
+
+if __name__ == "__main__":
+    main()
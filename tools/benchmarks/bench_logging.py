@@ -0,0 +1,106 @@
+"""
+Benchmark: per-call cost of a log call, synchronous handlers vs the async queue.
+
+Logs N INFO records through an SA-style logger (console plus rotating file
+handler, same format as get_logger) in three modes:
+
+  sync    handlers run on the calling thread (the default)
+  async   lib/logging_util/async_logging: the caller only enqueues
+  limited async, plus limit_rate() on a DEBUG site (suppressed calls)
+
+It reports p50 / p99 / max per-call latency as seen by the caller. With
+--disk-delay-ms, each file write is slowed to simulate a stalled disk. That
+stall lands on the tick thread in sync mode and on the listener thread in
+async mode.
+
+Usage:
+    python -m tools.benchmarks.bench_logging
+    python -m tools.benchmarks.bench_logging --calls 20000 --disk-delay-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from lib.logging_util import async_logging
+from lib.logging_util.factory import _LOG_DATE_FORMAT, _LOG_FORMAT
+
+
+class SlowFileHandler(RotatingFileHandler):
+    def __init__(self, path: str, delay: float):
+        super().__init__(path, maxBytes=10 * 1024 * 1024, backupCount=1)
+        self.delay = delay
+
+    def emit(self, record):
+        if self.delay:
+            time.sleep(self.delay)
+        super().emit(record)
+
+
+def make_logger(name: str, path: str, delay: float) -> logging.Logger:
+    logger = logging.getLogger(f"SA.bench.{name}")
+    logger.handlers.clear()
+    logger.filters.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = SlowFileHandler(path, delay)
+    handler.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_LOG_DATE_FORMAT))
+    logger.addHandler(handler)
+    return logger
+
+
+def run(logger: logging.Logger, calls: int, level: int) -> list[float]:
+    samples = []
+    for i in range(calls):
+        t0 = time.perf_counter()
+        logger.log(level, "tick %s ltp=%.2f oi=%d", "NIFTY", 22000.0 + i, i)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--disk-delay-ms", type=float, default=0.0, help="sleep per file write")
+    args = parser.parse_args()
+    delay = args.disk_delay_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        results["sync"] = run(make_logger("sync", os.path.join(tmp, "sync.log"), delay), args.calls, logging.INFO)
+
+        async_logging.enable_async_logging(capacity=max(args.calls, 10_000))
+        logger = make_logger("async", os.path.join(tmp, "async.log"), delay)
+        async_logging.attach(logger)
+        results["async"] = run(logger, args.calls, logging.INFO)
+
+        limited = make_logger("limited", os.path.join(tmp, "limited.log"), delay)
+        async_logging.attach(limited)
+        async_logging.limit_rate(limited, per_second=5.0, burst=20)
+        results["limited"] = run(limited, args.calls, logging.DEBUG)
+        stats = async_logging.async_logging_stats()
+
+        t0 = time.perf_counter()
+        async_logging.disable_async_logging()
+        drain = time.perf_counter() - t0
+
+    print(f"\n{args.calls:,} calls per mode, disk delay {args.disk_delay_ms:g} ms per write")
+    print(f"  {'mode':10} {'p50 us':>10} {'p99 us':>10} {'max us':>10} {'total ms':>10}")
+    for mode, samples in results.items():
+        print(f"  {mode:10} {pct(samples, 0.5):10.1f} {pct(samples, 0.99):10.1f} "
+              f"{max(samples) * 1e6:10.1f} {sum(samples) * 1000:10.1f}")
+    print(f"  queue: enqueued={stats['enqueued']:,} dropped={stats['dropped']:,}; "
+          f"listener drain at exit {drain * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
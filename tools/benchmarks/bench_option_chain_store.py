@@ -0,0 +1,159 @@
+"""
+Benchmark: nested-dict options_live vs the columnar OptionChainStore.
+
+Replays the same full-mode option ticks into the previous dict layout
+(`{strike: {"CE": {...}, "PE": {...}}}`, one dict per side plus the tick's
+depth dicts) and into OptionChainStore.apply_tick, and reports:
+
+  - per-tick write cost
+  - retained memory for the whole chain (tracemalloc)
+  - time to build an OptionChainFrame (what GEX/OI analysers read)
+
+Default chain: 3 indices x 120 strikes x CE/PE, every tick with depth.
+
+Usage:
+    python -m tools.benchmarks.bench_option_chain_store
+    python -m tools.benchmarks.bench_option_chain_store --strikes 200 --no-depth
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from lib.zerodha.option_chain_store import OptionChainStore
+from services.analysis_engine.analyser.OptionChainFrame import OptionChainFrame
+
+
+def make_ticks(n_ticks: int, strikes: list[float], depth: bool, seed: int = 7) -> list[tuple]:
+    rng = random.Random(seed)
+    ticks = []
+    for _ in range(n_ticks):
+        tick = {
+            "last_price": rng.randrange(5, 40000) / 20,
+            "oi": rng.randrange(10**6),
+            "volume_traded": rng.randrange(10**7),
+            "total_buy_quantity": rng.randrange(10**5),
+            "total_sell_quantity": rng.randrange(10**5),
+            "exchange_timestamp": datetime(2025, 7, 1, 10, rng.randrange(60)),
+            "ohlc": {"open": 10.0, "high": 12.5, "low": 9.0, "close": 11.0},
+        }
+        if depth:
+            tick["depth"] = {
+                book: [{"quantity": rng.randrange(1000), "price": rng.randrange(100, 9000) / 20,
+                        "orders": rng.randrange(30)} for _ in range(5)]
+                for book in ("buy", "sell")
+            }
+        ticks.append((rng.choice(strikes), rng.choice(("CE", "PE")), tick))
+    return ticks
+
+
+def legacy_update(options_live: dict, strike: float, option_type: str, tick: dict) -> None:
+    """TickStore.update_option_tick's dict write before the columnar store."""
+    if strike not in options_live:
+        options_live[strike] = {}
+    entry = options_live[strike].get(option_type, {})
+    entry["prev_oi"] = entry.get("oi", 0)
+    entry["ltp"] = tick.get("last_price", 0)
+    entry["oi"] = tick.get("oi", 0)
+    entry["volume"] = tick.get("volume_traded", 0)
+    entry["buy_qty"] = tick.get("total_buy_quantity", 0)
+    entry["sell_qty"] = tick.get("total_sell_quantity", 0)
+    entry["timestamp"] = tick.get("exchange_timestamp")
+    if "ohlc" in tick:
+        entry["open"] = tick["ohlc"].get("open", 0)
+        entry["high"] = tick["ohlc"].get("high", 0)
+        entry["low"] = tick["ohlc"].get("low", 0)
+        entry["close"] = tick["ohlc"].get("close", 0)
+    if "depth" in tick:
+        entry["depth"] = tick["depth"]
+    options_live[strike][option_type] = entry
+
+
+def retained_bytes(build) -> int:
+    """Bytes still allocated after `build()` returns, with its result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--indices", type=int, default=3)
+    parser.add_argument("--strikes", type=int, default=120)
+    parser.add_argument("--ticks", type=int, default=50_000)
+    parser.add_argument("--no-depth", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    depth = not args.no_depth
+    strikes = [24000.0 + 50 * (i - args.strikes // 2) for i in range(args.strikes)]
+    ticks = make_ticks(args.ticks, strikes, depth)
+    # One tick per strike/side, so both layouts hold the full chain.
+    sides = [(strike, side) for strike in strikes for side in ("CE", "PE")]
+    full = [(strike, side, tick) for (strike, side), (_, _, tick)
+            in zip(sides, make_ticks(len(sides), strikes, depth, seed=1))]
+
+    def fill_dicts():
+        chains = []
+        for _ in range(args.indices):
+            chain = {}
+            for strike, side, tick in full:
+                legacy_update(chain, strike, side, _fresh(tick))
+            chains.append(chain)
+        return chains
+
+    def fill_stores():
+        chains = []
+        for _ in range(args.indices):
+            store = OptionChainStore()
+            for strike, side, tick in full:
+                store.apply_tick(strike, side, tick)
+            chains.append(store)
+        return chains
+
+    dict_bytes = retained_bytes(fill_dicts)
+    store_bytes = retained_bytes(fill_stores)
+
+    chain_dict, store = fill_dicts()[0], fill_stores()[0]
+    t_dict = best_of(args.repeat, lambda: [legacy_update(chain_dict, s, side, t) for s, side, t in ticks])
+    t_store = best_of(args.repeat, lambda: [store.apply_tick(s, side, t) for s, side, t in ticks])
+    f_dict = best_of(args.repeat, lambda: OptionChainFrame.from_options_live(chain_dict))
+    f_store = best_of(args.repeat, lambda: OptionChainFrame.from_options_live(store))
+
+    print(f"\n{args.indices} indices x {args.strikes} strikes x CE/PE, depth={'on' if depth else 'off'}")
+    print(f"  {'':22} {'dicts':>12} {'store':>12} {'ratio':>8}")
+    print(f"  {'retained memory (KB)':22} {dict_bytes / 1024:12,.0f} {store_bytes / 1024:12,.0f} "
+          f"{dict_bytes / store_bytes:7.1f}x")
+    print(f"  {'tick write (us)':22} {t_dict / len(ticks) * 1e6:12.2f} {t_store / len(ticks) * 1e6:12.2f} "
+          f"{t_dict / t_store:7.2f}x")
+    print(f"  {'frame build (ms)':22} {f_dict * 1e3:12.2f} {f_store * 1e3:12.2f} {f_dict / f_store:7.1f}x")
+
+
+def _fresh(tick: dict) -> dict:
+    """Copy with its own depth dicts, as the parser produces per packet."""
+    if "depth" not in tick:
+        return tick
+    depth = {book: [dict(level) for level in levels] for book, levels in tick["depth"].items()}
+    return dict(tick, depth=depth)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark: CPU per Sensibull option-chain snapshot, previous vs current decoder.
+
+  previous  gzip magic scan, gzip.decompress and a full json.loads on the
+            WebSocket thread, for every frame
+  current   SensibullFeed._process: skip when the gzip trailer (CRC-32 and
+            size of the JSON) matches the previous frame for that underlying,
+            otherwise zlib decompress, json.loads and _compact_snapshot
+
+CPU time is measured with time.process_time, per snapshot. It also reports
+the retained size of the decoded chain that SensibullAdapter walks.
+
+Frames come from a ws_capture session (the "sensibull" stream), or are
+synthesised when no session is given: full chains with the relay's extra
+per-leg fields, where --repeat-ratio of frames repeat the previous snapshot.
+
+Usage:
+    python -m tools.benchmarks.bench_sensibull_decode --capture data/ws_capture/20260526-091500
+    python -m tools.benchmarks.bench_sensibull_decode --strikes 120 --frames 600
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import pickle
+import random
+import time
+
+from services.market_data.sensibull_feed import SensibullFeed, _decode_frame
+
+INDICES = {256265: 22500, 260105: 48000, 257801: 23800}   # NIFTY, BANKNIFTY, FINNIFTY
+
+
+def decode_previous(raw: bytes) -> dict | None:
+    """The decoder before the decode stage (full JSON, no skip)."""
+    if len(raw) <= 2:
+        return None
+    idx = raw.find(b"\x1f\x8b")
+    if idx == -1:
+        return None
+    data = json.loads(gzip.decompress(raw[idx:]))
+    data["_underlying_token"] = int.from_bytes(raw[1:5], "big")
+    return data
+
+
+def synth_chain(rng: random.Random, atm: int, strikes: int, step: int = 50) -> dict:
+    chain = {}
+    for i in range(-strikes // 2, strikes // 2):
+        strike = atm + i * step
+        row = {
+            "greeks": {"call_delta": rng.random(), "gamma": rng.random() / 100, "theta": -rng.random() * 20,
+                       "vega": rng.random() * 15, "iv": 0.1 + rng.random() / 10, "rho": rng.random(),
+                       "put_delta": -rng.random()},
+            "iv_change": rng.uniform(-0.01, 0.01),
+            "strike_token": rng.randrange(10 ** 7),
+        }
+        for side in ("call", "put"):
+            row[side] = {
+                "token": rng.randrange(10 ** 7), "tradingsymbol": f"NIFTY26MAY{strike}{side[0].upper()}E",
+                "last_price": round(rng.uniform(1, 900), 2), "oi": rng.randrange(10 ** 7),
+                "oi_change_quantity": rng.randrange(-10 ** 5, 10 ** 5), "volume": rng.randrange(10 ** 7),
+                "best_buy_price": round(rng.uniform(1, 900), 2), "best_sell_price": round(rng.uniform(1, 900), 2),
+                "best_buy_qty": rng.randrange(10 ** 4), "best_sell_qty": rng.randrange(10 ** 4),
+                "prev_close": round(rng.uniform(1, 900), 2), "change": rng.uniform(-50, 50),
+                "timestamp": "2026-05-26T10:15:00+05:30", "depth_levels": [rng.random() for _ in range(5)],
+            }
+        chain[str(strike)] = row
+    return {
+        "future_price": atm + 10.0, "atm_strike": atm, "atm_iv": 0.13, "atm_iv_percentile": 0.4,
+        "atm_ivp_type": "1y", "max_pain_strike": atm, "pcr": 0.95,
+        "per_expiry_stats": {"2026-05-26": {"dte": 12, "lot_size": 75}},
+        "chain": chain,
+    }
+
+
+def synth_frames(frames: int, strikes: int, repeat_ratio: float) -> list[bytes]:
+    rng = random.Random(11)
+    out, last = [], {}
+    for i in range(frames):
+        token, atm = list(INDICES.items())[i % len(INDICES)]
+        if token in last and rng.random() < repeat_ratio:
+            payload = last[token]
+        else:
+            payload = last[token] = json.dumps(synth_chain(rng, atm, strikes)).encode()
+        out.append(b"\x01" + token.to_bytes(4, "big") + b"20260526" + gzip.compress(payload))
+    return out
+
+
+def captured_frames(path: str) -> list[bytes]:
+    from services.market_data.ws_capture import read_frames
+    return [f.payload for f in read_frames(path) if f.stream == "sensibull" and len(f.payload) > 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capture", help="ws_capture session directory")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--strikes", type=int, default=120)
+    parser.add_argument("--repeat-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+
+    frames = captured_frames(args.capture) if args.capture else synth_frames(args.frames, args.strikes,
+                                                                             args.repeat_ratio)
+    if not frames:
+        print("no sensibull frames")
+        return
+    source = args.capture or f"synthetic, {args.strikes} strikes, repeat ratio {args.repeat_ratio:g}"
+    print(f"\n{len(frames):,} frames ({source}), avg {sum(map(len, frames)) / len(frames) / 1024:.1f} KiB gzip")
+
+    t0 = time.process_time()
+    for raw in frames:
+        decode_previous(raw)
+    previous_cpu = time.process_time() - t0
+
+    delivered = []
+    feed = SensibullFeed([], on_snapshot=lambda token, data: delivered.append(token))
+    t0 = time.process_time()
+    for raw in frames:
+        feed._process(raw)
+    current_cpu = time.process_time() - t0
+
+    full = decode_previous(frames[0])
+    compact = _decode_frame(frames[0])
+    print(f"  {'':28} {'previous':>10} {'current':>10}")
+    print(f"  {'CPU / snapshot (ms)':28} {previous_cpu / len(frames) * 1000:10.2f} "
+          f"{current_cpu / len(frames) * 1000:10.2f}  ({previous_cpu / max(current_cpu, 1e-9):.1f}x)")
+    print(f"  {'snapshots delivered':28} {len(frames):10,} {len(delivered):10,}  "
+          f"(unchanged skipped {feed.unchanged:,})")
+    print(f"  {'decoded chain (KiB pickled)':28} {len(pickle.dumps(full)) / 1024:10.1f} "
+          f"{len(pickle.dumps(compact)) / 1024:10.1f}")
+    print("  (current also runs on the SensibullDecode thread, not the WebSocket thread)")
+
+
+if __name__ == "__main__":
+    main()
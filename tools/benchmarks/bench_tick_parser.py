@@ -0,0 +1,234 @@
+"""
+Benchmark: KiteTicker binary tick parsing, per-field slicing vs precompiled structs.
+
+Parses the same WebSocket frames with the previous parser (split packets into
+`bytes` slices, `struct.unpack` a fresh slice per field) and with the current
+`KiteTicker._parse_binary`, and checks both produce identical ticks before
+timing them. Frames come from a capture file or are synthesised to look like
+an expiry-day options socket: mostly 184-byte full-mode option packets with
+some quote, LTP and index packets mixed in.
+
+Capture file format: repeated (4-byte big-endian length, frame payload).
+
+Usage:
+    python -m tools.benchmarks.bench_tick_parser
+    python -m tools.benchmarks.bench_tick_parser --frames 2000 --packets 50
+    python -m tools.benchmarks.bench_tick_parser --capture ws_frames.bin
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import struct
+import time
+from datetime import datetime
+
+from lib.zerodha.zerodha_ticker import KiteTicker
+
+_FRAME_LEN = struct.Struct(">I")
+
+
+# ── Frames ────────────────────────────────────────────────────────────────────
+
+def make_packet(rng: random.Random, length: int, token: int | None = None) -> bytes:
+    """One packet of `length` bytes (8/28/32/44/184) with plausible field values."""
+    ts = 1_700_000_000 + rng.randrange(20_000)
+    price = rng.randrange(5_00, 25_000_00)
+    if length in (28, 32):
+        token = token or (256265 if rng.random() < 0.5 else 260105)   # segment 9: index
+        body = struct.pack(">6I", token, price, price + 500, price - 500, price - 100, price - 200)
+        body += struct.pack(">I", 0)
+        if length == 32:
+            body += struct.pack(">I", ts)
+        return body
+    token = token or (rng.randrange(10_000, 1 << 24) << 8 | 2)          # segment 2: nfo
+    if length == 8:
+        return struct.pack(">2I", token, price)
+    body = struct.pack(
+        ">11I", token, price, rng.randrange(1, 500), price - 10, rng.randrange(10**7),
+        rng.randrange(10**6), rng.randrange(10**6), price - 300, price + 400, price - 600, price - 250,
+    )
+    if length == 44:
+        return body
+    body += struct.pack(">5I", ts - 3, rng.randrange(10**7), rng.randrange(10**7), rng.randrange(10**6), ts)
+    for _ in range(10):
+        body += struct.pack(">IIH2x", rng.randrange(10**5), price + rng.randrange(-500, 500), rng.randrange(50))
+    return body
+
+
+def make_frame(packets: list[bytes]) -> bytes:
+    out = [struct.pack(">H", len(packets))]
+    for packet in packets:
+        out.append(struct.pack(">H", len(packet)))
+        out.append(packet)
+    return b"".join(out)
+
+
+def synthetic_frames(n_frames: int, packets_per_frame: int, seed: int = 11) -> list[bytes]:
+    rng = random.Random(seed)
+    lengths = [184] * 80 + [44] * 10 + [8] * 6 + [32] * 2 + [28] * 2
+    return [
+        make_frame([make_packet(rng, rng.choice(lengths)) for _ in range(packets_per_frame)])
+        for _ in range(n_frames)
+    ]
+
+
+def read_capture(path: str) -> list[bytes]:
+    frames = []
+    with open(path, "rb") as f:
+        while True:
+            head = f.read(4)
+            if len(head) < 4:
+                return frames
+            frames.append(f.read(_FRAME_LEN.unpack(head)[0]))
+
+
+# ── Previous parser (reference) ───────────────────────────────────────────────
+
+def legacy_parse_binary(ticker: KiteTicker, bin: bytes) -> list[dict]:
+    """KiteTicker._parse_binary before the struct fast path, kept as the reference."""
+    packets = ticker._split_packets(bin)
+    data = []
+
+    for packet in packets:
+        instrument_token = ticker._unpack_int(packet, 0, 4)
+        segment = instrument_token & 0xff
+
+        if segment == ticker.EXCHANGE_MAP["cds"]:
+            divisor = 10000000.0
+        elif segment == ticker.EXCHANGE_MAP["bcd"]:
+            divisor = 10000.0
+        else:
+            divisor = 100.0
+
+        tradable = False if segment == ticker.EXCHANGE_MAP["indices"] else True
+
+        if len(packet) == 8:
+            data.append({
+                "tradable": tradable,
+                "mode": ticker.MODE_LTP,
+                "instrument_token": instrument_token,
+                "last_price": ticker._unpack_int(packet, 4, 8) / divisor
+            })
+        elif len(packet) == 28 or len(packet) == 32:
+            mode = ticker.MODE_QUOTE if len(packet) == 28 else ticker.MODE_FULL
+            d = {
+                "tradable": tradable,
+                "mode": mode,
+                "instrument_token": instrument_token,
+                "last_price": ticker._unpack_int(packet, 4, 8) / divisor,
+                "ohlc": {
+                    "high": ticker._unpack_int(packet, 8, 12) / divisor,
+                    "low": ticker._unpack_int(packet, 12, 16) / divisor,
+                    "open": ticker._unpack_int(packet, 16, 20) / divisor,
+                    "close": ticker._unpack_int(packet, 20, 24) / divisor
+                }
+            }
+            d["change"] = 0
+            if (d["ohlc"]["close"] != 0):
+                d["change"] = (d["last_price"] - d["ohlc"]["close"]) * 100 / d["ohlc"]["close"]
+            if len(packet) == 32:
+                try:
+                    timestamp = datetime.fromtimestamp(ticker._unpack_int(packet, 28, 32))
+                except Exception:
+                    timestamp = None
+                d["exchange_timestamp"] = timestamp
+            data.append(d)
+        elif len(packet) == 44 or len(packet) == 184:
+            mode = ticker.MODE_QUOTE if len(packet) == 44 else ticker.MODE_FULL
+            d = {
+                "tradable": tradable,
+                "mode": mode,
+                "instrument_token": instrument_token,
+                "last_price": ticker._unpack_int(packet, 4, 8) / divisor,
+                "last_traded_quantity": ticker._unpack_int(packet, 8, 12),
+                "average_traded_price": ticker._unpack_int(packet, 12, 16) / divisor,
+                "volume_traded": ticker._unpack_int(packet, 16, 20),
+                "total_buy_quantity": ticker._unpack_int(packet, 20, 24),
+                "total_sell_quantity": ticker._unpack_int(packet, 24, 28),
+                "ohlc": {
+                    "open": ticker._unpack_int(packet, 28, 32) / divisor,
+                    "high": ticker._unpack_int(packet, 32, 36) / divisor,
+                    "low": ticker._unpack_int(packet, 36, 40) / divisor,
+                    "close": ticker._unpack_int(packet, 40, 44) / divisor
+                }
+            }
+            d["change"] = 0
+            if (d["ohlc"]["close"] != 0):
+                d["change"] = (d["last_price"] - d["ohlc"]["close"]) * 100 / d["ohlc"]["close"]
+            if len(packet) == 184:
+                try:
+                    last_trade_time = datetime.fromtimestamp(ticker._unpack_int(packet, 44, 48))
+                except Exception:
+                    last_trade_time = None
+                try:
+                    timestamp = datetime.fromtimestamp(ticker._unpack_int(packet, 60, 64))
+                except Exception:
+                    timestamp = None
+                d["last_trade_time"] = last_trade_time
+                d["oi"] = ticker._unpack_int(packet, 48, 52)
+                d["oi_day_high"] = ticker._unpack_int(packet, 52, 56)
+                d["oi_day_low"] = ticker._unpack_int(packet, 56, 60)
+                d["exchange_timestamp"] = timestamp
+                depth = {"buy": [], "sell": []}
+                for i, p in enumerate(range(64, len(packet), 12)):
+                    depth["sell" if i >= 5 else "buy"].append({
+                        "quantity": ticker._unpack_int(packet, p, p + 4),
+                        "price": ticker._unpack_int(packet, p + 4, p + 8) / divisor,
+                        "orders": ticker._unpack_int(packet, p + 8, p + 10, byte_format="H")
+                    })
+                d["depth"] = depth
+            data.append(d)
+
+    return data
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+
+def make_ticker(depth_tokens=None, tick_records=False) -> KiteTicker:
+    ticker = KiteTicker("bench", "bench", "bench")
+    ticker.depth_tokens = depth_tokens
+    ticker.tick_records = tick_records
+    return ticker
+
+
+def bench(label: str, parse, frames: list[bytes], repeat: int, baseline: float | None = None) -> float:
+    best = float("inf")
+    ticks = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ticks = sum(len(parse(frame)) for frame in frames)
+        best = min(best, time.perf_counter() - start)
+    rate = ticks / best
+    speedup = f"{rate / baseline:8.2f}x" if baseline else ""
+    print(f"  {label:24} {rate:14,.0f} {speedup}")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capture", help="length-prefixed capture of raw WS frames")
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--packets", type=int, default=40, help="packets per synthetic frame")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = read_capture(args.capture) if args.capture else synthetic_frames(args.frames, args.packets)
+    ticker = make_ticker()
+    for frame in frames:
+        if ticker._parse_binary(frame) != legacy_parse_binary(ticker, frame):
+            raise SystemExit("parsers disagree — not benchmarking")
+
+    n_ticks = sum(len(ticker._parse_binary(f)) for f in frames)
+    print(f"\n{len(frames)} frames, {n_ticks} ticks (outputs identical)")
+    print(f"  {'':24} {'ticks/s':>14} {'speedup':>9}")
+    base = bench("legacy", lambda f: legacy_parse_binary(ticker, f), frames, args.repeat)
+    bench("struct dicts", ticker._parse_binary, frames, args.repeat, base)
+    bench("struct dicts, no depth", make_ticker(depth_tokens=frozenset())._parse_binary, frames, args.repeat, base)
+    bench("struct records", make_ticker(tick_records=True)._parse_binary, frames, args.repeat, base)
+    bench("struct records, no depth",
+          make_ticker(depth_tokens=frozenset(), tick_records=True)._parse_binary, frames, args.repeat, base)
+
+
+if __name__ == "__main__":
+    main()
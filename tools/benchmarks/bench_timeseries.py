@@ -0,0 +1,142 @@
+"""
+Benchmark: resource-monitor time series as ring buffers vs string-member ZSETs.
+
+Fills a day of 30 s samples for a resource monitor's metric set (system
+metrics plus RSS and CPU for each service) in both layouts:
+
+  zset  sys:ts:{metric} — member "{ts:.6f}:{value}", score ts, ZREMRANGEBYSCORE
+        on every write (the previous store_timeseries)
+  ring  sys:ring:{metric}:{tier} — services/common/timeseries.py, raw 24 h plus
+        1m / 15m / 1d rollups
+
+It then reports Redis MEMORY USAGE per metric, write cost per cycle, and the
+cost of reading 24 hourly averages (the /sysstats history sparkline).
+
+Without --redis-url it prints only the ring's exact payload size, since ZSET
+memory depends on the server's encoding.
+
+Usage:
+    python -m tools.benchmarks.bench_timeseries --redis-url redis://localhost:6379/15
+    python -m tools.benchmarks.bench_timeseries --services 8 --hours 24
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from services.common.timeseries import TIERS, RingWriter, memory_bytes, query, ring_key
+
+SYSTEM_METRICS = ("cpu", "ram", "cpu_core_avg", "cpu_core_max", "redis_mem")
+PREFIX = "bench:ring"
+ZSET_PREFIX = "bench:ts"
+
+
+def metric_names(services: int) -> list[str]:
+    names = list(SYSTEM_METRICS)
+    for i in range(services):
+        names += [f"rss:svc{i}", f"cpu:svc{i}"]
+    return names
+
+
+def fill_zset(rc, metrics: list[str], start: float, cycles: int, rng: random.Random) -> float:
+    """Previous layout, one pipeline per metric per cycle as store_timeseries did."""
+    elapsed = 0.0
+    for c in range(cycles):
+        ts = start + c * 30
+        t0 = time.perf_counter()
+        for metric in metrics:
+            key = f"{ZSET_PREFIX}:{metric}"
+            value = round(rng.uniform(0, 100), 1)
+            pipe = rc.pipeline()
+            pipe.zadd(key, {f"{ts:.6f}:{value}": ts})
+            pipe.zremrangebyscore(key, 0, ts - 86400)
+            pipe.expire(key, 25 * 3600)
+            pipe.execute()
+        elapsed += time.perf_counter() - t0
+    return elapsed / cycles
+
+
+def fill_ring(rc, metrics: list[str], start: float, cycles: int, rng: random.Random) -> float:
+    writer = RingWriter(rc, prefix=PREFIX)
+    elapsed = 0.0
+    for c in range(cycles):
+        ts = start + c * 30
+        t0 = time.perf_counter()
+        for metric in metrics:
+            writer.add(metric, ts, round(rng.uniform(0, 100), 1))
+        writer.flush()
+        elapsed += time.perf_counter() - t0
+    return elapsed / cycles
+
+
+def hourly_zset(rc, metric: str, now: float) -> list[float]:
+    """What sysstats._ts_to_hourly_avg did against the ZSET."""
+    raw = rc.zrangebyscore(f"{ZSET_PREFIX}:{metric}", now - 86400, now, withscores=True)
+    hourly: dict[int, list[float]] = {}
+    for member, ts in raw:
+        member = member.decode() if isinstance(member, bytes) else member
+        hourly.setdefault(int(ts) // 3600, []).append(float(member.split(":", 1)[-1]))
+    return [sum(v) / len(v) for _, v in sorted(hourly.items())]
+
+
+def _usage(rc, keys: list[str]) -> int:
+    return sum(rc.memory_usage(key, samples=0) or 0 for key in keys)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", help="scratch Redis (bench:* keys are written and deleted)")
+    parser.add_argument("--services", type=int, default=8)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--reads", type=int, default=50)
+    args = parser.parse_args()
+
+    metrics = metric_names(args.services)
+    cycles = int(args.hours * 120)
+    ring_payload = memory_bytes()
+    print(f"\n{len(metrics)} metrics, {cycles:,} samples each ({args.hours:g} h at 30 s)")
+    print(f"  ring payload per metric (all tiers, full): {ring_payload / 1024:.1f} KiB "
+          f"(raw 24 h {TIERS[0].slots * 8 / 1024:.1f} KiB)")
+    if not args.redis_url:
+        return
+
+    import redis as sync_redis
+    rc = sync_redis.from_url(args.redis_url)
+    rng = random.Random(7)
+    start = time.time() // 86400 * 86400
+    now = start + cycles * 30
+
+    try:
+        zset_write = fill_zset(rc, metrics, start, cycles, random.Random(7))
+        ring_write = fill_ring(rc, metrics, start, cycles, rng)
+
+        zset_keys = [f"{ZSET_PREFIX}:{m}" for m in metrics]
+        ring_keys = [ring_key(m, t, PREFIX) for m in metrics for t in TIERS]
+        zset_mem, ring_mem = _usage(rc, zset_keys), _usage(rc, ring_keys)
+
+        t0 = time.perf_counter()
+        for _ in range(args.reads):
+            hourly_zset(rc, "cpu", now)
+        zset_read = (time.perf_counter() - t0) / args.reads
+        t0 = time.perf_counter()
+        for _ in range(args.reads):
+            query(rc, "cpu", now - 86400, now, step=3600, prefix=PREFIX)
+        ring_read = (time.perf_counter() - t0) / args.reads
+
+        print(f"  {'':28} {'zset':>12} {'ring':>12} {'ratio':>8}")
+        print(f"  {'memory / metric (KiB)':28} {zset_mem / len(metrics) / 1024:12.1f} "
+              f"{ring_mem / len(metrics) / 1024:12.1f} {zset_mem / max(ring_mem, 1):7.1f}x")
+        print(f"  {'memory total (KiB)':28} {zset_mem / 1024:12.1f} {ring_mem / 1024:12.1f}")
+        print(f"  {'write / cycle (ms)':28} {zset_write * 1000:12.2f} {ring_write * 1000:12.2f} "
+              f"{zset_write / ring_write:7.1f}x")
+        print(f"  {'24 h hourly read (ms)':28} {zset_read * 1000:12.2f} {ring_read * 1000:12.2f} "
+              f"{zset_read / ring_read:7.1f}x")
+        print("  (ring also keeps 48 h of 1-min, 14 d of 15-min and ~13 mo of daily rollups)")
+    finally:
+        rc.delete(*[f"{ZSET_PREFIX}:{m}" for m in metrics])
+        rc.delete(*[ring_key(m, t, PREFIX) for m in metrics for t in TIERS])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Local market-data storage shared by the backtest tools and the ML pipeline.
+"""
+
+from tools.market_data.ohlcv_store import OHLCVStore, get_default_store
+
+__all__ = ['OHLCVStore', 'get_default_store']
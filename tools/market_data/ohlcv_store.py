@@ -0,0 +1,425 @@
+"""
+Persistent on-disk OHLCV store shared by the backtest tools and the ML pipeline.
+
+Every backtest / optimiser run used to re-download the same multi-year
+history from yfinance.  ``OHLCVStore`` keeps one frame per (symbol, interval)
+on local disk together with the date range it is known to cover, and only
+fetches what a request needs beyond that range.
+
+Layout (``root`` defaults to ``data/ohlcv_store``, override with
+``OHLCV_STORE_DIR``):
+
+    root/
+    ├── index.json            # (symbol, interval) → object, coverage, LRU stamp
+    ├── .lock                 # flock'd around every index read-modify-write
+    └── objects/
+        └── <sha256>.saf      # frame codec payload, named by its own hash
+
+Objects are content-addressed: the file name is the SHA-256 of its bytes, so
+``get`` detects a truncated or corrupted file on load, drops the entry and
+fetches the range again.  Coverage is a half-open ``[start, end)`` range of
+*requested* dates (holidays inside it simply have no bars).  It never extends
+past the start of the current day, so today's still-forming bar is always
+re-fetched.  Coverage only grows over segments a fetch actually returned
+bars for: an empty frame (or an exception) leaves the segment uncovered, so
+it is fetched again next time.  A fetcher that knows a range genuinely has
+no bars returns ``NO_BARS`` to record it as covered.  When the objects
+exceed ``max_bytes`` the least-recently-read entries are evicted.
+
+The index lock is held only for index reads and writes, never across a
+fetch, so processes sharing the store do not queue behind the network.
+
+Usage:
+    store = OHLCVStore()
+    df = store.get("RELIANCE", "day", "2023-01-01", "2025-01-01", fetch=my_fetch)
+    df = store.get("RELIANCE", "day", "2023-01-01", "2025-01-01")   # offline
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import datetime
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from lib.logging_util import get_logger
+from services.common.serialization import (
+    FRAME_CODEC_VERSION,
+    decode_frame_payload,
+    encode_frame_payload,
+)
+logger = get_logger("backtest")
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(__file__), "..", "..", "data", "ohlcv_store")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+INDEX_VERSION = 1
+
+DateLike = Union[str, pd.Timestamp, datetime.datetime, datetime.date]
+# fetch(symbol, interval, start, end) → frame for [start, end)
+Fetcher = Callable[[str, str, pd.Timestamp, pd.Timestamp], pd.DataFrame]
+Range = Tuple[pd.Timestamp, pd.Timestamp]
+
+# Returned (by identity) from a fetcher: "[start, end) has no bars", as
+# opposed to an empty frame from a failed download.
+NO_BARS = pd.DataFrame()
+
+
+def _ts(value: DateLike) -> pd.Timestamp:
+    """Naive (wall-clock) timestamp for coverage bookkeeping."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    if not isinstance(ts, pd.Timestamp):
+        raise ValueError(f"not a date: {value!r}")
+    return ts
+
+
+def _slice(df: pd.DataFrame, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> pd.DataFrame:
+    """Rows with start <= index < end; bounds are wall-clock in the index's tz."""
+    if df.empty:
+        return df
+    tz = getattr(df.index, "tz", None)
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df.index >= (start.tz_localize(tz) if tz is not None else start)
+    if end is not None:
+        mask &= df.index < (end.tz_localize(tz) if tz is not None else end)
+    return df.loc[mask.to_numpy()]
+
+
+class OHLCVStore:
+    """
+    Local content-addressed OHLCV cache with range coverage and LRU eviction.
+
+    Parameters
+    ----------
+    root : str | None
+        Store directory.  Default ``$OHLCV_STORE_DIR`` or ``data/ohlcv_store``.
+    max_bytes : int | None
+        Disk budget for objects.  Default ``$OHLCV_STORE_MAX_BYTES`` or 2 GiB.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.root = os.path.abspath(root or os.environ.get("OHLCV_STORE_DIR") or DEFAULT_ROOT)
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("OHLCV_STORE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self._objects_dir = os.path.join(self.root, "objects")
+        self._index_path = os.path.join(self.root, "index.json")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(
+        self,
+        symbol: str,
+        interval: str,
+        start: DateLike,
+        end: DateLike,
+        fetch: Optional[Fetcher] = None,
+    ) -> pd.DataFrame:
+        """
+        Bars for ``[start, end)``, topping up the stored range with *fetch*.
+
+        Only the parts of the request outside the stored coverage are
+        fetched.  Without *fetch* (offline) whatever is stored is returned.
+        If a top-up fetch fails the stored bars (plus any segments that did
+        fetch) are returned with a warning; the error propagates only when
+        nothing is stored and nothing was fetched.
+        """
+        start, end = _ts(start), _ts(end)
+        key = self._key(symbol, interval)
+        with self._locked():
+            index = self._read_index()
+            df = self._load(index, key) if key in index["entries"] else None
+            entry = index["entries"].get(key)  # _load drops corrupt entries
+            coverage = (_ts(entry["start"]), _ts(entry["end"])) if entry else None
+            missing = []
+            if fetch is not None:
+                missing = self._missing_ranges(start, end, *(coverage or (None, None)))
+            if entry:
+                entry["last_access"] = time.time()
+            self._write_index(index)
+
+        if missing and fetch is not None:
+            df = self._top_up(symbol, interval, key, fetch, missing, df, coverage)
+
+        if df is None:
+            return pd.DataFrame()
+        return _slice(df, start, end)
+
+    def put(self, symbol: str, interval: str, df: pd.DataFrame, start: DateLike, end: DateLike):
+        """Merge *df* into the stored frame and mark ``[start, end)`` as covered."""
+        start, end = _ts(start), _ts(end)
+        key = self._key(symbol, interval)
+        with self._locked():
+            index = self._read_index()
+            entry = index["entries"].get(key)
+            existing = self._load(index, key) if entry else None
+            entry = index["entries"].get(key)
+            if entry:
+                start = min(start, _ts(entry["start"]))
+                end = max(end, _ts(entry["end"]))
+            self._store(index, key, self._merge(existing, [df]), start, self._clamp_end(end))
+            self._write_index(index)
+
+    def coverage(self, symbol: str, interval: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Stored ``(start, end)`` coverage for a key, or None."""
+        entry = self._read_index()["entries"].get(self._key(symbol, interval))
+        if not entry:
+            return None
+        return _ts(entry["start"]), _ts(entry["end"])
+
+    def symbols(self, interval: Optional[str] = None) -> List[str]:
+        """Symbols with stored data (optionally for one interval)."""
+        out = []
+        for key in self._read_index()["entries"]:
+            sym, _, ivl = key.rpartition("|")
+            if interval is None or ivl == interval:
+                out.append(sym)
+        return sorted(set(out))
+
+    def total_bytes(self) -> int:
+        return sum(e["bytes"] for e in self._read_index()["entries"].values())
+
+    def delete(self, symbol: str, interval: str) -> bool:
+        key = self._key(symbol, interval)
+        with self._locked():
+            index = self._read_index()
+            entry = index["entries"].pop(key, None)
+            if entry is None:
+                return False
+            self._unlink_unreferenced(index, entry["object"])
+            self._write_index(index)
+        return True
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _top_up(
+        self,
+        symbol: str,
+        interval: str,
+        key: str,
+        fetch: Fetcher,
+        missing: List[Range],
+        df: Optional[pd.DataFrame],
+        coverage: Optional[Range],
+    ) -> Optional[pd.DataFrame]:
+        """Fetch *missing* segments (unlocked), then merge what arrived into the entry."""
+        fetched: List[pd.DataFrame] = []
+        covered: List[Range] = []
+        error: Optional[Exception] = None
+        for seg_start, seg_end in missing:
+            logger.info(f"[OHLCVStore] fetching {key} {seg_start} → {seg_end}")
+            try:
+                part = fetch(symbol, interval, seg_start, seg_end)
+            except Exception as e:
+                logger.warning(f"[OHLCVStore] fetch failed for {key} {seg_start} → {seg_end}: {e}")
+                error = error or e
+                continue
+            if part is NO_BARS:
+                covered.append((seg_start, seg_end))
+            elif part is not None and not part.empty:
+                fetched.append(part)
+                covered.append((seg_start, seg_end))
+            else:
+                logger.warning(f"[OHLCVStore] no bars for {key} {seg_start} → {seg_end}; not marking it covered")
+
+        if not covered:
+            if error is not None and df is None:
+                raise error
+            return df
+
+        with self._locked():
+            index = self._read_index()
+            entry = index["entries"].get(key)
+            if entry:
+                # Another process may have extended the entry while we fetched
+                current = self._load(index, key)
+                entry = index["entries"].get(key)
+                if entry and current is not None:
+                    df, coverage = current, (_ts(entry["start"]), _ts(entry["end"]))
+            df = self._merge(df, fetched)
+            new_start, new_end = self._extend(coverage, covered)
+            self._store(index, key, df, new_start, self._clamp_end(new_end))
+            self._write_index(index)
+        return df
+
+    @staticmethod
+    def _key(symbol: str, interval: str) -> str:
+        return f"{symbol.upper()}|{interval}"
+
+    @staticmethod
+    def _clamp_end(end: pd.Timestamp) -> pd.Timestamp:
+        return min(end, pd.Timestamp.now().normalize())
+
+    @staticmethod
+    def _missing_ranges(
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        cov_start: Optional[pd.Timestamp],
+        cov_end: Optional[pd.Timestamp],
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Segments to fetch so coverage becomes one contiguous range containing
+        ``[start, end)``.  A request disjoint from the coverage also fetches
+        the gap between them.
+        """
+        if start >= end:
+            return []
+        if cov_start is None or cov_end is None:
+            return [(start, end)]
+        missing = []
+        if start < cov_start:
+            missing.append((start, cov_start))
+        if end > cov_end:
+            missing.append((cov_end, end))
+        return missing
+
+    @staticmethod
+    def _extend(coverage: Optional[Range], segments: List[Range]) -> Range:
+        """Grow *coverage* by the segments touching it (repeatedly), keeping it contiguous."""
+        segments = sorted(segments)
+        lo, hi = coverage if coverage is not None else segments.pop(0)
+        grown = True
+        while grown:
+            grown = False
+            for seg in list(segments):
+                if seg[0] <= hi and seg[1] >= lo:
+                    lo, hi = min(lo, seg[0]), max(hi, seg[1])
+                    segments.remove(seg)
+                    grown = True
+        return lo, hi
+
+    @staticmethod
+    def _merge(existing: Optional[pd.DataFrame], parts: List[pd.DataFrame]) -> pd.DataFrame:
+        frames = [f for f in ([existing] if existing is not None else []) + parts if f is not None and not f.empty]
+        if not frames:
+            return existing if existing is not None else pd.DataFrame()
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        df = df.loc[~df.index.duplicated(keep="last")]
+        return df.sort_index()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects_dir, f"{digest}.saf")
+
+    def _load(self, index: dict, key: str) -> Optional[pd.DataFrame]:
+        """Read and verify an entry's object; drop the entry if it is unusable."""
+        entry = index["entries"][key]
+        path = self._object_path(entry["object"])
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            if hashlib.sha256(blob).hexdigest() != entry["object"]:
+                raise ValueError("content hash mismatch")
+            if entry.get("codec") != FRAME_CODEC_VERSION:
+                raise ValueError(f"codec version {entry.get('codec')}")
+            return decode_frame_payload(blob)
+        except Exception as e:
+            logger.warning(f"[OHLCVStore] dropping unreadable entry {key}: {e}")
+            del index["entries"][key]
+            self._unlink_unreferenced(index, entry["object"])
+            return None
+
+    def _store(self, index: dict, key: str, df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp):
+        blob = encode_frame_payload(df)
+        digest = hashlib.sha256(blob).hexdigest()
+        # Always (re)write: an existing file with this name may be the corrupt
+        # copy another entry still points at.
+        path = self._object_path(digest)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+
+        old = index["entries"].get(key)
+        index["entries"][key] = {
+            "object": digest,
+            "codec": FRAME_CODEC_VERSION,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "rows": len(df),
+            "bytes": len(blob),
+            "last_access": time.time(),
+        }
+        if old and old["object"] != digest:
+            self._unlink_unreferenced(index, old["object"])
+        self._evict(index, keep=key)
+
+    def _evict(self, index: dict, keep: str):
+        """Drop least-recently-read entries (never *keep*) until under budget."""
+        entries = index["entries"]
+        total = sum(e["bytes"] for e in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = entries.pop(key)
+            total -= entry["bytes"]
+            self._unlink_unreferenced(index, entry["object"])
+            logger.info(f"[OHLCVStore] evicted {key} ({entry['bytes']} bytes)")
+
+    def _unlink_unreferenced(self, index: dict, digest: str):
+        if any(e["object"] == digest for e in index["entries"].values()):
+            return
+        try:
+            os.remove(self._object_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index_path, "r") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION and isinstance(index.get("entries"), dict):
+                return index
+            logger.warning(f"[OHLCVStore] ignoring index with version {index.get('version')}")
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"[OHLCVStore] unreadable index, starting empty: {e}")
+        return {"version": INDEX_VERSION, "entries": {}}
+
+    def _write_index(self, index: dict):
+        tmp = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, self._index_path)
+
+    @contextmanager
+    def _locked(self):
+        """Serialise index updates across processes sharing the store."""
+        os.makedirs(self._objects_dir, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.root, ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+_default_store: Optional[OHLCVStore] = None
+
+
+def get_default_store() -> OHLCVStore:
+    """Process-wide store at the default location."""
+    global _default_store
+    if _default_store is None:
+        _default_store = OHLCVStore()
+    return _default_store
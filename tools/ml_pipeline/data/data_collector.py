@@ -16,6 +16,12 @@ Data Flow:
 4. Store data in parquet format for efficient access
 5. Support incremental updates (fetch only new data)
 
+Bulk mode (``DataCollector.collect`` / ``update_all_stocks``) downloads
+symbols in multi-ticker batches on a small thread pool behind one shared
+rate limiter, validates in a worker pool, and appends only new rows to a
+symbol/year partitioned dataset. A manifest of per-symbol last dates tells
+each run exactly where to resume.
+
 Usage:
     from ml_pipeline.data.data_collector import DataCollector
     
@@ -27,13 +33,19 @@ Usage:
     # Fetch data for specific stocks
     collector.fetch_stocks(['RELIANCE.NS', 'TCS.NS'], start_date='2020-01-01')
     
+    # Bring every F&O stock up to date (bulk, incremental)
+    collector.update_all_stocks()
+    
     # Load stored data
     data = collector.load_stock_data('RELIANCE.NS')
 """
 
 import os
+import json
+import shutil
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
@@ -44,6 +56,8 @@ import numpy as np
 import yfinance as yf
 
 from lib.logging_util import get_logger
+from services.common.rate_limiter import RateLimiter
+from tools.market_data.ohlcv_store import OHLCVStore
 logger = get_logger("ml-pipeline")
 
 
@@ -274,8 +288,23 @@ class DataStorage:
         ├── indices/
         │   ├── NIFTY50.parquet
         │   └── BANKNIFTY.parquet
+        ├── dataset/                      # bulk mode, append-only
+        │   └── RELIANCE_NS/
+        │       ├── year=2024/part-20240101-20241231.parquet
+        │       └── year=2025/part-20250102-20250110.parquet
+        ├── manifest.json                 # dataset symbol -> last date, rows
         └── metadata.json
     
+    ``append_stock_data`` writes only rows newer than the manifest's last
+    date, as new part files in their year partition; a partition is
+    compacted into one file once it holds ``MAX_PARTS_PER_YEAR`` parts. A
+    symbol's legacy file is folded into the dataset on its first append, and
+    the dataset is dropped again if ``save_stock_data`` rewrites the file.
+    
+    If an ``OHLCVStore`` (tools/market_data) is passed, daily bars the
+    backtest tools already downloaded are readable too: ``load_stock_data``
+    falls back to the store when a symbol has no parquet file.
+    
     Example:
         storage = DataStorage(data_dir='./data')
         
@@ -289,17 +318,26 @@ class DataStorage:
         stocks = storage.get_available_stocks()
     """
     
-    def __init__(self, data_dir: str = './data'):
+    MAX_PARTS_PER_YEAR = 24
+    MANIFEST_VERSION = 1
+    
+    def __init__(self, data_dir: str = './data', ohlcv_store: Optional[OHLCVStore] = None):
         """
         Initialize the data storage.
         
         Args:
             data_dir: Root directory for data storage
+            ohlcv_store: Optional shared OHLCV store to read from when a
+                symbol has no parquet file
         """
+        self.ohlcv_store = ohlcv_store
         self.data_dir = Path(data_dir)
         self.stocks_dir = self.data_dir / 'stocks'
         self.indices_dir = self.data_dir / 'indices'
         self.metadata_file = self.data_dir / 'metadata.json'
+        self.dataset_dir = self.data_dir / 'dataset'
+        self.manifest_file = self.data_dir / 'manifest.json'
+        self._manifest: Optional[Dict[str, Dict]] = None
         
         # Create directories if they don't exist
         self.stocks_dir.mkdir(parents=True, exist_ok=True)
@@ -343,6 +381,9 @@ class DataStorage:
             
             df.to_parquet(file_path, index=True)
             logger.info(f"Saved {len(df)} rows for {symbol} to {file_path}")
+            # The file is authoritative again; the next bulk append re-seeds from it
+            if self._drop_dataset(symbol):
+                self.save_manifest()
             return True
             
         except Exception as e:
@@ -366,9 +407,14 @@ class DataStorage:
         Returns:
             DataFrame with OHLCV data, or None if not found
         """
+        if symbol in self.manifest:
+            return self._load_from_dataset(symbol, start_date, end_date)
+        
         file_path = self.stocks_dir / f"{symbol.replace('.', '_')}.parquet"
         
         if not file_path.exists():
+            if self.ohlcv_store is not None:
+                return self._load_from_ohlcv_store(symbol, start_date, end_date)
             logger.warning(f"No data file found for {symbol}")
             return None
         
@@ -391,6 +437,36 @@ class DataStorage:
             logger.error(f"Error loading data for {symbol}: {e}", exc_info=True)
             return None
     
+    def _load_from_ohlcv_store(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Read daily bars for a symbol from the shared OHLCV store (no fetching).
+        
+        The store keys symbols without the exchange suffix ('RELIANCE', not
+        'RELIANCE.NS'). Returns OHLCV columns with a tz-naive index like
+        ``load_stock_data``, or None if the store has nothing for the symbol.
+        """
+        coverage = self.ohlcv_store.coverage(symbol.replace('.NS', ''), 'day')
+        if coverage is None:
+            logger.warning(f"No data file or OHLCV store entry found for {symbol}")
+            return None
+        
+        start = pd.to_datetime(start_date) if start_date else coverage[0]
+        # end_date is inclusive here; the store's ranges are half-open
+        end = pd.to_datetime(end_date) + timedelta(days=1) if end_date else coverage[1]
+        df = self.ohlcv_store.get(symbol.replace('.NS', ''), 'day', start, end)
+        if df.empty:
+            return None
+        
+        df = df[[c for c in ['Open', 'High', 'Low', 'Close', 'Volume'] if c in df.columns]].copy()
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        return df
+    
     def get_available_stocks(self) -> List[str]:
         """
         Get list of stocks with stored data.
@@ -399,7 +475,11 @@ class DataStorage:
             List of stock symbols
         """
         parquet_files = list(self.stocks_dir.glob('*.parquet'))
-        return [f.stem.replace('_', '.') for f in parquet_files]
+        symbols = [f.stem.replace('_', '.') for f in parquet_files]
+        symbols += [s for s in self.manifest if s not in symbols]
+        if self.ohlcv_store is not None:
+            symbols += [f"{s}.NS" for s in self.ohlcv_store.symbols('day') if f"{s}.NS" not in symbols]
+        return symbols
     
     def get_data_info(self, symbol: str) -> Optional[Dict]:
         """
@@ -435,6 +515,9 @@ class DataStorage:
             True if deletion was successful
         """
         file_path = self.stocks_dir / f"{symbol.replace('.', '_')}.parquet"
+        deleted = self._drop_dataset(symbol)
+        if deleted:
+            self.save_manifest()
         
         if file_path.exists():
             try:
@@ -445,7 +528,156 @@ class DataStorage:
                 logger.error(f"Error deleting data for {symbol}: {e}", exc_info=True)
                 return False
         
-        return False
+        return deleted
+    
+    # ── Partitioned dataset (bulk mode) ──────────────────────────────────────
+    
+    @property
+    def manifest(self) -> Dict[str, Dict]:
+        """Dataset symbol -> {'last': 'YYYY-MM-DD', 'rows': n, 'updated': ...}."""
+        if self._manifest is None:
+            self._manifest = {}
+            if self.manifest_file.exists():
+                try:
+                    with open(self.manifest_file, 'r') as f:
+                        data = json.load(f)
+                    if data.get('version') == self.MANIFEST_VERSION:
+                        self._manifest = data.get('symbols', {})
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable manifest {self.manifest_file}: {e}")
+        return self._manifest
+    
+    def save_manifest(self):
+        """Write the manifest atomically (temp file + rename)."""
+        tmp = self.manifest_file.with_suffix('.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'version': self.MANIFEST_VERSION, 'symbols': self.manifest}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_file)
+    
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """
+        Last stored date for a symbol, or None if nothing is stored.
+        
+        Answered from the manifest; only a symbol that still lives in a
+        legacy file (not yet in the dataset) costs a file read.
+        """
+        entry = self.manifest.get(symbol)
+        if entry is not None:
+            return pd.Timestamp(entry['last'])
+        df = self.load_stock_data(symbol)
+        if df is None or df.empty:
+            return None
+        return df.index.max()
+    
+    def append_stock_data(self, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append rows newer than the symbol's last stored date to the dataset.
+        
+        Updates the in-memory manifest; call ``save_manifest`` to persist it
+        (the collector does so once per downloaded batch). Existing part
+        files are never rewritten, except when a year partition is compacted.
+        
+        Args:
+            symbol: Stock symbol (e.g., 'RELIANCE.NS')
+            df: DataFrame with OHLCV data
+            
+        Returns:
+            The new rows (empty if already up to date); a folded-in legacy
+            file is written too but not returned
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df = df.copy()
+            df.index = pd.to_datetime(df.index)
+        df = df.sort_index()
+        df = df[~df.index.duplicated(keep='last')]
+        
+        entry = self.manifest.get(symbol)
+        if entry is None:
+            # First append: fold the legacy file (if any) into the dataset
+            existing = self.load_stock_data(symbol)
+            rows = 0
+            if existing is not None and not existing.empty:
+                new = df[df.index > existing.index.max()]
+                df = pd.concat([existing, new])
+            else:
+                new = df
+        else:
+            new = df = df[df.index > pd.Timestamp(entry['last'])]
+            rows = entry['rows']
+        
+        if df.empty:
+            return new
+        
+        symbol_dir = self.dataset_dir / symbol.replace('.', '_')
+        for year, part in df.groupby(df.index.year):
+            year_dir = symbol_dir / f"year={year}"
+            year_dir.mkdir(parents=True, exist_ok=True)
+            name = f"part-{part.index[0]:%Y%m%d}-{part.index[-1]:%Y%m%d}.parquet"
+            part.to_parquet(year_dir / name, index=True)
+            if len(list(year_dir.glob('part-*.parquet'))) >= self.MAX_PARTS_PER_YEAR:
+                self._compact_partition(year_dir)
+        
+        self.manifest[symbol] = {
+            'last': f"{df.index[-1]:%Y-%m-%d}",
+            'rows': rows + len(df),
+            'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        logger.info(f"Appended {len(df)} rows for {symbol} to {symbol_dir}")
+        return new
+    
+    def _read_partition(self, year_dir: Path) -> pd.DataFrame:
+        parts = [pd.read_parquet(f) for f in sorted(year_dir.glob('part-*.parquet'))]
+        df = pd.concat(parts) if parts else pd.DataFrame()
+        return df[~df.index.duplicated(keep='last')].sort_index()
+    
+    def _compact_partition(self, year_dir: Path):
+        """Rewrite one year partition as a single part file."""
+        files = sorted(year_dir.glob('part-*.parquet'))
+        df = self._read_partition(year_dir)
+        name = f"part-{df.index[0]:%Y%m%d}-{df.index[-1]:%Y%m%d}.parquet"
+        tmp = year_dir / f".{name}.tmp"
+        df.to_parquet(tmp, index=True)
+        for f in files:
+            f.unlink()
+        os.replace(tmp, year_dir / name)
+        logger.info(f"Compacted {len(files)} parts in {year_dir}")
+    
+    def _load_from_dataset(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """Read a symbol's year partitions, skipping years outside the date filter."""
+        symbol_dir = self.dataset_dir / symbol.replace('.', '_')
+        first_year = pd.to_datetime(start_date).year if start_date else None
+        last_year = pd.to_datetime(end_date).year if end_date else None
+        try:
+            frames = []
+            for year_dir in sorted(symbol_dir.glob('year=*')):
+                year = int(year_dir.name.split('=', 1)[1])
+                if (first_year and year < first_year) or (last_year and year > last_year):
+                    continue
+                frames.append(self._read_partition(year_dir))
+            frames = [f for f in frames if not f.empty]
+            if not frames:
+                return None
+            df = pd.concat(frames)
+            if start_date:
+                df = df[df.index >= pd.to_datetime(start_date)]
+            if end_date:
+                df = df[df.index <= pd.to_datetime(end_date)]
+            return df
+        except Exception as e:
+            logger.error(f"Error loading dataset for {symbol}: {e}", exc_info=True)
+            return None
+    
+    def _drop_dataset(self, symbol: str) -> bool:
+        """Remove a symbol's partitions and manifest entry (manifest not saved)."""
+        symbol_dir = self.dataset_dir / symbol.replace('.', '_')
+        if symbol_dir.exists():
+            shutil.rmtree(symbol_dir, ignore_errors=True)
+        return self.manifest.pop(symbol, None) is not None
 
 
 class DataCollector:
@@ -465,6 +697,9 @@ class DataCollector:
     - Progress tracking and logging
     - Batch processing for large stock lists
     - Incremental updates (only fetch new data)
+    - Bulk mode (``collect``): multi-ticker batch downloads on a thread
+      pool sharing one rate limiter, validation in a worker pool, and
+      append-only writes to the partitioned dataset driven by its manifest
     
     Example:
         collector = DataCollector(data_dir='./data')
@@ -490,6 +725,13 @@ class DataCollector:
     MAX_RETRIES = 3
     RETRY_DELAY = 2  # Seconds to wait before retry
     
+    # Bulk mode settings
+    DEFAULT_START_DATE = '2020-01-01'
+    BATCH_SIZE = 25  # Tickers per yf.download call
+    BATCH_INTERVAL = 1.0  # Seconds between batch downloads, shared by all workers
+    DOWNLOAD_WORKERS = 3
+    VALIDATION_WORKERS = 4
+    
     def __init__(
         self,
         data_dir: str = './data',
@@ -506,6 +748,7 @@ class DataCollector:
         self.validator = DataValidator()
         self.fno_list_file = fno_list_file
         self._last_request_time = 0
+        self._batch_limiter = RateLimiter(max_calls=1, per_seconds=self.BATCH_INTERVAL)
         
         # Load F&O stock list
         self.fno_stocks = self._load_fno_list()
@@ -689,24 +932,9 @@ class DataCollector:
                     logger.warning(f"No data returned for {symbol}")
                     return None
                 
-                # Standardize column names
-                df.columns = [col.capitalize() for col in df.columns]
-                
-                # Ensure we have required columns
-                required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-                for col in required_cols:
-                    if col not in df.columns:
-                        logger.warning(f"Missing column {col} for {symbol}")
-                        return None
-                
-                # Keep only OHLCV columns
-                df = df[required_cols].copy()
-                
-                # Remove timezone info from index for consistency
-                if df.index.tz is not None:
-                    df.index = df.index.tz_localize(None)
-                
-                logger.info(f"Fetched {len(df)} rows for {symbol}")
+                df = self._normalize_ohlcv(df, symbol)
+                if df is not None:
+                    logger.info(f"Fetched {len(df)} rows for {symbol}")
                 return df
                 
             except Exception as e:
@@ -717,6 +945,84 @@ class DataCollector:
         logger.error(f"All retries failed for {symbol}", exc_info=True)
         return None
     
+    @staticmethod
+    def _normalize_ohlcv(df: pd.DataFrame, symbol: str) -> Optional[pd.DataFrame]:
+        """OHLCV columns only, capitalized, with a tz-naive index (None if a column is missing)."""
+        # Standardize column names
+        df.columns = [col.capitalize() for col in df.columns]
+        
+        # Ensure we have required columns
+        required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+        for col in required_cols:
+            if col not in df.columns:
+                logger.warning(f"Missing column {col} for {symbol}")
+                return None
+        
+        # Keep only OHLCV columns
+        df = df[required_cols].copy()
+        
+        # Remove timezone info from index for consistency
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        
+        return df
+    
+    def _download_batch(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch one multi-ticker batch with retry logic.
+        
+        Runs on a download worker; every attempt first takes a slot from the
+        limiter shared by all workers.
+        
+        Returns:
+            Dictionary mapping symbol to OHLCV DataFrame (symbols without
+            data are left out)
+        """
+        data = None
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                self._batch_limiter.acquire()
+                data = yf.download(
+                    symbols,
+                    start=start_date,
+                    end=end_date,
+                    interval='1d',
+                    group_by='ticker',
+                    auto_adjust=True,
+                    repair=True,
+                    threads=False,  # the worker pool is the concurrency
+                    progress=False
+                )
+                break
+            except Exception as e:
+                logger.warning(f"Attempt {attempt + 1} failed for batch {symbols[0]}..{symbols[-1]}: {e}")
+                if attempt < self.MAX_RETRIES - 1:
+                    time.sleep(self.RETRY_DELAY * (attempt + 1))
+        
+        if data is None or data.empty:
+            logger.warning(f"No data returned for batch {symbols[0]}..{symbols[-1]} ({len(symbols)} symbols)")
+            return {}
+        
+        frames = {}
+        for symbol in symbols:
+            if isinstance(data.columns, pd.MultiIndex):
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                df = data[symbol]
+            else:
+                df = data
+            # Tickers share one index in a batch; drop the other tickers' dates
+            df = self._normalize_ohlcv(df.dropna(how='all'), symbol)
+            if df is not None and not df.empty:
+                frames[symbol] = df
+        logger.info(f"Fetched {len(frames)}/{len(symbols)} symbols from {start_date}")
+        return frames
+    
     def fetch_stock(
         self,
         symbol: str,
@@ -836,6 +1142,94 @@ class DataCollector:
             save=save
         )
     
+    def collect(
+        self,
+        symbols: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        validate: bool = True
+    ) -> Dict[str, Tuple[Optional[pd.DataFrame], Optional[DataQualityReport]]]:
+        """
+        Bulk, incremental collection into the partitioned dataset.
+        
+        Each symbol is fetched from the day after its last stored date (from
+        the manifest), or from ``start_date`` if nothing is stored; for stored
+        symbols ``start_date`` is ignored. Symbols
+        with the same fetch start are downloaded together in batches of
+        ``BATCH_SIZE``, on ``DOWNLOAD_WORKERS`` threads sharing one rate
+        limiter. Validation runs in a pool of ``VALIDATION_WORKERS``. Only
+        new rows are written, and the manifest is saved after each batch.
+        
+        Args:
+            symbols: Stock symbols (default: all F&O stocks)
+            start_date: Start date for symbols with no stored data
+                (default: DEFAULT_START_DATE)
+            end_date: End date (YYYY-MM-DD, exclusive), defaults to today
+            validate: Whether to validate the new rows
+            
+        Returns:
+            Dictionary mapping symbol to (new rows, Report). The frame is
+            empty when the symbol was already up to date and None when the
+            download returned nothing.
+        """
+        symbols = list(dict.fromkeys(symbols if symbols is not None else self.fno_stocks))
+        start_date = start_date or self.DEFAULT_START_DATE
+        end_date = end_date or datetime.now().strftime('%Y-%m-%d')
+        
+        results: Dict[str, Tuple[Optional[pd.DataFrame], Optional[DataQualityReport]]] = {}
+        by_start: Dict[str, List[str]] = {}
+        for symbol in symbols:
+            last = self.storage.last_date(symbol)
+            # Stored symbols always resume right after their last date, even
+            # if start_date is later: the dataset must stay gap-free.
+            fetch_from = start_date if last is None else (last + timedelta(days=1)).strftime('%Y-%m-%d')
+            if fetch_from >= end_date:
+                results[symbol] = (pd.DataFrame(), None)
+            else:
+                by_start.setdefault(fetch_from, []).append(symbol)
+        
+        batches = [
+            (fetch_from, group[i:i + self.BATCH_SIZE])
+            for fetch_from, group in sorted(by_start.items())
+            for i in range(0, len(group), self.BATCH_SIZE)
+        ]
+        logger.info(f"Collecting {len(symbols)} symbols: {len(results)} up to date, "
+                    f"{sum(len(b) for _, b in batches)} to fetch in {len(batches)} batches")
+        
+        with ThreadPoolExecutor(self.DOWNLOAD_WORKERS, thread_name_prefix='collect-dl') as downloads, \
+                ThreadPoolExecutor(self.VALIDATION_WORKERS, thread_name_prefix='collect-val') as validators:
+            pending = {
+                downloads.submit(self._download_batch, batch, fetch_from, end_date): batch
+                for fetch_from, batch in batches
+            }
+            for done, future in enumerate(as_completed(pending), 1):
+                batch = pending[future]
+                try:
+                    frames = future.result()
+                except Exception as e:
+                    logger.error(f"Batch {batch[0]}..{batch[-1]} failed: {e}", exc_info=True)
+                    frames = {}
+                
+                reports = {}
+                if validate and frames:
+                    reports = dict(zip(frames, validators.map(self.validator.validate, frames.values(), frames)))
+                    for symbol, report in reports.items():
+                        if not report.is_valid:
+                            logger.warning(f"Data quality issues for {symbol}: {report.issues}")
+                
+                # Writes stay on this thread: one writer for the dataset and manifest
+                for symbol in batch:
+                    if symbol in frames:
+                        results[symbol] = (self.storage.append_stock_data(symbol, frames[symbol]), reports.get(symbol))
+                    else:
+                        results[symbol] = (None, None)
+                self.storage.save_manifest()
+                logger.info(f"Batch {done}/{len(batches)} stored ({len(frames)}/{len(batch)} symbols)")
+        
+        fetched = sum(1 for df, _ in results.values() if df is not None)
+        logger.info(f"Completed: {fetched}/{len(symbols)} collected")
+        return results
+    
     def update_stock(self, symbol: str) -> Optional[pd.DataFrame]:
         """
         Update data for a single stock (incremental update).
@@ -853,10 +1247,10 @@ class DataCollector:
         
         if info is None:
             # No existing data, fetch from default start date
-            logger.info(f"No existing data for {symbol}, fetching from 2020-01-01")
+            logger.info(f"No existing data for {symbol}, fetching from {self.DEFAULT_START_DATE}")
             df, _ = self.fetch_stock(
                 symbol=symbol,
-                start_date='2020-01-01',
+                start_date=self.DEFAULT_START_DATE,
                 validate=True,
                 save=True
             )
@@ -892,15 +1286,35 @@ class DataCollector:
         
         return merged_df
     
-    def update_all_stocks(self) -> Dict[str, Optional[pd.DataFrame]]:
+    def update_all_stocks(
+        self,
+        bulk: bool = True,
+        new_rows_only: bool = False
+    ) -> Dict[str, Optional[pd.DataFrame]]:
         """
         Update data for all F&O stocks (incremental update).
         
+        Args:
+            bulk: Use ``collect`` (batched, append-only, manifest-driven).
+                With False, each stock goes through ``update_stock``.
+            new_rows_only: Bulk mode only. Return just the rows this run
+                appended instead of re-reading every symbol's full history.
+        
         Returns:
-            Dictionary mapping symbol to updated DataFrame
+            Dictionary mapping symbol to its full updated DataFrame (None if
+            nothing is stored), as ``update_stock`` returns. With
+            ``bulk=True, new_rows_only=True`` the frames are the new rows
+            only: empty when already up to date, None when the download
+            returned nothing.
         """
         logger.info(f"Updating data for {len(self.fno_stocks)} F&O stocks")
         
+        if bulk:
+            collected = self.collect()
+            if new_rows_only:
+                return {symbol: df for symbol, (df, _) in collected.items()}
+            return {symbol: self.storage.load_stock_data(symbol) for symbol in collected}
+        
         results = {}
         for i, symbol in enumerate(self.fno_stocks, 1):
             logger.info(f"Updating {i}/{len(self.fno_stocks)}: {symbol}")